@@ -777,6 +777,118 @@ resource "yandex_serverless_container" "retention_task" {
   }
 }
 
+resource "yandex_serverless_container" "analytics_rollup_task" {
+  name               = "${local.name_prefix}-access-analytics-rollup"
+  description        = "Daily modal analytics rollup for access"
+  memory             = var.task_memory_mb
+  cores              = 1
+  core_fraction      = 100
+  concurrency        = 1
+  execution_timeout  = var.task_execution_timeout
+  service_account_id = yandex_iam_service_account.runtime.id
+
+  runtime {
+    type = "task"
+  }
+
+  connectivity {
+    network_id = yandex_vpc_network.portal.id
+  }
+
+  metadata_options {
+    gce_http_endpoint = 1
+  }
+
+  image {
+    url         = "cr.yandex/${yandex_container_registry.portal.id}/updatingspace-portal-access:${local.image_tags.access}"
+    command     = ["/app/bin/serverless-task.sh"]
+    args        = ["rollup_modal_analytics"]
+    environment = local.access_env
+  }
+
+  secrets {
+    id                   = yandex_lockbox_secret.runtime.id
+    version_id           = yandex_lockbox_secret_version.runtime.id
+    key                  = "DJANGO_SECRET_KEY"
+    environment_variable = "DJANGO_SECRET_KEY"
+  }
+
+  secrets {
+    id                   = yandex_lockbox_secret.runtime.id
+    version_id           = yandex_lockbox_secret_version.runtime.id
+    key                  = "BFF_INTERNAL_HMAC_SECRET"
+    environment_variable = "BFF_INTERNAL_HMAC_SECRET"
+  }
+
+  log_options {
+    log_group_id = yandex_logging_group.portal.id
+    min_level    = "INFO"
+  }
+}
+
+resource "yandex_serverless_container" "dsar_jobs_task" {
+  name               = "${local.name_prefix}-bff-dsar-jobs"
+  description        = "Queued DSAR export and erase jobs for bff"
+  memory             = var.task_memory_mb
+  cores              = 1
+  core_fraction      = 100
+  concurrency        = 1
+  execution_timeout  = var.task_execution_timeout
+  service_account_id = yandex_iam_service_account.runtime.id
+
+  runtime {
+    type = "task"
+  }
+
+  connectivity {
+    network_id = yandex_vpc_network.portal.id
+  }
+
+  metadata_options {
+    gce_http_endpoint = 1
+  }
+
+  image {
+    url         = "cr.yandex/${yandex_container_registry.portal.id}/updatingspace-portal-bff:${local.image_tags.bff}"
+    command     = ["/app/bin/serverless-task.sh"]
+    args        = ["process_dsar_jobs"]
+    environment = local.bff_env
+  }
+
+  secrets {
+    id                   = yandex_lockbox_secret.runtime.id
+    version_id           = yandex_lockbox_secret_version.runtime.id
+    key                  = "DJANGO_SECRET_KEY"
+    environment_variable = "DJANGO_SECRET_KEY"
+  }
+
+  secrets {
+    id                   = yandex_lockbox_secret.runtime.id
+    version_id           = yandex_lockbox_secret_version.runtime.id
+    key                  = "BFF_INTERNAL_HMAC_SECRET"
+    environment_variable = "BFF_INTERNAL_HMAC_SECRET"
+  }
+
+  secrets {
+    id                   = yandex_lockbox_secret.runtime.id
+    version_id           = yandex_lockbox_secret_version.runtime.id
+    key                  = "BFF_UPDSPACEID_CALLBACK_SECRET"
+    environment_variable = "BFF_UPDSPACEID_CALLBACK_SECRET"
+  }
+
+  secrets {
+    id                   = yandex_lockbox_secret.runtime.id
+    version_id           = yandex_lockbox_secret_version.runtime.id
+    key                  = "BFF_OIDC_CLIENT_SECRET"
+    environment_variable = "BFF_OIDC_CLIENT_SECRET"
+  }
+
+  log_options {
+    log_group_id = yandex_logging_group.portal.id
+    min_level    = "INFO"
+  }
+}
+
 resource "yandex_message_queue" "outbox" {
   for_each = local.outbox_services
 
@@ -836,6 +948,32 @@ resource "yandex_function_trigger" "retention" {
   }
 }
 
+resource "yandex_function_trigger" "analytics_rollup" {
+  name = "${local.name_prefix}-access-analytics-rollup"
+
+  container {
+    id                 = yandex_serverless_container.analytics_rollup_task.id
+    service_account_id = yandex_iam_service_account.trigger.id
+  }
+
+  timer {
+    cron_expression = var.analytics_rollup_cron
+  }
+}
+
+resource "yandex_function_trigger" "dsar_jobs" {
+  name = "${local.name_prefix}-bff-dsar-jobs"
+
+  container {
+    id                 = yandex_serverless_container.dsar_jobs_task.id
+    service_account_id = yandex_iam_service_account.trigger.id
+  }
+
+  timer {
+    cron_expression = var.dsar_jobs_cron
+  }
+}
+
 resource "yandex_api_gateway" "portal" {
   name        = "${local.name_prefix}-gateway"
   description = "Portal shared gateway for tenant wildcard routing and Object Storage frontend delivery"
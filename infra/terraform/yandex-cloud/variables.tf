@@ -216,6 +216,18 @@ variable "retention_cron" {
   default     = "0 0 3 ? * *"
 }
 
+variable "analytics_rollup_cron" {
+  description = "Cron schedule for the nightly access modal analytics rollup trigger."
+  type        = string
+  default     = "0 30 0 ? * *"
+}
+
+variable "dsar_jobs_cron" {
+  description = "Cron schedule for the trigger that runs queued BFF DSAR jobs."
+  type        = string
+  default     = "0 * * ? * *"
+}
+
 variable "log_retention_period" {
   description = "Cloud Logging group retention period."
   type        = string
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Connection-count benchmark for the BFF streaming proxy.
+
+Opens N concurrent SSE streams through the BFF, holds them open and, while
+they are idle, measures the latency of regular API calls. Under the old
+gthread worker the probes stall once N reaches the thread count; under the
+ASGI server they should stay flat up to thousands of streams.
+
+Usage:
+    python scripts/bench/bff_stream_connections.py \\
+        --base-url http://localhost:8080 --cookie "updspace_session=<id>" \\
+        --streams 2000 --probes 50
+
+Requires only httpx. Prints a JSON summary.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+
+async def _hold_stream(
+    client: httpx.AsyncClient,
+    path: str,
+    opened: asyncio.Queue[bool],
+    stop: asyncio.Event,
+) -> None:
+    try:
+        async with client.stream("GET", path, headers={"Accept": "text/event-stream"}) as resp:
+            await opened.put(resp.status_code == 200)
+            if resp.status_code != 200:
+                return
+            async for _ in resp.aiter_bytes():
+                if stop.is_set():
+                    return
+    except httpx.HTTPError:
+        await opened.put(False)
+
+
+async def _wait_opened(opened: asyncio.Queue[bool], expected: int, timeout: float) -> tuple[int, int]:
+    ok = failed = 0
+    deadline = time.monotonic() + timeout
+    while ok + failed < expected:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            if await asyncio.wait_for(opened.get(), remaining):
+                ok += 1
+            else:
+                failed += 1
+        except asyncio.TimeoutError:
+            break
+    return ok, failed
+
+
+async def _probe(client: httpx.AsyncClient, path: str, count: int) -> tuple[list[float], int]:
+    latencies: list[float] = []
+    errors = 0
+    for _ in range(count):
+        started = time.perf_counter()
+        try:
+            resp = await client.get(path, timeout=30)
+            if resp.status_code >= 500:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+            continue
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, errors
+
+
+def _percentile(values: list[float], pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return round(ordered[index], 2)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    headers = {"Cookie": args.cookie} if args.cookie else {}
+    limits = httpx.Limits(max_connections=args.streams + 16, max_keepalive_connections=16)
+    timeout = httpx.Timeout(30, read=None)
+    async with (
+        httpx.AsyncClient(base_url=args.base_url, headers=headers, limits=limits, timeout=timeout) as streams,
+        httpx.AsyncClient(base_url=args.base_url, headers=headers, timeout=30) as probes,
+    ):
+        baseline, _ = await _probe(probes, args.probe_path, args.probes)
+
+        stop = asyncio.Event()
+        opened: asyncio.Queue[bool] = asyncio.Queue()
+        tasks = []
+        for index in range(args.streams):
+            tasks.append(asyncio.create_task(_hold_stream(streams, args.stream_path, opened, stop)))
+            if args.ramp and index % args.ramp == args.ramp - 1:
+                await asyncio.sleep(0.05)
+        ok, failed = await _wait_opened(opened, args.streams, args.open_timeout)
+
+        await asyncio.sleep(args.settle)
+        loaded, errors = await _probe(probes, args.probe_path, args.probes)
+
+        stop.set()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def summary(values: list[float]) -> dict:
+        return {
+            "count": len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "max_ms": round(max(values), 2) if values else None,
+            "mean_ms": round(statistics.fmean(values), 2) if values else None,
+        }
+
+    return {
+        "streams_requested": args.streams,
+        "streams_open": ok,
+        "streams_failed": failed,
+        "streams_pending": args.streams - ok - failed,
+        "probe_baseline": summary(baseline),
+        "probe_under_load": {**summary(loaded), "errors": errors},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8080")
+    parser.add_argument("--cookie", default="", help="Session cookie, e.g. updspace_session=<id>")
+    parser.add_argument("--stream-path", default="/api/v1/activity/feed/sse")
+    parser.add_argument("--probe-path", default="/api/v1/session/me")
+    parser.add_argument("--streams", type=int, default=1000)
+    parser.add_argument("--probes", type=int, default=50)
+    parser.add_argument("--ramp", type=int, default=200, help="Streams opened per 50 ms step (0 = all at once)")
+    parser.add_argument("--open-timeout", type=float, default=60.0)
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to idle before probing")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,8 @@ from access_control.models import (
     TenantAdminAuditEvent,
 )
 from access_control.schemas import (
+    CheckBulkIn,
+    CheckBulkOut,
     CheckIn,
     CheckOut,
     EffectiveRoleOut,
@@ -42,6 +44,7 @@ from access_control.schemas import (
 from access_control.services import (
     MasterFlags,
     compute_effective_access,
+    compute_effective_access_bulk,
     log_tenant_admin_event,
     master_flags_from_dict,
 )
@@ -175,6 +178,7 @@ def dsar_export(request, target_user_id: UUID):
         target_type="dsar_request",
         target_id=audit_target_id,
         metadata={"subject_scope": subject_scope},
+        sync=True,
     )
     return payload
 
@@ -208,10 +212,20 @@ def dsar_erase(request, target_user_id: UUID):
             target_type="dsar_request",
             target_id=audit_target_id,
             metadata={"subject_scope": subject_scope},
+            sync=True,
         )
         return payload
 
 
+def _check_master_flags(mf_in, ctx) -> MasterFlags:
+    return MasterFlags(
+        suspended=bool(getattr(mf_in, "suspended", False)) if mf_in else bool(ctx.master_flags.get("suspended")),
+        banned=bool(getattr(mf_in, "banned", False)) if mf_in else bool(ctx.master_flags.get("banned")),
+        system_admin=bool(getattr(mf_in, "system_admin", False)) if mf_in else bool(ctx.master_flags.get("system_admin")),
+        membership_status=getattr(mf_in, "membership_status", None) if mf_in else ctx.master_flags.get("membership_status"),
+    )
+
+
 @router.post(
     "/check",
     response={200: CheckOut, 400: ErrorOut, 401: ErrorOut, 403: ErrorOut},
@@ -236,13 +250,7 @@ def check_access(request, payload: CheckIn):
             message="user_id does not match X-User-Id",
         )
 
-    mf_in = payload.master_flags
-    mf = MasterFlags(
-        suspended=bool(getattr(mf_in, "suspended", False)) if mf_in else bool(ctx.master_flags.get("suspended")),
-        banned=bool(getattr(mf_in, "banned", False)) if mf_in else bool(ctx.master_flags.get("banned")),
-        system_admin=bool(getattr(mf_in, "system_admin", False)) if mf_in else bool(ctx.master_flags.get("system_admin")),
-        membership_status=getattr(mf_in, "membership_status", None) if mf_in else ctx.master_flags.get("membership_status"),
-    )
+    mf = _check_master_flags(payload.master_flags, ctx)
 
     decision = compute_effective_access(
         tenant_id=payload.tenant_id,
@@ -264,6 +272,44 @@ def check_access(request, payload: CheckIn):
     )
 
 
+@router.post(
+    "/check-bulk",
+    response={200: CheckBulkOut, 400: ErrorOut, 401: ErrorOut, 403: ErrorOut},
+    operation_id="access_check_bulk",
+)
+def check_access_bulk(request, payload: CheckBulkIn):
+    """Evaluate several actions at one scope in a single round trip."""
+    ctx = require_internal_context(request)
+
+    if str(payload.tenant_id) != str(ctx.tenant_id):
+        return _error(
+            request,
+            status=400,
+            code="TENANT_MISMATCH",
+            message="tenant_id does not match X-Tenant-Id",
+        )
+    if str(payload.user_id) != str(ctx.user_id):
+        return _error(
+            request,
+            status=400,
+            code="USER_MISMATCH",
+            message="user_id does not match X-User-Id",
+        )
+
+    mf = _check_master_flags(payload.master_flags, ctx)
+
+    return CheckBulkOut(
+        permissions=compute_effective_access_bulk(
+            tenant_id=payload.tenant_id,
+            user_id=payload.user_id,
+            permission_keys=payload.actions,
+            scope_type=payload.scope.type,
+            scope_id=payload.scope.id,
+            master_flags=mf,
+        )
+    )
+
+
 @router.get(
     "/permissions",
     response={200: list[PermissionOut], 401: ErrorOut},
@@ -5,9 +5,9 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
 from access_control.models import TenantAdminAuditEvent
+from core.retention import PurgeTarget, RetentionPurge, add_purge_arguments
 
 
 class Command(BaseCommand):
@@ -20,11 +20,19 @@ class Command(BaseCommand):
             default=int(getattr(settings, "ACCESS_RETENTION_AUDIT_DAYS", 365)),
             help="Retention window for tenant admin audit events in days",
         )
+        add_purge_arguments(parser)
 
     def handle(self, *args, **options):
-        now = timezone.now()
+        purge = RetentionPurge.from_options(options)
+        now = purge.started_at
         audit_cutoff = now - timedelta(days=int(options["audit_days"]))
-        audit_deleted, _ = TenantAdminAuditEvent.objects.filter(created_at__lt=audit_cutoff).delete()
+        audit_deleted = purge.run(
+            PurgeTarget(
+                "tenant_admin_audit",
+                TenantAdminAuditEvent.objects.filter(created_at__lt=audit_cutoff),
+                order_field="created_at",
+            )
+        )
 
         payload = {
             "service": "access",
@@ -35,5 +43,6 @@ class Command(BaseCommand):
             "counts": {
                 "tenant_admin_audit_deleted": audit_deleted,
             },
+            "purge": purge.finish(),
         }
         self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access_control", "0016_backfill_personalization_member_permissions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RolloutConfigVersion",
+            fields=[
+                ("scope", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Rollout config version",
+                "verbose_name_plural": "Rollout config versions",
+            },
+        ),
+    ]
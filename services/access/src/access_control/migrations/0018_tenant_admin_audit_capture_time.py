@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:19
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("access_control", "0017_rollout_config_version"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tenantadminauditevent",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -183,7 +183,7 @@ class TenantAdminAuditEvent(models.Model):
     target_type = models.CharField(max_length=32, blank=True)
     target_id = models.CharField(max_length=128, blank=True)
     metadata = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         verbose_name = "Tenant admin audit event"
@@ -351,6 +351,25 @@ class KillSwitch(models.Model):
         return f"kill:{self.feature_key} {'ACTIVE' if self.active else 'inactive'}"
 
 
+class RolloutConfigVersion(models.Model):
+    """Monotonic change counter for rollout config, per scope.
+
+    ``scope`` is ``"global"`` for rows with tenant_id=None, otherwise the
+    tenant id. Evaluation caches compiled rulesets keyed by these versions.
+    """
+
+    scope = models.CharField(max_length=64, primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Rollout config version"
+        verbose_name_plural = "Rollout config versions"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.scope}@{self.version}"
+
+
 class RolloutAuditLog(models.Model):
     """Audit log for rollout/feature flag/experiment changes."""
 
@@ -20,7 +20,7 @@ from access_control.models import (
     KillSwitch,
     RolloutAuditLog,
 )
-from access_control.rollout_services import evaluate_rollout
+from access_control.rollout_services import bump_rollout_version, evaluate_rollout
 from access_control.schemas import (
     ErrorEnvelope,
     ErrorOut,
@@ -80,6 +80,9 @@ def _log_rollout_change(
         entity_id=entity_id,
         changes=changes or {},
     )
+    # Every rollout write is logged here, so this is also where compiled
+    # rulesets are invalidated.
+    bump_rollout_version(tenant_id)
 
 
 # ---------------------------------------------------------------------------
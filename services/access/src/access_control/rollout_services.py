@@ -3,23 +3,45 @@ Rollout evaluation logic.
 
 Evaluates feature flags and experiments for a given user+tenant context.
 Supports: kill switches, percentage rollout, user lists, tenant lists.
+
+Rows are compiled once per tenant into a ``RolloutRuleset``: tenant-specific
+rows shadow global ones, kill switches and tenant lists are resolved up front,
+user lists become sets and percentages become bucket thresholds. Rulesets are
+cached per process and keyed by ``RolloutConfigVersion`` counters, which the
+rollout API bumps on every write; a worker re-reads the counters at most every
+``ACCESS_ROLLOUT_VERSION_CHECK_SECONDS``, so evaluation normally runs no queries.
 """
 from __future__ import annotations
 
 import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from uuid import UUID
 
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
 
 from access_control.models import (
     Experiment,
     FeatureFlag,
     KillSwitch,
+    RolloutConfigVersion,
 )
 
 logger = logging.getLogger(__name__)
 
+GLOBAL_SCOPE = "global"
+
+# Compiled rule modes. Constant modes are decided at compile time.
+_MODE_OFF = "off"
+_MODE_ON = "on"
+_MODE_PERCENT = "percent"
+_MODE_USERS = "users"
+
 
 def _in_percentage(user_key_hash: str, feature_key: str, pct: int) -> bool:
     """Deterministic percentage check using hash(user_key_hash + feature_key)."""
@@ -82,6 +104,257 @@ def _assign_variant(
     return variants[-1].get("name", "control")
 
 
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    key: str
+    mode: str
+    threshold: int = 0
+    user_ids: frozenset[str] = frozenset()
+    hash_suffix: bytes = b""
+
+    def matches(self, user_id: str, user_key_hash: bytes) -> bool:
+        if self.mode == _MODE_ON:
+            return True
+        if self.mode == _MODE_USERS:
+            return user_id in self.user_ids
+        if self.mode == _MODE_PERCENT:
+            return _bucket(user_key_hash + self.hash_suffix, 100) < self.threshold
+        return False
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledExperiment:
+    rule: CompiledRule
+    # (cumulative upper bound, variant name), in declaration order.
+    variants: tuple[tuple[int, str], ...] = ()
+    total_weight: int = 0
+    fallback: str = "control"
+    hash_suffix: bytes = b""
+
+    def assign(self, user_id: str, user_key_hash: bytes) -> str:
+        if not self.rule.matches(user_id, user_key_hash):
+            return "control"
+        if self.total_weight <= 0:
+            return self.fallback
+        bucket = _bucket(user_key_hash + self.hash_suffix, self.total_weight)
+        for upper, name in self.variants:
+            if bucket < upper:
+                return name
+        return self.fallback
+
+
+@dataclass(frozen=True, slots=True)
+class RolloutRuleset:
+    versions: tuple[int, int]
+    flags: tuple[CompiledRule, ...]
+    experiments: tuple[CompiledExperiment, ...]
+
+    def evaluate(self, user_id: UUID, user_key_hash: str) -> tuple[dict[str, bool], dict[str, str]]:
+        uid = str(user_id)
+        key_hash = user_key_hash.encode()
+        flags = {rule.key: rule.matches(uid, key_hash) for rule in self.flags}
+        experiments = {exp.rule.key: exp.assign(uid, key_hash) for exp in self.experiments}
+        return flags, experiments
+
+
+def _bucket(data: bytes, modulo: int) -> int:
+    # Same bucket as int(sha256(...).hexdigest()[:8], 16) % modulo.
+    return int.from_bytes(hashlib.sha256(data).digest()[:4], "big") % modulo
+
+
+def _compile_rule(
+    *,
+    key: str,
+    enabled: bool,
+    killed: bool,
+    target_type: str,
+    target_value: dict,
+    tenant_id: str,
+) -> CompiledRule:
+    if killed or not enabled:
+        return CompiledRule(key=key, mode=_MODE_OFF)
+    if target_type == "all":
+        return CompiledRule(key=key, mode=_MODE_ON)
+    if target_type == "percent":
+        pct = target_value.get("pct", 0)
+        if not isinstance(pct, (int, float)):
+            return CompiledRule(key=key, mode=_MODE_OFF)
+        pct = int(pct)
+        if pct >= 100:
+            return CompiledRule(key=key, mode=_MODE_ON)
+        if pct <= 0:
+            return CompiledRule(key=key, mode=_MODE_OFF)
+        return CompiledRule(
+            key=key,
+            mode=_MODE_PERCENT,
+            threshold=pct,
+            hash_suffix=f":{key}".encode(),
+        )
+    if target_type == "user_list":
+        user_ids = frozenset(str(uid) for uid in target_value.get("user_ids", []))
+        return CompiledRule(key=key, mode=_MODE_USERS, user_ids=user_ids)
+    if target_type == "tenant_list":
+        tenant_ids = {str(tid) for tid in target_value.get("tenant_ids", [])}
+        return CompiledRule(key=key, mode=_MODE_ON if tenant_id in tenant_ids else _MODE_OFF)
+    return CompiledRule(key=key, mode=_MODE_OFF)
+
+
+def _compile_experiment(exp: Experiment, *, killed: bool, tenant_id: str) -> CompiledExperiment:
+    rule = _compile_rule(
+        key=exp.key,
+        enabled=exp.enabled,
+        killed=killed,
+        target_type=exp.target_type,
+        target_value=exp.target_value or {},
+        tenant_id=tenant_id,
+    )
+    variants = [v for v in exp.variants if isinstance(v, dict)] if isinstance(exp.variants, list) else []
+    if not variants:
+        return CompiledExperiment(rule=rule)
+
+    bounds: list[tuple[int, str]] = []
+    cumulative = 0
+    for variant in variants:
+        cumulative += variant.get("weight", 0)
+        bounds.append((cumulative, variant.get("name", "control")))
+    total_weight = sum(v.get("weight", 0) for v in variants)
+    fallback_index = 0 if total_weight <= 0 else -1
+    return CompiledExperiment(
+        rule=rule,
+        variants=tuple(bounds),
+        total_weight=total_weight,
+        fallback=variants[fallback_index].get("name", "control"),
+        hash_suffix=f":exp:{exp.key}".encode(),
+    )
+
+
+def _scoped_rows(model: type[FeatureFlag | Experiment], tenant_id: UUID) -> list:
+    """
+    Rows visible to the tenant by key, tenant-specific rows shadowing global ones.
+
+    The precedence is decided here, not by row order. The previous
+    ``order_by("key", "-tenant_id")`` put NULL (global) rows first on
+    Postgres, so there a global row shadowed the tenant's own row; tenant
+    rows now win on every backend.
+    """
+    by_key: dict[str, FeatureFlag | Experiment] = {}
+    for row in model.objects.filter(Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True)):
+        current = by_key.get(row.key)
+        if current is None or current.tenant_id is None:
+            by_key[row.key] = row
+    return [by_key[key] for key in sorted(by_key)]
+
+
+def compile_ruleset(tenant_id: UUID, *, versions: tuple[int, int] = (0, 0)) -> RolloutRuleset:
+    tenant_key = str(tenant_id)
+    kill_switches = set(
+        KillSwitch.objects.filter(active=True)
+        .filter(Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True))
+        .values_list("feature_key", flat=True)
+    )
+    flags = tuple(
+        _compile_rule(
+            key=flag.key,
+            enabled=flag.enabled,
+            killed=flag.key in kill_switches,
+            target_type=flag.target_type,
+            target_value=flag.target_value or {},
+            tenant_id=tenant_key,
+        )
+        for flag in _scoped_rows(FeatureFlag, tenant_id)
+    )
+    experiments = tuple(
+        _compile_experiment(exp, killed=exp.key in kill_switches, tenant_id=tenant_key)
+        for exp in _scoped_rows(Experiment, tenant_id)
+    )
+    return RolloutRuleset(versions=versions, flags=flags, experiments=experiments)
+
+
+# ---------------------------------------------------------------------------
+# Versioned ruleset cache
+# ---------------------------------------------------------------------------
+
+
+def _scope(tenant_id: UUID | None) -> str:
+    return GLOBAL_SCOPE if tenant_id is None else str(tenant_id)
+
+
+def read_rollout_versions(tenant_id: UUID) -> tuple[int, int]:
+    """(global version, tenant version); scopes never written count as 0."""
+    tenant_scope = _scope(tenant_id)
+    rows = dict(
+        RolloutConfigVersion.objects.filter(scope__in=[GLOBAL_SCOPE, tenant_scope]).values_list(
+            "scope", "version"
+        )
+    )
+    return rows.get(GLOBAL_SCOPE, 0), rows.get(tenant_scope, 0)
+
+
+class RulesetCache:
+    """Per-process LRU of compiled rulesets, revalidated against the DB version."""
+
+    def __init__(self, *, max_size: int, check_seconds: float) -> None:
+        self.max_size = max(1, max_size)
+        self.check_seconds = check_seconds
+        self._items: OrderedDict[str, tuple[RolloutRuleset, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, tenant_id: UUID) -> RolloutRuleset:
+        key = str(tenant_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and now - entry[1] < self.check_seconds:
+                self._items.move_to_end(key)
+                return entry[0]
+
+        versions = read_rollout_versions(tenant_id)
+        if entry is not None and entry[0].versions == versions:
+            ruleset = entry[0]
+        else:
+            ruleset = compile_ruleset(tenant_id, versions=versions)
+        with self._lock:
+            self._items[key] = (ruleset, now)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return ruleset
+
+    def invalidate(self, tenant_id: UUID | None) -> None:
+        with self._lock:
+            if tenant_id is None:
+                self._items.clear()
+            else:
+                self._items.pop(str(tenant_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+ruleset_cache = RulesetCache(
+    max_size=int(getattr(settings, "ACCESS_ROLLOUT_CACHE_SIZE", 1024)),
+    check_seconds=float(getattr(settings, "ACCESS_ROLLOUT_VERSION_CHECK_SECONDS", 2)),
+)
+
+
+def bump_rollout_version(tenant_id: UUID | None) -> None:
+    """Record a rollout config change for a tenant (or globally for None).
+
+    Call inside the writing transaction. Other workers notice on their next
+    version check; this one drops its compiled copy immediately and again on
+    commit, so a ruleset compiled from pre-commit rows is not kept.
+    """
+    scope = _scope(tenant_id)
+    updated = RolloutConfigVersion.objects.filter(scope=scope).update(version=F("version") + 1)
+    if not updated:
+        _, created = RolloutConfigVersion.objects.get_or_create(scope=scope, defaults={"version": 1})
+        if not created:
+            RolloutConfigVersion.objects.filter(scope=scope).update(version=F("version") + 1)
+    ruleset_cache.invalidate(tenant_id)
+    transaction.on_commit(lambda: ruleset_cache.invalidate(tenant_id))
+
+
 def evaluate_rollout(
     tenant_id: UUID,
     user_id: UUID,
@@ -96,78 +369,4 @@ def evaluate_rollout(
     """
     if not user_key_hash:
         user_key_hash = hashlib.sha256(str(user_id).encode()).hexdigest()
-
-    # Collect kill switches
-    kill_switches = set(
-        KillSwitch.objects.filter(
-            active=True,
-        )
-        .filter(Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True))
-        .values_list("feature_key", flat=True)
-    )
-
-    # Evaluate feature flags
-    flags_qs = FeatureFlag.objects.filter(
-        Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True)
-    ).order_by("key", "-tenant_id")  # tenant-specific first
-
-    feature_flags: dict[str, bool] = {}
-    seen_keys: set[str] = set()
-    for flag in flags_qs:
-        if flag.key in seen_keys:
-            continue
-        seen_keys.add(flag.key)
-
-        if flag.key in kill_switches:
-            feature_flags[flag.key] = False
-            continue
-
-        if not flag.enabled:
-            feature_flags[flag.key] = False
-            continue
-
-        feature_flags[flag.key] = _matches_target(
-            flag.target_type,
-            flag.target_value or {},
-            user_id,
-            tenant_id,
-            user_key_hash,
-            flag.key,
-        )
-
-    # Evaluate experiments
-    experiments_qs = Experiment.objects.filter(
-        Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True)
-    ).order_by("key", "-tenant_id")
-
-    experiments: dict[str, str] = {}
-    seen_exp_keys: set[str] = set()
-    for exp in experiments_qs:
-        if exp.key in seen_exp_keys:
-            continue
-        seen_exp_keys.add(exp.key)
-
-        if exp.key in kill_switches:
-            # Killed experiment -> assign "control"
-            experiments[exp.key] = "control"
-            continue
-
-        if not exp.enabled:
-            experiments[exp.key] = "control"
-            continue
-
-        if not _matches_target(
-            exp.target_type,
-            exp.target_value or {},
-            user_id,
-            tenant_id,
-            user_key_hash,
-            exp.key,
-        ):
-            experiments[exp.key] = "control"
-            continue
-
-        variants = exp.variants if isinstance(exp.variants, list) else []
-        experiments[exp.key] = _assign_variant(user_key_hash, exp.key, variants)
-
-    return feature_flags, experiments
+    return ruleset_cache.get(tenant_id).evaluate(user_id, user_key_hash)
@@ -58,6 +58,18 @@ class CheckOut(Schema):
     effective_permissions: list[str] | None = None
 
 
+class CheckBulkIn(Schema):
+    tenant_id: uuid.UUID
+    user_id: uuid.UUID
+    actions: list[str] = Field(min_length=1, max_length=100)
+    scope: ScopeIn
+    master_flags: MasterFlagsIn | None = None
+
+
+class CheckBulkOut(Schema):
+    permissions: dict[str, bool]
+
+
 class PermissionOut(Schema):
     key: str
     description: str
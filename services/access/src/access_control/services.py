@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import uuid
 from dataclasses import dataclass
@@ -19,6 +20,7 @@ from access_control.models import (
     TenantAdminAuditEvent,
 )
 from access_control.permissions_mvp import DEFAULT_MEMBER_ROLE_NAME
+from core.audit_writer import AuditWriter
 
 logger = logging.getLogger(__name__)
 
@@ -201,6 +203,86 @@ def compute_effective_access(
     )
 
 
+def compute_effective_access_bulk(
+    *,
+    tenant_id,
+    user_id,
+    permission_keys: list[str],
+    scope_type: str,
+    scope_id: str,
+    master_flags: MasterFlags | None = None,
+) -> dict[str, bool]:
+    """Evaluate several permission keys at one scope.
+
+    Same rules as :func:`compute_effective_access`, but overrides, bindings,
+    default roles and role permissions are each loaded once for the whole
+    set, so the query count does not grow with the number of keys.
+    """
+
+    mf = master_flags or MasterFlags()
+    keys = list(dict.fromkeys(permission_keys))
+    services_by_key = dict(Permission.objects.filter(key__in=keys).values_list("key", "service"))
+    result = dict.fromkeys(keys, False)
+    if not services_by_key or mf.suspended or mf.banned:
+        return result
+
+    if mf.system_admin:
+        logger.warning(
+            "System admin access allowed",
+            extra={
+                "tenant_id": str(tenant_id),
+                "user_id": str(user_id),
+                "permission": ",".join(sorted(services_by_key)),
+                "scope_type": scope_type,
+                "scope_id": scope_id,
+            },
+        )
+        return {key: key in services_by_key for key in keys}
+
+    now = timezone.now()
+    overrides = list(
+        PolicyOverride.objects.filter(tenant_id=tenant_id, user_id=user_id)
+        .filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+    )
+    service_names = set(services_by_key.values())
+
+    role_ids_by_service: dict[str, set[int]] = {service: set() for service in service_names}
+    for b in RoleBinding.objects.filter(tenant_id=tenant_id, user_id=user_id).select_related("role").filter(
+        role__service__in=service_names
+    ):
+        if _scope_matches(b, tenant_id, scope_type, scope_id):
+            role_ids_by_service[b.role.service].add(b.role_id)
+
+    # Implicit baseline role per service; tenant-specific overrides template.
+    default_roles: dict[str, int] = {}
+    for role in Role.objects.filter(
+        Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True, is_system_template=True),
+        service__in=service_names,
+        name=DEFAULT_MEMBER_ROLE_NAME,
+    ):
+        if role.tenant_id is not None or role.service not in default_roles:
+            default_roles[role.service] = role.id
+    for service, role_id in default_roles.items():
+        role_ids_by_service[service].add(role_id)
+
+    all_role_ids = set().union(*role_ids_by_service.values())
+    perms_by_role: dict[int, set[str]] = {}
+    for role_id, permission_id in RolePermission.objects.filter(role_id__in=all_role_ids).values_list(
+        "role_id", "permission_id"
+    ):
+        perms_by_role.setdefault(role_id, set()).add(permission_id)
+
+    for key, service in services_by_key.items():
+        matching = [o for o in overrides if o.permission_id is None or o.permission_id == key]
+        if any(o.action == PolicyAction.DENY for o in matching):
+            continue
+        if any(o.action == PolicyAction.ALLOW for o in matching):
+            result[key] = True
+            continue
+        result[key] = any(key in perms_by_role.get(role_id, ()) for role_id in role_ids_by_service[service])
+    return result
+
+
 def master_flags_from_dict(master_flags: dict | None) -> MasterFlags:
     flags = master_flags if isinstance(master_flags, dict) else {}
     return MasterFlags(
@@ -211,6 +293,11 @@ def master_flags_from_dict(master_flags: dict | None) -> MasterFlags:
     )
 
 
+# Synchronous unless ACCESS_AUDIT_ASYNC is on; the exit hook drains that queue.
+tenant_admin_audit_writer = AuditWriter(TenantAdminAuditEvent, prefix="ACCESS_AUDIT")
+atexit.register(tenant_admin_audit_writer.shutdown)
+
+
 def log_tenant_admin_event(
     *,
     tenant_id: str | uuid.UUID,
@@ -219,8 +306,10 @@ def log_tenant_admin_event(
     target_type: str,
     target_id: str | None = None,
     metadata: dict[str, Any] | None = None,
+    sync: bool = False,
 ) -> TenantAdminAuditEvent:
-    return TenantAdminAuditEvent.objects.create(
+    """Insert a tenant admin audit row (queued instead when ``ACCESS_AUDIT_ASYNC`` is on)."""
+    event = TenantAdminAuditEvent(
         tenant_id=tenant_id,
         performed_by=performed_by,
         action=action,
@@ -228,3 +317,4 @@ def log_tenant_admin_event(
         target_id=target_id or "",
         metadata=metadata or {},
     )
+    return tenant_admin_audit_writer.write(event, sync=sync)
@@ -543,3 +543,22 @@ class TenantAdminApiTests(TestCase):
         events = events_resp.json()
         self.assertGreaterEqual(len(events), 1)
         self.assertEqual(events[0]["action"], event.action)
+
+    def test_check_bulk_returns_all_requested_keys(self):
+        path = "/api/v1/access/check-bulk"
+        payload = {
+            "tenant_id": self.tenant_id,
+            "user_id": self.user_id,
+            "actions": ["portal.roles.read", "portal.roles.write", "portal.unknown"],
+            "scope": {"type": "TENANT", "id": self.tenant_id},
+        }
+        resp = self._post(path, payload)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json()["permissions"],
+            {"portal.roles.read": True, "portal.roles.write": True, "portal.unknown": False},
+        )
+
+        mismatch = self._post(path, {**payload, "user_id": str(uuid.uuid4())})
+        self.assertEqual(mismatch.status_code, 400)
@@ -6,10 +6,12 @@ Comprehensive coverage of every branch in:
 - _matches_target
 - _assign_variant
 - evaluate_rollout
+- compiled rulesets and their version cache
 """
 
 import hashlib
 import uuid
+from unittest.mock import patch
 
 from django.test import TestCase
 
@@ -17,12 +19,16 @@ from access_control.models import (
     Experiment,
     FeatureFlag,
     KillSwitch,
+    RolloutConfigVersion,
 )
 from access_control.rollout_services import (
     _assign_variant,
     _in_percentage,
     _matches_target,
+    _scoped_rows,
+    bump_rollout_version,
     evaluate_rollout,
+    ruleset_cache,
 )
 
 
@@ -145,6 +151,7 @@ class VariantAssignmentTests(TestCase):
 
 class EvaluateRolloutTests(TestCase):
     def setUp(self):
+        ruleset_cache.clear()
         self.tenant_id = uuid.uuid4()
         self.user_id = uuid.uuid4()
 
@@ -226,6 +233,14 @@ class EvaluateRolloutTests(TestCase):
         flags, _ = evaluate_rollout(self.tenant_id, self.user_id)
         self.assertFalse(flags["override_me"])
 
+    def test_tenant_flag_shadows_global_in_any_row_order(self):
+        # Postgres returns NULL tenant_id first for "-tenant_id"; SQLite last.
+        global_flag = FeatureFlag(key="override_me", tenant_id=None, enabled=True)
+        tenant_flag = FeatureFlag(key="override_me", tenant_id=self.tenant_id, enabled=False)
+        for rows in ([global_flag, tenant_flag], [tenant_flag, global_flag]):
+            with patch.object(FeatureFlag.objects, "filter", return_value=rows):
+                self.assertEqual(_scoped_rows(FeatureFlag, self.tenant_id), [tenant_flag])
+
     def test_enabled_experiment(self):
         Experiment.objects.create(
             key="ab_test",
@@ -487,6 +502,7 @@ class EvaluateRolloutEdgeCaseTests(TestCase):
     """Additional integration tests for evaluate_rollout."""
 
     def setUp(self):
+        ruleset_cache.clear()
         self.tenant_id = uuid.uuid4()
         self.user_id = uuid.uuid4()
 
@@ -742,3 +758,94 @@ class EvaluateRolloutEdgeCaseTests(TestCase):
         )
         flags, _ = evaluate_rollout(self.tenant_id, self.user_id)
         self.assertNotIn("tenant_only", flags)
+
+
+class CompiledRulesetTests(TestCase):
+    """The per-tenant ruleset cache and its version-based invalidation."""
+
+    def setUp(self):
+        ruleset_cache.clear()
+        self.tenant_id = uuid.uuid4()
+        self.user_id = uuid.uuid4()
+
+    def test_cached_evaluation_runs_no_queries(self):
+        FeatureFlag.objects.create(
+            key="cached", tenant_id=self.tenant_id, enabled=True, target_type="all"
+        )
+        evaluate_rollout(self.tenant_id, self.user_id)
+        with self.assertNumQueries(0):
+            flags, _ = evaluate_rollout(self.tenant_id, uuid.uuid4())
+        self.assertTrue(flags["cached"])
+
+    def test_version_bump_invalidates_ruleset(self):
+        flag = FeatureFlag.objects.create(
+            key="toggled", tenant_id=self.tenant_id, enabled=True, target_type="all"
+        )
+        self.assertTrue(evaluate_rollout(self.tenant_id, self.user_id)[0]["toggled"])
+
+        flag.enabled = False
+        flag.save()
+        # Without a bump the compiled ruleset is still served.
+        self.assertTrue(evaluate_rollout(self.tenant_id, self.user_id)[0]["toggled"])
+
+        bump_rollout_version(self.tenant_id)
+        self.assertFalse(evaluate_rollout(self.tenant_id, self.user_id)[0]["toggled"])
+        self.assertEqual(
+            RolloutConfigVersion.objects.get(scope=str(self.tenant_id)).version, 1
+        )
+
+    def test_global_bump_invalidates_every_tenant(self):
+        other_tenant = uuid.uuid4()
+        evaluate_rollout(self.tenant_id, self.user_id)
+        evaluate_rollout(other_tenant, self.user_id)
+        KillSwitch.objects.create(feature_key="everywhere", tenant_id=None, active=True)
+        FeatureFlag.objects.create(
+            key="everywhere", tenant_id=None, enabled=True, target_type="all"
+        )
+
+        bump_rollout_version(None)
+        self.assertFalse(evaluate_rollout(self.tenant_id, self.user_id)[0]["everywhere"])
+        self.assertFalse(evaluate_rollout(other_tenant, self.user_id)[0]["everywhere"])
+
+    def test_stale_version_is_recompiled_after_check_interval(self):
+        FeatureFlag.objects.create(
+            key="remote", tenant_id=self.tenant_id, enabled=True, target_type="all"
+        )
+        evaluate_rollout(self.tenant_id, self.user_id)
+        # Simulate a write made by another worker: the DB version moves but
+        # this process' cache is not told directly.
+        FeatureFlag.objects.filter(key="remote").update(enabled=False)
+        RolloutConfigVersion.objects.create(scope=str(self.tenant_id), version=7)
+
+        previous = ruleset_cache.check_seconds
+        ruleset_cache.check_seconds = 0
+        try:
+            flags, _ = evaluate_rollout(self.tenant_id, self.user_id)
+        finally:
+            ruleset_cache.check_seconds = previous
+        self.assertFalse(flags["remote"])
+
+    def test_compiled_targets_match_reference_functions(self):
+        FeatureFlag.objects.create(
+            key="pct", tenant_id=self.tenant_id, enabled=True,
+            target_type="percent", target_value={"pct": 37},
+        )
+        FeatureFlag.objects.create(
+            key="tenants", tenant_id=None, enabled=True,
+            target_type="tenant_list", target_value={"tenant_ids": [str(self.tenant_id)]},
+        )
+        variants = [
+            {"name": "a", "weight": 10},
+            {"name": "b", "weight": 30},
+            {"name": "c", "weight": 60},
+        ]
+        Experiment.objects.create(
+            key="weighted", tenant_id=self.tenant_id, enabled=True, variants=variants,
+        )
+        for i in range(200):
+            user_id = uuid.uuid4()
+            key_hash = f"hash_{i}"
+            flags, exps = evaluate_rollout(self.tenant_id, user_id, user_key_hash=key_hash)
+            self.assertEqual(flags["pct"], _in_percentage(key_hash, "pct", 37))
+            self.assertTrue(flags["tenants"])
+            self.assertEqual(exps["weighted"], _assign_variant(key_hash, "weighted", variants))
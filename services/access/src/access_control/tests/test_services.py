@@ -208,6 +208,78 @@ class AccessControlComputeTests(TestCase):
         self.assertEqual(decision.reason_code, "RBAC_DENY")
 
 
+class AccessControlBulkComputeTests(TestCase):
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        self.user_id = uuid.uuid4()
+        self.keys = ["voting.vote.cast", "voting.poll.close", "voting.poll.export", "voting.unknown"]
+        for key in self.keys[:3]:
+            Permission.objects.get_or_create(key=key, defaults={"description": key, "service": "voting"})
+
+        role = Role.objects.create(tenant_id=self.tenant_id, service="voting", name="voter")
+        RolePermission.objects.create(role=role, permission_id="voting.vote.cast")
+        RolePermission.objects.create(role=role, permission_id="voting.poll.close")
+        RoleBinding.objects.create(
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            scope_type=ScopeType.TEAM,
+            scope_id="team-1",
+            role=role,
+        )
+        PolicyOverride.objects.create(
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            action=PolicyAction.DENY,
+            permission_id="voting.poll.close",
+            reason="blocked",
+        )
+        PolicyOverride.objects.create(
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            action=PolicyAction.ALLOW,
+            permission_id="voting.poll.export",
+            reason="temporary",
+        )
+
+    def _single(self, key: str, scope_id: str, flags: MasterFlags) -> bool:
+        return compute_effective_access(
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            permission_key=key,
+            scope_type="TEAM",
+            scope_id=scope_id,
+            master_flags=flags,
+        ).allowed
+
+    def test_bulk_matches_single_checks(self):
+        from access_control.services import compute_effective_access_bulk
+
+        for scope_id in ("team-1", "team-2"):
+            for flags in (MasterFlags(), MasterFlags(system_admin=True), MasterFlags(banned=True)):
+                with self.subTest(scope_id=scope_id, flags=flags):
+                    bulk = compute_effective_access_bulk(
+                        tenant_id=self.tenant_id,
+                        user_id=self.user_id,
+                        permission_keys=self.keys,
+                        scope_type="TEAM",
+                        scope_id=scope_id,
+                        master_flags=flags,
+                    )
+                    self.assertEqual(bulk, {key: self._single(key, scope_id, flags) for key in self.keys})
+
+    def test_bulk_query_count_does_not_grow_with_keys(self):
+        from access_control.services import compute_effective_access_bulk
+
+        with self.assertNumQueries(5):
+            compute_effective_access_bulk(
+                tenant_id=self.tenant_id,
+                user_id=self.user_id,
+                permission_keys=self.keys,
+                scope_type="TEAM",
+                scope_id="team-1",
+            )
+
+
 class PersonalizationMemberPermissionMigrationTests(TestCase):
     def setUp(self):
         self.tenant_id = uuid.uuid4()
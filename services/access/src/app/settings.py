@@ -141,3 +141,41 @@ BFF_INTERNAL_HMAC_SECRET = require_env(
 
 # Data lifecycle / retention defaults
 ACCESS_RETENTION_AUDIT_DAYS = int(os.getenv("ACCESS_RETENTION_AUDIT_DAYS", "365"))
+
+# Audit rows are inserted in the request by default. Long-lived workers may
+# opt in to queueing them for a background thread that bulk-inserts them;
+# never enable it on serverless containers, which freeze between requests.
+ACCESS_AUDIT_ASYNC = read_env_flag("ACCESS_AUDIT_ASYNC", False)
+ACCESS_AUDIT_BATCH_SIZE = int(os.getenv("ACCESS_AUDIT_BATCH_SIZE", "200"))
+ACCESS_AUDIT_FLUSH_SECONDS = float(os.getenv("ACCESS_AUDIT_FLUSH_SECONDS", "1"))
+ACCESS_AUDIT_QUEUE_MAX = int(os.getenv("ACCESS_AUDIT_QUEUE_MAX", "10000"))
+
+# Compiled rollout rulesets: how often a worker re-reads the config version,
+# and how many tenants it keeps compiled.
+ACCESS_ROLLOUT_VERSION_CHECK_SECONDS = float(
+    os.getenv("ACCESS_ROLLOUT_VERSION_CHECK_SECONDS", "2")
+)
+ACCESS_ROLLOUT_CACHE_SIZE = int(os.getenv("ACCESS_ROLLOUT_CACHE_SIZE", "1024"))
+
+# Modal analytics are inserted on the request path. Buffering (flush by size
+# or age, failed batches spooled to disk and replayed in the background or by
+# `manage.py flush_modal_analytics`) is opt-in for long-lived workers only.
+ACCESS_ANALYTICS_BUFFERED = read_env_flag("ACCESS_ANALYTICS_BUFFERED", False)
+ACCESS_ANALYTICS_BUFFER_SIZE = int(os.getenv("ACCESS_ANALYTICS_BUFFER_SIZE", "500"))
+ACCESS_ANALYTICS_FLUSH_SECONDS = float(os.getenv("ACCESS_ANALYTICS_FLUSH_SECONDS", "5"))
+ACCESS_ANALYTICS_MODAL_CACHE_SECONDS = float(
+    os.getenv("ACCESS_ANALYTICS_MODAL_CACHE_SECONDS", "60")
+)
+ACCESS_ANALYTICS_SPOOL_DIR = os.getenv("ACCESS_ANALYTICS_SPOOL_DIR", "")
+ACCESS_ANALYTICS_REPLAY_SECONDS = float(os.getenv("ACCESS_ANALYTICS_REPLAY_SECONDS", "60"))
+
+# Cached homepage content lists (modals, content widgets, dashboard layouts):
+# how often a worker re-reads the change tokens, how long an entry may live
+# regardless of tokens, and how many lists it keeps.
+ACCESS_CONTENT_VERSION_CHECK_SECONDS = float(
+    os.getenv("ACCESS_CONTENT_VERSION_CHECK_SECONDS", "2")
+)
+ACCESS_CONTENT_CACHE_MAX_AGE_SECONDS = float(
+    os.getenv("ACCESS_CONTENT_CACHE_MAX_AGE_SECONDS", "300")
+)
+ACCESS_CONTENT_CACHE_SIZE = int(os.getenv("ACCESS_CONTENT_CACHE_SIZE", "4096"))
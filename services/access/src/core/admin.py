@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from . import content_cache
 from .models import (
     ContentWidget,
     DashboardLayout,
@@ -9,6 +10,18 @@ from .models import (
     UserPreference,
 )
 
+# Queryset update()/delete() skip the model save()/delete() hooks, so every
+# bulk admin path bumps the content cache tokens itself, after the write.
+
+
+def _widget_scopes(queryset) -> set[str]:
+    return {content_cache.widgets_scope(tenant_id) for tenant_id in queryset.values_list("tenant_id", flat=True)}
+
+
+def _bump_scopes(scopes) -> None:
+    for scope in scopes:
+        content_cache.bump_content_version(scope)
+
 
 @admin.register(UserPreference)
 class UserPreferenceAdmin(admin.ModelAdmin):
@@ -120,25 +133,33 @@ class HomePageModalAdmin(admin.ModelAdmin):
 
     actions = ["activate_modals", "deactivate_modals", "soft_delete_modals", "restore_modals"]
 
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
+
     @admin.action(description="Activate selected modals")
     def activate_modals(self, request, queryset):
         count = queryset.update(is_active=True)
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
         self.message_user(request, f"Activated {count} modals")
 
     @admin.action(description="Deactivate selected modals")
     def deactivate_modals(self, request, queryset):
         count = queryset.update(is_active=False)
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
         self.message_user(request, f"Deactivated {count} modals")
 
     @admin.action(description="Soft delete selected modals")
     def soft_delete_modals(self, request, queryset):
         from django.utils import timezone
         count = queryset.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
         self.message_user(request, f"Soft deleted {count} modals")
 
     @admin.action(description="Restore selected modals")
     def restore_modals(self, request, queryset):
         count = queryset.filter(deleted_at__isnull=False).update(deleted_at=None)
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
         self.message_user(request, f"Restored {count} modals")
 
 
@@ -190,20 +211,31 @@ class ContentWidgetAdmin(admin.ModelAdmin):
 
     actions = ["activate_widgets", "deactivate_widgets", "soft_delete_widgets"]
 
+    def delete_queryset(self, request, queryset):
+        scopes = _widget_scopes(queryset)
+        super().delete_queryset(request, queryset)
+        _bump_scopes(scopes)
+
     @admin.action(description="Activate selected widgets")
     def activate_widgets(self, request, queryset):
+        scopes = _widget_scopes(queryset)
         count = queryset.update(is_active=True)
+        _bump_scopes(scopes)
         self.message_user(request, f"Activated {count} widgets")
 
     @admin.action(description="Deactivate selected widgets")
     def deactivate_widgets(self, request, queryset):
+        scopes = _widget_scopes(queryset)
         count = queryset.update(is_active=False)
+        _bump_scopes(scopes)
         self.message_user(request, f"Deactivated {count} widgets")
 
     @admin.action(description="Soft delete selected widgets")
     def soft_delete_widgets(self, request, queryset):
         from django.utils import timezone
+        scopes = _widget_scopes(queryset)
         count = queryset.filter(deleted_at__isnull=True).update(deleted_at=timezone.now())
+        _bump_scopes(scopes)
         self.message_user(request, f"Soft deleted {count} widgets")
 
 
@@ -240,6 +272,14 @@ class DashboardLayoutAdmin(admin.ModelAdmin):
     readonly_fields = ["id", "created_at", "updated_at"]
     ordering = ["-is_default", "-updated_at"]
 
+    def delete_queryset(self, request, queryset):
+        scopes = {
+            content_cache.layouts_scope(tenant_id, user_id)
+            for tenant_id, user_id in queryset.values_list("tenant_id", "user_id")
+        }
+        super().delete_queryset(request, queryset)
+        _bump_scopes(scopes)
+
 
 @admin.register(DashboardWidget)
 class DashboardWidgetAdmin(admin.ModelAdmin):
@@ -1,19 +1,32 @@
+from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from django.db.models import Count, Q
-from django.http import HttpRequest
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from ninja import Query, Router
 from ninja.errors import HttpError
 
+from personalization.analytics import record_events
+from personalization.rollups import modal_event_counts
+
+from .content_cache import (
+    MODALS_SCOPE,
+    ContentView,
+    ScheduledItem,
+    bump_content_version,
+    content_cache,
+    layouts_scope,
+    respond,
+    widgets_scope,
+)
 from .models import (
     ContentWidget,
     DashboardLayout,
     DashboardWidget,
     HomePageModal,
-    ModalAnalytics,
     UserPreference,
 )
 from .schemas import (
@@ -302,35 +315,40 @@ def _modal_to_out(modal: HomePageModal) -> dict[str, Any]:
     }
 
 
+def homepage_modals_view(tenant_id: str | None, language: str, now: datetime) -> ContentView:
+    """Active modals of a tenant (plus global ones), translated and cached.
+
+    ``tenant_id=None`` lists the modals of every tenant.
+    """
+
+    def load() -> list[ScheduledItem]:
+        modals = HomePageModal.objects.filter(is_active=True, deleted_at__isnull=True)
+        if tenant_id is not None:
+            modals = modals.filter(Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True))
+        items = []
+        for modal in modals.order_by("order", "-created_at"):
+            out = _modal_to_out(modal)
+            # Apply translations if available
+            if language != "en" and modal.translations:
+                out.update(modal.get_translated_content(language))
+            items.append(ScheduledItem(out, modal.start_date, modal.end_date))
+        return items
+
+    return content_cache.get(
+        f"modals:{tenant_id or '*'}:{language}",
+        scopes=(MODALS_SCOPE,),
+        load=load,
+        now=now,
+    )
+
+
 @router.get(
     "/homepage-modals", response=list[HomePageModalOut], tags=["personalization"]
 )
-def list_homepage_modals(request: HttpRequest, language: str = "en"):
+def list_homepage_modals(request: HttpRequest, response: HttpResponse, language: str = "en"):
     """Get active homepage modals for display (user-facing)"""
     _user_id, tenant_id = _get_user_context(request)
-    now = timezone.now()
-
-    modals = HomePageModal.objects.filter(
-        Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True),
-        is_active=True,
-        deleted_at__isnull=True,
-    )
-
-    result = []
-    for modal in modals:
-        if modal.start_date and modal.start_date > now:
-            continue
-        if modal.end_date and modal.end_date < now:
-            continue
-
-        out = _modal_to_out(modal)
-        # Apply translations if available
-        if language != "en" and modal.translations:
-            translated = modal.get_translated_content(language)
-            out.update(translated)
-        result.append(out)
-
-    return result
+    return respond(request, response, homepage_modals_view(tenant_id, language, timezone.now()))
 
 
 @router.get(
@@ -479,14 +497,12 @@ def admin_bulk_action_modals(request: HttpRequest, payload: HomePageModalBulkAct
     )
 
     count = 0
-    if payload.action == "activate":
+    if payload.action in ("activate", "deactivate"):
         count = queryset.filter(deleted_at__isnull=True).update(
-            is_active=True, updated_by=UUID(user_id)
-        )
-    elif payload.action == "deactivate":
-        count = queryset.filter(deleted_at__isnull=True).update(
-            is_active=False, updated_by=UUID(user_id)
+            is_active=payload.action == "activate", updated_by=UUID(user_id)
         )
+        # Queryset updates bypass HomePageModal.save.
+        bump_content_version(MODALS_SCOPE)
     elif payload.action == "delete":
         for modal in queryset.filter(deleted_at__isnull=True):
             modal.soft_delete(UUID(user_id))
@@ -529,38 +545,63 @@ def admin_preview_homepage_modal(
 # =============================================================================
 
 
+def _widget_to_out(widget: ContentWidget) -> dict[str, Any]:
+    """Convert ContentWidget to output dict"""
+    return {
+        "id": str(widget.id),
+        "tenant_id": str(widget.tenant_id),
+        "name": widget.name,
+        "widget_type": widget.widget_type,
+        "placement": widget.placement,
+        "content": widget.content or {},
+        "is_active": widget.is_active,
+        "start_date": widget.start_date,
+        "end_date": widget.end_date,
+        "priority": widget.priority,
+        "target_pages": widget.target_pages or [],
+        "target_roles": widget.target_roles or [],
+        "deleted_at": widget.deleted_at,
+        "created_by": str(widget.created_by) if widget.created_by else None,
+        "updated_by": str(widget.updated_by) if widget.updated_by else None,
+        "created_at": widget.created_at,
+        "updated_at": widget.updated_at,
+    }
+
+
 @router.get("/content-widgets", response=list[ContentWidgetOut], tags=["content"])
 def list_content_widgets(
     request: HttpRequest,
+    response: HttpResponse,
     placement: str | None = None,
     page: str | None = None,
 ):
     """Get active content widgets for display (user-facing)"""
     _user_id, tenant_id = _get_user_context(request)
-    now = timezone.now()
 
-    queryset = ContentWidget.objects.filter(
-        tenant_id=tenant_id,
-        is_active=True,
-        deleted_at__isnull=True,
+    def load() -> list[ScheduledItem]:
+        queryset = ContentWidget.objects.filter(
+            tenant_id=tenant_id,
+            is_active=True,
+            deleted_at__isnull=True,
+        )
+        if placement:
+            queryset = queryset.filter(placement=placement)
+
+        items = []
+        for widget in queryset:
+            # Check target pages
+            if widget.target_pages and page and page not in widget.target_pages:
+                continue
+            items.append(ScheduledItem(_widget_to_out(widget), widget.start_date, widget.end_date))
+        return items
+
+    view = content_cache.get(
+        f"widgets:{tenant_id}:{placement or ''}:{page or ''}",
+        scopes=(widgets_scope(tenant_id),),
+        load=load,
+        now=timezone.now(),
     )
-
-    if placement:
-        queryset = queryset.filter(placement=placement)
-
-    result = []
-    for widget in queryset:
-        # Check date range
-        if widget.start_date and widget.start_date > now:
-            continue
-        if widget.end_date and widget.end_date < now:
-            continue
-        # Check target pages
-        if widget.target_pages and page and page not in widget.target_pages:
-            continue
-        result.append(widget)
-
-    return result
+    return respond(request, response, view)
 
 
 @router.get("/admin/content-widgets", response=list[ContentWidgetOut], tags=["admin"])
@@ -653,17 +694,12 @@ def track_analytics_event(request: HttpRequest, payload: AnalyticsEventIn):
     """Track a modal analytics event (view, click, dismiss)"""
     user_id, tenant_id = _get_user_context(request)
 
-    # Verify modal exists
-    modal = get_object_or_404(HomePageModal, id=payload.modal_id)
-
-    ModalAnalytics.objects.create(
-        modal=modal,
+    if record_events(
         tenant_id=UUID(tenant_id),
         user_id=UUID(user_id) if user_id else None,
-        session_id=payload.session_id,
-        event_type=payload.event_type,
-        metadata=payload.metadata,
-    )
+        events=[payload],
+    ):
+        raise HttpError(404, "Not Found")
 
     return {"success": True}
 
@@ -676,48 +712,33 @@ def admin_get_modal_analytics(
     """Get analytics summary for all modals"""
     _user_id, tenant_id = _get_user_context(request)
 
-    start_date = timezone.now() - timezone.timedelta(days=days)
+    end_date = timezone.now()
+    start_date = end_date - timezone.timedelta(days=days)
+    counts = modal_event_counts(UUID(tenant_id), start=start_date, end=end_date)
+    return _modal_analytics_rows(tenant_id, counts)
+
 
-    # Get modals with aggregated analytics
+def _modal_analytics_rows(tenant_id: str, counts) -> list[dict[str, Any]]:
     modals = HomePageModal.objects.filter(
         Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True),
         deleted_at__isnull=True,
-    ).annotate(
-        total_views=Count(
-            "analytics",
-            filter=Q(
-                analytics__event_type="view",
-                analytics__timestamp__gte=start_date,
-            ),
-        ),
-        total_clicks=Count(
-            "analytics",
-            filter=Q(
-                analytics__event_type="click",
-                analytics__timestamp__gte=start_date,
-            ),
-        ),
-        total_dismissals=Count(
-            "analytics",
-            filter=Q(
-                analytics__event_type="dismiss",
-                analytics__timestamp__gte=start_date,
-            ),
-        ),
-    )
+    ).only("id", "title")
 
     result = []
     for modal in modals:
+        modal_counts = counts.get(modal.id, {})
+        views = modal_counts.get("view", 0)
+        clicks = modal_counts.get("click", 0)
         ctr = 0.0
-        if modal.total_views > 0:
-            ctr = round((modal.total_clicks / modal.total_views) * 100, 2)
+        if views > 0:
+            ctr = round((clicks / views) * 100, 2)
 
         result.append({
             "modal_id": modal.id,
             "modal_title": modal.title,
-            "total_views": modal.total_views,
-            "total_clicks": modal.total_clicks,
-            "total_dismissals": modal.total_dismissals,
+            "total_views": views,
+            "total_clicks": clicks,
+            "total_dismissals": modal_counts.get("dismiss", 0),
             "click_through_rate": ctr,
         })
 
@@ -735,31 +756,23 @@ def admin_get_analytics_report(
     end_date = timezone.now()
     start_date = end_date - timezone.timedelta(days=days)
 
-    # Get aggregated counts
-    analytics_qs = ModalAnalytics.objects.filter(
-        tenant_id=tenant_id,
-        timestamp__gte=start_date,
-        timestamp__lte=end_date,
-    )
+    # Daily rollups plus the raw tail since the last rollup run
+    counts = modal_event_counts(UUID(tenant_id), start=start_date, end=end_date)
 
-    total_views = analytics_qs.filter(event_type="view").count()
-    total_clicks = analytics_qs.filter(event_type="click").count()
-    total_dismissals = analytics_qs.filter(event_type="dismiss").count()
+    total_views = sum(item.get("view", 0) for item in counts.values())
+    total_clicks = sum(item.get("click", 0) for item in counts.values())
+    total_dismissals = sum(item.get("dismiss", 0) for item in counts.values())
 
     avg_ctr = 0.0
     if total_views > 0:
         avg_ctr = round((total_clicks / total_views) * 100, 2)
 
-    # Get per-modal stats
-    modal_stats = admin_get_modal_analytics(request, days=days)
+    modal_stats = _modal_analytics_rows(tenant_id, counts)
 
     return {
         "period_start": start_date,
         "period_end": end_date,
-        "total_modals": HomePageModal.objects.filter(
-            Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True),
-            deleted_at__isnull=True,
-        ).count(),
+        "total_modals": len(modal_stats),
         "total_views": total_views,
         "total_clicks": total_clicks,
         "total_dismissals": total_dismissals,
@@ -776,16 +789,30 @@ def admin_get_analytics_report(
 @router.get("/admin/dashboards/layouts", response=list[DashboardLayoutOut], tags=["admin"])
 def admin_list_dashboard_layouts(
     request: HttpRequest,
+    response: HttpResponse,
     include_deleted: bool = False,
 ):
     user_id, tenant_id = _get_user_context(request)
-    query = DashboardLayout.objects.filter(
-        tenant_id=UUID(tenant_id),
-        user_id=UUID(user_id),
+
+    def load() -> list[ScheduledItem]:
+        query = DashboardLayout.objects.filter(
+            tenant_id=UUID(tenant_id),
+            user_id=UUID(user_id),
+        )
+        if not include_deleted:
+            query = query.filter(deleted_at__isnull=True)
+        return [
+            ScheduledItem(DashboardLayoutOut.from_orm(layout).model_dump())
+            for layout in query.order_by("-is_default", "-updated_at")
+        ]
+
+    view = content_cache.get(
+        f"layouts:{tenant_id}:{user_id}:{int(include_deleted)}",
+        scopes=(layouts_scope(tenant_id, user_id),),
+        load=load,
+        now=timezone.now(),
     )
-    if not include_deleted:
-        query = query.filter(deleted_at__isnull=True)
-    return list(query.order_by("-is_default", "-updated_at"))
+    return respond(request, response, view)
 
 
 @router.post("/admin/dashboards/layouts", response=DashboardLayoutOut, tags=["admin"])
@@ -0,0 +1,234 @@
+"""Cached, pre-serialized lists of homepage content.
+
+Homepage modals, content widgets and dashboard layouts are read on every page
+load but only change through admin writes. Each user-facing list is cached
+in-process per key (tenant, language, user, ...) as serialized items plus
+their ``start_date``/``end_date`` windows. Between writes a list only changes
+when one of those dates passes, so the visible slice is recomputed exactly at
+the next boundary from the cached items, without touching the database.
+
+Writes replace the ``ContentCacheVersion`` token of their scope (model
+``save``/``delete`` call ``bump_content_version``; so must queryset
+``update()``/``delete()`` callers such as the admin actions). Entries re-read
+their tokens at most every ``ACCESS_CONTENT_VERSION_CHECK_SECONDS``, and the
+writing process drops its own entries at once. As a safety net for a write
+path that forgets to bump, no entry is served longer than
+``ACCESS_CONTENT_CACHE_MAX_AGE_SECONDS`` after it was loaded. Every view
+carries an ETag over its payload so clients can revalidate with
+``If-None-Match``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils.http import quote_etag
+
+from .models import ContentCacheVersion
+
+MODALS_SCOPE = "modals"
+
+_END_GRACE = timedelta(microseconds=1)
+
+
+def widgets_scope(tenant_id: object) -> str:
+    return f"widgets:{tenant_id}"
+
+
+def layouts_scope(tenant_id: object, user_id: object) -> str:
+    return f"layouts:{tenant_id}:{user_id}"
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduledItem:
+    """A serialized list item, visible while ``start <= now <= end``."""
+
+    payload: dict[str, Any]
+    start: datetime | None = None
+    end: datetime | None = None
+
+    def visible_at(self, now: datetime) -> bool:
+        if self.start is not None and self.start > now:
+            return False
+        return self.end is None or self.end >= now
+
+
+@dataclass(frozen=True, slots=True)
+class ContentView:
+    items: list[dict[str, Any]]
+    etag: str
+
+    def matches(self, request: HttpRequest) -> bool:
+        """True if the request's ``If-None-Match`` already names this view."""
+        header = request.headers.get("If-None-Match")
+        if not header:
+            return False
+        if header.strip() == "*":
+            return True
+        return quote_etag(self.etag) in {tag.strip() for tag in header.split(",")}
+
+
+def compute_etag(items: list[dict[str, Any]]) -> str:
+    body = json.dumps(items, cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]
+
+
+def _boundaries(items: tuple[ScheduledItem, ...], now: datetime) -> tuple[datetime | None, datetime | None]:
+    """The schedule segment ``[lower, upper)`` containing ``now``."""
+    lower: datetime | None = None
+    upper: datetime | None = None
+    for item in items:
+        # Visibility flips at ``start`` and right after ``end`` (inclusive).
+        edges = (item.start, item.end + _END_GRACE if item.end is not None else None)
+        for edge in edges:
+            if edge is None:
+                continue
+            if edge <= now:
+                lower = edge if lower is None or edge > lower else lower
+            elif upper is None or edge < upper:
+                upper = edge
+    return lower, upper
+
+
+class _Entry:
+    __slots__ = (
+        "checked_at",
+        "items",
+        "loaded_at",
+        "lock",
+        "scopes",
+        "tokens",
+        "valid_from",
+        "valid_until",
+        "view",
+    )
+
+    def __init__(self, scopes: tuple[str, ...], tokens: tuple[str, ...], items: tuple[ScheduledItem, ...]) -> None:
+        self.scopes = scopes
+        self.tokens = tokens
+        self.items = items
+        self.checked_at = self.loaded_at = time.monotonic()
+        self.view: ContentView | None = None
+        self.valid_from: datetime | None = None
+        self.valid_until: datetime | None = None
+        self.lock = threading.Lock()
+
+    def view_at(self, now: datetime) -> ContentView:
+        with self.lock:
+            view = self.view
+            if (
+                view is not None
+                and (self.valid_from is None or self.valid_from <= now)
+                and (self.valid_until is None or now < self.valid_until)
+            ):
+                return view
+            visible = [item.payload for item in self.items if item.visible_at(now)]
+            view = ContentView(items=visible, etag=compute_etag(visible))
+            self.view = view
+            self.valid_from, self.valid_until = _boundaries(self.items, now)
+            return view
+
+
+def read_content_tokens(scopes: tuple[str, ...]) -> tuple[str, ...]:
+    rows = dict(ContentCacheVersion.objects.filter(scope__in=scopes).values_list("scope", "token"))
+    return tuple(rows.get(scope, "") for scope in scopes)
+
+
+class ContentCache:
+    """Per-process LRU of scheduled content lists, revalidated against scope tokens."""
+
+    def __init__(self, *, max_size: int, check_seconds: float, max_age_seconds: float = 300) -> None:
+        self.max_size = max(1, max_size)
+        self.check_seconds = check_seconds
+        self.max_age_seconds = max_age_seconds
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self,
+        key: str,
+        *,
+        scopes: tuple[str, ...],
+        load: Callable[[], Iterable[ScheduledItem]],
+        now: datetime,
+    ) -> ContentView:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None and time.monotonic() - entry.loaded_at >= self.max_age_seconds:
+            entry = None
+        if entry is not None and time.monotonic() - entry.checked_at >= self.check_seconds:
+            if read_content_tokens(scopes) == entry.tokens:
+                entry.checked_at = time.monotonic()
+            else:
+                entry = None
+
+        if entry is None:
+            # Tokens are read before the rows: a write landing in between
+            # leaves a stale token behind, so the next check reloads.
+            tokens = read_content_tokens(scopes)
+            entry = _Entry(scopes, tokens, tuple(load()))
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+        return entry.view_at(now)
+
+    def invalidate(self, scope: str) -> None:
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if scope in entry.scopes]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+content_cache = ContentCache(
+    max_size=int(getattr(settings, "ACCESS_CONTENT_CACHE_SIZE", 4096)),
+    check_seconds=float(getattr(settings, "ACCESS_CONTENT_VERSION_CHECK_SECONDS", 2)),
+    max_age_seconds=float(getattr(settings, "ACCESS_CONTENT_CACHE_MAX_AGE_SECONDS", 300)),
+)
+
+
+def bump_content_version(scope: str) -> None:
+    """Record a change to ``scope``.
+
+    Other workers notice on their next token check; this one drops its
+    entries immediately and again on commit, so a list loaded from
+    pre-commit rows is not kept.
+    """
+    token = uuid.uuid4().hex
+    updated = ContentCacheVersion.objects.filter(scope=scope).update(token=token)
+    if not updated:
+        _, created = ContentCacheVersion.objects.get_or_create(scope=scope, defaults={"token": token})
+        if not created:
+            ContentCacheVersion.objects.filter(scope=scope).update(token=token)
+    content_cache.invalidate(scope)
+    transaction.on_commit(lambda: content_cache.invalidate(scope))
+
+
+def respond(request: HttpRequest, response: HttpResponse, view: ContentView) -> Any:
+    """304 if the client already holds ``view``, else its items with an ETag."""
+    etag = quote_etag(view.etag)
+    if view.matches(request):
+        not_modified = HttpResponse(status=304)
+        not_modified["ETag"] = etag
+        return not_modified
+    response["ETag"] = etag
+    return view.items
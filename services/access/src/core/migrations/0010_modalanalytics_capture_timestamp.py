@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_userpreference_theme_source"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="modalanalytics",
+            name="timestamp",
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name="Время"),
+        ),
+    ]
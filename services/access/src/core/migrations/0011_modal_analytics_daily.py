@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_modalanalytics_capture_timestamp"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ModalAnalyticsRollupState",
+            fields=[
+                ("id", models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ("rolled_through", models.DateField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Состояние агрегации аналитики",
+            },
+        ),
+        migrations.CreateModel(
+            name="ModalAnalyticsDaily",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("tenant_id", models.UUIDField(verbose_name="Tenant ID")),
+                ("day", models.DateField(verbose_name="День")),
+                ("event_type", models.CharField(choices=[("view", "Просмотр"), ("click", "Клик"), ("dismiss", "Закрытие")], max_length=20, verbose_name="Тип события")),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Количество")),
+                ("modal", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="daily_analytics", to="core.homepagemodal")),
+            ],
+            options={
+                "verbose_name": "Дневная аналитика модалки",
+                "verbose_name_plural": "Дневная аналитика модалок",
+                "indexes": [models.Index(fields=["tenant_id", "day"], name="core_modal_daily_tenant_day")],
+                "constraints": [models.UniqueConstraint(fields=("tenant_id", "modal", "day", "event_type"), name="core_modal_daily_uniq")],
+            },
+        ),
+    ]
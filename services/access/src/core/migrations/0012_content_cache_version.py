@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_modal_analytics_daily"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ContentCacheVersion",
+            fields=[
+                ("scope", models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ("token", models.CharField(max_length=32)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Версия кэша контента",
+                "verbose_name_plural": "Версии кэша контента",
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_content_cache_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="modalanalytics",
+            name="created_at",
+            field=models.DateTimeField(
+                auto_now_add=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Записано",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="modalanalyticsrollupstate",
+            name="ingested_through",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_modal_analytics_ingested_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RetentionCheckpoint",
+            fields=[
+                ("name", models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ("started_at", models.DateTimeField()),
+                ("targets", models.JSONField(blank=True, default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Контрольная точка очистки",
+                "verbose_name_plural": "Контрольные точки очистки",
+                "db_table": "access_retention_checkpoint",
+            },
+        ),
+    ]
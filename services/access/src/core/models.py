@@ -1,6 +1,7 @@
 import uuid
 
 from django.db import models
+from django.utils import timezone
 
 
 class UserPreference(models.Model):
@@ -171,6 +172,19 @@ class HomePageModal(models.Model):
     def __str__(self) -> str:
         return f"{self.title} ({self.modal_type})"
 
+    def save(self, *args, **kwargs) -> None:
+        from . import content_cache
+
+        super().save(*args, **kwargs)
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
+
+    def delete(self, *args, **kwargs):
+        from . import content_cache
+
+        result = super().delete(*args, **kwargs)
+        content_cache.bump_content_version(content_cache.MODALS_SCOPE)
+        return result
+
     def soft_delete(self, user_id: uuid.UUID | None = None) -> None:
         """Soft delete the modal"""
         from django.utils import timezone
@@ -284,6 +298,19 @@ class ContentWidget(models.Model):
     def __str__(self) -> str:
         return f"{self.name} ({self.widget_type})"
 
+    def save(self, *args, **kwargs) -> None:
+        from . import content_cache
+
+        super().save(*args, **kwargs)
+        content_cache.bump_content_version(content_cache.widgets_scope(self.tenant_id))
+
+    def delete(self, *args, **kwargs):
+        from . import content_cache
+
+        result = super().delete(*args, **kwargs)
+        content_cache.bump_content_version(content_cache.widgets_scope(self.tenant_id))
+        return result
+
     def soft_delete(self, user_id: uuid.UUID | None = None) -> None:
         """Soft delete the widget"""
         from django.utils import timezone
@@ -333,6 +360,19 @@ class DashboardLayout(models.Model):
     def __str__(self) -> str:
         return f"{self.layout_name} ({self.user_id})"
 
+    def save(self, *args, **kwargs) -> None:
+        from . import content_cache
+
+        super().save(*args, **kwargs)
+        content_cache.bump_content_version(content_cache.layouts_scope(self.tenant_id, self.user_id))
+
+    def delete(self, *args, **kwargs):
+        from . import content_cache
+
+        result = super().delete(*args, **kwargs)
+        content_cache.bump_content_version(content_cache.layouts_scope(self.tenant_id, self.user_id))
+        return result
+
     def soft_delete(self) -> None:
         from django.utils import timezone
 
@@ -414,7 +454,10 @@ class ModalAnalytics(models.Model):
         max_length=20,
         choices=EventType.choices,
     )
-    timestamp = models.DateTimeField("Время", auto_now_add=True)
+    # Capture time: buffered and spooled events are inserted later.
+    timestamp = models.DateTimeField("Время", default=timezone.now)
+    # Insert time: lets rollups find late rows for already rolled-up days.
+    created_at = models.DateTimeField("Записано", auto_now_add=True, db_index=True)
 
     # Additional context
     metadata = models.JSONField("Метаданные", default=dict, blank=True)
@@ -429,3 +472,82 @@ class ModalAnalytics(models.Model):
 
     def __str__(self) -> str:
         return f"{self.event_type} on modal {self.modal_id} at {self.timestamp}"
+
+
+class ModalAnalyticsDaily(models.Model):
+    """Per-UTC-day event counts rolled up from ModalAnalytics"""
+
+    tenant_id = models.UUIDField("Tenant ID")
+    modal = models.ForeignKey(
+        HomePageModal,
+        on_delete=models.CASCADE,
+        related_name="daily_analytics",
+    )
+    day = models.DateField("День")
+    event_type = models.CharField(
+        "Тип события",
+        max_length=20,
+        choices=ModalAnalytics.EventType.choices,
+    )
+    count = models.PositiveIntegerField("Количество", default=0)
+
+    class Meta:
+        verbose_name = "Дневная аналитика модалки"
+        verbose_name_plural = "Дневная аналитика модалок"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant_id", "modal", "day", "event_type"],
+                name="core_modal_daily_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["tenant_id", "day"], name="core_modal_daily_tenant_day"),
+        ]
+
+
+class ModalAnalyticsRollupState(models.Model):
+    """Rollups are complete for every UTC day up to ``rolled_through``"""
+
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    rolled_through = models.DateField(null=True, blank=True)
+    # Rows inserted before this were already folded into their day's rollup.
+    ingested_through = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Состояние агрегации аналитики"
+
+
+class ContentCacheVersion(models.Model):
+    """Change token of a cached content scope (see core.content_cache)"""
+
+    scope = models.CharField(max_length=128, primary_key=True)
+    token = models.CharField(max_length=32)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Версия кэша контента"
+        verbose_name_plural = "Версии кэша контента"
+
+    def __str__(self) -> str:
+        return f"{self.scope}: {self.token}"
+
+
+class RetentionCheckpoint(models.Model):
+    """Progress of a resumable ``purge_retention`` run (see core.retention)"""
+
+    name = models.CharField(max_length=128, primary_key=True)
+    started_at = models.DateTimeField()
+    # Per-target progress: {"audit": {"deleted": 10, "last_key": [...], ...}}.
+    targets = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "access_retention_checkpoint"
+        verbose_name = "Контрольная точка очистки"
+        verbose_name_plural = "Контрольные точки очистки"
+
+    def __str__(self) -> str:
+        return self.name
@@ -285,6 +285,21 @@ class AnalyticsEventIn(Schema):
         return v
 
 
+class AnalyticsBatchIn(Schema):
+    """Schema for tracking several analytics events in one request"""
+    events: list[AnalyticsEventIn] = Field(..., min_length=1, max_length=200)
+
+
+class AnalyticsRejectedOut(Schema):
+    index: int
+    error: str
+
+
+class AnalyticsBatchOut(Schema):
+    accepted: int
+    rejected: list[AnalyticsRejectedOut]
+
+
 class ModalAnalyticsOut(Schema):
     """Schema for modal analytics output"""
     modal_id: int
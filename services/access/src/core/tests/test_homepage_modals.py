@@ -6,9 +6,10 @@ from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.db import IntegrityError
-from django.test import Client, TestCase
+from django.test import Client, TestCase, modify_settings
 from django.utils import timezone
 
+from core.content_cache import content_cache
 from core.models import (
     ContentWidget,
     DashboardLayout,
@@ -22,6 +23,7 @@ User = get_user_model()
 
 class HomePageModalApiTests(TestCase):
     def setUp(self):
+        content_cache.clear()
         self.client = Client()
         self.superuser = User.objects.create_superuser(
             username="admin",
@@ -319,3 +321,174 @@ class ExtendedContentModelsTests(TestCase):
         widget.soft_delete()
         widget.refresh_from_db()
         self.assertIsNotNone(widget.deleted_at)
+
+
+class ContentCacheTests(TestCase):
+    def setUp(self):
+        content_cache.clear()
+        self.client = Client()
+        self.user_id = uuid.uuid4()
+        self.tenant_id = uuid.uuid4()
+        self.headers = {
+            "HTTP_X_USER_ID": str(self.user_id),
+            "HTTP_X_TENANT_ID": str(self.tenant_id),
+        }
+
+    def _list_modals(self, **extra):
+        return self.client.get("/api/core/homepage-modals", **self.headers, **extra)
+
+    def test_repeated_list_is_served_from_cache(self):
+        HomePageModal.objects.create(title="Hello", content="World", tenant_id=self.tenant_id)
+
+        first = self._list_modals()
+        with patch.object(content_cache, "check_seconds", 3600), self.assertNumQueries(0):
+            second = self._list_modals()
+
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_list_is_cached_per_language(self):
+        HomePageModal.objects.create(
+            title="Hello",
+            content="World",
+            translations={"ru": {"title": "Привет"}},
+        )
+
+        english = self._list_modals()
+        russian = self.client.get("/api/core/homepage-modals?language=ru", **self.headers)
+
+        self.assertEqual(english.json()[0]["title"], "Hello")
+        self.assertEqual(russian.json()[0]["title"], "Привет")
+        self.assertNotEqual(english["ETag"], russian["ETag"])
+
+    def test_if_none_match_returns_not_modified(self):
+        HomePageModal.objects.create(title="Hello", content="World")
+        etag = self._list_modals()["ETag"]
+
+        response = self._list_modals(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_admin_update_invalidates_list(self):
+        modal = HomePageModal.objects.create(title="Before", content="Text", tenant_id=self.tenant_id)
+        etag = self._list_modals()["ETag"]
+
+        response = self.client.put(
+            f"/api/core/admin/homepage-modals/{modal.id}",
+            data={"title": "After", "content": "Text"},
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+
+        listed = self._list_modals(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(listed.status_code, 200)
+        self.assertEqual(listed.json()[0]["title"], "After")
+
+    def test_entry_expires_at_schedule_boundary(self):
+        now = timezone.now()
+        modal = HomePageModal.objects.create(
+            title="Scheduled",
+            content="Text",
+            start_date=now + timedelta(hours=1),
+            end_date=now + timedelta(hours=2),
+        )
+
+        def ids_at(moment):
+            with patch("core.api.timezone.now", return_value=moment):
+                return [item["id"] for item in self._list_modals().json()]
+
+        self.assertEqual(ids_at(now), [])
+        with patch.object(content_cache, "check_seconds", 3600), self.assertNumQueries(0):
+            self.assertEqual(ids_at(modal.start_date - timedelta(microseconds=1)), [])
+            self.assertEqual(ids_at(modal.start_date), [modal.id])
+            self.assertEqual(ids_at(modal.end_date), [modal.id])
+            self.assertEqual(ids_at(modal.end_date + timedelta(microseconds=1)), [])
+
+    def test_content_widgets_are_cached_and_invalidated(self):
+        widget = ContentWidget.objects.create(
+            tenant_id=self.tenant_id,
+            name="Banner",
+            target_pages=["home"],
+        )
+
+        listed = self.client.get("/api/core/content-widgets?page=home", **self.headers)
+        self.assertEqual([item["id"] for item in listed.json()], [str(widget.id)])
+        self.assertEqual(
+            self.client.get("/api/core/content-widgets?page=events", **self.headers).json(),
+            [],
+        )
+
+        widget.soft_delete()
+
+        response = self.client.get(
+            "/api/core/content-widgets?page=home",
+            HTTP_IF_NONE_MATCH=listed["ETag"],
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_dashboard_layouts_are_cached_per_user(self):
+        DashboardLayout.objects.create(
+            user_id=self.user_id,
+            tenant_id=self.tenant_id,
+            layout_name="main",
+            layout_config={},
+        )
+        etag = self.client.get("/api/core/admin/dashboards/layouts", **self.headers)["ETag"]
+
+        response = self.client.get(
+            "/api/core/admin/dashboards/layouts",
+            HTTP_IF_NONE_MATCH=etag,
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 304)
+
+        other = self.client.get(
+            "/api/core/admin/dashboards/layouts",
+            HTTP_X_USER_ID=str(uuid.uuid4()),
+            HTTP_X_TENANT_ID=str(self.tenant_id),
+        )
+        self.assertEqual(other.json(), [])
+
+    @modify_settings(INSTALLED_APPS={"append": "django.contrib.admin"})
+    def test_admin_bulk_actions_invalidate_lists(self):
+        from django.contrib import admin
+
+        from core.admin import ContentWidgetAdmin, HomePageModalAdmin
+
+        modal = HomePageModal.objects.create(title="Hello", content="World", tenant_id=self.tenant_id)
+        widget = ContentWidget.objects.create(tenant_id=self.tenant_id, name="Banner", target_pages=["home"])
+        modal_admin = HomePageModalAdmin(HomePageModal, admin.site)
+        widget_admin = ContentWidgetAdmin(ContentWidget, admin.site)
+
+        def widgets():
+            return self.client.get("/api/core/content-widgets?page=home", **self.headers).json()
+
+        with patch.object(content_cache, "check_seconds", 3600), patch.object(modal_admin, "message_user"):
+            self.assertEqual(len(self._list_modals().json()), 1)
+            modal_admin.deactivate_modals(None, HomePageModal.objects.filter(id=modal.id))
+            self.assertEqual(self._list_modals().json(), [])
+
+            modal_admin.activate_modals(None, HomePageModal.objects.filter(id=modal.id))
+            self.assertEqual(len(self._list_modals().json()), 1)
+            modal_admin.delete_queryset(None, HomePageModal.objects.filter(id=modal.id))
+            self.assertEqual(self._list_modals().json(), [])
+
+        with patch.object(content_cache, "check_seconds", 3600), patch.object(widget_admin, "message_user"):
+            self.assertEqual(len(widgets()), 1)
+            widget_admin.soft_delete_widgets(None, ContentWidget.objects.filter(id=widget.id))
+            self.assertEqual(widgets(), [])
+
+    def test_entries_are_reloaded_after_max_age(self):
+        HomePageModal.objects.create(title="Hello", content="World")
+        self._list_modals()
+        # A write that bypassed bump_content_version entirely.
+        HomePageModal.objects.update(title="Changed")
+
+        with patch.object(content_cache, "check_seconds", 3600):
+            self.assertEqual(self._list_modals().json()[0]["title"], "Hello")
+            with patch.object(content_cache, "max_age_seconds", 0):
+                self.assertEqual(self._list_modals().json()[0]["title"], "Changed")
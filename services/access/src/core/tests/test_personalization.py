@@ -7,6 +7,7 @@ from django.contrib.auth import get_user_model
 from django.test import Client, TestCase
 from django.utils import timezone
 
+from core.content_cache import content_cache
 from core.models import HomePageModal
 from core.models import UserPreference as CoreUserPreference
 from personalization.models import UserPreference
@@ -216,6 +217,7 @@ class UserPreferenceApiTests(TestCase):
 
 class HomePageModalApiTests(TestCase):
     def setUp(self):
+        content_cache.clear()
         self.client = Client()
         self.user = User.objects.create_user(
             username="user",
@@ -0,0 +1,291 @@
+"""Ingestion of homepage modal analytics.
+
+Track endpoints validate modal ids against an in-process id set and, by
+default, write each request's events with one ``bulk_create`` before
+responding, so an accepted event is durable.
+
+Long-lived workers can opt into buffering with ``ACCESS_ANALYTICS_BUFFERED``:
+unsaved rows are then collected and written when the buffer reaches
+``ACCESS_ANALYTICS_BUFFER_SIZE`` rows or its oldest row is
+``ACCESS_ANALYTICS_FLUSH_SECONDS`` old (a daemon thread), and once more at
+interpreter exit. Batches that cannot be written are spooled as JSON lines to
+``ACCESS_ANALYTICS_SPOOL_DIR``; the same thread replays the spool every
+``ACCESS_ANALYTICS_REPLAY_SECONDS`` and ``flush_modal_analytics`` does it on
+demand. Do not enable buffering on serverless containers.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+from core.models import HomePageModal, ModalAnalytics
+
+logger = logging.getLogger(__name__)
+
+INSERT_CHUNK = 500
+
+
+def _setting(name: str, default: float) -> float:
+    try:
+        return float(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def spool_dir() -> Path:
+    configured = str(getattr(settings, "ACCESS_ANALYTICS_SPOOL_DIR", "") or "").strip()
+    return Path(configured or os.path.join(tempfile.gettempdir(), "access-analytics-spool"))
+
+
+class ModalIdCache:
+    """Ids of existing modals, reloaded on a TTL or on a (rate-limited) miss."""
+
+    def __init__(self) -> None:
+        self._ids: frozenset[int] = frozenset()
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _reload(self) -> frozenset[int]:
+        ids = frozenset(HomePageModal.objects.values_list("id", flat=True))
+        with self._lock:
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+        return ids
+
+    def contains(self, modal_id: int) -> bool:
+        age = time.monotonic() - self._loaded_at
+        ids = self._ids
+        if age >= _setting("ACCESS_ANALYTICS_MODAL_CACHE_SECONDS", 60):
+            ids = self._reload()
+        if modal_id in ids:
+            return True
+        # A modal created since the last load: reload, at most once a second.
+        if age >= 1.0:
+            ids = self._reload()
+        return modal_id in ids
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids = frozenset()
+            self._loaded_at = 0.0
+
+
+def _row_to_dict(row: ModalAnalytics) -> dict[str, Any]:
+    return {
+        "id": str(row.id),
+        "modal_id": row.modal_id,
+        "tenant_id": str(row.tenant_id),
+        "user_id": str(row.user_id) if row.user_id else None,
+        "session_id": row.session_id,
+        "event_type": row.event_type,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+        "metadata": row.metadata,
+    }
+
+
+def _row_from_dict(data: dict[str, Any]) -> ModalAnalytics:
+    row = ModalAnalytics(
+        id=uuid.UUID(data["id"]),
+        modal_id=int(data["modal_id"]),
+        tenant_id=uuid.UUID(data["tenant_id"]),
+        user_id=uuid.UUID(data["user_id"]) if data.get("user_id") else None,
+        session_id=data.get("session_id") or "",
+        event_type=data["event_type"],
+        metadata=data.get("metadata") or {},
+    )
+    if data.get("timestamp"):
+        row.timestamp = datetime.fromisoformat(data["timestamp"])
+    return row
+
+
+def write_rows(rows: list[ModalAnalytics]) -> int:
+    """Insert rows, dropping those whose modal was hard-deleted meanwhile."""
+    existing = set(
+        HomePageModal.objects.filter(id__in={row.modal_id for row in rows}).values_list(
+            "id", flat=True
+        )
+    )
+    rows = [row for row in rows if row.modal_id in existing]
+    for start in range(0, len(rows), INSERT_CHUNK):
+        ModalAnalytics.objects.bulk_create(rows[start : start + INSERT_CHUNK], ignore_conflicts=True)
+    return len(rows)
+
+
+def spool_rows(rows: Iterable[ModalAnalytics]) -> Path:
+    directory = spool_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{int(time.time() * 1000)}-{uuid.uuid4().hex}.jsonl"
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as fh:
+        for row in rows:
+            fh.write(json.dumps(_row_to_dict(row), ensure_ascii=False) + "\n")
+    tmp.replace(path)
+    return path
+
+
+def replay_spool() -> tuple[int, int]:
+    """Write spooled batches to the database. Returns (files, rows) replayed."""
+    directory = spool_dir()
+    if not directory.is_dir():
+        return 0, 0
+    files = rows_total = 0
+    for path in sorted(directory.glob("*.jsonl")):
+        with path.open(encoding="utf-8") as fh:
+            rows = [_row_from_dict(json.loads(line)) for line in fh if line.strip()]
+        # Rows keep their spooled ids, so a replay interrupted after the
+        # insert but before the unlink does not duplicate events.
+        write_rows(rows)
+        path.unlink()
+        files += 1
+        rows_total += len(rows)
+    return files, rows_total
+
+
+class AnalyticsBuffer:
+    """Thread-safe buffer of unsaved analytics rows."""
+
+    def __init__(self) -> None:
+        self._rows: list[ModalAnalytics] = []
+        self._oldest_at = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, rows: Iterable[ModalAnalytics]) -> None:
+        with self._lock:
+            if not self._rows:
+                self._oldest_at = time.monotonic()
+            self._rows.extend(rows)
+            full = len(self._rows) >= int(_setting("ACCESS_ANALYTICS_BUFFER_SIZE", 500))
+        self._ensure_timer()
+        if full:
+            # Runs on the request path: a failed flush must not fail the request.
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Modal analytics flush failed")
+
+    def _take(self) -> list[ModalAnalytics]:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            return rows
+
+    def flush(self) -> int:
+        """Write buffered rows; spool them to disk if the database write fails."""
+        with self._flush_lock:
+            rows = self._take()
+            if not rows:
+                return 0
+            try:
+                write_rows(rows)
+            except Exception:
+                path = spool_rows(rows)
+                logger.warning(
+                    "Modal analytics flush failed, batch spooled",
+                    extra={"rows": len(rows), "path": str(path)},
+                    exc_info=True,
+                )
+            return len(rows)
+
+    def _ensure_timer(self) -> None:
+        interval = _setting("ACCESS_ANALYTICS_FLUSH_SECONDS", 5)
+        if interval <= 0 or (self._timer is not None and self._timer.is_alive()):
+            return
+        with self._lock:
+            if self._timer is not None and self._timer.is_alive():
+                return
+            self._timer = threading.Thread(
+                target=self._run_timer,
+                name="access-analytics-flush",
+                daemon=True,
+            )
+            self._timer.start()
+
+    def _run_timer(self) -> None:
+        replayed_at = 0.0
+        while True:
+            interval = _setting("ACCESS_ANALYTICS_FLUSH_SECONDS", 5)
+            if interval <= 0:
+                return
+            time.sleep(interval / 2)
+            if self._rows and time.monotonic() - self._oldest_at >= interval:
+                try:
+                    self.flush()
+                except Exception:  # the flusher must outlive a bad batch
+                    logger.exception("Modal analytics background flush failed")
+            if time.monotonic() - replayed_at >= _setting("ACCESS_ANALYTICS_REPLAY_SECONDS", 60):
+                replayed_at = time.monotonic()
+                try:
+                    replay_spool()
+                except Exception:
+                    logger.exception("Modal analytics spool replay failed")
+
+    def clear(self) -> None:
+        self._take()
+
+    def shutdown(self) -> None:
+        """Last flush at exit; anything that cannot reach the database is spooled."""
+        rows = self._take()
+        if not rows:
+            return
+        try:
+            write_rows(rows)
+        except Exception:  # interpreter is exiting: never lose the batch
+            logger.exception("Modal analytics shutdown flush failed, spooling")
+            spool_rows(rows)
+
+
+modal_ids = ModalIdCache()
+analytics_buffer = AnalyticsBuffer()
+atexit.register(analytics_buffer.shutdown)
+
+
+def record_events(
+    *,
+    tenant_id: uuid.UUID,
+    user_id: uuid.UUID | None,
+    events: Iterable[Any],
+) -> list[tuple[int, str]]:
+    """Store events for known modals, or buffer them if buffering is on.
+
+    ``events`` are ``AnalyticsEventIn``-shaped objects. Returns
+    ``(index, error)`` pairs for rejected events.
+    """
+    rows: list[ModalAnalytics] = []
+    rejected: list[tuple[int, str]] = []
+    for index, event in enumerate(events):
+        if not modal_ids.contains(event.modal_id):
+            rejected.append((index, "modal not found"))
+            continue
+        rows.append(
+            ModalAnalytics(
+                modal_id=event.modal_id,
+                tenant_id=tenant_id,
+                user_id=user_id,
+                session_id=event.session_id,
+                event_type=event.event_type,
+                metadata=event.metadata,
+            )
+        )
+    if not rows:
+        return rejected
+    if getattr(settings, "ACCESS_ANALYTICS_BUFFERED", False):
+        analytics_buffer.add(rows)
+    else:
+        write_rows(rows)
+    return rejected
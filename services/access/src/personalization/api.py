@@ -5,8 +5,8 @@ import uuid
 from typing import Any
 
 from django.db import DatabaseError
-from django.db.models import Count, Q
-from django.http import HttpRequest
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
 from ninja import Query, Router
@@ -15,14 +15,23 @@ from ninja.errors import HttpError
 from access_control.models import ScopeType
 from access_control.services import compute_effective_access, master_flags_from_dict
 from core import api as core_api
+from core.content_cache import (
+    MODALS_SCOPE,
+    ScheduledItem,
+    bump_content_version,
+    content_cache,
+    layouts_scope,
+    respond,
+)
 from core.models import (
     ContentWidget,
     DashboardLayout,
     DashboardWidget,
     HomePageModal,
-    ModalAnalytics,
 )
 from core.schemas import (
+    AnalyticsBatchIn,
+    AnalyticsBatchOut,
     AnalyticsEventIn,
     AnalyticsReportOut,
     ContentWidgetIn,
@@ -39,7 +48,9 @@ from core.schemas import (
     ModalListFilters,
 )
 
+from .analytics import record_events
 from .models import UserPreference
+from .rollups import modal_event_counts
 from .schemas import (
     UserPreferenceDefaultsSchema,
     UserPreferenceSchema,
@@ -194,24 +205,9 @@ def reset_preferences(request: HttpRequest) -> dict[str, Any]:
 
 
 @router.get("/homepage-modals", response=list[HomePageModalOut])
-def list_homepage_modals(request: HttpRequest, language: str = "en"):
-    now = core_api.timezone.now()
-    modals = HomePageModal.objects.filter(
-        is_active=True,
-        deleted_at__isnull=True,
-    ).order_by("order", "-created_at")
-
-    result: list[dict[str, Any]] = []
-    for modal in modals:
-        if modal.start_date and modal.start_date > now:
-            continue
-        if modal.end_date and modal.end_date < now:
-            continue
-        item = core_api._modal_to_out(modal)
-        if language != "en" and modal.translations:
-            item.update(modal.get_translated_content(language))
-        result.append(item)
-    return result
+def list_homepage_modals(request: HttpRequest, response: HttpResponse, language: str = "en"):
+    view = core_api.homepage_modals_view(None, language, core_api.timezone.now())
+    return respond(request, response, view)
 
 
 @router.get("/admin/homepage-modals", response=list[HomePageModalListOut])
@@ -342,14 +338,12 @@ def admin_bulk_action_modals(request: HttpRequest, payload: HomePageModalBulkAct
     )
 
     affected = 0
-    if payload.action == "activate":
-        affected = queryset.filter(deleted_at__isnull=True).update(
-            is_active=True, updated_by=user_id
-        )
-    elif payload.action == "deactivate":
+    if payload.action in ("activate", "deactivate"):
         affected = queryset.filter(deleted_at__isnull=True).update(
-            is_active=False, updated_by=user_id
+            is_active=payload.action == "activate", updated_by=user_id
         )
+        # Queryset updates bypass HomePageModal.save.
+        bump_content_version(MODALS_SCOPE)
     elif payload.action == "delete":
         for modal in queryset.filter(deleted_at__isnull=True):
             modal.soft_delete(user_id)
@@ -462,102 +456,108 @@ def admin_restore_content_widget(request: HttpRequest, widget_id: str):
 @router.post("/analytics/track")
 def track_analytics_event(request: HttpRequest, payload: AnalyticsEventIn):
     user_id, tenant_id = get_user_and_tenant(request)
-    modal = get_object_or_404(HomePageModal, id=payload.modal_id)
-    ModalAnalytics.objects.create(
-        modal=modal,
-        tenant_id=tenant_id,
-        user_id=user_id,
-        session_id=payload.session_id,
-        event_type=payload.event_type,
-        metadata=payload.metadata,
-    )
+    if record_events(tenant_id=tenant_id, user_id=user_id, events=[payload]):
+        raise HttpError(404, "Not Found")
     return {"success": True}
 
 
-@router.get("/admin/analytics/modals", response=list[ModalAnalyticsOut])
-def admin_get_modal_analytics(request: HttpRequest, days: int = 30):
+@router.post("/analytics/track/batch", response=AnalyticsBatchOut)
+def track_analytics_events_batch(request: HttpRequest, payload: AnalyticsBatchIn):
+    """Buffer a batch of modal events; unknown modal ids are reported, not fatal."""
     user_id, tenant_id = get_user_and_tenant(request)
-    _ensure_content_manage_permission(request, user_id, tenant_id)
-    start_date = timezone.now() - timezone.timedelta(days=days)
+    rejected = record_events(tenant_id=tenant_id, user_id=user_id, events=payload.events)
+    return {
+        "accepted": len(payload.events) - len(rejected),
+        "rejected": [{"index": index, "error": error} for index, error in rejected],
+    }
+
+
+def _modal_analytics_rows(tenant_id: uuid.UUID, counts) -> list[dict[str, Any]]:
     modals = HomePageModal.objects.filter(
         Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True),
         deleted_at__isnull=True,
-    ).annotate(
-        total_views=Count(
-            "analytics",
-            filter=Q(analytics__event_type="view", analytics__timestamp__gte=start_date),
-        ),
-        total_clicks=Count(
-            "analytics",
-            filter=Q(analytics__event_type="click", analytics__timestamp__gte=start_date),
-        ),
-        total_dismissals=Count(
-            "analytics",
-            filter=Q(analytics__event_type="dismiss", analytics__timestamp__gte=start_date),
-        ),
-    )
+    ).only("id", "title")
     result = []
     for modal in modals:
-        ctr = round((modal.total_clicks / modal.total_views) * 100, 2) if modal.total_views > 0 else 0.0
+        modal_counts = counts.get(modal.id, {})
+        views = modal_counts.get("view", 0)
+        clicks = modal_counts.get("click", 0)
+        ctr = round((clicks / views) * 100, 2) if views > 0 else 0.0
         result.append(
             {
                 "modal_id": modal.id,
                 "modal_title": modal.title,
-                "total_views": modal.total_views,
-                "total_clicks": modal.total_clicks,
-                "total_dismissals": modal.total_dismissals,
+                "total_views": views,
+                "total_clicks": clicks,
+                "total_dismissals": modal_counts.get("dismiss", 0),
                 "click_through_rate": ctr,
             }
         )
     return result
 
 
+@router.get("/admin/analytics/modals", response=list[ModalAnalyticsOut])
+def admin_get_modal_analytics(request: HttpRequest, days: int = 30):
+    user_id, tenant_id = get_user_and_tenant(request)
+    _ensure_content_manage_permission(request, user_id, tenant_id)
+    end_date = timezone.now()
+    start_date = end_date - timezone.timedelta(days=days)
+    counts = modal_event_counts(tenant_id, start=start_date, end=end_date)
+    return _modal_analytics_rows(tenant_id, counts)
+
+
 @router.get("/admin/analytics/report", response=AnalyticsReportOut)
 def admin_get_analytics_report(request: HttpRequest, days: int = 30):
     user_id, tenant_id = get_user_and_tenant(request)
     _ensure_content_manage_permission(request, user_id, tenant_id)
     end_date = timezone.now()
     start_date = end_date - timezone.timedelta(days=days)
-    analytics_qs = ModalAnalytics.objects.filter(
-        tenant_id=tenant_id,
-        timestamp__gte=start_date,
-        timestamp__lte=end_date,
-    )
-    total_views = analytics_qs.filter(event_type="view").count()
-    total_clicks = analytics_qs.filter(event_type="click").count()
-    total_dismissals = analytics_qs.filter(event_type="dismiss").count()
+    counts = modal_event_counts(tenant_id, start=start_date, end=end_date)
+    total_views = sum(item.get("view", 0) for item in counts.values())
+    total_clicks = sum(item.get("click", 0) for item in counts.values())
+    total_dismissals = sum(item.get("dismiss", 0) for item in counts.values())
     average_ctr = round((total_clicks / total_views) * 100, 2) if total_views > 0 else 0.0
+    modals = _modal_analytics_rows(tenant_id, counts)
 
     return {
         "period_start": start_date,
         "period_end": end_date,
-        "total_modals": HomePageModal.objects.filter(
-            Q(tenant_id=tenant_id) | Q(tenant_id__isnull=True),
-            deleted_at__isnull=True,
-        ).count(),
+        "total_modals": len(modals),
         "total_views": total_views,
         "total_clicks": total_clicks,
         "total_dismissals": total_dismissals,
         "average_ctr": average_ctr,
-        "modals": admin_get_modal_analytics(request, days=days),
+        "modals": modals,
     }
 
 
 @router.get("/admin/dashboards/layouts", response=list[DashboardLayoutOut])
 def list_dashboard_layouts(
     request: HttpRequest,
+    response: HttpResponse,
     include_deleted: bool = False,
     limit: int = 100,
     offset: int = 0,
 ):
     user_id, tenant_id = get_user_and_tenant(request)
     _ensure_dashboard_customize_permission(request, user_id, tenant_id)
-    query = DashboardLayout.objects.filter(user_id=user_id, tenant_id=tenant_id).prefetch_related("widgets")
-    if not include_deleted:
-        query = query.filter(deleted_at__isnull=True)
     safe_limit = max(1, min(limit, 200))
     safe_offset = max(0, offset)
-    return list(query.order_by("-is_default", "-updated_at")[safe_offset : safe_offset + safe_limit])
+
+    def load() -> list[ScheduledItem]:
+        query = DashboardLayout.objects.filter(user_id=user_id, tenant_id=tenant_id)
+        if not include_deleted:
+            query = query.filter(deleted_at__isnull=True)
+        page = query.order_by("-is_default", "-updated_at")[safe_offset : safe_offset + safe_limit]
+        return [ScheduledItem(DashboardLayoutOut.from_orm(layout).model_dump()) for layout in page]
+
+    view = content_cache.get(
+        f"layouts:{tenant_id}:{user_id}:{int(include_deleted)}:{safe_offset}:{safe_limit}",
+        scopes=(layouts_scope(tenant_id, user_id),),
+        load=load,
+        now=timezone.now(),
+    )
+    return respond(request, response, view)
 
 
 @router.post("/admin/dashboards/layouts", response=DashboardLayoutOut)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from personalization.analytics import replay_spool, spool_dir
+
+
+class Command(BaseCommand):
+    help = "Replay modal analytics batches spooled to disk by failed buffer flushes"
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        files, rows = replay_spool()
+
+        payload = {
+            "service": "access",
+            "executed_at": now.isoformat(),
+            "spool_dir": str(spool_dir()),
+            "counts": {
+                "files_replayed": files,
+                "rows_replayed": rows,
+            },
+        }
+        self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from personalization.rollups import rollup_pending
+
+
+class Command(BaseCommand):
+    help = "Roll raw modal analytics events up into per-day counts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--recompute-days",
+            type=int,
+            default=2,
+            help="Closed days to recompute even if already rolled up (late events)",
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        summary = rollup_pending(recompute_days=int(options["recompute_days"]), now=now)
+
+        payload = {
+            "service": "access",
+            "executed_at": now.isoformat(),
+            "rollup": summary,
+        }
+        self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
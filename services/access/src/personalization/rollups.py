@@ -0,0 +1,195 @@
+"""Daily rollups of homepage modal analytics.
+
+``ModalAnalyticsDaily`` holds (tenant, modal, UTC day, event type) counts and
+``ModalAnalyticsRollupState.rolled_through`` marks the last complete day.
+``rollup_pending`` (run nightly by ``manage.py rollup_modal_analytics``) fills
+closed days, recomputes the trailing few and also every older day that got
+rows inserted since the previous run (``ModalAnalytics.created_at`` past
+``ingested_through``), so buffered or spooled events that land late are still
+counted. Reports read whole days from rollups and only the partial edges of
+the window, including today, from raw events.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import ModalAnalytics, ModalAnalyticsDaily, ModalAnalyticsRollupState
+
+INSERT_CHUNK = 500
+# Inserts can commit a little after their created_at: rescan this far back.
+LATE_ROW_MARGIN = timedelta(minutes=10)
+
+EventCounts = dict[int, dict[str, int]]
+
+
+def _midnight(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def _utc_day(value: datetime) -> date:
+    return value.astimezone(dt_timezone.utc).date()
+
+
+def rolled_through() -> date | None:
+    return (
+        ModalAnalyticsRollupState.objects.filter(id=ModalAnalyticsRollupState.SINGLETON_ID)
+        .values_list("rolled_through", flat=True)
+        .first()
+    )
+
+
+def _is_ydb_mode() -> bool:
+    return getattr(settings, "DB_DRIVER", "postgres") == "ydb"
+
+
+def rollup_day(day: date) -> int:
+    """Recompute all rollup rows of one UTC day. Returns the number of rows."""
+    grouped = (
+        ModalAnalytics.objects.filter(
+            timestamp__gte=_midnight(day),
+            timestamp__lt=_midnight(day + timedelta(days=1)),
+        )
+        .values("tenant_id", "modal_id", "event_type")
+        .annotate(total=Count("id"))
+    )
+    rows = [
+        ModalAnalyticsDaily(
+            tenant_id=item["tenant_id"],
+            modal_id=item["modal_id"],
+            day=day,
+            event_type=item["event_type"],
+            count=item["total"],
+        )
+        for item in grouped
+    ]
+    with transaction.atomic():
+        ModalAnalyticsDaily.objects.filter(day=day).delete()
+        for start in range(0, len(rows), INSERT_CHUNK):
+            ModalAnalyticsDaily.objects.bulk_create(rows[start : start + INSERT_CHUNK])
+    return len(rows)
+
+
+def _late_days(*, before: date, ingested_since: datetime | None) -> list[date]:
+    """Rolled-up days before ``before`` that got rows inserted since ``ingested_since``."""
+    if ingested_since is None:
+        return []
+    return sorted(
+        ModalAnalytics.objects.filter(
+            created_at__gte=ingested_since,
+            timestamp__lt=_midnight(before),
+        )
+        .annotate(day=TruncDate("timestamp", tzinfo=dt_timezone.utc))
+        .values_list("day", flat=True)
+        .distinct()
+    )
+
+
+def rollup_pending(*, recompute_days: int = 2, now: datetime | None = None) -> dict[str, object]:
+    """
+    Roll up every closed UTC day not yet rolled, plus the last ``recompute_days``
+    and any older day that received rows since the previous run.
+    """
+    now = now or timezone.now()
+    last_closed = _utc_day(now) - timedelta(days=1)
+    watermark = rolled_through()
+    if watermark is None:
+        earliest = ModalAnalytics.objects.aggregate(first=Min("timestamp"))["first"]
+        first = _utc_day(earliest) if earliest else last_closed + timedelta(days=1)
+    else:
+        first = min(
+            watermark + timedelta(days=1),
+            last_closed - timedelta(days=max(recompute_days, 0) - 1),
+        )
+    ingested_since = (
+        ModalAnalyticsRollupState.objects.filter(id=ModalAnalyticsRollupState.SINGLETON_ID)
+        .values_list("ingested_through", flat=True)
+        .first()
+    )
+    late = _late_days(before=first, ingested_since=ingested_since) if watermark is not None else []
+
+    days = rows = 0
+    for day in late:
+        rows += rollup_day(day)
+        days += 1
+    day = first
+    while day <= last_closed:
+        rows += rollup_day(day)
+        days += 1
+        day += timedelta(days=1)
+
+    with transaction.atomic():
+        state_qs = ModalAnalyticsRollupState.objects.filter(
+            id=ModalAnalyticsRollupState.SINGLETON_ID
+        )
+        if not _is_ydb_mode():
+            state_qs = state_qs.select_for_update()
+        state = state_qs.first() or ModalAnalyticsRollupState()
+        if state.rolled_through is None or state.rolled_through < last_closed:
+            state.rolled_through = last_closed
+        state.ingested_through = now - LATE_ROW_MARGIN
+        state.save()
+
+    return {
+        "first_day": first.isoformat() if days else None,
+        "late_days": [day.isoformat() for day in late],
+        "rolled_through": last_closed.isoformat(),
+        "days": days,
+        "rows": rows,
+    }
+
+
+def _add_raw(counts: EventCounts, tenant_id: UUID, start: datetime, end: datetime) -> None:
+    if start >= end:
+        return
+    grouped = (
+        ModalAnalytics.objects.filter(tenant_id=tenant_id, timestamp__gte=start, timestamp__lt=end)
+        .values("modal_id", "event_type")
+        .annotate(total=Count("id"))
+    )
+    for item in grouped:
+        counts[item["modal_id"]][item["event_type"]] += item["total"]
+
+
+def modal_event_counts(tenant_id: UUID, *, start: datetime, end: datetime) -> EventCounts:
+    """Event counts per modal for a tenant in ``[start, end)``.
+
+    Whole UTC days covered by the rollup are summed from ``ModalAnalyticsDaily``;
+    the partial first day and everything after the watermark come from raw
+    events, so the cost no longer grows with the window length.
+    """
+    counts: EventCounts = defaultdict(lambda: defaultdict(int))
+    first_full = _utc_day(start)
+    if _midnight(first_full) < start:
+        first_full += timedelta(days=1)
+    last_full = _utc_day(end) - timedelta(days=1)
+    watermark = rolled_through()
+    if watermark is not None:
+        last_full = min(last_full, watermark)
+
+    if watermark is None or first_full > last_full:
+        _add_raw(counts, tenant_id, start, end)
+        return counts
+
+    grouped = (
+        ModalAnalyticsDaily.objects.filter(
+            tenant_id=tenant_id,
+            day__gte=first_full,
+            day__lte=last_full,
+        )
+        .values("modal_id", "event_type")
+        .annotate(total=Sum("count"))
+    )
+    for item in grouped:
+        counts[item["modal_id"]][item["event_type"]] += item["total"] or 0
+    _add_raw(counts, tenant_id, start, _midnight(first_full))
+    _add_raw(counts, tenant_id, _midnight(last_full + timedelta(days=1)), end)
+    return counts
@@ -0,0 +1,282 @@
+"""Tests for modal analytics ingestion (direct and buffered) and daily rollups."""
+from __future__ import annotations
+
+import json
+import tempfile
+import uuid
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from core.models import HomePageModal, ModalAnalytics, ModalAnalyticsDaily
+from personalization import analytics
+from personalization.analytics import analytics_buffer, modal_ids
+
+
+class TestModalAnalyticsDirectIngestion(TestCase):
+    def setUp(self):
+        modal_ids.clear()
+        analytics_buffer.clear()
+        self.client = Client()
+        self.headers = {
+            "HTTP_X_USER_ID": str(uuid.uuid4()),
+            "HTTP_X_TENANT_ID": str(uuid.uuid4()),
+        }
+        self.modal = HomePageModal.objects.create(title="Hello", content="Body", is_active=True)
+
+    def test_events_are_stored_before_the_response(self):
+        response = self.client.post(
+            "/api/personalization/analytics/track/batch",
+            data=json.dumps({"events": [{"modal_id": self.modal.id, "event_type": "view"}] * 2}),
+            content_type="application/json",
+            **self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["accepted"], 2)
+        self.assertEqual(ModalAnalytics.objects.filter(modal=self.modal).count(), 2)
+        self.assertEqual(len(analytics_buffer), 0)
+
+
+@override_settings(
+    ACCESS_ANALYTICS_BUFFERED=True,
+    ACCESS_ANALYTICS_FLUSH_SECONDS=0,
+    ACCESS_ANALYTICS_BUFFER_SIZE=100,
+)
+class TestModalAnalyticsIngestion(TestCase):
+    def setUp(self):
+        modal_ids.clear()
+        analytics_buffer.clear()
+        self.client = Client()
+        self.user_id = uuid.uuid4()
+        self.tenant_id = uuid.uuid4()
+        self.headers = {
+            "HTTP_X_USER_ID": str(self.user_id),
+            "HTTP_X_TENANT_ID": str(self.tenant_id),
+        }
+        self.modal = HomePageModal.objects.create(title="Hello", content="Body", is_active=True)
+
+    def tearDown(self):
+        analytics_buffer.clear()
+
+    def _post_batch(self, events):
+        return self.client.post(
+            "/api/personalization/analytics/track/batch",
+            data=json.dumps({"events": events}),
+            content_type="application/json",
+            **self.headers,
+        )
+
+    def test_batch_is_buffered_until_flush(self):
+        response = self._post_batch(
+            [
+                {"modal_id": self.modal.id, "event_type": "view"},
+                {"modal_id": self.modal.id, "event_type": "click", "session_id": "s1"},
+                {"modal_id": self.modal.id + 1000, "event_type": "view"},
+            ]
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"accepted": 2, "rejected": [{"index": 2, "error": "modal not found"}]},
+        )
+        self.assertEqual(ModalAnalytics.objects.count(), 0)
+
+        self.assertEqual(analytics_buffer.flush(), 2)
+        rows = ModalAnalytics.objects.filter(modal=self.modal).order_by("event_type")
+        self.assertEqual([row.event_type for row in rows], ["click", "view"])
+        self.assertTrue(all(row.tenant_id == self.tenant_id for row in rows))
+
+    def test_single_track_rejects_unknown_modal(self):
+        response = self.client.post(
+            "/api/personalization/analytics/track",
+            data=json.dumps({"modal_id": self.modal.id + 1000, "event_type": "view"}),
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(analytics_buffer), 0)
+
+    def test_core_track_goes_through_the_buffer(self):
+        track = {"modal_id": self.modal.id, "event_type": "view", "session_id": "s1"}
+        response = self.client.post(
+            "/api/core/analytics/track",
+            data=json.dumps(track),
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ModalAnalytics.objects.count(), 0)
+        self.assertEqual(analytics_buffer.flush(), 1)
+        row = ModalAnalytics.objects.get()
+        self.assertEqual((row.tenant_id, row.user_id), (self.tenant_id, self.user_id))
+
+        response = self.client.post(
+            "/api/core/analytics/track",
+            data=json.dumps({**track, "modal_id": self.modal.id + 1000}),
+            content_type="application/json",
+            **self.headers,
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(len(analytics_buffer), 0)
+
+    @override_settings(ACCESS_ANALYTICS_BUFFER_SIZE=3)
+    def test_buffer_flushes_when_full(self):
+        self._post_batch([{"modal_id": self.modal.id, "event_type": "view"}] * 2)
+        self.assertEqual(ModalAnalytics.objects.count(), 0)
+
+        self._post_batch([{"modal_id": self.modal.id, "event_type": "dismiss"}])
+        self.assertEqual(ModalAnalytics.objects.count(), 3)
+        self.assertEqual(len(analytics_buffer), 0)
+
+    @override_settings(ACCESS_ANALYTICS_BUFFER_SIZE=2)
+    def test_size_triggered_flush_error_does_not_fail_the_request(self):
+        with (
+            tempfile.TemporaryDirectory() as spool,
+            override_settings(ACCESS_ANALYTICS_SPOOL_DIR=spool),
+            patch.object(analytics, "write_rows", side_effect=ValueError("bad row")),
+        ):
+            response = self._post_batch([{"modal_id": self.modal.id, "event_type": "view"}] * 2)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(list(Path(spool).glob("*.jsonl"))), 1)
+
+            with patch.object(analytics, "spool_rows", side_effect=OSError("read-only")):
+                response = self._post_batch([{"modal_id": self.modal.id, "event_type": "view"}] * 2)
+            self.assertEqual(response.status_code, 200)
+
+    def test_failed_flush_is_spooled_and_replayed(self):
+        self._post_batch([{"modal_id": self.modal.id, "event_type": "view"}] * 2)
+        with tempfile.TemporaryDirectory() as spool, override_settings(
+            ACCESS_ANALYTICS_SPOOL_DIR=spool
+        ):
+            with patch.object(analytics, "write_rows", side_effect=DatabaseError("down")):
+                analytics_buffer.flush()
+            self.assertEqual(len(list(Path(spool).glob("*.jsonl"))), 1)
+            self.assertEqual(ModalAnalytics.objects.count(), 0)
+
+            out = StringIO()
+            call_command("flush_modal_analytics", stdout=out)
+            self.assertEqual(json.loads(out.getvalue())["counts"]["rows_replayed"], 2)
+            self.assertEqual(list(Path(spool).glob("*.jsonl")), [])
+            self.assertEqual(ModalAnalytics.objects.count(), 2)
+
+
+class TestModalAnalyticsRollups(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user_id = uuid.uuid4()
+        self.tenant_id = uuid.uuid4()
+        self.headers = {
+            "HTTP_X_USER_ID": str(self.user_id),
+            "HTTP_X_TENANT_ID": str(self.tenant_id),
+        }
+        self.modal = HomePageModal.objects.create(title="Hello", content="Body", is_active=True)
+        self.now = timezone.now()
+
+    def _event(self, event_type: str, *, days_ago: float, tenant_id=None) -> None:
+        ModalAnalytics.objects.create(
+            modal=self.modal,
+            tenant_id=tenant_id or self.tenant_id,
+            event_type=event_type,
+            timestamp=self.now - timedelta(days=days_ago),
+        )
+
+    def _report(self, days: int) -> dict:
+        with patch("personalization.api._ensure_content_manage_permission"):
+            response = self.client.get(
+                f"/api/personalization/admin/analytics/report?days={days}", **self.headers
+            )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_report_combines_rollups_with_raw_edges(self):
+        for days_ago in (3, 2, 2):
+            self._event("view", days_ago=days_ago)
+        self._event("click", days_ago=2)
+        self._event("view", days_ago=0)
+        self._event("view", days_ago=2, tenant_id=uuid.uuid4())
+
+        out = StringIO()
+        call_command("rollup_modal_analytics", stdout=out)
+        summary = json.loads(out.getvalue())["rollup"]
+        self.assertEqual(
+            summary["rolled_through"], (self.now - timedelta(days=1)).date().isoformat()
+        )
+        self.assertEqual(
+            ModalAnalyticsDaily.objects.filter(tenant_id=self.tenant_id).count(), 3
+        )
+
+        # Rolled-up days no longer need their raw rows.
+        yesterday_midnight = self.now.replace(hour=0, minute=0, second=0, microsecond=0)
+        ModalAnalytics.objects.filter(
+            timestamp__lt=yesterday_midnight - timedelta(days=1)
+        ).delete()
+
+        report = self._report(days=7)
+        self.assertEqual(report["total_views"], 4)
+        self.assertEqual(report["total_clicks"], 1)
+        self.assertEqual(report["average_ctr"], 25.0)
+        modal = next(item for item in report["modals"] if item["modal_id"] == self.modal.id)
+        self.assertEqual(modal["total_views"], 4)
+
+    def test_core_admin_analytics_read_rollups(self):
+        for days_ago in (3, 2):
+            self._event("view", days_ago=days_ago)
+        self._event("click", days_ago=2)
+        call_command("rollup_modal_analytics", stdout=StringIO())
+        # Only the rollups know about the rolled-up days from here on.
+        ModalAnalytics.objects.filter(timestamp__lt=self.now - timedelta(days=1)).delete()
+
+        response = self.client.get("/api/core/admin/analytics/report?days=7", **self.headers)
+        self.assertEqual(response.status_code, 200)
+        report = response.json()
+        self.assertEqual(report["total_views"], 2)
+        self.assertEqual(report["total_clicks"], 1)
+        self.assertEqual(report["average_ctr"], 50.0)
+
+        response = self.client.get("/api/core/admin/analytics/modals?days=7", **self.headers)
+        self.assertEqual(response.status_code, 200)
+        modal = next(item for item in response.json() if item["modal_id"] == self.modal.id)
+        self.assertEqual(modal["total_views"], 2)
+        self.assertEqual(modal["click_through_rate"], 50.0)
+
+    def test_report_without_rollups_reads_raw_events(self):
+        self._event("view", days_ago=1.5)
+        self._event("dismiss", days_ago=0)
+
+        report = self._report(days=30)
+        self.assertEqual(report["total_views"], 1)
+        self.assertEqual(report["total_dismissals"], 1)
+
+    def test_rerun_recomputes_trailing_days(self):
+        self._event("view", days_ago=1)
+        call_command("rollup_modal_analytics", stdout=StringIO())
+        # A late (e.g. spooled) event for an already rolled-up day.
+        self._event("view", days_ago=1)
+        call_command("rollup_modal_analytics", stdout=StringIO())
+
+        total = ModalAnalyticsDaily.objects.filter(tenant_id=self.tenant_id).get()
+        self.assertEqual(total.count, 2)
+
+    def test_rerun_recomputes_old_days_that_received_late_rows(self):
+        self._event("view", days_ago=6)
+        self._event("view", days_ago=1)
+        call_command("rollup_modal_analytics", stdout=StringIO())
+        # Replayed long after the recompute window closed for that day.
+        self._event("view", days_ago=6)
+
+        out = StringIO()
+        call_command("rollup_modal_analytics", stdout=out)
+
+        old_day = (self.now - timedelta(days=6)).date()
+        self.assertEqual(json.loads(out.getvalue())["rollup"]["late_days"], [old_day.isoformat()])
+        self.assertEqual(
+            ModalAnalyticsDaily.objects.get(tenant_id=self.tenant_id, day=old_day).count, 2
+        )
@@ -10,7 +10,7 @@ from uuid import UUID
 from botocore.exceptions import BotoCoreError, ClientError
 from django.conf import settings
 from django.core import signing
-from django.db import models, transaction
+from django.db import models
 from django.http import FileResponse, HttpResponse, JsonResponse
 from django.utils import timezone
 from ninja import Body, Router
@@ -20,7 +20,19 @@ from activity import schemas
 from activity.audit import log_audit_event as _log_audit
 from activity.connectors import install_connectors
 from activity.context import require_activity_context
-from activity.dsar import erase_user_data, export_user_data
+from activity.domain_events import (
+    DOMAIN_EVENT_SOURCES,
+    INGEST_MAX_BATCH,
+    DomainEventIn,
+    ingest_domain_events,
+)
+from activity.dsar import (
+    erase_user_data,
+    erasure_payload,
+    export_user_data,
+    run_erasure,
+    start_erasure,
+)
 from activity.enums import NewsStatus, ScopeType, Visibility
 from activity.media import (
     build_news_media_key,
@@ -37,6 +49,7 @@ from activity.media import (
 from activity.models import (
     AccountLink,
     ActivityEvent,
+    DsarErasure,
     NewsComment,
     NewsCommentReaction,
     NewsPost,
@@ -70,7 +83,9 @@ from activity.services import (
     verify_hmac_signature,
 )
 from core.errors import error_payload
+from core.http import require_request_id
 from core.schemas import ErrorOut
+from core.security import require_internal_signature
 
 router = Router(tags=["Activity"], auth=None)
 REQUIRED_BODY = Body(...)
@@ -1588,6 +1603,7 @@ def dsar_export(request, target_user_id: str):
         target_id=audit_target_id,
         metadata={"subject_scope": subject_scope},
         request_id=ctx.request_id,
+        sync=True,
     )
     return payload
 
@@ -1607,18 +1623,75 @@ def dsar_erase(request, target_user_id: str):
     )
     _ensure_dsar_subject(ctx, parsed_user_id)
     subject_scope, audit_target_id = _dsar_audit_target(ctx, parsed_user_id)
-    with transaction.atomic():
-        payload = erase_user_data(tenant_id=ctx.tenant_id, user_id=parsed_user_id)
+    # Chunks commit as they go; a failed erase resumes on the next call.
+    payload = erase_user_data(tenant_id=ctx.tenant_id, user_id=parsed_user_id)
+    _log_audit(
+        tenant_id=ctx.tenant_id,
+        actor_user_id=ctx.user_id,
+        action="dsar.erased",
+        target_type="dsar_request",
+        target_id=audit_target_id,
+        metadata={"subject_scope": subject_scope, "erasure_id": payload["erasure_id"]},
+        request_id=ctx.request_id,
+        sync=True,
+    )
+    return payload
+
+
+@router.post(
+    "/feed/internal/dsar/users/{target_user_id}/erasure",
+    response={200: dict, 401: ErrorOut, 403: ErrorOut, 400: ErrorOut},
+    summary="Start or continue a chunked activity erase",
+    operation_id="activity_dsar_erasure_run",
+)
+def dsar_erasure_run(request, target_user_id: str, max_seconds: float = 5.0):
+    ctx = require_activity_context(request, require_user=True)
+    parsed_user_id = _parse_uuid(
+        target_user_id,
+        code="INVALID_USER_ID",
+        message="Invalid user id",
+    )
+    _ensure_dsar_subject(ctx, parsed_user_id)
+    subject_scope, audit_target_id = _dsar_audit_target(ctx, parsed_user_id)
+    erasure = start_erasure(tenant_id=ctx.tenant_id, user_id=parsed_user_id)
+    erasure = run_erasure(erasure, max_seconds=min(max(max_seconds, 0.1), 30.0))
+    payload = erasure_payload(erasure)
+    if erasure.status == DsarErasure.Status.COMPLETED:
         _log_audit(
             tenant_id=ctx.tenant_id,
             actor_user_id=ctx.user_id,
             action="dsar.erased",
             target_type="dsar_request",
             target_id=audit_target_id,
-            metadata={"subject_scope": subject_scope},
+            metadata={"subject_scope": subject_scope, "erasure_id": erasure.id},
             request_id=ctx.request_id,
+            sync=True,
         )
-        return payload
+    return payload
+
+
+@router.get(
+    "/feed/internal/dsar/users/{target_user_id}/erasure",
+    response={200: dict, 401: ErrorOut, 403: ErrorOut, 400: ErrorOut, 404: ErrorOut},
+    summary="Latest activity erase status",
+    operation_id="activity_dsar_erasure_status",
+)
+def dsar_erasure_status(request, target_user_id: str):
+    ctx = require_activity_context(request, require_user=True)
+    parsed_user_id = _parse_uuid(
+        target_user_id,
+        code="INVALID_USER_ID",
+        message="Invalid user id",
+    )
+    _ensure_dsar_subject(ctx, parsed_user_id)
+    erasure = (
+        DsarErasure.objects.filter(tenant_id=ctx.tenant_id, user_id=parsed_user_id)
+        .order_by("-id")
+        .first()
+    )
+    if erasure is None:
+        raise HttpError(404, error_payload("NOT_FOUND", "No erasure for this user"))
+    return erasure_payload(erasure)
 
 
 @router.get(
@@ -1821,3 +1894,69 @@ def ingest_webhook_minecraft(request):
         "raw_deduped": 0 if created_raw else 1,
         "activity_created": 1 if created_act else 0,
     }
+
+
+@router.post(
+    "/events/ingest",
+    auth=None,
+    response={200: schemas.DomainEventIngestOut, 400: ErrorOut, 401: ErrorOut, 413: ErrorOut},
+    summary="Batch ingest of cross-service domain events",
+    operation_id="activity_events_ingest",
+)
+def events_ingest(request, payload: schemas.DomainEventIngestIn = REQUIRED_BODY):
+    # Service-to-service relay: signed like any internal call, but items carry
+    # their own tenant_id so one batch may span tenants.
+    require_internal_signature(request)
+    require_request_id(request)
+    source = (request.headers.get("X-Source-Service") or "").strip().lower()
+    if source not in DOMAIN_EVENT_SOURCES:
+        raise HttpError(
+            400,
+            error_payload(
+                "INVALID_SOURCE_SERVICE",
+                "X-Source-Service must name a known domain event source",
+                details={"allowed": sorted(DOMAIN_EVENT_SOURCES)},
+            ),
+        )
+    if len(payload.events) > INGEST_MAX_BATCH:
+        raise HttpError(
+            413,
+            error_payload(
+                "BATCH_TOO_LARGE",
+                "Too many events in one batch",
+                details={"max_items": INGEST_MAX_BATCH},
+            ),
+        )
+
+    results = ingest_domain_events(
+        source=source,
+        events=[
+            DomainEventIn(
+                event_id=item.event_id,
+                event_type=item.event_type,
+                tenant_id=item.tenant_id,
+                occurred_at=item.occurred_at,
+                payload=item.payload,
+            )
+            for item in payload.events
+        ],
+    )
+    counts = {status: 0 for status in ("created", "duplicate", "ignored", "invalid")}
+    for result in results:
+        counts[result.status] += 1
+    return {
+        "ok": True,
+        "created": counts["created"],
+        "duplicates": counts["duplicate"],
+        "ignored": counts["ignored"],
+        "invalid": counts["invalid"],
+        "items": [
+            {
+                "event_id": result.event_id,
+                "status": result.status,
+                "activity_event_id": result.activity_event_id,
+                "error": result.error,
+            }
+            for result in results
+        ],
+    }
@@ -12,6 +12,7 @@ Design notes:
 
 from __future__ import annotations
 
+import atexit
 import logging
 import uuid
 from typing import Any
@@ -19,6 +20,8 @@ from typing import Any
 from django.db import models
 from django.utils import timezone
 
+from core.audit_writer import AuditWriter
+
 logger = logging.getLogger(__name__)
 
 
@@ -51,6 +54,11 @@ class ActivityAuditEvent(models.Model):
         return f"{self.action} by {self.actor_user_id} ({self.tenant_id})"
 
 
+# Synchronous unless ACTIVITY_AUDIT_ASYNC is on; the exit hook drains that queue.
+audit_writer = AuditWriter(ActivityAuditEvent, prefix="ACTIVITY_AUDIT")
+atexit.register(audit_writer.shutdown)
+
+
 def log_audit_event(
     *,
     tenant_id: str | uuid.UUID,
@@ -60,8 +68,14 @@ def log_audit_event(
     target_id: str = "",
     metadata: dict[str, Any] | None = None,
     request_id: str = "",
+    sync: bool = False,
 ) -> ActivityAuditEvent:
-    """Write a single audit record.
+    """Record a single audit event.
+
+    The row is inserted before returning, unless ``ACTIVITY_AUDIT_ASYNC``
+    queues it for a batched background insert (see ``audit_writer``);
+    pass ``sync=True`` for compliance-critical actions that must be stored
+    before the caller returns either way.
 
     Parameters
     ----------
@@ -79,8 +93,10 @@ def log_audit_event(
         **PII-safe** context dict — only field names, counts, hashes, etc.
     request_id:
         Distributed trace ID from ``X-Request-Id`` header.
+    sync:
+        Insert immediately, inside the caller's transaction if any.
     """
-    event = ActivityAuditEvent.objects.create(
+    event = ActivityAuditEvent(
         tenant_id=str(tenant_id),
         actor_user_id=str(actor_user_id),
         action=action,
@@ -89,6 +105,7 @@ def log_audit_event(
         metadata=metadata or {},
         request_id=str(request_id),
     )
+    audit_writer.write(event, sync=sync)
     logger.info(
         "audit: %s target=%s/%s actor=%s tenant=%s",
         action,
@@ -0,0 +1,305 @@
+"""
+Batch ingestion of cross-service domain events.
+
+Voting, events and gamification relay their outbox messages to
+``POST /events/ingest`` in batches. Each message is mapped to an
+``ActivityEvent`` row (or, for batch messages, one row per item) keyed by
+``source_ref`` so redelivered messages are deduplicated by the
+``act_event_source_ref_uniq`` constraint.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from activity.enums import ScopeType, Visibility
+from activity.models import ActivityEvent, OutboxEventType, uuid_from_str
+from activity.services import publish_outbox_event
+
+logger = logging.getLogger(__name__)
+
+DOMAIN_EVENT_SOURCES = frozenset({"voting", "events", "gamification"})
+INGEST_MAX_BATCH = 1000
+INGEST_INSERT_CHUNK = 500
+
+STATUS_CREATED = "created"
+STATUS_DUPLICATE = "duplicate"
+STATUS_IGNORED = "ignored"
+STATUS_INVALID = "invalid"
+
+
+@dataclass(frozen=True)
+class DomainEventIn:
+    event_id: str
+    event_type: str
+    tenant_id: str
+    occurred_at: datetime | None
+    payload: dict[str, Any]
+
+
+@dataclass(frozen=True)
+class DomainEventResult:
+    event_id: str
+    status: str
+    activity_event_id: int | None = None
+    error: str | None = None
+
+
+def domain_source_ref(*, source: str, event_id: str) -> str:
+    return f"{source}:outbox:{event_id}"
+
+
+def _optional_uuid(value: Any) -> UUID | None:
+    if not value:
+        return None
+    try:
+        return uuid_from_str(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _map_vote_cast(tenant_id: UUID, payload: dict[str, Any]) -> dict[str, Any]:
+    # Ballot choice stays in voting: the feed only learns that a vote happened.
+    return {
+        "type": "vote.cast",
+        "title": "Vote cast",
+        "actor_user_id": _optional_uuid(payload.get("user_id")),
+        "visibility": Visibility.PRIVATE,
+        "scope_type": ScopeType.TENANT,
+        "scope_id": str(tenant_id),
+        "payload_json": {
+            "poll_id": payload.get("poll_id"),
+            "nomination_id": payload.get("nomination_id"),
+        },
+    }
+
+
+def _map_event_created(tenant_id: UUID, payload: dict[str, Any]) -> dict[str, Any]:
+    scope_type = str(payload.get("scope_type") or ScopeType.TENANT).upper()
+    # Only the events service knows who may see the event: without an
+    # explicit visibility the feed item stays private.
+    visibility = str(payload.get("visibility") or Visibility.PRIVATE)
+    if visibility not in Visibility.values:
+        visibility = Visibility.PRIVATE
+    return {
+        "type": "event.created",
+        "title": str(payload.get("title") or "Event created")[:256],
+        "actor_user_id": _optional_uuid(payload.get("created_by")),
+        "visibility": visibility,
+        "scope_type": scope_type,
+        "scope_id": str(payload.get("scope_id") or tenant_id),
+        "payload_json": {
+            "event_id": payload.get("event_id"),
+            "starts_at": payload.get("starts_at"),
+        },
+    }
+
+
+def _map_rsvp_changed(tenant_id: UUID, payload: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "type": "event.rsvp.changed",
+        "title": "RSVP changed",
+        "actor_user_id": _optional_uuid(payload.get("user_id")),
+        "visibility": Visibility.PRIVATE,
+        "scope_type": ScopeType.TENANT,
+        "scope_id": str(tenant_id),
+        "payload_json": {
+            "event_id": payload.get("event_id"),
+            "status": payload.get("status"),
+        },
+    }
+
+
+def _map_grant_created(tenant_id: UUID, payload: dict[str, Any]) -> dict[str, Any]:
+    visibility = Visibility.PRIVATE if payload.get("visibility") == "private" else Visibility.PUBLIC
+    return {
+        "type": "achievement.granted",
+        "title": "Achievement granted",
+        "actor_user_id": _optional_uuid(payload.get("issuer_id")),
+        "target_user_id": _optional_uuid(payload.get("recipient_id")),
+        "visibility": visibility,
+        "scope_type": ScopeType.TENANT,
+        "scope_id": str(tenant_id),
+        "payload_json": {
+            "grant_id": payload.get("grant_id"),
+            "achievement_id": payload.get("achievement_id"),
+        },
+    }
+
+
+def _map_grants_bulk_created(tenant_id: UUID, payload: dict[str, Any]) -> list[tuple[str, dict[str, Any]]]:
+    # One feed item per recipient, the same as a single grant.created each.
+    shared = {key: value for key, value in payload.items() if key != "grants"}
+    return [
+        (str(grant.get("grant_id")), _map_grant_created(tenant_id, {**shared, **grant}))
+        for grant in payload.get("grants") or []
+        if isinstance(grant, dict) and grant.get("grant_id")
+    ]
+
+
+DomainEventMapper = Callable[[UUID, dict[str, Any]], dict[str, Any]]
+DomainEventFanoutMapper = Callable[[UUID, dict[str, Any]], list[tuple[str, dict[str, Any]]]]
+
+DOMAIN_EVENT_MAPPERS: dict[str, DomainEventMapper] = {
+    "voting.vote.cast": _map_vote_cast,
+    "event.created": _map_event_created,
+    "event.rsvp.changed": _map_rsvp_changed,
+    "gamification.grant.created": _map_grant_created,
+}
+
+# Batch messages: each item becomes its own row, keyed ``<source_ref>:<item key>``.
+DOMAIN_EVENT_FANOUT_MAPPERS: dict[str, DomainEventFanoutMapper] = {
+    "gamification.grant.bulk_created": _map_grants_bulk_created,
+}
+
+
+def _existing_refs(objs: list[ActivityEvent]) -> set[tuple[UUID, str]]:
+    return set(
+        ActivityEvent.objects.filter(source_ref__in=[obj.source_ref for obj in objs]).values_list(
+            "tenant_id",
+            "source_ref",
+        )
+    )
+
+
+def _insert_chunk(objs: list[ActivityEvent]) -> None:
+    """Insert ``objs``; rows whose ``source_ref`` already exists keep ``pk=None``."""
+    try:
+        with transaction.atomic():
+            ActivityEvent.objects.bulk_create(objs)
+    except IntegrityError:
+        # A concurrent relay stored some of these first: retry row by row.
+        for obj in objs:
+            obj.pk = None
+            try:
+                with transaction.atomic():
+                    obj.save(force_insert=True)
+            except IntegrityError:
+                obj.pk = None
+        return
+
+    # Backends that do not return primary keys from bulk inserts get them
+    # with one lookup; every row of the chunk is ours.
+    missing = {(obj.tenant_id, obj.source_ref): obj for obj in objs if obj.pk is None}
+    if missing:
+        for tenant_id, source_ref, event_id in ActivityEvent.objects.filter(
+            source_ref__in=[source_ref for _, source_ref in missing]
+        ).values_list("tenant_id", "source_ref", "id"):
+            if (tenant_id, source_ref) in missing:
+                missing[(tenant_id, source_ref)].pk = event_id
+
+
+def ingest_domain_events(
+    *,
+    source: str,
+    events: list[DomainEventIn],
+) -> list[DomainEventResult]:
+    """
+    Map a batch of domain events to ActivityEvent rows.
+
+    Already-ingested events are found with a single ``source_ref IN`` query and
+    the rest are inserted with ``bulk_create`` in chunks. A chunk that hits the
+    unique ``source_ref`` constraint (a concurrent relay delivering the same
+    message) is retried row by row, and the rows that lost the race are
+    reported as duplicates. A fan-out message is ``created`` if any of its
+    rows was inserted. Returns one result per input item, in input order.
+    """
+    results: list[DomainEventResult | None] = [None] * len(events)
+    pending: list[tuple[int, ActivityEvent]] = []
+    seen_refs: set[str] = set()
+
+    for index, item in enumerate(events):
+        tenant_id = _optional_uuid(item.tenant_id)
+        if tenant_id is None or not item.event_id:
+            results[index] = DomainEventResult(
+                event_id=item.event_id,
+                status=STATUS_INVALID,
+                error="tenant_id and event_id are required",
+            )
+            continue
+        mapper = DOMAIN_EVENT_MAPPERS.get(item.event_type)
+        fanout = DOMAIN_EVENT_FANOUT_MAPPERS.get(item.event_type)
+        if mapper is None and fanout is None:
+            results[index] = DomainEventResult(event_id=item.event_id, status=STATUS_IGNORED)
+            continue
+        source_ref = domain_source_ref(source=source, event_id=item.event_id)
+        if source_ref in seen_refs:
+            results[index] = DomainEventResult(event_id=item.event_id, status=STATUS_DUPLICATE)
+            continue
+        seen_refs.add(source_ref)
+        if fanout is not None:
+            rows = [(f"{source_ref}:{key}", fields) for key, fields in fanout(tenant_id, item.payload or {})]
+        else:
+            rows = [(source_ref, mapper(tenant_id, item.payload or {}))]
+        if not rows:
+            results[index] = DomainEventResult(event_id=item.event_id, status=STATUS_IGNORED)
+            continue
+        for row_ref, fields in rows:
+            pending.append(
+                (
+                    index,
+                    ActivityEvent(
+                        tenant_id=tenant_id,
+                        occurred_at=item.occurred_at or timezone.now(),
+                        source_ref=row_ref,
+                        **fields,
+                    ),
+                )
+            )
+
+    existing = _existing_refs([obj for _, obj in pending])
+    to_insert = [(index, obj) for index, obj in pending if (obj.tenant_id, obj.source_ref) not in existing]
+
+    created_by_tenant: dict[UUID, list[int]] = {}
+    created_by_index: dict[int, int] = {}
+    with transaction.atomic():
+        for start in range(0, len(to_insert), INGEST_INSERT_CHUNK):
+            _insert_chunk([obj for _, obj in to_insert[start : start + INGEST_INSERT_CHUNK]])
+
+        for index, obj in to_insert:
+            if obj.pk is None:
+                continue
+            created_by_index.setdefault(index, obj.pk)
+            created_by_tenant.setdefault(obj.tenant_id, []).append(obj.pk)
+
+        for index in dict.fromkeys(index for index, _ in pending):
+            if index in created_by_index:
+                results[index] = DomainEventResult(
+                    event_id=events[index].event_id,
+                    status=STATUS_CREATED,
+                    activity_event_id=created_by_index[index],
+                )
+            else:
+                results[index] = DomainEventResult(event_id=events[index].event_id, status=STATUS_DUPLICATE)
+
+        # One FEED_UPDATED per tenant per batch instead of one per row.
+        for tenant_id, event_ids in created_by_tenant.items():
+            publish_outbox_event(
+                tenant_id=tenant_id,
+                event_type=OutboxEventType.FEED_UPDATED,
+                aggregate_type="domain_event_batch",
+                aggregate_id=f"{source}:{event_ids[0]}",
+                payload={
+                    "source": source,
+                    "event_ids": event_ids,
+                    "count": len(event_ids),
+                },
+            )
+
+    logger.info(
+        "Domain events ingested",
+        extra={
+            "source": source,
+            "received": len(events),
+            "created_count": sum(len(ids) for ids in created_by_tenant.values()),
+        },
+    )
+    return [result for result in results if result is not None]
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import json
+import re
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from typing import Any
 from uuid import UUID
 
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from activity.models import (
     AccountLink,
     ActivityEvent,
+    DsarErasure,
     FeedLastSeen,
     NewsComment,
     NewsPost,
@@ -29,14 +38,40 @@ def _iso(value) -> str | None:
     return value.isoformat() if value else None
 
 
-def _scrub_json(value: Any, *, tokens: set[str]) -> Any:
-    if isinstance(value, dict):
-        return {key: _scrub_json(item, tokens=tokens) for key, item in value.items()}
-    if isinstance(value, list):
-        return [_scrub_json(item, tokens=tokens) for item in value]
-    if isinstance(value, str):
-        return REDACTED_VALUE if value.strip() in tokens else value
-    return value
+class TokenMatcher:
+    """Redacts JSON strings that equal (after ``strip``) one of the tokens.
+
+    One compiled pattern over the serialized payload decides whether a
+    payload mentions any token at all; only those payloads are walked, so
+    the many rows that do not mention the user cost a single scan.
+    """
+
+    def __init__(self, tokens: Iterable[str]) -> None:
+        self.tokens = frozenset(token for token in tokens if token)
+        # Match the escaped form a token takes inside serialized JSON.
+        escaped = sorted(
+            {json.dumps(token, ensure_ascii=False)[1:-1] for token in self.tokens},
+            key=len,
+            reverse=True,
+        )
+        self._pattern = re.compile("|".join(re.escape(item) for item in escaped)) if escaped else None
+
+    def mentions(self, value: Any) -> bool:
+        if self._pattern is None or not value:
+            return False
+        return self._pattern.search(json.dumps(value, ensure_ascii=False, default=str)) is not None
+
+    def _redact(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: self._redact(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._redact(item) for item in value]
+        if isinstance(value, str):
+            return REDACTED_VALUE if value.strip() in self.tokens else value
+        return value
+
+    def scrub(self, value: Any) -> Any:
+        return self._redact(value) if self.mentions(value) else value
 
 
 def _serialize_account_link(item: AccountLink) -> dict[str, Any]:
@@ -245,149 +280,323 @@ def export_user_data(*, tenant_id: UUID, user_id: UUID) -> dict[str, Any]:
     }
 
 
-def erase_user_data(*, tenant_id: UUID, user_id: UUID) -> dict[str, Any]:
-    account_links = list(
-        AccountLink.objects.filter(tenant_id=tenant_id, user_id=user_id).order_by("created_at", "id")
-    )
-    account_link_ids = [item.id for item in account_links]
-    external_refs = {
-        item.external_identity_ref.strip()
-        for item in account_links
-        if isinstance(item.external_identity_ref, str) and item.external_identity_ref.strip()
-    }
-    tokens = {str(user_id), *external_refs}
+# =========================
+# Erasure
+# =========================
+# Each step works through one table in primary-key chunks. A chunk and the
+# ``DsarErasure`` checkpoint commit in the same transaction, so an
+# interrupted erase resumes at the next chunk. Account links go last: their
+# external identity refs are the scrub tokens of the earlier steps.
 
-    raw_events = list(
-        RawEvent.objects.filter(tenant_id=tenant_id, account_link_id__in=account_link_ids).order_by("id")
-    ) if account_link_ids else []
-    raw_event_ids = [item.id for item in raw_events]
-    activity_events = list(
-        _affected_events_queryset(
-            tenant_id=tenant_id,
-            user_id=user_id,
-            raw_event_ids=raw_event_ids,
-        ).order_by("id")
-    )
 
-    now = timezone.now()
+@dataclass(frozen=True)
+class _EraseScope:
+    tenant_id: UUID
+    user_id: UUID
+    account_link_ids: list[int]
+    matcher: TokenMatcher
 
-    news_posts_redacted = NewsPost.objects.filter(
+
+def _erase_scope(*, tenant_id: UUID, user_id: UUID) -> _EraseScope:
+    links = list(
+        AccountLink.objects.filter(tenant_id=tenant_id, user_id=user_id).values_list(
+            "id",
+            "external_identity_ref",
+        )
+    )
+    external_refs = {ref.strip() for _, ref in links if isinstance(ref, str) and ref.strip()}
+    return _EraseScope(
         tenant_id=tenant_id,
-        author_user_id=user_id,
-    ).update(
+        user_id=user_id,
+        account_link_ids=[link_id for link_id, _ in links],
+        matcher=TokenMatcher({str(user_id), *external_refs}),
+    )
+
+
+def _chunk_of(queryset: QuerySet, after: Any, limit: int) -> QuerySet:
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    return queryset.order_by("pk")[:limit]
+
+
+def _delete_chunk(queryset: QuerySet, after: Any, limit: int, key: str) -> tuple[list[Any], dict[str, int]]:
+    pks = list(_chunk_of(queryset, after, limit).values_list("pk", flat=True))
+    if not pks:
+        return pks, {}
+    deleted, _ = queryset.model.objects.filter(pk__in=pks).delete()
+    return pks, {key: deleted}
+
+
+def _erase_news_posts(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = NewsPost.objects.filter(tenant_id=scope.tenant_id, author_user_id=scope.user_id)
+    pks = list(_chunk_of(queryset, after, limit).values_list("pk", flat=True))
+    redacted = NewsPost.objects.filter(pk__in=pks).update(
         author_user_id=ANONYMIZED_USER_ID,
         title=REDACTED_TITLE,
         body=REDACTED_TEXT,
         tags_json=[],
         media_json=[],
-        updated_at=now,
+        updated_at=timezone.now(),
     )
-    news_comments_redacted = NewsComment.objects.filter(
-        tenant_id=tenant_id,
-        user_id=user_id,
-    ).update(
+    return pks, {"news_posts_redacted": redacted}
+
+
+def _erase_news_comments(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = NewsComment.objects.filter(tenant_id=scope.tenant_id, user_id=scope.user_id)
+    pks = list(_chunk_of(queryset, after, limit).values_list("pk", flat=True))
+    redacted = NewsComment.objects.filter(pk__in=pks).update(
         user_id=ANONYMIZED_USER_ID,
         body=REDACTED_TEXT,
     )
+    return pks, {"news_comments_redacted": redacted}
+
+
+def _erase_news_reactions(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = NewsReaction.objects.filter(tenant_id=scope.tenant_id, user_id=scope.user_id)
+    rows = list(_chunk_of(queryset, after, limit).values_list("pk", "post_id"))
+    if not rows:
+        return [], {}
+    pks = [pk for pk, _ in rows]
+    deleted, _ = NewsReaction.objects.filter(pk__in=pks).delete()
+    remaining = (
+        NewsReaction.objects.filter(post_id=OuterRef("pk"))
+        .order_by()
+        .values("post_id")
+        .annotate(total=Count("pk"))
+        .values("total")[:1]
+    )
+    NewsPost.objects.filter(id__in={post_id for _, post_id in rows}).update(
+        reactions_count=Coalesce(Subquery(remaining), Value(0)),
+    )
+    return pks, {"news_reactions_deleted": deleted}
+
+
+def _redacted_event(row: dict[str, Any], scope: _EraseScope) -> tuple[str, Any]:
+    payload_json = row["payload_json"] or {}
+    if row["type"] == "news.posted" and row["actor_user_id"] == scope.user_id:
+        if isinstance(payload_json, dict) and payload_json.get("news_id"):
+            return REDACTED_EVENT_TITLE, {"news_id": payload_json.get("news_id"), "redacted": True}
+        return REDACTED_EVENT_TITLE, {"redacted": True}
+    return row["title"], scope.matcher.scrub(payload_json)
+
+
+def _erase_activity_events(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    query = Q(actor_user_id=scope.user_id) | Q(target_user_id=scope.user_id)
+    if scope.account_link_ids:
+        query |= Q(raw_event__account_link_id__in=scope.account_link_ids)
+    queryset = ActivityEvent.objects.filter(tenant_id=scope.tenant_id).filter(query)
+    rows = list(
+        _chunk_of(queryset, after, limit).values(
+            "pk",
+            "type",
+            "title",
+            "payload_json",
+            "actor_user_id",
+            "target_user_id",
+            "raw_event__account_link_id",
+        )
+    )
+    if not rows:
+        return [], {}
+    pks = [row["pk"] for row in rows]
+    link_ids = set(scope.account_link_ids)
+
+    rewritten: list[ActivityEvent] = []
+    redacted = 0
+    for row in rows:
+        title, payload_json = _redacted_event(row, scope)
+        content_changed = title != row["title"] or payload_json != (row["payload_json"] or {})
+        if content_changed:
+            rewritten.append(ActivityEvent(pk=row["pk"], title=title, payload_json=payload_json))
+        if (
+            content_changed
+            or scope.user_id in (row["actor_user_id"], row["target_user_id"])
+            or row["raw_event__account_link_id"] in link_ids
+        ):
+            redacted += 1
+
+    if rewritten:
+        ActivityEvent.objects.bulk_update(rewritten, ["title", "payload_json"])
+    chunk = ActivityEvent.objects.filter(pk__in=pks)
+    chunk.filter(actor_user_id=scope.user_id).update(actor_user_id=None)
+    chunk.filter(target_user_id=scope.user_id).update(target_user_id=None)
+    if link_ids:
+        chunk.filter(raw_event__account_link_id__in=link_ids).update(raw_event=None)
+    return pks, {"activity_events_redacted": redacted}
+
+
+def _erase_account_link_outbox(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    if not scope.account_link_ids:
+        return [], {}
+    queryset = Outbox.objects.filter(
+        tenant_id=scope.tenant_id,
+        aggregate_type="account_link",
+        aggregate_id__in=[str(item) for item in scope.account_link_ids],
+    )
+    return _delete_chunk(queryset, after, limit, "account_link_outbox_deleted")
+
+
+def _scrub_outbox(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = Outbox.objects.filter(tenant_id=scope.tenant_id)
+    rows = list(_chunk_of(queryset, after, limit).values_list("pk", "payload_json"))
+    rewritten: list[Outbox] = []
+    for pk, payload_json in rows:
+        payload_json = payload_json or {}
+        scrubbed = scope.matcher.scrub(payload_json)
+        if scrubbed != payload_json:
+            rewritten.append(Outbox(pk=pk, payload_json=scrubbed))
+    if rewritten:
+        Outbox.objects.bulk_update(rewritten, ["payload_json"])
+    return [pk for pk, _ in rows], {"outbox_scrubbed": len(rewritten)}
+
+
+def _erase_raw_events(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    if not scope.account_link_ids:
+        return [], {}
+    queryset = RawEvent.objects.filter(tenant_id=scope.tenant_id, account_link_id__in=scope.account_link_ids)
+    return _delete_chunk(queryset, after, limit, "raw_events_deleted")
+
+
+def _erase_account_links(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = AccountLink.objects.filter(tenant_id=scope.tenant_id, id__in=scope.account_link_ids)
+    if not scope.account_link_ids:
+        return [], {}
+    return _delete_chunk(queryset, after, limit, "account_links_deleted")
+
+
+def _erase_subscriptions(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = Subscription.objects.filter(tenant_id=scope.tenant_id, user_id=scope.user_id)
+    return _delete_chunk(queryset, after, limit, "subscriptions_deleted")
+
+
+def _erase_feed_last_seen(scope: _EraseScope, after: Any, limit: int) -> tuple[list[Any], dict[str, int]]:
+    queryset = FeedLastSeen.objects.filter(tenant_id=scope.tenant_id, user_id=scope.user_id)
+    return _delete_chunk(queryset, after, limit, "feed_last_seen_deleted")
+
+
+EraseStep = Callable[[_EraseScope, Any, int], tuple[list[Any], dict[str, int]]]
+
+ERASE_STEPS: tuple[tuple[str, type, EraseStep], ...] = (
+    ("news_posts", NewsPost, _erase_news_posts),
+    ("news_comments", NewsComment, _erase_news_comments),
+    ("news_reactions", NewsReaction, _erase_news_reactions),
+    ("activity_events", ActivityEvent, _erase_activity_events),
+    ("account_link_outbox", Outbox, _erase_account_link_outbox),
+    ("outbox", Outbox, _scrub_outbox),
+    ("raw_events", RawEvent, _erase_raw_events),
+    ("account_links", AccountLink, _erase_account_links),
+    ("subscriptions", Subscription, _erase_subscriptions),
+    ("feed_last_seen", FeedLastSeen, _erase_feed_last_seen),
+)
+ERASE_COUNT_KEYS = (
+    "news_posts_redacted",
+    "news_comments_redacted",
+    "news_reactions_deleted",
+    "activity_events_redacted",
+    "account_link_outbox_deleted",
+    "outbox_scrubbed",
+    "raw_events_deleted",
+    "account_links_deleted",
+    "subscriptions_deleted",
+    "feed_last_seen_deleted",
+)
+_STEP_INDEX = {name: index for index, (name, _, _) in enumerate(ERASE_STEPS)}
+
+
+def _is_ydb_mode() -> bool:
+    return getattr(settings, "DB_DRIVER", "postgres") == "ydb"
+
 
-    reaction_post_ids = list(
-        NewsReaction.objects.filter(tenant_id=tenant_id, user_id=user_id).values_list("post_id", flat=True)
+def start_erasure(*, tenant_id: UUID, user_id: UUID) -> DsarErasure:
+    """The user's unfinished erase, or a new one."""
+    erasure = (
+        DsarErasure.objects.filter(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            status=DsarErasure.Status.RUNNING,
+        )
+        .order_by("id")
+        .first()
     )
-    news_reactions_deleted, _ = NewsReaction.objects.filter(
-        tenant_id=tenant_id,
-        user_id=user_id,
-    ).delete()
-    for post_id in sorted({item for item in reaction_post_ids}):
-        remaining = NewsReaction.objects.filter(post_id=post_id).count()
-        NewsPost.objects.filter(id=post_id).update(reactions_count=remaining)
-
-    activity_events_redacted = 0
-    for item in activity_events:
-        updates: list[str] = []
-        payload_json = item.payload_json or {}
-        new_payload = _scrub_json(payload_json, tokens=tokens)
-        new_title = item.title
-
-        if item.type == "news.posted" and item.actor_user_id == user_id:
-            new_title = REDACTED_EVENT_TITLE
-            if isinstance(payload_json, dict) and payload_json.get("news_id"):
-                new_payload = {
-                    "news_id": payload_json.get("news_id"),
-                    "redacted": True,
-                }
-            else:
-                new_payload = {"redacted": True}
-
-        if item.actor_user_id == user_id:
-            item.actor_user_id = None
-            updates.append("actor_user_id")
-        if item.target_user_id == user_id:
-            item.target_user_id = None
-            updates.append("target_user_id")
-        if item.raw_event_id in raw_event_ids:
-            item.raw_event = None
-            updates.append("raw_event")
-        if new_payload != payload_json:
-            item.payload_json = new_payload
-            updates.append("payload_json")
-        if new_title != item.title:
-            item.title = new_title
-            updates.append("title")
-
-        if updates:
-            item.save(update_fields=updates)
-            activity_events_redacted += 1
-
-    account_link_outbox_deleted = 0
-    if account_link_ids:
-        account_link_outbox_deleted, _ = Outbox.objects.filter(
+    if erasure is None:
+        erasure = DsarErasure.objects.create(
             tenant_id=tenant_id,
-            aggregate_type="account_link",
-            aggregate_id__in=[str(item) for item in account_link_ids],
-        ).delete()
-
-    outbox_scrubbed = 0
-    for item in Outbox.objects.filter(tenant_id=tenant_id).order_by("id"):
-        payload_json = item.payload_json or {}
-        new_payload = _scrub_json(payload_json, tokens=tokens)
-        if new_payload != payload_json:
-            item.payload_json = new_payload
-            item.save(update_fields=["payload_json"])
-            outbox_scrubbed += 1
-
-    raw_events_deleted, _ = RawEvent.objects.filter(
-        tenant_id=tenant_id,
-        account_link_id__in=account_link_ids,
-    ).delete() if account_link_ids else (0, {})
-    account_links_deleted, _ = AccountLink.objects.filter(
-        tenant_id=tenant_id,
-        id__in=account_link_ids,
-    ).delete() if account_link_ids else (0, {})
-    subscriptions_deleted, _ = Subscription.objects.filter(
-        tenant_id=tenant_id,
-        user_id=user_id,
-    ).delete()
-    feed_last_seen_deleted, _ = FeedLastSeen.objects.filter(
-        tenant_id=tenant_id,
-        user_id=user_id,
-    ).delete()
+            user_id=user_id,
+            step=ERASE_STEPS[0][0],
+            counts=dict.fromkeys(ERASE_COUNT_KEYS, 0),
+        )
+    return erasure
+
+
+def _erase_chunk(erasure: DsarErasure, scope: _EraseScope, limit: int) -> None:
+    index = _STEP_INDEX[erasure.step]
+    _, model, handler = ERASE_STEPS[index]
+    after = model._meta.pk.to_python(erasure.cursor) if erasure.cursor else None
+    pks, counts = handler(scope, after, limit)
+    for key, value in counts.items():
+        erasure.counts[key] = int(erasure.counts.get(key, 0)) + value
+    if len(pks) == limit:
+        erasure.cursor = str(pks[-1])
+        return
+    erasure.cursor = ""
+    if index + 1 < len(ERASE_STEPS):
+        erasure.step = ERASE_STEPS[index + 1][0]
+    else:
+        erasure.step = ""
+        erasure.status = DsarErasure.Status.COMPLETED
+        erasure.completed_at = timezone.now()
+
+
+def run_erasure(
+    erasure: DsarErasure,
+    *,
+    max_seconds: float | None = None,
+    chunk_size: int | None = None,
+) -> DsarErasure:
+    """Advance ``erasure`` chunk by chunk until it completes or ``max_seconds`` pass."""
+    limit = max(1, int(chunk_size or getattr(settings, "ACTIVITY_DSAR_ERASE_CHUNK_SIZE", 500)))
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    scope = _erase_scope(tenant_id=erasure.tenant_id, user_id=erasure.user_id)
+    while True:
+        with transaction.atomic():
+            locked = DsarErasure.objects.filter(pk=erasure.pk)
+            if not _is_ydb_mode():
+                locked = locked.select_for_update()
+            erasure = locked.get()
+            if erasure.status == DsarErasure.Status.COMPLETED:
+                return erasure
+            _erase_chunk(erasure, scope, limit)
+            erasure.save()
+        if erasure.status == DsarErasure.Status.COMPLETED:
+            return erasure
+        if deadline is not None and time.monotonic() >= deadline:
+            return erasure
+
+
+def erasure_payload(erasure: DsarErasure) -> dict[str, Any]:
+    return {
+        "service": "activity",
+        "erasure_id": erasure.id,
+        "tenant_id": str(erasure.tenant_id),
+        "user_id": str(erasure.user_id),
+        "status": erasure.status,
+        "step": erasure.step or None,
+        "counts": {key: int(erasure.counts.get(key, 0)) for key in ERASE_COUNT_KEYS},
+        "started_at": _iso(erasure.started_at),
+        "updated_at": _iso(erasure.updated_at),
+        "completed_at": _iso(erasure.completed_at),
+    }
 
+
+def erase_user_data(*, tenant_id: UUID, user_id: UUID) -> dict[str, Any]:
+    """Run (or finish) the user's erase to completion."""
+    erasure = run_erasure(start_erasure(tenant_id=tenant_id, user_id=user_id))
     return {
         "service": "activity",
         "tenant_id": str(tenant_id),
         "user_id": str(user_id),
         "mode": "hybrid",
-        "erased_at": timezone.now().isoformat(),
-        "counts": {
-            "news_posts_redacted": news_posts_redacted,
-            "news_comments_redacted": news_comments_redacted,
-            "news_reactions_deleted": news_reactions_deleted,
-            "activity_events_redacted": activity_events_redacted,
-            "account_link_outbox_deleted": account_link_outbox_deleted,
-            "outbox_scrubbed": outbox_scrubbed,
-            "raw_events_deleted": raw_events_deleted,
-            "account_links_deleted": account_links_deleted,
-            "subscriptions_deleted": subscriptions_deleted,
-            "feed_last_seen_deleted": feed_last_seen_deleted,
-        },
+        "erasure_id": erasure.id,
+        "erased_at": _iso(erasure.completed_at),
+        "counts": erasure_payload(erasure)["counts"],
     }
@@ -3,6 +3,10 @@ Django management command to process outbox events.
 
 Processes pending events from the Outbox table and publishes them
 to downstream services. Can run as a daemon or process a batch.
+
+In daemon mode the processor blocks on outbox wake-ups (a YMQ long-poll on
+YMQ_OUTBOX_WAKEUP_QUEUE, or the OUTBOX_WAKEUP_SOCKET stand-in for local runs) and only falls back to a
+safety-net poll every --wakeup-timeout seconds.
 """
 
 from __future__ import annotations
@@ -19,6 +23,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 from activity.models import Outbox, OutboxEventType
+from core.ymq import OutboxWakeupListener
 
 logger = logging.getLogger(__name__)
 
@@ -46,7 +51,16 @@ class Command(BaseCommand):
             "--poll-interval",
             type=float,
             default=5.0,
-            help="Seconds between polling when in daemon mode (default: 5)",
+            help="Seconds between polling in daemon mode without a wake-up channel (default: 5)",
+        )
+        parser.add_argument(
+            "--wakeup-timeout",
+            type=float,
+            default=60.0,
+            help=(
+                "Safety-net poll in seconds while waiting for outbox wake-ups (default: 60); "
+                "lower it, e.g. to 5, only if wake-ups are unreliable"
+            ),
         )
         parser.add_argument(
             "--max-retries",
@@ -73,10 +87,13 @@ class Command(BaseCommand):
         max_retries = options["max_retries"]
         dry_run = options["dry_run"]
         lease_seconds = options["lease_seconds"]
+        wakeup_timeout = options["wakeup_timeout"]
 
+        listener = None
         if daemon:
             signal.signal(signal.SIGTERM, self._handle_signal)
             signal.signal(signal.SIGINT, self._handle_signal)
+            listener = OutboxWakeupListener()
 
         self.stdout.write(
             self.style.SUCCESS(
@@ -101,8 +118,14 @@ class Command(BaseCommand):
                 break
 
             if processed == 0:
-                # No events to process, wait before polling again
-                time.sleep(poll_interval)
+                # No events to process, wait for a wake-up or the next poll
+                if listener is not None and listener.enabled:
+                    listener.wait(wakeup_timeout)
+                else:
+                    time.sleep(poll_interval)
+
+        if listener is not None:
+            listener.close()
 
         self.stdout.write(
             self.style.SUCCESS(f"Outbox processor stopped. Total processed: {total_processed}")
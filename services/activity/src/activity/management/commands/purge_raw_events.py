@@ -4,9 +4,9 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from django.utils import timezone
 
 from activity.models import RawEvent
+from core.retention import PurgeTarget, RetentionPurge, add_purge_arguments
 
 
 class Command(BaseCommand):
@@ -19,11 +19,7 @@ class Command(BaseCommand):
             default=None,
             help="Override ACTIVITY_RAW_EVENT_RETENTION_DAYS for this run.",
         )
-        parser.add_argument(
-            "--dry-run",
-            action="store_true",
-            help="Report how many rows would be deleted without changing data.",
-        )
+        add_purge_arguments(parser)
 
     def handle(self, *args, **options):
         days = options.get("days")
@@ -32,9 +28,16 @@ class Command(BaseCommand):
         if days < 0:
             raise CommandError("Retention days must be zero or greater")
 
-        cutoff = timezone.now() - timedelta(days=days)
-        queryset = RawEvent.objects.filter(fetched_at__lt=cutoff)
-        count = queryset.count()
+        purge = RetentionPurge.from_options(options)
+        cutoff = purge.started_at - timedelta(days=days)
+        count = purge.run(
+            PurgeTarget(
+                "raw_events",
+                RawEvent.objects.filter(fetched_at__lt=cutoff),
+                order_field="fetched_at",
+            )
+        )
+        report = purge.finish()
 
         if options.get("dry_run"):
             self.stdout.write(
@@ -44,9 +47,17 @@ class Command(BaseCommand):
             )
             return
 
-        deleted, _ = queryset.delete()
+        if not report["completed"]:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Deleted {count} raw events fetched before {cutoff.isoformat()}; "
+                    "stopped at the runtime limit, rerun with the same --checkpoint to continue",
+                )
+            )
+            return
+
         self.stdout.write(
             self.style.SUCCESS(
-                f"Deleted {deleted} raw events fetched before {cutoff.isoformat()}",
+                f"Deleted {count} raw events fetched before {cutoff.isoformat()}",
             )
-        )
\ No newline at end of file
+        )
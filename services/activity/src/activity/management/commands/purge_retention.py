@@ -5,10 +5,10 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
 from activity.audit import ActivityAuditEvent
 from activity.models import Outbox, RawEvent
+from core.retention import PurgeTarget, RetentionPurge, add_purge_arguments
 
 
 class Command(BaseCommand):
@@ -33,19 +33,36 @@ class Command(BaseCommand):
             default=int(getattr(settings, "ACTIVITY_RETENTION_AUDIT_DAYS", 365)),
             help="Retention window for activity audit events in days",
         )
+        add_purge_arguments(parser)
 
     def handle(self, *args, **options):
-        now = timezone.now()
+        purge = RetentionPurge.from_options(options)
+        now = purge.started_at
         raw_cutoff = now - timedelta(days=int(options["raw_events_days"]))
         outbox_cutoff = now - timedelta(days=int(options["processed_outbox_days"]))
         audit_cutoff = now - timedelta(days=int(options["audit_days"]))
 
-        raw_events_deleted, _ = RawEvent.objects.filter(fetched_at__lt=raw_cutoff).delete()
-        outbox_deleted, _ = Outbox.objects.filter(
-            processed_at__isnull=False,
-            processed_at__lt=outbox_cutoff,
-        ).delete()
-        audit_deleted, _ = ActivityAuditEvent.objects.filter(created_at__lt=audit_cutoff).delete()
+        raw_events_deleted = purge.run(
+            PurgeTarget(
+                "raw_events",
+                RawEvent.objects.filter(fetched_at__lt=raw_cutoff),
+                order_field="fetched_at",
+            )
+        )
+        outbox_deleted = purge.run(
+            PurgeTarget(
+                "processed_outbox",
+                Outbox.objects.filter(processed_at__isnull=False, processed_at__lt=outbox_cutoff),
+                order_field="processed_at",
+            )
+        )
+        audit_deleted = purge.run(
+            PurgeTarget(
+                "activity_audit",
+                ActivityAuditEvent.objects.filter(created_at__lt=audit_cutoff),
+                order_field="created_at",
+            )
+        )
 
         payload = {
             "service": "activity",
@@ -60,5 +77,6 @@ class Command(BaseCommand):
                 "processed_outbox_deleted": outbox_deleted,
                 "activity_audit_deleted": audit_deleted,
             },
+            "purge": purge.finish(),
         }
         self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:21
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("activity", "0011_merge_0009_outbox_claim_fields_0010_newspost_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DsarErasure",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("user_id", models.UUIDField()),
+                ("status", models.CharField(choices=[("running", "Running"), ("completed", "Completed")], default="running", max_length=16)),
+                ("step", models.CharField(blank=True, max_length=32)),
+                ("cursor", models.CharField(blank=True, max_length=64)),
+                ("counts", models.JSONField(default=dict)),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "act_dsar_erasure",
+                "indexes": [models.Index(fields=["tenant_id", "user_id", "status"], name="act_dsar_erasure_subject_idx")],
+            },
+        ),
+    ]
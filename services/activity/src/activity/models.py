@@ -437,6 +437,43 @@ class FeedLastSeen(models.Model):
         ]
 
 
+class DsarErasure(models.Model):
+    """
+    Progress of a chunked DSAR erase for one tenant user.
+
+    ``step``/``cursor`` name the table and the last primary key processed;
+    each chunk commits together with this row, so an interrupted erase
+    resumes where it stopped (see ``activity.dsar``).
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "Running"
+        COMPLETED = "completed", "Completed"
+
+    id = models.BigAutoField(primary_key=True)
+    tenant_id = models.UUIDField()
+    user_id = models.UUIDField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.RUNNING)
+    step = models.CharField(max_length=32, blank=True)
+    cursor = models.CharField(max_length=64, blank=True)
+    counts = models.JSONField(default=dict)
+    started_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "act_dsar_erasure"
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "user_id", "status"],
+                name="act_dsar_erasure_subject_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"DsarErasure({self.id}, {self.status}, {self.step})"
+
+
 def source_ref_for_raw(*, source: Source, raw_event_id: int) -> str:
     return f"{source.type}:{source.id}:raw:{raw_event_id}"
 
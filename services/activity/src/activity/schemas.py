@@ -308,6 +308,38 @@ class WebhookIngestOut(Schema):
     activity_created: int
 
 
+class DomainEventItemIn(Schema):
+    """Outbox message relayed by voting, events or gamification."""
+
+    event_id: str
+    event_type: str
+    tenant_id: str
+    occurred_at: datetime | None = None
+    payload: dict[str, Any] = Field(default_factory=dict)
+
+
+class DomainEventIngestIn(Schema):
+    events: list[DomainEventItemIn] = Field(default_factory=list)
+
+
+class DomainEventResultOut(Schema):
+    event_id: str
+    status: Literal["created", "duplicate", "ignored", "invalid"]
+    activity_event_id: int | None = None
+    error: str | None = None
+
+
+class DomainEventIngestOut(Schema):
+    """Per-item result of a domain event batch."""
+
+    ok: bool
+    created: int
+    duplicates: int
+    ignored: int
+    invalid: int
+    items: list[DomainEventResultOut]
+
+
 # ============================================================================
 # Unread Count & Real-time
 # ============================================================================
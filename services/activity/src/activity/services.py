@@ -46,6 +46,7 @@ MVP_EVENT_TYPES = {
     "event.rsvp.changed",
     "post.created",
     "news.posted",
+    "achievement.granted",
 }
 
 VISIBLE_FEED_VISIBILITIES = (
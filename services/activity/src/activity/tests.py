@@ -5,6 +5,8 @@ import hmac
 import json
 import logging
 import os
+import shutil
+import tempfile
 import time
 import uuid
 from datetime import datetime, timedelta, timezone
@@ -42,6 +44,9 @@ from activity.services import (
     publish_outbox_event,
     update_last_seen,
 )
+from core.models import RetentionCheckpoint
+from core.retention import RetentionPurge
+from core.ymq import OutboxWakeupListener
 
 TEST_HMAC_SECRET = "test-hmac-secret"
 
@@ -308,6 +313,181 @@ class ActivityDedupeWebhookTests(TestCase):
         )
 
 
+@override_settings(BFF_INTERNAL_HMAC_SECRET=TEST_HMAC_SECRET)
+class DomainEventIngestTests(TestCase):
+    path = "/api/v1/events/ingest"
+
+    def setUp(self):
+        self.client = Client()
+        self.tenant_id = uuid.uuid4()
+        self.user_id = uuid.uuid4()
+
+    def _post(self, events, *, source="voting", request_id="rid-ingest"):
+        body = json.dumps({"events": events}).encode("utf-8")
+        headers = _headers(
+            tenant_id=self.tenant_id,
+            tenant_slug="t",
+            request_id=request_id,
+            method="POST",
+            path=self.path,
+            body=body,
+        )
+        headers["HTTP_X_SOURCE_SERVICE"] = source
+        return self.client.post(
+            self.path,
+            data=body,
+            content_type="application/json",
+            **headers,
+        )
+
+    def _vote_event(self, event_id=None):
+        return {
+            "event_id": event_id or str(uuid.uuid4()),
+            "event_type": "voting.vote.cast",
+            "tenant_id": str(self.tenant_id),
+            "occurred_at": "2026-01-12T00:00:00+00:00",
+            "payload": {
+                "poll_id": "p1",
+                "nomination_id": "n1",
+                "option_id": "o1",
+                "user_id": str(self.user_id),
+            },
+        }
+
+    def test_batch_creates_events_and_reports_per_item_status(self):
+        events = [
+            self._vote_event(),
+            self._vote_event(),
+            {**self._vote_event(), "event_type": "voting.vote.revoked"},
+            {**self._vote_event(), "tenant_id": "not-a-uuid"},
+        ]
+
+        resp = self._post(events)
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(
+            [item["status"] for item in data["items"]],
+            ["created", "created", "ignored", "invalid"],
+        )
+        self.assertEqual(data["created"], 2)
+        created = ActivityEvent.objects.filter(tenant_id=self.tenant_id, type="vote.cast")
+        self.assertEqual(created.count(), 2)
+        event = created.get(id=data["items"][0]["activity_event_id"])
+        self.assertEqual(event.actor_user_id, self.user_id)
+        self.assertEqual(event.visibility, "private")
+        self.assertNotIn("option_id", event.payload_json)
+        self.assertEqual(
+            Outbox.objects.filter(
+                tenant_id=self.tenant_id,
+                event_type=OutboxEventType.FEED_UPDATED,
+            ).count(),
+            1,
+        )
+
+    def test_redelivery_is_deduplicated_by_source_ref(self):
+        event = self._vote_event()
+
+        first = self._post([event], request_id="rid-1")
+        second = self._post([event, event], request_id="rid-2")
+
+        self.assertEqual(first.json()["items"][0]["status"], "created")
+        self.assertEqual(
+            [item["status"] for item in second.json()["items"]],
+            ["duplicate", "duplicate"],
+        )
+        self.assertEqual(ActivityEvent.objects.filter(tenant_id=self.tenant_id).count(), 1)
+
+    def test_lost_insert_race_is_reported_as_duplicate(self):
+        raced, fresh = self._vote_event(), self._vote_event()
+        ActivityEvent.objects.create(
+            tenant_id=self.tenant_id,
+            type="vote.cast",
+            occurred_at=datetime.now(tz=timezone.utc),
+            title="Vote cast",
+            visibility="private",
+            scope_type="TENANT",
+            scope_id=str(self.tenant_id),
+            source_ref=f"voting:outbox:{raced['event_id']}",
+        )
+
+        # The other relay commits between our lookup and our insert.
+        with patch("activity.domain_events._existing_refs", return_value=set()):
+            resp = self._post([raced, fresh])
+
+        self.assertEqual(
+            [item["status"] for item in resp.json()["items"]],
+            ["duplicate", "created"],
+        )
+        self.assertEqual(resp.json()["created"], 1)
+        feed_updated = Outbox.objects.get(tenant_id=self.tenant_id, event_type=OutboxEventType.FEED_UPDATED)
+        self.assertEqual(feed_updated.payload_json["event_ids"], [resp.json()["items"][1]["activity_event_id"]])
+
+    def test_event_created_without_visibility_stays_private(self):
+        event = {
+            "event_id": str(uuid.uuid4()),
+            "event_type": "event.created",
+            "tenant_id": str(self.tenant_id),
+            "payload": {"event_id": "e1", "scope_type": "TENANT", "scope_id": str(self.tenant_id)},
+        }
+        public = {
+            **event,
+            "event_id": str(uuid.uuid4()),
+            "payload": {**event["payload"], "visibility": "public"},
+        }
+
+        resp = self._post([event, public], source="events")
+
+        ids = [item["activity_event_id"] for item in resp.json()["items"]]
+        self.assertEqual(ActivityEvent.objects.get(id=ids[0]).visibility, "private")
+        self.assertEqual(ActivityEvent.objects.get(id=ids[1]).visibility, "public")
+
+    def test_bulk_grant_fans_out_to_one_item_per_recipient(self):
+        recipients = [uuid.uuid4(), uuid.uuid4()]
+        event = {
+            "event_id": str(uuid.uuid4()),
+            "event_type": "gamification.grant.bulk_created",
+            "tenant_id": str(self.tenant_id),
+            "payload": {
+                "achievement_id": "a1",
+                "issuer_id": str(self.user_id),
+                "visibility": "public",
+                "grants": [
+                    {"grant_id": str(uuid.uuid4()), "recipient_id": str(recipient)} for recipient in recipients
+                ],
+            },
+        }
+
+        first = self._post([event], source="gamification")
+        again = self._post([event], source="gamification")
+
+        self.assertEqual(first.json()["items"][0]["status"], "created")
+        self.assertEqual(again.json()["items"][0]["status"], "duplicate")
+        granted = ActivityEvent.objects.filter(tenant_id=self.tenant_id, type="achievement.granted")
+        self.assertEqual(sorted(granted.values_list("target_user_id", flat=True)), sorted(recipients))
+        self.assertEqual({row.actor_user_id for row in granted}, {self.user_id})
+        self.assertEqual({row.payload_json["achievement_id"] for row in granted}, {"a1"})
+
+    def test_rejects_unknown_source_service(self):
+        resp = self._post([self._vote_event()], source="bff")
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()["error"]["code"], "INVALID_SOURCE_SERVICE")
+        self.assertFalse(ActivityEvent.objects.exists())
+
+    def test_requires_internal_signature(self):
+        body = json.dumps({"events": [self._vote_event()]}).encode("utf-8")
+        resp = self.client.post(
+            self.path,
+            data=body,
+            content_type="application/json",
+            HTTP_X_REQUEST_ID="rid-unsigned",
+            HTTP_X_SOURCE_SERVICE="voting",
+        )
+
+        self.assertEqual(resp.status_code, 401)
+
+
 @override_settings(BFF_INTERNAL_HMAC_SECRET=TEST_HMAC_SECRET)
 class ActivityDsarApiTests(TestCase):
     def setUp(self):
@@ -470,6 +650,108 @@ class ActivityDsarApiTests(TestCase):
         self.assertEqual(len(audits), 1)
         self.assertEqual(audits[0].target_id, "self")
 
+    def test_chunked_erasure_resumes_from_checkpoint(self):
+        from activity.dsar import run_erasure, start_erasure
+        from activity.models import DsarErasure
+
+        for index in range(3):
+            NewsComment.objects.create(
+                tenant_id=self.tenant_id,
+                post=self.news_post,
+                user_id=self.user_id,
+                body=f"Comment {index}",
+            )
+
+        erasure = start_erasure(tenant_id=self.tenant_id, user_id=self.user_id)
+        with patch("activity.dsar.time") as clock:
+            clock.monotonic.side_effect = [0.0, 10.0]
+            erasure = run_erasure(erasure, max_seconds=1, chunk_size=2)
+        self.assertEqual(erasure.status, DsarErasure.Status.RUNNING)
+        self.assertEqual(erasure.step, "news_comments")
+        self.assertEqual(erasure.counts["news_posts_redacted"], 1)
+        self.assertTrue(AccountLink.objects.filter(id=self.account_link.id).exists())
+
+        # A second start picks up the same erase where it stopped.
+        resumed = start_erasure(tenant_id=self.tenant_id, user_id=self.user_id)
+        self.assertEqual(resumed.id, erasure.id)
+        resumed = run_erasure(resumed, chunk_size=2)
+
+        self.assertEqual(resumed.status, DsarErasure.Status.COMPLETED)
+        self.assertIsNotNone(resumed.completed_at)
+        self.assertEqual(resumed.counts["news_posts_redacted"], 1)
+        self.assertEqual(resumed.counts["news_comments_redacted"], 4)
+        self.assertEqual(resumed.counts["subscriptions_deleted"], 1)
+        self.assertEqual(resumed.counts["activity_events_redacted"], 1)
+        self.assertEqual(resumed.counts["outbox_scrubbed"], 1)
+        self.assertFalse(NewsComment.objects.filter(user_id=self.user_id).exists())
+        self.assertFalse(AccountLink.objects.filter(id=self.account_link.id).exists())
+        self.outbox.refresh_from_db()
+        self.assertEqual(self.outbox.payload_json["linked_user_id"], "[redacted]")
+
+    def test_erasure_endpoint_reports_progress(self):
+        from activity.audit import ActivityAuditEvent
+
+        path = f"/api/v1/feed/internal/dsar/users/{self.user_id}/erasure"
+        status_resp = self.client.get(
+            path,
+            **_headers(
+                tenant_id=self.tenant_id,
+                tenant_slug="tenant",
+                request_id="rid-erasure-missing",
+                user_id=self.user_id,
+                path=path,
+            ),
+        )
+        self.assertEqual(status_resp.status_code, 404)
+
+        resp = self.client.post(
+            f"{path}?max_seconds=10",
+            data=b"",
+            content_type="application/json",
+            **_headers(
+                tenant_id=self.tenant_id,
+                tenant_slug="tenant",
+                request_id="rid-erasure-run",
+                user_id=self.user_id,
+                method="POST",
+                path=path,
+            ),
+        )
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["status"], "completed")
+        self.assertEqual(data["counts"]["raw_events_deleted"], 1)
+        audits = list(ActivityAuditEvent.objects.filter(action="dsar.erased"))
+        self.assertEqual(len(audits), 1)
+        self.assertEqual(audits[0].metadata["erasure_id"], data["erasure_id"])
+
+        status_resp = self.client.get(
+            path,
+            **_headers(
+                tenant_id=self.tenant_id,
+                tenant_slug="tenant",
+                request_id="rid-erasure-status",
+                user_id=self.user_id,
+                path=path,
+            ),
+        )
+        self.assertEqual(status_resp.status_code, 200)
+        self.assertEqual(status_resp.json()["erasure_id"], data["erasure_id"])
+
+    def test_token_matcher_redacts_exact_values_only(self):
+        from activity.dsar import TokenMatcher
+
+        matcher = TokenMatcher({"steam:1", 'quote"d'})
+        payload = {"ref": " steam:1 ", "nested": [{"q": 'quote"d'}], "note": "steam:12 is someone else"}
+
+        self.assertTrue(matcher.mentions(payload))
+        self.assertEqual(
+            matcher.scrub(payload),
+            {"ref": "[redacted]", "nested": [{"q": "[redacted]"}], "note": "steam:12 is someone else"},
+        )
+        untouched = {"ref": "steam:2"}
+        self.assertIs(matcher.scrub(untouched), untouched)
+
 
 class OutboxPatternTests(TestCase):
     """Tests for outbox pattern implementation."""
@@ -582,6 +864,95 @@ class OutboxPatternTests(TestCase):
         self.assertIsNone(event.claim_token)
 
 
+class OutboxWakeupListenerTests(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.tmpdir, "outbox.sock")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_commit_wakes_socket_listener(self):
+        with patch.dict(os.environ, {"OUTBOX_WAKEUP_SOCKET": self.socket_path}):
+            listener = OutboxWakeupListener()
+            try:
+                self.assertEqual(listener.mode, "socket")
+                self.assertFalse(listener.wait(0.01))
+
+                with self.captureOnCommitCallbacks(execute=True):
+                    publish_outbox_event(
+                        tenant_id=uuid.uuid4(),
+                        event_type=OutboxEventType.FEED_UPDATED,
+                        aggregate_type="activity_event",
+                        aggregate_id="1",
+                        payload={},
+                    )
+                    publish_outbox_event(
+                        tenant_id=uuid.uuid4(),
+                        event_type=OutboxEventType.FEED_UPDATED,
+                        aggregate_type="activity_event",
+                        aggregate_id="2",
+                        payload={},
+                    )
+
+                self.assertTrue(listener.wait(1))
+                # Both commits coalesce into a single wake-up.
+                self.assertFalse(listener.wait(0.01))
+            finally:
+                listener.close()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+    def test_without_channel_falls_back_to_sleep(self):
+        with patch.dict(
+            os.environ,
+            {"OUTBOX_WAKEUP_SOCKET": "", "YMQ_OUTBOX_QUEUE": "", "YMQ_OUTBOX_WAKEUP_QUEUE": ""},
+        ):
+            listener = OutboxWakeupListener()
+
+        self.assertEqual(listener.mode, "sleep")
+        self.assertFalse(listener.enabled)
+        self.assertFalse(listener.wait(0))
+
+    def test_listener_never_consumes_the_trigger_queue(self):
+        env = {
+            "OUTBOX_WAKEUP_SOCKET": "",
+            "S3_ACCESS_KEY_ID": "key",
+            "S3_SECRET_ACCESS_KEY": "secret",
+            "YMQ_OUTBOX_QUEUE": "activity-outbox",
+        }
+        with patch.dict(os.environ, {**env, "YMQ_OUTBOX_WAKEUP_QUEUE": ""}):
+            self.assertEqual(OutboxWakeupListener().mode, "sleep")
+        with patch.dict(os.environ, {**env, "YMQ_OUTBOX_WAKEUP_QUEUE": "activity-outbox"}):
+            self.assertEqual(OutboxWakeupListener().mode, "sleep")
+        with patch.dict(os.environ, {**env, "YMQ_OUTBOX_WAKEUP_QUEUE": "activity-outbox-relay"}):
+            self.assertEqual(OutboxWakeupListener().mode, "ymq")
+
+    def test_wakeup_is_sent_to_trigger_and_listener_queues(self):
+        from core import ymq
+
+        env = {
+            "OUTBOX_WAKEUP_SOCKET": "",
+            "S3_ACCESS_KEY_ID": "key",
+            "S3_SECRET_ACCESS_KEY": "secret",
+            "YMQ_OUTBOX_QUEUE": "https://ymq.local/activity-outbox",
+            "YMQ_OUTBOX_WAKEUP_QUEUE": "https://ymq.local/activity-outbox-relay",
+        }
+        with (
+            patch.dict(os.environ, env),
+            patch.object(ymq, "_build_client") as build_client,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            ymq.schedule_outbox_wakeup(
+                service_name="activity",
+                event_type="feed.updated",
+                tenant_id="t1",
+                payload={},
+            )
+
+        sent_to = [call.kwargs["QueueUrl"] for call in build_client.return_value.send_message.call_args_list]
+        self.assertEqual(sent_to, [env["YMQ_OUTBOX_QUEUE"], env["YMQ_OUTBOX_WAKEUP_QUEUE"]])
+
+
 class FeedLastSeenTests(TestCase):
     """Tests for feed last_seen tracking and unread count."""
 
@@ -1703,3 +2074,110 @@ class ActivityAccountLinkAuditTests(TestCase):
 
         self.assertFalse(ActivityAuditEvent.objects.filter(id=old_event.id).exists())
         self.assertTrue(ActivityAuditEvent.objects.filter(id=fresh_event.id).exists())
+
+
+class RetentionPurgeTests(TestCase):
+    def setUp(self):
+        self.tenant_id = uuid.uuid4()
+        self.user_id = uuid.uuid4()
+        self.checkpoint = "nightly"
+        source = Source.objects.create(tenant_id=self.tenant_id, type="steam", config_json={})
+        self.link = AccountLink.objects.create(
+            tenant_id=self.tenant_id,
+            user_id=self.user_id,
+            source=source,
+            status="active",
+        )
+
+    def _audit_events(self, count: int, *, age_days: int):
+        from activity.audit import ActivityAuditEvent
+
+        return [
+            ActivityAuditEvent.objects.create(
+                tenant_id=self.tenant_id,
+                actor_user_id=self.user_id,
+                action="account_link.created",
+                target_type="account_link",
+                target_id=str(index),
+                metadata={},
+                request_id=f"rid-{index}",
+                created_at=datetime.now(timezone.utc) - timedelta(days=age_days, minutes=index),
+            )
+            for index in range(count)
+        ]
+
+    def _purge(self, *args: str) -> dict:
+        output = StringIO()
+        call_command(
+            "purge_retention",
+            "--audit-days=365",
+            "--chunk-size=2",
+            "--max-chunk-size=2",
+            f"--checkpoint={self.checkpoint}",
+            *args,
+            stdout=output,
+        )
+        return json.loads(output.getvalue())
+
+    def test_purge_deletes_in_chunks_and_reports_progress(self):
+        from activity.audit import ActivityAuditEvent
+
+        self._audit_events(5, age_days=400)
+        fresh = self._audit_events(1, age_days=1)
+        for index in range(3):
+            RawEvent.objects.create(
+                tenant_id=self.tenant_id,
+                account_link=self.link,
+                payload_json={},
+                fetched_at=datetime.now(timezone.utc) - timedelta(days=60),
+                dedupe_hash=f"old-{index}",
+            )
+
+        payload = self._purge()
+
+        self.assertEqual(payload["counts"]["activity_audit_deleted"], 5)
+        self.assertEqual(payload["counts"]["raw_events_deleted"], 3)
+        audit = payload["purge"]["targets"]["activity_audit"]
+        self.assertEqual(audit["chunks"], 3)
+        self.assertTrue(audit["raw_delete"])
+        # RawEvent rows null out ActivityEvent.raw_event, so they go through the collector.
+        self.assertFalse(payload["purge"]["targets"]["raw_events"]["raw_delete"])
+        self.assertTrue(payload["purge"]["completed"])
+        self.assertEqual(list(ActivityAuditEvent.objects.values_list("id", flat=True)), [fresh[0].id])
+        self.assertFalse(RetentionCheckpoint.objects.exists())
+
+    def test_interrupted_purge_resumes_from_checkpoint(self):
+        from activity.audit import ActivityAuditEvent
+
+        self._audit_events(5, age_days=400)
+
+        # Raw events and outbox are empty; the runtime limit hits after one audit chunk.
+        with patch.object(RetentionPurge, "_out_of_time", side_effect=[False, False, False, True]):
+            first = self._purge()
+
+        self.assertFalse(first["purge"]["completed"])
+        self.assertEqual(first["counts"]["activity_audit_deleted"], 2)
+        self.assertEqual(ActivityAuditEvent.objects.count(), 3)
+        saved = RetentionCheckpoint.objects.get(name=self.checkpoint)
+        self.assertEqual(saved.started_at.isoformat(), first["executed_at"])
+        self.assertEqual(saved.targets["activity_audit"]["chunks"], 1)
+
+        second = self._purge()
+
+        self.assertTrue(second["purge"]["resumed"])
+        self.assertEqual(second["executed_at"], first["executed_at"])
+        self.assertEqual(second["counts"]["activity_audit_deleted"], 5)
+        self.assertEqual(ActivityAuditEvent.objects.count(), 0)
+        self.assertFalse(RetentionCheckpoint.objects.exists())
+
+    def test_dry_run_counts_without_deleting(self):
+        from activity.audit import ActivityAuditEvent
+
+        self._audit_events(3, age_days=400)
+
+        payload = self._purge("--dry-run")
+
+        self.assertTrue(payload["purge"]["dry_run"])
+        self.assertEqual(payload["counts"]["activity_audit_deleted"], 3)
+        self.assertEqual(ActivityAuditEvent.objects.count(), 3)
+        self.assertFalse(RetentionCheckpoint.objects.exists())
@@ -154,6 +154,16 @@ ACTIVITY_RETENTION_PROCESSED_OUTBOX_DAYS = int(
     os.getenv("ACTIVITY_RETENTION_PROCESSED_OUTBOX_DAYS", "14")
 )
 ACTIVITY_RETENTION_AUDIT_DAYS = int(os.getenv("ACTIVITY_RETENTION_AUDIT_DAYS", "365"))
+# Rows touched per transaction by the resumable DSAR erase.
+ACTIVITY_DSAR_ERASE_CHUNK_SIZE = int(os.getenv("ACTIVITY_DSAR_ERASE_CHUNK_SIZE", "500"))
+
+# Audit rows are inserted in the request by default. Long-lived workers may
+# opt in to queueing them for a background thread that bulk-inserts them;
+# never enable it on serverless containers, which freeze between requests.
+ACTIVITY_AUDIT_ASYNC = read_env_flag("ACTIVITY_AUDIT_ASYNC", False)
+ACTIVITY_AUDIT_BATCH_SIZE = int(os.getenv("ACTIVITY_AUDIT_BATCH_SIZE", "200"))
+ACTIVITY_AUDIT_FLUSH_SECONDS = float(os.getenv("ACTIVITY_AUDIT_FLUSH_SECONDS", "1"))
+ACTIVITY_AUDIT_QUEUE_MAX = int(os.getenv("ACTIVITY_AUDIT_QUEUE_MAX", "10000"))
 
 # Cache is local-only; do not rely on shared Redis state in production.
 CACHES = {
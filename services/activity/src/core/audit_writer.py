@@ -0,0 +1,174 @@
+"""Optional batched audit writes off the request path.
+
+By default ``AuditWriter.write`` inserts the row in the caller, which is the
+only durable choice where instances are frozen or recycled between requests
+(serverless containers). Long-lived workers can enable ``<PREFIX>_ASYNC``:
+``write`` then queues an unsaved audit row and returns at once. A
+daemon thread writes the queue with ``bulk_create`` every
+``<PREFIX>_FLUSH_SECONDS`` or as soon as ``<PREFIX>_BATCH_SIZE`` rows are
+waiting; with ``FLUSH_SECONDS <= 0`` there is no thread and the caller that
+fills a batch writes it. The owning module drains the queue at interpreter
+exit. A row written inside a transaction is queued on commit, so a
+rolled-back change leaves no audit record, as with the synchronous insert
+this replaces. Rows are never dropped: once ``<PREFIX>_QUEUE_MAX`` rows are
+waiting, new rows are inserted in the caller again.
+
+``sync=True`` always inserts in the caller. Compliance-critical actions such
+as DSAR export and erasure pass it to keep the record in the same
+transaction as the change it describes.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, router, transaction
+from django.db.models import Model
+
+logger = logging.getLogger(__name__)
+
+
+class AuditWriter:
+    """Queue of unsaved audit rows for one model, flushed in batches."""
+
+    def __init__(self, model: type[Model], *, prefix: str) -> None:
+        self.model = model
+        self.prefix = prefix
+        self._queue: deque[Model] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _setting(self, name: str, default: float) -> float:
+        try:
+            return float(getattr(settings, f"{self.prefix}_{name}", default))
+        except (TypeError, ValueError):
+            return default
+
+    @property
+    def async_enabled(self) -> bool:
+        return bool(getattr(settings, f"{self.prefix}_ASYNC", False))
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def write(self, event: Model, *, sync: bool = False) -> Model:
+        """Persist ``event`` now (``sync``) or queue it for the next batch."""
+        if sync or not self.async_enabled:
+            event.save(force_insert=True)
+            return event
+        using = router.db_for_write(self.model)
+        if transaction.get_connection(using).in_atomic_block:
+            transaction.on_commit(lambda: self._enqueue(event), using=using)
+        else:
+            self._enqueue(event)
+        return event
+
+    def _enqueue(self, event: Model) -> None:
+        with self._lock:
+            backlog = len(self._queue) >= int(self._setting("QUEUE_MAX", 10000))
+        if backlog and self._write_now(event):
+            return
+        with self._lock:
+            self._queue.append(event)
+            full = len(self._queue) >= int(self._setting("BATCH_SIZE", 200))
+        if not full:
+            self._ensure_thread()
+        elif self._ensure_thread():
+            self._wakeup.set()
+        else:
+            self.flush()
+
+    def _write_now(self, event: Model) -> bool:
+        """Insert past a full queue; on failure the row is queued over the limit."""
+        try:
+            event.save(force_insert=True)
+        except DatabaseError:
+            logger.warning(
+                "Audit queue full and insert failed, %s %s kept queued",
+                event._meta.label,
+                event.pk,
+                extra={"audit_action": getattr(event, "action", "")},
+                exc_info=True,
+            )
+            return False
+        return True
+
+    def _take(self, limit: int) -> list[Model]:
+        with self._lock:
+            return [self._queue.popleft() for _ in range(min(limit, len(self._queue)))]
+
+    def flush(self) -> int:
+        """Write every queued row; a failed batch stays queued for the next flush."""
+        written = 0
+        batch_size = max(1, int(self._setting("BATCH_SIZE", 200)))
+        with self._flush_lock:
+            while batch := self._take(batch_size):
+                try:
+                    # Rows keep their generated ids, so a retry after an
+                    # ambiguous failure cannot duplicate them.
+                    self.model.objects.bulk_create(batch, ignore_conflicts=True)
+                except DatabaseError:
+                    with self._lock:
+                        self._queue.extendleft(reversed(batch))
+                    logger.warning(
+                        "Audit flush failed, %d rows kept for retry",
+                        len(batch),
+                        extra={"audit_model": self.model._meta.label},
+                        exc_info=True,
+                    )
+                    break
+                written += len(batch)
+        return written
+
+    def _ensure_thread(self) -> bool:
+        if self._setting("FLUSH_SECONDS", 1) <= 0:
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"{self.prefix.lower()}-writer",
+                    daemon=True,
+                )
+                self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            interval = self._setting("FLUSH_SECONDS", 1)
+            if interval <= 0:
+                return
+            self._wakeup.wait(interval)
+            self._wakeup.clear()
+            if not self._queue:
+                continue
+            try:
+                self.flush()
+            except Exception:  # the writer must outlive a bad batch
+                logger.exception("Audit background flush failed")
+            finally:
+                close_old_connections()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._queue.clear()
+
+    def shutdown(self) -> None:
+        """Final flush at exit; rows that still cannot be written are logged."""
+        try:
+            self.flush()
+        except Exception:  # interpreter is exiting: report, never raise
+            logger.exception("Audit shutdown flush failed")
+        for event in self._take(len(self._queue)):
+            logger.error(
+                "Audit row lost at shutdown: %s %s",
+                event._meta.label,
+                event.pk,
+                extra={"audit_action": getattr(event, "action", "")},
+            )
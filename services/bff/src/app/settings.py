@@ -1,4 +1,6 @@
+import json
 import os
+import tempfile
 from pathlib import Path
 
 from django.core.exceptions import ImproperlyConfigured
@@ -205,6 +207,14 @@ YC_IAM_TOKEN_URL = read_env(
 BFF_RETENTION_SESSION_DAYS = int(os.getenv("BFF_RETENTION_SESSION_DAYS", "30"))
 BFF_RETENTION_AUDIT_DAYS = int(os.getenv("BFF_RETENTION_AUDIT_DAYS", "365"))
 
+# Audit rows are inserted in the request by default. Long-lived workers may
+# opt in to queueing them for a background thread that bulk-inserts them;
+# never enable it on serverless containers, which freeze between requests.
+BFF_AUDIT_ASYNC = read_env_flag("BFF_AUDIT_ASYNC", False)
+BFF_AUDIT_BATCH_SIZE = int(os.getenv("BFF_AUDIT_BATCH_SIZE", "200"))
+BFF_AUDIT_FLUSH_SECONDS = float(os.getenv("BFF_AUDIT_FLUSH_SECONDS", "1"))
+BFF_AUDIT_QUEUE_MAX = int(os.getenv("BFF_AUDIT_QUEUE_MAX", "10000"))
+
 # OIDC settings for login via ID.UpdSpace
 BFF_OIDC_CLIENT_ID = read_env("BFF_OIDC_CLIENT_ID", "")
 BFF_OIDC_CLIENT_SECRET = read_env("BFF_OIDC_CLIENT_SECRET", "")
@@ -220,6 +230,74 @@ try:
 except ValueError:
     BFF_PROXY_TIMEOUT_SECONDS = 10.0
 
+# Pooled async client used for SSE / long-poll relays under ASGI.
+try:
+    BFF_ASYNC_PROXY_MAX_CONNECTIONS = int(os.getenv("BFF_ASYNC_PROXY_MAX_CONNECTIONS", "2000"))
+except ValueError:
+    BFF_ASYNC_PROXY_MAX_CONNECTIONS = 2000
+
+try:
+    BFF_ASYNC_PROXY_MAX_KEEPALIVE_CONNECTIONS = int(
+        os.getenv("BFF_ASYNC_PROXY_MAX_KEEPALIVE_CONNECTIONS", "100")
+    )
+except ValueError:
+    BFF_ASYNC_PROXY_MAX_KEEPALIVE_CONNECTIONS = 100
+
+# How long the local feature flag snapshot is served before a background
+# delta refresh against the featureflags service.
+try:
+    BFF_FEATUREFLAGS_REFRESH_SECONDS = float(os.getenv("BFF_FEATUREFLAGS_REFRESH_SECONDS", "30"))
+except ValueError:
+    BFF_FEATUREFLAGS_REFRESH_SECONDS = 30.0
+
+# Background DSAR exports: archives are written to the "dsar_exports" entry of
+# STORAGES and kept for the TTL. It must be shared by every BFF instance and
+# the process_dsar_jobs task (object storage); a local directory is only used
+# under DEBUG.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+BFF_DSAR_EXPORT_STORAGE_BACKEND = read_env("BFF_DSAR_EXPORT_STORAGE_BACKEND", "")
+if BFF_DSAR_EXPORT_STORAGE_BACKEND:
+    try:
+        _dsar_storage_options = json.loads(read_env("BFF_DSAR_EXPORT_STORAGE_OPTIONS", "") or "{}")
+    except ValueError as exc:
+        raise ImproperlyConfigured("BFF_DSAR_EXPORT_STORAGE_OPTIONS must be a JSON object") from exc
+    STORAGES["dsar_exports"] = {
+        "BACKEND": BFF_DSAR_EXPORT_STORAGE_BACKEND,
+        "OPTIONS": _dsar_storage_options,
+    }
+elif DEBUG:
+    STORAGES["dsar_exports"] = {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {
+            "location": read_env("BFF_DSAR_EXPORT_DIR", "")
+            or os.path.join(tempfile.gettempdir(), "bff-dsar-exports"),
+        },
+    }
+try:
+    BFF_DSAR_JOB_WORKERS = int(os.getenv("BFF_DSAR_JOB_WORKERS", "2"))
+    BFF_DSAR_EXPORT_TTL_HOURS = float(os.getenv("BFF_DSAR_EXPORT_TTL_HOURS", "72"))
+    BFF_DSAR_JOB_STALE_SECONDS = float(os.getenv("BFF_DSAR_JOB_STALE_SECONDS", "3600"))
+    BFF_DSAR_JOB_MAX_ATTEMPTS = int(os.getenv("BFF_DSAR_JOB_MAX_ATTEMPTS", "3"))
+    # Erase jobs: time box per chunked upstream call, and the wall-clock
+    # limit for one service's chunked erase before the job fails.
+    BFF_DSAR_ERASE_SLICE_SECONDS = float(os.getenv("BFF_DSAR_ERASE_SLICE_SECONDS", "10"))
+    BFF_DSAR_ERASE_MAX_SECONDS = float(os.getenv("BFF_DSAR_ERASE_MAX_SECONDS", "600"))
+except ValueError:
+    BFF_DSAR_JOB_WORKERS = 2
+    BFF_DSAR_EXPORT_TTL_HOURS = 72.0
+    BFF_DSAR_JOB_STALE_SECONDS = 3600.0
+    BFF_DSAR_JOB_MAX_ATTEMPTS = 3
+    BFF_DSAR_ERASE_SLICE_SECONDS = 10.0
+    BFF_DSAR_ERASE_MAX_SECONDS = 600.0
+# Jobs are run by the scheduled process_dsar_jobs task. For tests and local
+# development they can instead run inline on commit, or in a thread pool of
+# the request worker (lost if that worker is recycled).
+BFF_DSAR_JOBS_EAGER = read_env_flag("BFF_DSAR_JOBS_EAGER", False)
+BFF_DSAR_JOBS_IN_PROCESS = read_env_flag("BFF_DSAR_JOBS_IN_PROCESS", False)
+
 ROOT_URLCONF = "app.urls"
 
 TEMPLATES = [
@@ -237,6 +315,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "app.wsgi.application"
+ASGI_APPLICATION = "app.asgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
@@ -9,7 +9,10 @@ from typing import Any
 from urllib.parse import urlencode
 
 import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.db import DatabaseError
 from django.http import (
     HttpRequest,
@@ -23,11 +26,13 @@ from django.utils import timezone
 from django.views.decorators.csrf import csrf_protect
 from ninja import NinjaAPI, Router
 
+from . import dsar_jobs
 from .dsar import erase_user_data as erase_bff_user_data
 from .dsar import export_user_data as export_bff_user_data
 from .errors import error_response
-from .models import BffOauthState
-from .proxy import proxy_request
+from .featureflags import feature_flags_client
+from .models import BffDsarJob, BffOauthState
+from .proxy import async_proxy_request, proxy_request
 from .security import verify_updspaceid_callback
 from .session_store import SessionStore
 from .tenant import (
@@ -707,45 +712,25 @@ def _load_feature_flags_snapshot(request: HttpRequest, ctx) -> dict[str, bool]:
     if not featureflags_upstream:
         return {}
 
-    try:
-        resp = proxy_request(
+    # Flags are global, so any caller's context can sign the refresh; copy the
+    # headers because the refresh may run after this request has finished.
+    incoming_headers = dict(request.headers)
+    context_headers = _active_context_headers(request, ctx)
+    request_id = request.request_id
+
+    def _fetch(since: int | None) -> httpx.Response:
+        return proxy_request(
             upstream_base_url=featureflags_upstream,
             upstream_path="flags/evaluate",
             method="GET",
-            query_string="",
+            query_string="" if since is None else f"since={since}",
             body=b"",
-            incoming_headers=request.headers,
-            context_headers=_active_context_headers(request, ctx),
-            request_id=request.request_id,
-        )
-    except BFF_RECOVERABLE_EXCEPTIONS:
-        logger.warning(
-            "session/me feature flags probe failed",
-            extra={"request_id": request.request_id},
-            exc_info=True,
+            incoming_headers=incoming_headers,
+            context_headers=context_headers,
+            request_id=request_id,
         )
-        return {}
 
-    if resp.status_code != 200:
-        return {}
-
-    try:
-        data = resp.json()
-    except BFF_RECOVERABLE_EXCEPTIONS:
-        return {}
-
-    if not isinstance(data, dict):
-        return {}
-
-    feature_flags = data.get("feature_flags")
-    if not isinstance(feature_flags, dict):
-        return {}
-
-    return {
-        str(key): bool(value)
-        for key, value in feature_flags.items()
-        if isinstance(key, str)
-    }
+    return feature_flags_client.snapshot(_fetch)
 
 
 @router.post("/session/switch-tenant")
@@ -1741,20 +1726,16 @@ def internal_establish_session(request: HttpRequest):
     return response
 
 
-def _proxy_group(
+def _resolve_group_upstream(
     request: HttpRequest,
     group: str,
     upstream_setting: str,
     path: str,
-    ensure_prefix: str | None = None,
-):
-    ctx, err = _require_auth(request)
-    if err:
-        return err
-
+    ensure_prefix: str | None,
+) -> tuple[str, str, HttpResponse | None]:
     upstream = getattr(settings, upstream_setting, "")
     if not upstream:
-        return error_response(
+        return "", "", error_response(
             code="UPSTREAM_NOT_CONFIGURED",
             message=f"Upstream for {group} is not configured",
             request_id=getattr(request, "request_id", None),
@@ -1768,6 +1749,97 @@ def _proxy_group(
             upstream = base
         else:
             upstream_path = f"{ensure_prefix}/{upstream_path}".rstrip("/")
+    return upstream, upstream_path, None
+
+
+def _group_context_headers(request: HttpRequest, ctx) -> dict[str, str]:
+    return {
+        "X-Request-Id": request.request_id,
+        "X-Tenant-Id": ctx.tenant_id,
+        "X-Tenant-Slug": ctx.tenant_slug,
+        "X-User-Id": ctx.user_id,
+        "X-Master-Flags": json.dumps(
+            ctx.master_flags,
+            separators=(",", ":"),
+        ),
+    }
+
+
+def _is_stream_request(request: HttpRequest, upstream_path: str) -> bool:
+    accept_header = request.headers.get("accept", "")
+    return "event-stream" in accept_header or upstream_path.startswith("feed/sse")
+
+
+def _is_long_poll(upstream_path: str) -> bool:
+    return upstream_path.endswith("unread-count/long-poll")
+
+
+def _upstream_error_response(request: HttpRequest, group: str, resp: httpx.Response) -> HttpResponse:
+    details: dict[str, Any] = {}
+    try:
+        details["upstream_body"] = resp.json()
+    except BFF_RECOVERABLE_EXCEPTIONS:
+        details["upstream_body"] = resp.text
+    details["upstream_status"] = resp.status_code
+    return error_response(
+        code="UPSTREAM_ERROR",
+        message=f"{group} upstream returned error",
+        request_id=request.request_id,
+        status=resp.status_code,
+        details=details,
+    )
+
+
+def _proxy_config_error_response(request: HttpRequest, exc: RuntimeError) -> HttpResponse:
+    # e.g. missing BFF_INTERNAL_HMAC_SECRET
+    return error_response(
+        code="CONFIG_ERROR",
+        message=str(exc) or "BFF is not configured",
+        request_id=request.request_id,
+        status=500,
+    )
+
+
+def _upstream_unavailable_response(request: HttpRequest, group: str) -> HttpResponse:
+    return error_response(
+        code="UPSTREAM_UNAVAILABLE",
+        message=f"{group} upstream is unavailable",
+        request_id=request.request_id,
+        status=502,
+    )
+
+
+def _streaming_response(resp: httpx.Response, stream_iter) -> StreamingHttpResponse:
+    content_type = resp.headers.get("content-type", "application/json")
+    streaming_response = StreamingHttpResponse(
+        stream_iter,
+        status=resp.status_code,
+        content_type=content_type,
+    )
+    # Copy important headers for SSE
+    for header_name in ["cache-control", "x-accel-buffering"]:
+        header_value = resp.headers.get(header_name)
+        if header_value:
+            streaming_response[header_name] = header_value
+    return streaming_response
+
+
+def _proxy_group(
+    request: HttpRequest,
+    group: str,
+    upstream_setting: str,
+    path: str,
+    ensure_prefix: str | None = None,
+):
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+
+    upstream, upstream_path, err = _resolve_group_upstream(
+        request, group, upstream_setting, path, ensure_prefix
+    )
+    if err:
+        return err
 
     body = request.body or b""
     
@@ -1779,9 +1851,8 @@ def _proxy_group(
         extra={"request_id": request.request_id},
     )
     
-    accept_header = request.headers.get("accept", "")
-    is_stream = "event-stream" in accept_header or upstream_path.startswith("feed/sse")
-    is_long_poll = upstream_path.endswith("unread-count/long-poll")
+    is_stream = _is_stream_request(request, upstream_path)
+    is_long_poll = _is_long_poll(upstream_path)
 
     try:
         resp_result = proxy_request(
@@ -1791,28 +1862,13 @@ def _proxy_group(
             query_string=request.META.get("QUERY_STRING", ""),
             body=body,
             incoming_headers=request.headers,
-            context_headers={
-                "X-Request-Id": request.request_id,
-                "X-Tenant-Id": ctx.tenant_id,
-                "X-Tenant-Slug": ctx.tenant_slug,
-                "X-User-Id": ctx.user_id,
-                "X-Master-Flags": json.dumps(
-                    ctx.master_flags,
-                    separators=(",", ":"),
-                ),
-            },
+            context_headers=_group_context_headers(request, ctx),
             request_id=request.request_id,
             stream=is_stream,
             timeout=35 if is_long_poll else None,
         )
     except RuntimeError as exc:
-        # e.g. missing BFF_INTERNAL_HMAC_SECRET
-        return error_response(
-            code="CONFIG_ERROR",
-            message=str(exc) or "BFF is not configured",
-            request_id=request.request_id,
-            status=500,
-        )
+        return _proxy_config_error_response(request, exc)
     except Exception as exc:
         logger.exception(
             "BFF proxy error for %s/%s",
@@ -1824,12 +1880,7 @@ def _proxy_group(
                 "error": str(exc),
             },
         )
-        return error_response(
-            code="UPSTREAM_UNAVAILABLE",
-            message=f"{group} upstream is unavailable",
-            request_id=request.request_id,
-            status=502,
-        )
+        return _upstream_unavailable_response(request, group)
 
     if is_stream:
         resp, iterator, close_stream = resp_result
@@ -1838,21 +1889,10 @@ def _proxy_group(
 
     # Map upstream errors to unified shape
     if resp.status_code >= 400:
-        details: dict[str, Any] = {}
-        try:
-            details["upstream_body"] = resp.json()
-        except BFF_RECOVERABLE_EXCEPTIONS:
-            details["upstream_body"] = resp.text
-        details["upstream_status"] = resp.status_code
         if is_stream:
+            resp.read()
             close_stream()
-        return error_response(
-            code="UPSTREAM_ERROR",
-            message=f"{group} upstream returned error",
-            request_id=request.request_id,
-            status=resp.status_code,
-            details=details,
-        )
+        return _upstream_error_response(request, group, resp)
 
     content_type = resp.headers.get("content-type", "application/json")
     
@@ -1865,20 +1905,7 @@ def _proxy_group(
                     yield from resp.iter_bytes(chunk_size=1024)
                 finally:
                     resp.close()
-            stream_iter = iterator()
-        else:
-            stream_iter = iterator()
-        streaming_response = StreamingHttpResponse(
-            stream_iter,
-            status=resp.status_code,
-            content_type=content_type,
-        )
-        # Copy important headers for SSE
-        for header_name in ["cache-control", "x-accel-buffering"]:
-            header_value = resp.headers.get(header_name)
-            if header_value:
-                streaming_response[header_name] = header_value
-        return streaming_response
+        return _streaming_response(resp, iterator())
     
     try:
         return HttpResponse(
@@ -1905,6 +1932,86 @@ def _proxy_group(
         )
 
 
+async def _proxy_group_async(
+    request: HttpRequest,
+    group: str,
+    upstream_setting: str,
+    path: str,
+    ensure_prefix: str | None = None,
+):
+    """
+    ASGI entry point for groups that carry SSE streams and long-polls.
+
+    Streams and long-polls are relayed through the pooled async client, so
+    an open tab costs a socket instead of a worker thread. Everything else
+    (and every request under WSGI, where an async body would be buffered)
+    goes through the regular :func:`_proxy_group` in the thread pool.
+    """
+    upstream_path = path or ""
+    if ensure_prefix and not str(getattr(settings, upstream_setting, "")).rstrip("/").endswith(
+        f"/{ensure_prefix}"
+    ):
+        upstream_path = f"{ensure_prefix}/{upstream_path}".rstrip("/")
+    is_stream = _is_stream_request(request, upstream_path)
+    is_long_poll = _is_long_poll(upstream_path)
+    if not isinstance(request, ASGIRequest) or not (is_stream or is_long_poll):
+        return await sync_to_async(_proxy_group)(request, group, upstream_setting, path, ensure_prefix)
+
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+    upstream, upstream_path, err = _resolve_group_upstream(
+        request, group, upstream_setting, path, ensure_prefix
+    )
+    if err:
+        return err
+
+    try:
+        resp_result = await async_proxy_request(
+            upstream_base_url=upstream,
+            upstream_path=upstream_path,
+            method=request.method,
+            query_string=request.META.get("QUERY_STRING", ""),
+            body=request.body or b"",
+            incoming_headers=request.headers,
+            context_headers=_group_context_headers(request, ctx),
+            request_id=request.request_id,
+            stream=is_stream,
+            timeout=35 if is_long_poll else None,
+        )
+    except RuntimeError as exc:
+        return _proxy_config_error_response(request, exc)
+    except Exception as exc:
+        logger.exception(
+            "BFF proxy error for %s/%s",
+            group,
+            upstream_path,
+            extra={
+                "request_id": request.request_id,
+                "upstream_url": upstream,
+                "error": str(exc),
+            },
+        )
+        return _upstream_unavailable_response(request, group)
+
+    if not is_stream:
+        resp = resp_result
+        if resp.status_code >= 400:
+            return _upstream_error_response(request, group, resp)
+        return HttpResponse(
+            resp.content,
+            status=resp.status_code,
+            content_type=resp.headers.get("content-type", "application/json"),
+        )
+
+    resp, iterator = resp_result
+    if resp.status_code >= 400:
+        await resp.aread()
+        await resp.aclose()
+        return _upstream_error_response(request, group, resp)
+    return _streaming_response(resp, iterator)
+
+
 # -----------------------------------------------
 # /portal/applications → ID service (not Portal!)
 # These routes handle admin application management which lives in UpdSpaceID.
@@ -2008,6 +2115,85 @@ def proxy_events_root(request: HttpRequest):
     return _proxy_group(request, "events", "BFF_UPSTREAM_EVENTS_URL", "")
 
 
+_CALENDAR_CONDITIONAL_HEADERS = {
+    "If-None-Match": "if-none-match",
+    "If-Modified-Since": "if-modified-since",
+}
+_CALENDAR_RESPONSE_HEADERS = ("etag", "last-modified", "cache-control")
+
+
+@router.get("/events/calendar.ics")
+def proxy_events_calendar_feed(request: HttpRequest):
+    """
+    Public pass-through for calendar subscriptions.
+
+    Calendar clients have no session: the signed ``token`` query parameter is
+    the credential and is verified by the events service.
+    """
+    upstream = getattr(settings, "BFF_UPSTREAM_EVENTS_URL", "")
+    if not upstream:
+        return error_response(
+            code="UPSTREAM_NOT_CONFIGURED",
+            message="Upstream for events is not configured",
+            request_id=getattr(request, "request_id", None),
+            status=502,
+        )
+
+    context_headers = {"X-Request-Id": request.request_id}
+    for name, incoming in _CALENDAR_CONDITIONAL_HEADERS.items():
+        value = request.headers.get(incoming)
+        if value:
+            context_headers[name] = value
+
+    try:
+        resp = proxy_request(
+            upstream_base_url=upstream,
+            upstream_path="calendar.ics",
+            method="GET",
+            query_string=request.META.get("QUERY_STRING", ""),
+            body=b"",
+            incoming_headers=request.headers,
+            context_headers=context_headers,
+            request_id=request.request_id,
+        )
+    except Exception as exc:
+        logger.exception(
+            "BFF proxy error for events/calendar.ics",
+            extra={"request_id": request.request_id, "error": str(exc)},
+        )
+        return error_response(
+            code="UPSTREAM_UNAVAILABLE",
+            message="events upstream is unavailable",
+            request_id=request.request_id,
+            status=502,
+        )
+
+    if resp.status_code >= 400:
+        try:
+            details: dict[str, Any] = {"upstream_body": resp.json()}
+        except BFF_RECOVERABLE_EXCEPTIONS:
+            details = {"upstream_body": resp.text}
+        details["upstream_status"] = resp.status_code
+        return error_response(
+            code="UPSTREAM_ERROR",
+            message="events upstream returned error",
+            request_id=request.request_id,
+            status=resp.status_code,
+            details=details,
+        )
+
+    response = HttpResponse(
+        b"" if resp.status_code == 304 else resp.content,
+        status=resp.status_code,
+        content_type=resp.headers.get("content-type", "text/calendar; charset=utf-8"),
+    )
+    for header_name in _CALENDAR_RESPONSE_HEADERS:
+        header_value = resp.headers.get(header_name)
+        if header_value:
+            response[header_name] = header_value
+    return response
+
+
 @router.api_operation(
     ["GET", "POST", "PUT", "PATCH", "DELETE"],
     "/events/{path:path}",
@@ -2048,25 +2234,25 @@ def proxy_gamification(request: HttpRequest, path: str):
     ["GET", "POST", "PUT", "PATCH", "DELETE"],
     "/feed",
 )
-def proxy_feed_root(request: HttpRequest):
-    return _proxy_group(request, "feed", "BFF_UPSTREAM_FEED_URL", "")
+async def proxy_feed_root(request: HttpRequest):
+    return await _proxy_group_async(request, "feed", "BFF_UPSTREAM_FEED_URL", "")
 
 
 @router.api_operation(
     ["GET", "POST", "PUT", "PATCH", "DELETE"],
     "/feed/{path:path}",
 )
-def proxy_feed(request: HttpRequest, path: str):
-    return _proxy_group(request, "feed", "BFF_UPSTREAM_FEED_URL", path)
+async def proxy_feed(request: HttpRequest, path: str):
+    return await _proxy_group_async(request, "feed", "BFF_UPSTREAM_FEED_URL", path)
 
 
 @router.api_operation(
     ["GET", "POST", "PUT", "PATCH", "DELETE"],
     "/activity/{path:path}",
 )
-def proxy_activity(request: HttpRequest, path: str):
+async def proxy_activity(request: HttpRequest, path: str):
     """Alias for /feed - frontend uses /activity/feed endpoint."""
-    return _proxy_group(request, "feed", "BFF_UPSTREAM_FEED_URL", path)
+    return await _proxy_group_async(request, "feed", "BFF_UPSTREAM_FEED_URL", path)
 
 
 @router.delete("/account/me")
@@ -2075,40 +2261,9 @@ def delete_account_me(request: HttpRequest):
     if err:
         return err
 
-    service_calls = (
-        (
-            "portal",
-            "BFF_UPSTREAM_PORTAL_URL",
-            f"portal/internal/dsar/users/{ctx.user_id}/erase",
-        ),
-        (
-            "activity",
-            "BFF_UPSTREAM_FEED_URL",
-            f"feed/internal/dsar/users/{ctx.user_id}/erase",
-        ),
-        (
-            "access",
-            "BFF_UPSTREAM_ACCESS_URL",
-            f"access/internal/dsar/users/{ctx.user_id}/erase",
-        ),
-        (
-            "events",
-            "BFF_UPSTREAM_EVENTS_URL",
-            f"internal/dsar/users/{ctx.user_id}/erase",
-        ),
-        (
-            "gamification",
-            "BFF_UPSTREAM_GAMIFICATION_URL",
-            f"gamification/internal/dsar/users/{ctx.user_id}/erase",
-        ),
-        (
-            "voting",
-            "BFF_UPSTREAM_VOTING_URL",
-            f"internal/dsar/users/{ctx.user_id}/erase",
-        ),
-    )
-
-    for service_name, setting_name, upstream_path in service_calls:
+    # Always erase upstream, even after an erase job: the erases are
+    # idempotent and data may have been written since the job ran.
+    for service_name, setting_name, upstream_path in dsar_jobs.dsar_upstream_calls(ctx.user_id, "erase"):
         _, response = _call_dsar_erase_service(
             request,
             ctx,
@@ -2149,6 +2304,7 @@ def delete_account_me(request: HttpRequest):
                 "services_erased": services_erased,
             },
             request_id=getattr(request, "request_id", ""),
+            sync=True,
         )
         _log_audit(
             tenant_id=ctx.tenant_id,
@@ -2160,6 +2316,7 @@ def delete_account_me(request: HttpRequest):
                 "services_erased": services_erased,
             },
             request_id=getattr(request, "request_id", ""),
+            sync=True,
         )
     except Exception:
         logger.warning("Failed to write dsar/account deletion audit events", exc_info=True)
@@ -2183,40 +2340,7 @@ def export_account_me(request: HttpRequest):
     bundles: dict[str, Any] = {
         "bff": export_bff_user_data(tenant_id=ctx.tenant_id, user_id=ctx.user_id),
     }
-    service_calls = (
-        (
-            "portal",
-            "BFF_UPSTREAM_PORTAL_URL",
-            f"portal/internal/dsar/users/{ctx.user_id}/export",
-        ),
-        (
-            "activity",
-            "BFF_UPSTREAM_FEED_URL",
-            f"feed/internal/dsar/users/{ctx.user_id}/export",
-        ),
-        (
-            "access",
-            "BFF_UPSTREAM_ACCESS_URL",
-            f"access/internal/dsar/users/{ctx.user_id}/export",
-        ),
-        (
-            "events",
-            "BFF_UPSTREAM_EVENTS_URL",
-            f"internal/dsar/users/{ctx.user_id}/export",
-        ),
-        (
-            "gamification",
-            "BFF_UPSTREAM_GAMIFICATION_URL",
-            f"gamification/internal/dsar/users/{ctx.user_id}/export",
-        ),
-        (
-            "voting",
-            "BFF_UPSTREAM_VOTING_URL",
-            f"internal/dsar/users/{ctx.user_id}/export",
-        ),
-    )
-
-    for service_name, setting_name, upstream_path in service_calls:
+    for service_name, setting_name, upstream_path in dsar_jobs.dsar_upstream_calls(ctx.user_id, "export"):
         bundle, response = _call_dsar_export_service(
             request,
             ctx,
@@ -2243,6 +2367,7 @@ def export_account_me(request: HttpRequest):
                 "services_exported": sorted(bundles.keys()),
             },
             request_id=getattr(request, "request_id", ""),
+            sync=True,
         )
     except Exception:
         logger.warning("Failed to write dsar.exported audit event", exc_info=True)
@@ -2256,6 +2381,120 @@ def export_account_me(request: HttpRequest):
     }
 
 
+def _dsar_upstream_context(request: HttpRequest, ctx) -> dsar_jobs.UpstreamContext:
+    forwarded = {"accept-language", "user-agent", "x-forwarded-proto"}
+    return dsar_jobs.UpstreamContext(
+        request_id=request.request_id,
+        context_headers=_account_context_headers(request, ctx),
+        incoming_headers={k: v for k, v in request.headers.items() if k.lower() in forwarded},
+    )
+
+
+def _get_dsar_job(request: HttpRequest, ctx, job_id: str, kind: str = BffDsarJob.Kind.EXPORT):
+    try:
+        job = BffDsarJob.objects.filter(
+            id=job_id,
+            tenant_id=ctx.tenant_id,
+            user_id=ctx.user_id,
+            kind=kind,
+        ).first()
+    except (ValidationError, ValueError):
+        job = None
+    if job is None:
+        return None, error_response(
+            code="NOT_FOUND",
+            message=f"{BffDsarJob.Kind(kind).label} job not found",
+            request_id=request.request_id,
+            status=404,
+        )
+    return job, None
+
+
+@router.post("/account/me/export/jobs")
+def create_export_job(request: HttpRequest):
+    """Start a background export of all the user's data (or return the running one)."""
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+    if not dsar_jobs.export_storage_configured():
+        return error_response(
+            code="DSAR_EXPORT_UNAVAILABLE",
+            message="Export storage is not configured",
+            request_id=request.request_id,
+            status=503,
+        )
+
+    job, _created = dsar_jobs.submit_export_job(
+        tenant_id=ctx.tenant_id,
+        user_id=ctx.user_id,
+        upstream=_dsar_upstream_context(request, ctx),
+    )
+    return JsonResponse(dsar_jobs.job_payload(job), status=202)
+
+
+@router.get("/account/me/export/jobs/{job_id}")
+def get_export_job(request: HttpRequest, job_id: str):
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+    job, err = _get_dsar_job(request, ctx, job_id)
+    if err:
+        return err
+    return JsonResponse(dsar_jobs.job_payload(job))
+
+
+@router.post("/account/me/erase/jobs")
+def create_erase_job(request: HttpRequest):
+    """Start a background erase of the user's data in every service (or return the running one)."""
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+
+    job, _created = dsar_jobs.submit_erase_job(
+        tenant_id=ctx.tenant_id,
+        user_id=ctx.user_id,
+        upstream=_dsar_upstream_context(request, ctx),
+    )
+    return JsonResponse(dsar_jobs.job_payload(job), status=202)
+
+
+@router.get("/account/me/erase/jobs/{job_id}")
+def get_erase_job(request: HttpRequest, job_id: str):
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+    job, err = _get_dsar_job(request, ctx, job_id, BffDsarJob.Kind.ERASE)
+    if err:
+        return err
+    return JsonResponse(dsar_jobs.job_payload(job))
+
+
+@router.get("/account/me/export/jobs/{job_id}/download")
+def download_export_job(request: HttpRequest, job_id: str):
+    ctx, err = _require_auth(request)
+    if err:
+        return err
+    job, err = _get_dsar_job(request, ctx, job_id)
+    if err:
+        return err
+    if job.status != BffDsarJob.Status.SUCCEEDED:
+        return error_response(
+            code="EXPORT_NOT_READY",
+            message="Export is not ready",
+            request_id=request.request_id,
+            status=409,
+            details={"status": job.status},
+        )
+    if job.expires_at and job.expires_at <= timezone.now():
+        return error_response(
+            code="EXPORT_EXPIRED",
+            message="Export has expired",
+            request_id=request.request_id,
+            status=410,
+        )
+    return dsar_jobs.download_response(request, job)
+
+
 @router.api_operation(
     ["GET", "POST", "PUT", "PATCH", "DELETE"],
     "/feature-flags",
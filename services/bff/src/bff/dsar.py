@@ -9,6 +9,7 @@ from django.utils import timezone
 
 from bff.audit import BffAuditEvent
 from bff.models import BffOauthState, BffRateLimitWindow, BffSession
+from bff.retention import PurgeSettings, PurgeTarget, RetentionPurge
 
 
 def _iso(value) -> str | None:
@@ -68,6 +69,11 @@ def erase_user_data(*, tenant_id: UUID | str, user_id: UUID | str) -> dict[str,
     session_ids = [str(item.id) for item in sessions]
     BffSession.objects.filter(id__in=session_ids, revoked_at__isnull=True).update(revoked_at=now)
 
+    from bff.dsar_jobs import delete_user_jobs
+
+    # Export archives hold the user's data from every service.
+    job_counts = delete_user_jobs(tenant_id=tenant_id, user_id=user_id)
+
     return {
         "service": "bff",
         "tenant_id": str(tenant_id),
@@ -76,24 +82,45 @@ def erase_user_data(*, tenant_id: UUID | str, user_id: UUID | str) -> dict[str,
         "erased_at": now.isoformat(),
         "counts": {
             "sessions_revoked": len(session_ids),
+            **job_counts,
         },
     }
 
 
-def purge_retention(*, session_days: int, audit_days: int) -> dict[str, Any]:
-    now = timezone.now()
+def purge_retention(
+    *,
+    session_days: int,
+    audit_days: int,
+    purge: RetentionPurge | None = None,
+) -> dict[str, Any]:
+    purge = purge or RetentionPurge(PurgeSettings())
+    now = purge.started_at
     session_cutoff = now - timedelta(days=session_days)
     audit_cutoff = now - timedelta(days=audit_days)
-    sessions = list(
-        BffSession.objects.filter(
-            Q(revoked_at__lt=session_cutoff) | Q(expires_at__lt=session_cutoff)
-        ).order_by("id")
+    sessions_deleted = purge.run(
+        PurgeTarget(
+            "sessions",
+            BffSession.objects.filter(Q(revoked_at__lt=session_cutoff) | Q(expires_at__lt=session_cutoff)),
+        )
     )
-    session_ids = [str(item.id) for item in sessions]
-    sessions_deleted, _ = BffSession.objects.filter(id__in=session_ids).delete() if session_ids else (0, {})
-    oauth_states_deleted, _ = BffOauthState.objects.filter(expires_at__lt=now).delete()
-    rate_limit_deleted, _ = BffRateLimitWindow.objects.filter(expires_at__lt=now).delete()
-    audit_events_deleted, _ = BffAuditEvent.objects.filter(created_at__lt=audit_cutoff).delete()
+    oauth_states_deleted = purge.run(
+        PurgeTarget("oauth_states", BffOauthState.objects.filter(expires_at__lt=now), order_field="expires_at")
+    )
+    rate_limit_deleted = purge.run(
+        PurgeTarget(
+            "rate_limit_windows",
+            BffRateLimitWindow.objects.filter(expires_at__lt=now),
+            order_field="expires_at",
+        )
+    )
+    audit_events_deleted = purge.run(
+        PurgeTarget("audit_events", BffAuditEvent.objects.filter(created_at__lt=audit_cutoff), order_field="created_at")
+    )
+
+    from bff.dsar_jobs import purge_expired_jobs
+
+    # Few rows, each with an archive in storage: deleted one by one.
+    dsar_jobs_deleted = 0 if purge.settings.dry_run else purge_expired_jobs(now=now)
 
     return {
         "service": "bff",
@@ -107,5 +134,7 @@ def purge_retention(*, session_days: int, audit_days: int) -> dict[str, Any]:
             "oauth_states_deleted": oauth_states_deleted,
             "rate_limit_windows_deleted": rate_limit_deleted,
             "audit_events_deleted": audit_events_deleted,
+            "dsar_jobs_deleted": dsar_jobs_deleted,
         },
+        "purge": purge.finish(),
     }
@@ -0,0 +1,735 @@
+"""
+Background DSAR export and erase jobs.
+
+``POST /account/me/export/jobs`` records a ``BffDsarJob`` together with the
+upstream request context and returns at once. The jobs are run by the
+``process_dsar_jobs`` management command, started by a scheduled task, so
+they survive the request worker that created them. The job calls every
+service's DSAR export endpoint in parallel and streams each upstream body to
+a part file on disk. It then deflates the parts into one zip archive
+(``manifest.json``, ``bff.json`` and one ``<service>.json`` per upstream).
+Bodies are copied in fixed-size chunks, so the BFF's memory use does not
+grow with the export size.
+
+Archives go to the ``dsar_exports`` entry of ``STORAGES``, which must be a
+storage shared by every BFF instance (for example an object storage
+backend); settings only fall back to a local directory under ``DEBUG``.
+They are served by a download endpoint that supports ranges, so clients can
+resume, and ``purge_retention`` removes them after ``expires_at``.
+
+``POST /account/me/erase/jobs`` runs every service's DSAR erase the same way.
+Activity erases in resumable chunks, so its step is driven through
+``.../erasure`` in time-boxed calls until it reports ``completed``; the job
+status shows the per-service progress meanwhile, and a job still running
+after ``BFF_DSAR_ERASE_MAX_SECONDS`` fails (a retry resumes upstream).
+``DELETE /account/me`` always repeats the upstream erases, which are
+idempotent.
+
+``BFF_DSAR_JOBS_EAGER`` runs a job inline when its transaction commits and
+``BFF_DSAR_JOBS_IN_PROCESS`` hands it to a thread pool of the worker that
+created it; both are meant for tests and local development only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import IO, Any
+from uuid import UUID
+
+import httpx
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files import File
+from django.core.files.storage import Storage, storages
+from django.db import connections, transaction
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import quote_etag
+
+from .dsar import export_user_data as export_bff_user_data
+from .models import BffDsarJob
+from .proxy import proxy_request
+
+logger = logging.getLogger(__name__)
+
+COPY_CHUNK = 64 * 1024
+EXPORT_STORAGE_ALIAS = "dsar_exports"
+
+# (service, upstream setting, path template) in the order bundles are listed.
+DSAR_UPSTREAMS: tuple[tuple[str, str, str], ...] = (
+    ("portal", "BFF_UPSTREAM_PORTAL_URL", "portal/internal/dsar/users/{user_id}/{operation}"),
+    ("activity", "BFF_UPSTREAM_FEED_URL", "feed/internal/dsar/users/{user_id}/{operation}"),
+    ("access", "BFF_UPSTREAM_ACCESS_URL", "access/internal/dsar/users/{user_id}/{operation}"),
+    ("events", "BFF_UPSTREAM_EVENTS_URL", "internal/dsar/users/{user_id}/{operation}"),
+    (
+        "gamification",
+        "BFF_UPSTREAM_GAMIFICATION_URL",
+        "gamification/internal/dsar/users/{user_id}/{operation}",
+    ),
+    ("voting", "BFF_UPSTREAM_VOTING_URL", "internal/dsar/users/{user_id}/{operation}"),
+)
+
+# Services whose erase runs in resumable chunks (``.../erasure``).
+CHUNKED_ERASE_SERVICES = frozenset({"activity"})
+
+_FETCH_ERRORS = (httpx.HTTPError, OSError, RuntimeError)
+
+
+def dsar_upstream_calls(user_id: UUID | str, operation: str) -> list[tuple[str, str, str]]:
+    return [
+        (service, setting_name, path.format(user_id=user_id, operation=operation))
+        for service, setting_name, path in DSAR_UPSTREAMS
+    ]
+
+
+def _setting(name: str, default: float) -> float:
+    try:
+        return float(getattr(settings, name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass(frozen=True)
+class UpstreamContext:
+    """Headers captured from the request that started a job."""
+
+    request_id: str
+    context_headers: dict[str, str]
+    incoming_headers: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_job(cls, job: BffDsarJob) -> UpstreamContext:
+        stored = job.upstream or {}
+        return cls(
+            request_id=job.request_id,
+            context_headers=dict(stored.get("context_headers") or {}),
+            incoming_headers=dict(stored.get("incoming_headers") or {}),
+        )
+
+
+class DsarUpstreamError(Exception):
+    def __init__(self, service: str, detail: str) -> None:
+        super().__init__(f"{service}: {detail}")
+        self.service = service
+        self.detail = detail
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def export_storage() -> Storage:
+    """The shared archive storage; a worker-local directory would lose archives."""
+    if EXPORT_STORAGE_ALIAS not in getattr(settings, "STORAGES", {}):
+        raise ImproperlyConfigured(
+            f'DSAR exports need a shared "{EXPORT_STORAGE_ALIAS}" storage in STORAGES '
+            "(BFF_DSAR_EXPORT_STORAGE_BACKEND)"
+        )
+    return storages[EXPORT_STORAGE_ALIAS]
+
+
+def export_storage_configured() -> bool:
+    return EXPORT_STORAGE_ALIAS in getattr(settings, "STORAGES", {})
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+def job_payload(job: BffDsarJob) -> dict[str, Any]:
+    succeeded = job.status == BffDsarJob.Status.SUCCEEDED
+    downloadable = succeeded and job.kind == BffDsarJob.Kind.EXPORT
+    return {
+        "id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "services": job.services or {},
+        "error": job.error or None,
+        "size": job.artifact_size if downloadable else None,
+        "created_at": _iso(job.created_at),
+        "finished_at": _iso(job.finished_at),
+        "expires_at": _iso(job.expires_at),
+        "download_path": f"/account/me/export/jobs/{job.id}/download" if downloadable else None,
+    }
+
+
+# =========================
+# Submission
+# =========================
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(1, int(_setting("BFF_DSAR_JOB_WORKERS", 2))),
+                thread_name_prefix="bff-dsar-job",
+            )
+        return _executor
+
+
+def _runner(kind: str):
+    return run_erase_job if kind == BffDsarJob.Kind.ERASE else run_export_job
+
+
+def _run_in_worker(kind: str, job_id: UUID) -> None:
+    try:
+        _runner(kind)(job_id)
+    finally:
+        connections.close_all()
+
+
+def _dispatch(kind: str, job_id: UUID) -> None:
+    eager = getattr(settings, "BFF_DSAR_JOBS_EAGER", False)
+    if not eager and not getattr(settings, "BFF_DSAR_JOBS_IN_PROCESS", False):
+        return  # the job waits for the next ``process_dsar_jobs`` run
+    if not claim_job(job_id):
+        return
+    if eager:
+        _runner(kind)(job_id)
+    else:
+        _get_executor().submit(_run_in_worker, kind, job_id)
+
+
+def _submit_job(
+    kind: str,
+    *,
+    tenant_id: UUID | str,
+    user_id: UUID | str,
+    upstream: UpstreamContext,
+) -> tuple[BffDsarJob, bool]:
+    """Queue a ``kind`` job for the user, or return the one already in progress.
+
+    An active job that has not reported progress for
+    ``BFF_DSAR_JOB_STALE_SECONDS`` and has used up its attempts is marked
+    failed and replaced.
+    """
+    now = timezone.now()
+    active = (
+        BffDsarJob.objects.filter(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            kind=kind,
+            status__in=[BffDsarJob.Status.PENDING, BffDsarJob.Status.RUNNING],
+        )
+        .order_by("-created_at")
+        .first()
+    )
+    if active is not None:
+        stale_before = now - timedelta(seconds=_setting("BFF_DSAR_JOB_STALE_SECONDS", 3600))
+        if active.updated_at >= stale_before or active.attempts < _max_attempts():
+            return active, False
+        _finish(active, BffDsarJob.Status.FAILED, error="abandoned")
+
+    job = BffDsarJob.objects.create(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        kind=kind,
+        request_id=upstream.request_id[:64],
+        upstream={
+            "context_headers": upstream.context_headers,
+            "incoming_headers": upstream.incoming_headers,
+        },
+    )
+    transaction.on_commit(lambda: _dispatch(kind, job.id))
+    return job, True
+
+
+def submit_export_job(
+    *,
+    tenant_id: UUID | str,
+    user_id: UUID | str,
+    upstream: UpstreamContext,
+) -> tuple[BffDsarJob, bool]:
+    return _submit_job(BffDsarJob.Kind.EXPORT, tenant_id=tenant_id, user_id=user_id, upstream=upstream)
+
+
+def submit_erase_job(
+    *,
+    tenant_id: UUID | str,
+    user_id: UUID | str,
+    upstream: UpstreamContext,
+) -> tuple[BffDsarJob, bool]:
+    return _submit_job(BffDsarJob.Kind.ERASE, tenant_id=tenant_id, user_id=user_id, upstream=upstream)
+
+
+# =========================
+# Processing
+# =========================
+def _max_attempts() -> int:
+    return max(1, int(_setting("BFF_DSAR_JOB_MAX_ATTEMPTS", 3)))
+
+
+def claim_job(job_id: UUID) -> bool:
+    """Mark a pending job (or a stale running one) as running; False when taken."""
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=_setting("BFF_DSAR_JOB_STALE_SECONDS", 3600))
+    claimable = Q(status=BffDsarJob.Status.PENDING) | Q(
+        status=BffDsarJob.Status.RUNNING,
+        updated_at__lt=stale_before,
+    )
+    job = BffDsarJob.objects.filter(claimable, id=job_id, attempts__lt=_max_attempts()).first()
+    if job is None:
+        return False
+    # Conditional on the row being unchanged, so only one runner wins it.
+    return bool(
+        BffDsarJob.objects.filter(id=job.id, status=job.status, updated_at=job.updated_at).update(
+            status=BffDsarJob.Status.RUNNING,
+            attempts=job.attempts + 1,
+            updated_at=now,
+        )
+    )
+
+
+def process_pending_jobs(*, limit: int = 10) -> dict[str, int]:
+    """Run queued jobs oldest first; a job whose runner died is retried.
+
+    Called by the ``process_dsar_jobs`` command. Jobs that went stale after
+    ``BFF_DSAR_JOB_MAX_ATTEMPTS`` runs are failed instead of retried forever.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=_setting("BFF_DSAR_JOB_STALE_SECONDS", 3600))
+    stale = Q(status__in=[BffDsarJob.Status.PENDING, BffDsarJob.Status.RUNNING], updated_at__lt=stale_before)
+    abandoned = 0
+    for job in BffDsarJob.objects.filter(stale, attempts__gte=_max_attempts()).order_by("created_at"):
+        _finish(job, BffDsarJob.Status.FAILED, error="abandoned")
+        abandoned += 1
+
+    processed = 0
+    candidates = BffDsarJob.objects.filter(
+        Q(status=BffDsarJob.Status.PENDING) | Q(status=BffDsarJob.Status.RUNNING, updated_at__lt=stale_before),
+        attempts__lt=_max_attempts(),
+    ).order_by("created_at")
+    for job_id, kind in candidates.values_list("id", "kind")[: max(0, limit)]:
+        if not claim_job(job_id):
+            continue
+        _runner(kind)(job_id)
+        processed += 1
+    return {"processed": processed, "abandoned": abandoned}
+
+
+# =========================
+# Execution
+# =========================
+def _finish(job: BffDsarJob, status: str, *, error: str = "") -> bool:
+    """Record the outcome; False when the job was deleted meanwhile (erasure)."""
+    now = timezone.now()
+    job.status = status
+    job.error = error[:255]
+    job.finished_at = now
+    job.expires_at = now + timedelta(hours=_setting("BFF_DSAR_EXPORT_TTL_HOURS", 72))
+    job.updated_at = now
+    # An update, not save(): save() would re-insert a row erased mid-run.
+    return bool(
+        BffDsarJob.objects.filter(id=job.id).update(
+            status=job.status,
+            error=job.error,
+            finished_at=job.finished_at,
+            expires_at=job.expires_at,
+            updated_at=now,
+            services=job.services,
+            artifact_name=job.artifact_name,
+            artifact_size=job.artifact_size,
+            artifact_sha256=job.artifact_sha256,
+        )
+    )
+
+
+def _save_progress(job: BffDsarJob) -> None:
+    # Progress doubles as the heartbeat checked for stale jobs.
+    job.updated_at = timezone.now()
+    BffDsarJob.objects.filter(id=job.id).update(services=job.services, updated_at=job.updated_at)
+
+
+def _fetch_bundle(
+    service: str,
+    setting_name: str,
+    upstream_path: str,
+    upstream: UpstreamContext,
+    target: Path,
+) -> dict[str, Any]:
+    """Stream one service's export body to ``target``."""
+    base_url = getattr(settings, setting_name, "")
+    if not base_url:
+        target.write_text(json.dumps({"skipped": True, "reason": "upstream_not_configured"}))
+        return {"status": "skipped", "reason": "upstream_not_configured"}
+
+    resp, iterator, close = proxy_request(
+        upstream_base_url=base_url,
+        upstream_path=upstream_path,
+        method="GET",
+        query_string="",
+        body=b"",
+        incoming_headers=upstream.incoming_headers,
+        context_headers=upstream.context_headers,
+        request_id=upstream.request_id,
+        stream=True,
+    )
+    if resp.status_code != 200:
+        close()
+        raise DsarUpstreamError(service, f"status {resp.status_code}")
+
+    size = 0
+    with target.open("wb") as fh:
+        for chunk in iterator():
+            fh.write(chunk)
+            size += len(chunk)
+    return {"status": "done", "bytes": size}
+
+
+def _write_archive(
+    path: Path,
+    job: BffDsarJob,
+    services: dict[str, dict[str, Any]],
+    parts: Path,
+) -> None:
+    manifest = {
+        "service": "bff",
+        "job_id": str(job.id),
+        "tenant_id": str(job.tenant_id),
+        "user_id": str(job.user_id),
+        "exported_at": timezone.now().isoformat(),
+        "services": services,
+    }
+    bff_bundle = export_bff_user_data(tenant_id=job.tenant_id, user_id=job.user_id)
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, sort_keys=True))
+        archive.writestr("bff.json", json.dumps(bff_bundle, ensure_ascii=False))
+        for service, _setting_name, _path in DSAR_UPSTREAMS:
+            part = parts / f"{service}.json"
+            with part.open("rb") as src, archive.open(f"{service}.json", "w", force_zip64=True) as dst:
+                shutil.copyfileobj(src, dst, COPY_CHUNK)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(COPY_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def run_export_job(job_id: UUID) -> None:
+    job = BffDsarJob.objects.filter(id=job_id).first()
+    if job is None or not job.is_active:
+        return
+    try:
+        _run_export(job, UpstreamContext.from_job(job))
+    except Exception:  # a crashed job must not stay "running"
+        logger.exception("DSAR export job failed", extra={"job_id": str(job_id)})
+        _finish(job, BffDsarJob.Status.FAILED, error="internal_error")
+
+
+def _run_export(job: BffDsarJob, upstream: UpstreamContext) -> None:
+    calls = dsar_upstream_calls(job.user_id, "export")
+
+    with tempfile.TemporaryDirectory(prefix="bff-dsar-") as workdir:
+        parts = Path(workdir)
+        services: dict[str, dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="bff-dsar-fetch") as pool:
+            futures = {
+                pool.submit(_fetch_bundle, service, setting_name, path, upstream, parts / f"{service}.json"): service
+                for service, setting_name, path in calls
+            }
+            for future in as_completed(futures):
+                service = futures[future]
+                try:
+                    services[service] = future.result()
+                except DsarUpstreamError as exc:
+                    services[service] = {"status": "failed", "detail": exc.detail}
+                except _FETCH_ERRORS:
+                    logger.warning(
+                        "DSAR export upstream unavailable",
+                        extra={"service": service, "job_id": str(job.id)},
+                        exc_info=True,
+                    )
+                    services[service] = {"status": "failed", "detail": "unavailable"}
+                job.services = dict(sorted(services.items()))
+                _save_progress(job)
+
+        failed = sorted(name for name, result in services.items() if result["status"] == "failed")
+        if failed:
+            _finish(job, BffDsarJob.Status.FAILED, error="upstream_failed: " + ", ".join(failed))
+            return
+
+        archive = parts / "export.zip"
+        _write_archive(archive, job, services, parts)
+        storage = export_storage()
+        with archive.open("rb") as fh:
+            name = storage.save(f"{job.tenant_id}/{job.id}.zip", File(fh))
+        job.artifact_name = name
+        job.artifact_size = archive.stat().st_size
+        job.artifact_sha256 = _sha256(archive)
+
+    if not _finish(job, BffDsarJob.Status.SUCCEEDED):
+        storage.delete(name)
+        return
+
+    try:
+        from .audit import log_audit_event as _log_audit
+
+        _log_audit(
+            tenant_id=job.tenant_id,
+            actor_user_id=job.user_id,
+            action="dsar.exported",
+            target_type="dsar_bundle",
+            target_id="self",
+            metadata={
+                "subject_scope": "self",
+                "job_id": str(job.id),
+                "services_exported": sorted(["bff", *services]),
+            },
+            request_id=job.request_id,
+            sync=True,
+        )
+    except Exception:
+        logger.warning("Failed to write dsar.exported audit event", exc_info=True)
+
+
+def _erase_once(
+    service: str,
+    setting_name: str,
+    upstream_path: str,
+    upstream: UpstreamContext,
+    query_string: str = "",
+) -> dict[str, Any] | None:
+    """POST one erase call; None when the upstream is not configured."""
+    base_url = getattr(settings, setting_name, "")
+    if not base_url:
+        return None
+    resp = proxy_request(
+        upstream_base_url=base_url,
+        upstream_path=upstream_path,
+        method="POST",
+        query_string=query_string,
+        body=b"",
+        incoming_headers=upstream.incoming_headers,
+        context_headers=upstream.context_headers,
+        request_id=upstream.request_id,
+    )
+    if resp.status_code != 200:
+        raise DsarUpstreamError(service, f"status {resp.status_code}")
+    try:
+        payload = resp.json()
+    except ValueError:
+        payload = {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _erase_service(
+    job: BffDsarJob,
+    service: str,
+    setting_name: str,
+    upstream_path: str,
+    upstream: UpstreamContext,
+) -> dict[str, Any]:
+    if service not in CHUNKED_ERASE_SERVICES:
+        payload = _erase_once(service, setting_name, upstream_path, upstream)
+        if payload is None:
+            return {"status": "skipped", "reason": "upstream_not_configured"}
+        return {"status": "done", "counts": payload.get("counts") or {}}
+
+    # Each call erases for up to ``max_seconds`` and commits its progress
+    # upstream; a retried job continues where the last call stopped.
+    path = upstream_path.rsplit("/", 1)[0] + "/erasure"
+    query = f"max_seconds={_setting('BFF_DSAR_ERASE_SLICE_SECONDS', 10):g}"
+    deadline = time.monotonic() + _setting("BFF_DSAR_ERASE_MAX_SECONDS", 600)
+    while True:
+        if time.monotonic() >= deadline:
+            raise DsarUpstreamError(service, "deadline exceeded")
+        payload = _erase_once(service, setting_name, path, upstream, query)
+        if payload is None:
+            return {"status": "skipped", "reason": "upstream_not_configured"}
+        result = {
+            "status": "done" if payload.get("status") == "completed" else "running",
+            "step": payload.get("step"),
+            "counts": payload.get("counts") or {},
+        }
+        if result["status"] == "done":
+            return result
+        job.services = {**(job.services or {}), service: result}
+        _save_progress(job)
+
+
+def run_erase_job(job_id: UUID) -> None:
+    job = BffDsarJob.objects.filter(id=job_id).first()
+    if job is None or not job.is_active:
+        return
+    try:
+        _run_erase(job, UpstreamContext.from_job(job))
+    except Exception:  # a crashed job must not stay "running"
+        logger.exception("DSAR erase job failed", extra={"job_id": str(job_id)})
+        _finish(job, BffDsarJob.Status.FAILED, error="internal_error")
+
+
+def _run_erase(job: BffDsarJob, upstream: UpstreamContext) -> None:
+    # Services are erased one after another, in the same order as
+    # ``DELETE /account/me``, and the job stops at the first failure.
+    services: dict[str, dict[str, Any]] = {}
+    for service, setting_name, path in dsar_upstream_calls(job.user_id, "erase"):
+        try:
+            services[service] = _erase_service(job, service, setting_name, path, upstream)
+        except DsarUpstreamError as exc:
+            services[service] = {"status": "failed", "detail": exc.detail}
+        except _FETCH_ERRORS:
+            logger.warning(
+                "DSAR erase upstream unavailable",
+                extra={"service": service, "job_id": str(job.id)},
+                exc_info=True,
+            )
+            services[service] = {"status": "failed", "detail": "unavailable"}
+        job.services = dict(services)
+        _save_progress(job)
+        if services[service]["status"] == "failed":
+            _finish(job, BffDsarJob.Status.FAILED, error=f"upstream_failed: {service}")
+            return
+
+    if not _finish(job, BffDsarJob.Status.SUCCEEDED):
+        return
+
+    try:
+        from .audit import log_audit_event as _log_audit
+
+        _log_audit(
+            tenant_id=job.tenant_id,
+            actor_user_id=job.user_id,
+            action="dsar.erased",
+            target_type="dsar_request",
+            target_id="self",
+            metadata={
+                "subject_scope": "self",
+                "job_id": str(job.id),
+                "services_erased": sorted(name for name, item in services.items() if item["status"] == "done"),
+            },
+            request_id=job.request_id,
+            sync=True,
+        )
+    except Exception:
+        logger.warning("Failed to write dsar.erased audit event", exc_info=True)
+
+
+# =========================
+# Download
+# =========================
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Inclusive ``(start, end)`` of a single ``bytes=`` range, or None to send
+    the whole file (no header, a multi-range or a malformed one).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, sep, last = header[len("bytes="):].strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first:
+            start = int(first)
+            end = int(last) if last else size - 1
+        else:
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable
+            start, end = max(size - suffix, 0), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_file(fh: IO[bytes], start: int, length: int) -> Iterator[bytes]:
+    try:
+        fh.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = fh.read(min(COPY_CHUNK, remaining))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        fh.close()
+
+
+def download_response(request: HttpRequest, job: BffDsarJob) -> HttpResponse:
+    """Stream the archive of a finished job, honouring ``Range``/``If-Range``."""
+    size = job.artifact_size
+    etag = quote_etag(job.artifact_sha256[:32])
+    byte_range = None
+    if_range = request.headers.get("If-Range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            resp = HttpResponse(status=416)
+            resp["Content-Range"] = f"bytes */{size}"
+            return resp
+
+    fh = export_storage().open(job.artifact_name, "rb")
+    if byte_range is None:
+        resp = StreamingHttpResponse(_iter_file(fh, 0, size), content_type="application/zip")
+        resp["Content-Length"] = str(size)
+    else:
+        start, end = byte_range
+        resp = StreamingHttpResponse(
+            _iter_file(fh, start, end - start + 1),
+            status=206,
+            content_type="application/zip",
+        )
+        resp["Content-Length"] = str(end - start + 1)
+        resp["Content-Range"] = f"bytes {start}-{end}/{size}"
+    resp["Accept-Ranges"] = "bytes"
+    resp["ETag"] = etag
+    resp["Cache-Control"] = "private, no-store"
+    filename = f"dsar-export-{job.created_at:%Y%m%d}-{str(job.id)[:8]}.zip"
+    resp["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return resp
+
+
+# =========================
+# Retention
+# =========================
+def purge_expired_jobs(*, now=None) -> int:
+    """Delete finished jobs past ``expires_at`` together with their archives."""
+    now = now or timezone.now()
+    storage: Storage | None = None
+    deleted = 0
+    for job in BffDsarJob.objects.filter(expires_at__lt=now).order_by("expires_at", "id").iterator():
+        if job.artifact_name:
+            # Only jobs with an archive need the storage; without one
+            # configured no archive can exist and this raises loudly.
+            storage = storage or export_storage()
+            storage.delete(job.artifact_name)
+        job.delete()
+        deleted += 1
+    return deleted
+
+
+def delete_user_jobs(*, tenant_id: UUID | str, user_id: UUID | str) -> dict[str, int]:
+    """Delete every job of the user and its archive (the user's erasure)."""
+    jobs = list(BffDsarJob.objects.filter(tenant_id=tenant_id, user_id=user_id).order_by("created_at"))
+    archives = [job.artifact_name for job in jobs if job.artifact_name]
+    if archives:
+        storage = export_storage()
+        for name in archives:
+            storage.delete(name)
+    BffDsarJob.objects.filter(id__in=[job.id for job in jobs]).delete()
+    return {"dsar_jobs_deleted": len(jobs), "dsar_archives_deleted": len(archives)}
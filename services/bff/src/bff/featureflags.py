@@ -0,0 +1,155 @@
+"""
+Process-local copy of the featureflags snapshot.
+
+The featureflags service versions its snapshot; ``GET /flags/evaluate`` with
+``since=<version>`` answers 304 or only the changed flags. The BFF keeps the
+last snapshot in memory and refreshes it in a background thread at most every
+``BFF_FEATUREFLAGS_REFRESH_SECONDS``, so ``/session/me`` reads flags without a
+network hop. Only the very first read in a process fetches inline.
+
+``apply_event`` accepts ``feature_flag.*`` outbox payloads (which carry the
+flag's new ``version``) as a push channel: the next version in sequence is
+applied in place, anything else marks the copy stale.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+FlagsFetch = Callable[[int | None], httpx.Response]
+
+_FETCH_ERRORS = (httpx.HTTPError, RuntimeError, TypeError, ValueError)
+
+
+def _parse_flags(raw: Any) -> dict[str, bool] | None:
+    if not isinstance(raw, dict):
+        return None
+    return {str(key): bool(value) for key, value in raw.items() if isinstance(key, str)}
+
+
+class FeatureFlagsClient:
+    def __init__(self, *, refresh_seconds: float) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._flags: dict[str, bool] | None = None
+        self._version = 0
+        self._fetched_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def snapshot(self, fetch: FlagsFetch) -> dict[str, bool]:
+        """Current flags; schedules a background refresh when the copy is stale."""
+        with self._lock:
+            flags = self._flags
+            stale = time.monotonic() - self._fetched_at >= self.refresh_seconds
+            start_refresh = flags is not None and stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+
+        if flags is None:
+            self.refresh(fetch)
+            with self._lock:
+                return dict(self._flags or {})
+
+        if start_refresh:
+            threading.Thread(
+                target=self._refresh_in_background,
+                args=(fetch,),
+                name="bff-featureflags-refresh",
+                daemon=True,
+            ).start()
+        return dict(flags)
+
+    def refresh(self, fetch: FlagsFetch) -> bool:
+        """Fetch a delta (or full snapshot) and apply it. Returns False on failure."""
+        with self._lock:
+            since = self._version if self._flags is not None and self._version else None
+        try:
+            resp = fetch(since)
+            if resp.status_code == 304:
+                with self._lock:
+                    self._fetched_at = time.monotonic()
+                return True
+            if resp.status_code != 200:
+                logger.warning(
+                    "feature flags refresh returned non-200",
+                    extra={"status_code": resp.status_code},
+                )
+                return False
+            data = resp.json()
+        except _FETCH_ERRORS:
+            logger.warning("feature flags refresh failed", exc_info=True)
+            return False
+
+        flags = _parse_flags(data.get("feature_flags")) if isinstance(data, dict) else None
+        if flags is None:
+            return False
+        version = data.get("version")
+        version = version if isinstance(version, int) and not isinstance(version, bool) else 0
+        is_delta = bool(data.get("delta"))
+
+        with self._lock:
+            if is_delta:
+                if self._flags is None or since != self._version:
+                    # Our copy moved (or vanished) while the request was in
+                    # flight; refetch on the next read.
+                    self._fetched_at = 0.0
+                    return False
+                merged = dict(self._flags)
+                merged.update(flags)
+                flags = merged
+            if self._flags is not None and version and version < self._version:
+                return True
+            self._flags = flags
+            self._version = version
+            self._fetched_at = time.monotonic()
+        return True
+
+    def _refresh_in_background(self, fetch: FlagsFetch) -> None:
+        try:
+            self.refresh(fetch)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def apply_event(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Apply a ``feature_flag.created``/``feature_flag.updated`` outbox payload."""
+        if not event_type.startswith("feature_flag."):
+            return
+        key = payload.get("flag_key")
+        version = payload.get("version")
+        if not isinstance(key, str) or not isinstance(version, int):
+            return
+        with self._lock:
+            if self._flags is None or version <= self._version:
+                return
+            if version != self._version + 1:
+                self._fetched_at = 0.0
+                return
+            rollout = payload.get("rollout")
+            enabled = bool(payload.get("enabled")) and isinstance(rollout, int) and rollout > 0
+            self._flags = {**self._flags, key: enabled}
+            self._version = version
+
+    def reset(self) -> None:
+        with self._lock:
+            self._flags = None
+            self._version = 0
+            self._fetched_at = 0.0
+
+
+feature_flags_client = FeatureFlagsClient(
+    refresh_seconds=float(getattr(settings, "BFF_FEATUREFLAGS_REFRESH_SECONDS", 30)),
+)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from bff.dsar_jobs import process_pending_jobs
+
+
+class Command(BaseCommand):
+    help = "Run queued DSAR export and erase jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Maximum number of jobs to run in this invocation",
+        )
+
+    def handle(self, *args, **options):
+        payload = process_pending_jobs(limit=int(options["limit"]))
+        self.stdout.write(json.dumps(payload, sort_keys=True))
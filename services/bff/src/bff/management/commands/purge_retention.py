@@ -6,6 +6,7 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 
 from bff.dsar import purge_retention
+from bff.retention import RetentionPurge, add_purge_arguments
 
 
 class Command(BaseCommand):
@@ -24,10 +25,12 @@ class Command(BaseCommand):
             default=int(getattr(settings, "BFF_RETENTION_AUDIT_DAYS", 365)),
             help="Retention window for BFF audit events in days",
         )
+        add_purge_arguments(parser)
 
     def handle(self, *args, **options):
         payload = purge_retention(
             session_days=int(options["session_days"]),
             audit_days=int(options["audit_days"]),
+            purge=RetentionPurge.from_options(options),
         )
         self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:11
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bff", "0004_session_state_and_runtime_tables"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BffDsarJob",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("user_id", models.UUIDField()),
+                ("kind", models.CharField(choices=[("export", "Export")], max_length=16)),
+                ("status", models.CharField(choices=[("pending", "Pending"), ("running", "Running"), ("succeeded", "Succeeded"), ("failed", "Failed")], default="pending", max_length=16)),
+                ("services", models.JSONField(blank=True, default=dict)),
+                ("artifact_name", models.CharField(blank=True, default="", max_length=255)),
+                ("artifact_size", models.BigIntegerField(default=0)),
+                ("artifact_sha256", models.CharField(blank=True, default="", max_length=64)),
+                ("error", models.CharField(blank=True, default="", max_length=255)),
+                ("request_id", models.CharField(blank=True, default="", max_length=64)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("expires_at", models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                "verbose_name": "BFF DSAR job",
+                "verbose_name_plural": "BFF DSAR jobs",
+                "db_table": "bff_dsar_job",
+                "indexes": [models.Index(fields=["tenant_id", "user_id", "kind", "-created_at"], name="bff_dsar_job_subject_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bff", "0005_dsar_job"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="bffdsarjob",
+            name="kind",
+            field=models.CharField(choices=[("export", "Export"), ("erase", "Erase")], max_length=16),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bff", "0006_dsar_erase_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bffdsarjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="bffdsarjob",
+            name="upstream",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddIndex(
+            model_name="bffdsarjob",
+            index=models.Index(fields=["status", "created_at"], name="bff_dsar_job_queue_idx"),
+        ),
+    ]
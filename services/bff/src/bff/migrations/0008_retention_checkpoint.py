@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bff", "0007_dsar_job_queue"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RetentionCheckpoint",
+            fields=[
+                ("name", models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ("started_at", models.DateTimeField()),
+                ("targets", models.JSONField(blank=True, default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "BFF retention checkpoint",
+                "verbose_name_plural": "BFF retention checkpoints",
+                "db_table": "bff_retention_checkpoint",
+            },
+        ),
+    ]
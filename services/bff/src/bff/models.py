@@ -68,13 +68,80 @@ class BffRateLimitWindow(models.Model):
         db_table = "bff_rate_limit_window"
 
 
+class BffDsarJob(models.Model):
+    """A DSAR request handled in the background (see bff.dsar_jobs)."""
+
+    class Kind(models.TextChoices):
+        EXPORT = "export", "Export"
+        ERASE = "erase", "Erase"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tenant_id = models.UUIDField()
+    user_id = models.UUIDField()
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    # Per-service outcome, e.g. {"portal": {"status": "done", "bytes": 1234}}.
+    services = models.JSONField(default=dict, blank=True)
+    artifact_name = models.CharField(max_length=255, blank=True, default="")
+    artifact_size = models.BigIntegerField(default=0)
+    artifact_sha256 = models.CharField(max_length=64, blank=True, default="")
+    error = models.CharField(max_length=255, blank=True, default="")
+    request_id = models.CharField(max_length=64, blank=True, default="")
+    # Headers of the request that queued the job, replayed to the upstreams.
+    upstream = models.JSONField(default=dict, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        verbose_name = "BFF DSAR job"
+        verbose_name_plural = "BFF DSAR jobs"
+        db_table = "bff_dsar_job"
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "user_id", "kind", "-created_at"],
+                name="bff_dsar_job_subject_idx",
+            ),
+            models.Index(fields=["status", "created_at"], name="bff_dsar_job_queue_idx"),
+        ]
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in {self.Status.PENDING, self.Status.RUNNING}
+
+
+class RetentionCheckpoint(models.Model):
+    """Progress of a resumable ``purge_retention`` run (see bff.retention)."""
+
+    name = models.CharField(max_length=128, primary_key=True)
+    started_at = models.DateTimeField()
+    # Per-target progress: {"sessions": {"deleted": 10, "last_key": [...], ...}}.
+    targets = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "BFF retention checkpoint"
+        verbose_name_plural = "BFF retention checkpoints"
+        db_table = "bff_retention_checkpoint"
+
+
 # Audit model lives in bff.audit but must be discoverable by Django.
 from bff.audit import BffAuditEvent
 
 __all__ = [
     "BffAuditEvent",
+    "BffDsarJob",
     "BffOauthState",
     "BffRateLimitWindow",
     "BffSession",
+    "RetentionCheckpoint",
     "Tenant",
 ]
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import asyncio
 import threading
 import time
-from collections.abc import Callable, Iterable, Mapping
+import weakref
+from collections.abc import AsyncIterator, Callable, Iterable, Mapping
 from urllib.parse import urlparse
 
 import httpx
@@ -12,6 +14,11 @@ from .security import sign_internal_request
 
 _TOKEN_LOCK = threading.Lock()
 _TOKEN_CACHE: dict[str, str | float] = {"token": "", "expires_at": 0.0}
+# One pooled AsyncClient per event loop: under ASGI that is a single client
+# for the whole process; the weak key drops clients of short-lived loops.
+_ASYNC_CLIENTS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient] = (
+    weakref.WeakKeyDictionary()
+)
 
 
 def _filtered_request_headers(
@@ -44,6 +51,23 @@ def get_httpx_client(timeout: float | None = None) -> httpx.Client:
     return httpx.Client(timeout=timeout, follow_redirects=False)
 
 
+def get_async_httpx_client() -> httpx.AsyncClient:
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            follow_redirects=False,
+            limits=httpx.Limits(
+                max_connections=int(getattr(settings, "BFF_ASYNC_PROXY_MAX_CONNECTIONS", 2000)),
+                max_keepalive_connections=int(
+                    getattr(settings, "BFF_ASYNC_PROXY_MAX_KEEPALIVE_CONNECTIONS", 100)
+                ),
+            ),
+        )
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
 def _normalize_base_url(url: str) -> str:
     return url.rstrip("/")
 
@@ -95,7 +119,7 @@ def _get_iam_token() -> str:
         return token
 
 
-def proxy_request(
+def _build_upstream_request(
     *,
     upstream_base_url: str,
     upstream_path: str,
@@ -105,17 +129,16 @@ def proxy_request(
     incoming_headers: Mapping[str, str],
     context_headers: dict[str, str],
     request_id: str,
-    stream: bool = False,
-    timeout: float | None = None,
-) -> httpx.Response | tuple[httpx.Response, Callable[[], Iterable[bytes]], Callable[[], None]]:
+    iam_token: str | None,
+) -> tuple[str, dict[str, str]]:
     url = upstream_base_url.rstrip("/") + "/" + upstream_path.lstrip("/")
     if query_string:
         url = url + ("&" if "?" in url else "?") + query_string
 
     headers = _filtered_request_headers(incoming_headers)
     headers.update(context_headers)
-    if _requires_private_invoke_auth(upstream_base_url):
-        headers["Authorization"] = f"Bearer {_get_iam_token()}"
+    if iam_token:
+        headers["Authorization"] = f"Bearer {iam_token}"
 
     # signed_path must match the actual path that the target service sees.
     # Extract the path portion from the URL we're actually sending.
@@ -131,6 +154,33 @@ def proxy_request(
     )
     headers["X-Updspace-Timestamp"] = signed.timestamp
     headers["X-Updspace-Signature"] = signed.signature
+    return url, headers
+
+
+def proxy_request(
+    *,
+    upstream_base_url: str,
+    upstream_path: str,
+    method: str,
+    query_string: str,
+    body: bytes,
+    incoming_headers: Mapping[str, str],
+    context_headers: dict[str, str],
+    request_id: str,
+    stream: bool = False,
+    timeout: float | None = None,
+) -> httpx.Response | tuple[httpx.Response, Callable[[], Iterable[bytes]], Callable[[], None]]:
+    url, headers = _build_upstream_request(
+        upstream_base_url=upstream_base_url,
+        upstream_path=upstream_path,
+        method=method,
+        query_string=query_string,
+        body=body,
+        incoming_headers=incoming_headers,
+        context_headers=context_headers,
+        request_id=request_id,
+        iam_token=_get_iam_token() if _requires_private_invoke_auth(upstream_base_url) else None,
+    )
 
     if stream:
         client = get_httpx_client(timeout=None)
@@ -166,3 +216,63 @@ def proxy_request(
         # to avoid issues with accessing response data after client closes
         resp.read()
         return resp
+
+
+async def async_proxy_request(
+    *,
+    upstream_base_url: str,
+    upstream_path: str,
+    method: str,
+    query_string: str,
+    body: bytes,
+    incoming_headers: Mapping[str, str],
+    context_headers: dict[str, str],
+    request_id: str,
+    stream: bool = False,
+    timeout: float | None = None,
+) -> httpx.Response | tuple[httpx.Response, AsyncIterator[bytes]]:
+    """
+    Non-blocking counterpart of :func:`proxy_request` for the ASGI path.
+
+    Uses the process-wide pooled :class:`httpx.AsyncClient`, so an idle
+    stream holds a socket but no thread. With ``stream=True`` the returned
+    iterator relays upstream chunks as the client consumes them (the ASGI
+    server awaits each send, which gives backpressure) and releases the
+    connection when exhausted, cancelled on disconnect or closed; callers
+    that do not iterate must ``await resp.aclose()``.
+    """
+    iam_token = None
+    if _requires_private_invoke_auth(upstream_base_url):
+        iam_token = await asyncio.to_thread(_get_iam_token)
+    url, headers = _build_upstream_request(
+        upstream_base_url=upstream_base_url,
+        upstream_path=upstream_path,
+        method=method,
+        query_string=query_string,
+        body=body,
+        incoming_headers=incoming_headers,
+        context_headers=context_headers,
+        request_id=request_id,
+        iam_token=iam_token,
+    )
+    connect_timeout = float(getattr(settings, "BFF_PROXY_TIMEOUT_SECONDS", 10))
+    client = get_async_httpx_client()
+    upstream_request = client.build_request(
+        method=method,
+        url=url,
+        content=body,
+        headers=headers,
+        timeout=httpx.Timeout(connect_timeout, read=None if stream else (timeout or connect_timeout)),
+    )
+    resp = await client.send(upstream_request, stream=stream)
+    if not stream:
+        return resp
+
+    async def iterator() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in resp.aiter_bytes():
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    return resp, iterator()
@@ -5,22 +5,37 @@ import hmac
 import importlib
 import json
 import os
+import shutil
 import sys
+import tempfile
 import uuid
+import zipfile
 from datetime import timedelta
-from io import StringIO
+from io import BytesIO, StringIO
+from typing import ClassVar
 from unittest.mock import MagicMock, patch
 
 import httpx
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
-from django.test import Client, RequestFactory, SimpleTestCase, TestCase
+from django.db import DatabaseError, transaction
+from django.test import (
+    AsyncClient,
+    Client,
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
 from django.utils import timezone
 from ninja.errors import HttpError
 
+from bff import dsar_jobs
 from bff import proxy as proxy_module
-from bff.models import BffOauthState, BffRateLimitWindow, BffSession, Tenant
+from bff.dsar import erase_user_data as erase_bff_user_data
+from bff.featureflags import FeatureFlagsClient, feature_flags_client
+from bff.models import BffDsarJob, BffOauthState, BffRateLimitWindow, BffSession, Tenant
 from bff.proxy import proxy_request
 from bff.security import require_internal_signature, sign_internal_request
 from bff.session_store import SessionStore
@@ -168,6 +183,110 @@ class BffProxyRoutingTests(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(captured["upstream_path"], "flags")
 
+    def test_calendar_feed_is_public_and_forwards_conditional_headers(self):
+        captured: dict[str, object] = {}
+
+        def _mocked_proxy(*, upstream_path, query_string, context_headers, **kwargs):
+            captured["upstream_path"] = upstream_path
+            captured["query_string"] = query_string
+            captured["context_headers"] = context_headers
+            return httpx.Response(304, headers={"ETag": '"abc"'})
+
+        with (
+            self.settings(BFF_UPSTREAM_EVENTS_URL="http://events:8004/api/v1"),
+            patch("bff.api.proxy_request", side_effect=_mocked_proxy),
+        ):
+            resp = self.client.get(
+                "/api/v1/events/calendar.ics?token=t0ken",
+                HTTP_HOST=self.host,
+                HTTP_IF_NONE_MATCH='"abc"',
+            )
+
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp["ETag"], '"abc"')
+        self.assertEqual(captured["upstream_path"], "calendar.ics")
+        self.assertEqual(captured["query_string"], "token=t0ken")
+        self.assertEqual(captured["context_headers"]["If-None-Match"], '"abc"')
+        self.assertNotIn("X-User-Id", captured["context_headers"])
+
+
+class BffAsyncStreamProxyTests(TestCase):
+    def setUp(self):
+        self.tenant = Tenant.objects.create(slug="aef")
+        self.session = SessionStore().create(
+            tenant_id=str(self.tenant.id),
+            user_id=str(uuid.uuid4()),
+            master_flags={"email_verified": True},
+            ttl=timedelta(minutes=10),
+        )
+        # AsyncClient always sends Host: testserver, so use path-based tenancy.
+        SessionStore().set_active_tenant(
+            self.session.session_id,
+            tenant_id=str(self.tenant.id),
+            tenant_slug=self.tenant.slug,
+        )
+        self.client = AsyncClient()
+        self.client.cookies["updspace_session"] = self.session.session_id
+
+    def _upstream(self, handler):
+        return patch(
+            "bff.proxy.get_async_httpx_client",
+            side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+
+    async def test_sse_is_relayed_through_async_client(self):
+        seen: dict[str, str] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["path"] = request.url.path
+            seen["signature"] = request.headers.get("X-Updspace-Signature", "")
+            return httpx.Response(
+                200,
+                headers={"content-type": "text/event-stream", "cache-control": "no-cache"},
+                content=b"event: ping\ndata: 1\n\n",
+            )
+
+        with (
+            self.settings(BFF_UPSTREAM_FEED_URL="http://activity:8006/api/v1"),
+            self._upstream(handler),
+            patch("bff.api.proxy_request") as sync_proxy,
+        ):
+            resp = await self.client.get(
+                "/api/v1/activity/feed/sse",
+                headers={"accept": "text/event-stream"},
+            )
+            body = b"".join([chunk async for chunk in resp.streaming_content])
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Cache-Control"], "no-cache")
+        self.assertEqual(body, b"event: ping\ndata: 1\n\n")
+        self.assertEqual(seen["path"], "/api/v1/feed/sse")
+        self.assertTrue(seen["signature"])
+        sync_proxy.assert_not_called()
+
+    async def test_upstream_error_on_stream_maps_to_error_shape(self):
+        with (
+            self.settings(BFF_UPSTREAM_FEED_URL="http://activity:8006/api/v1"),
+            self._upstream(lambda request: httpx.Response(403, json={"code": "FORBIDDEN"})),
+        ):
+            resp = await self.client.get(
+                "/api/v1/activity/feed/unread-count/long-poll",
+            )
+
+        self.assertEqual(resp.status_code, 403)
+        payload = json.loads(resp.content)
+        self.assertEqual(payload["error"]["code"], "UPSTREAM_ERROR")
+
+    async def test_regular_requests_keep_sync_proxy_path(self):
+        with (
+            self.settings(BFF_UPSTREAM_FEED_URL="http://activity:8006/api/v1"),
+            patch("bff.api.proxy_request", return_value=httpx.Response(200, json={"items": []})) as sync_proxy,
+        ):
+            resp = await self.client.get("/api/v1/activity/feed")
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(sync_proxy.call_args.kwargs["upstream_path"], "feed")
+
 
 class BffApplicationApproveProvisioningTests(TestCase):
     def setUp(self):
@@ -523,8 +642,394 @@ class BffAccountDeletionTests(TestCase):
         )
 
 
+class BffDsarExportJobTests(TestCase):
+    UPSTREAMS: ClassVar[dict[str, str]] = {
+        "BFF_UPSTREAM_PORTAL_URL": "http://portal:8003/api/v1",
+        "BFF_UPSTREAM_FEED_URL": "http://activity:8006/api/v1",
+        "BFF_UPSTREAM_ACCESS_URL": "http://access:8002/api/v1",
+        "BFF_UPSTREAM_EVENTS_URL": "http://events:8005/api/v1",
+        "BFF_UPSTREAM_GAMIFICATION_URL": "http://gamification:8007/api/v1",
+        "BFF_UPSTREAM_VOTING_URL": "http://voting:8004/api/v1",
+    }
+
+    def setUp(self):
+        self.export_dir = tempfile.mkdtemp(prefix="bff-dsar-test-")
+        self.addCleanup(shutil.rmtree, self.export_dir, True)
+        self.storages = {
+            **settings.STORAGES,
+            "dsar_exports": {
+                "BACKEND": "django.core.files.storage.FileSystemStorage",
+                "OPTIONS": {"location": self.export_dir},
+            },
+        }
+        self.client = Client()
+        self.tenant = Tenant.objects.create(slug="aef")
+        self.user_id = str(uuid.uuid4())
+        session = SessionStore().create(
+            tenant_id=str(self.tenant.id),
+            user_id=self.user_id,
+            master_flags={"email_verified": True},
+            ttl=timedelta(minutes=10),
+        )
+        self.client.cookies["updspace_session"] = session.session_id
+        self.host = "aef.updspace.com"
+        self.failing_services: set[str] = set()
+        self.calls: list[str] = []
+
+    def _mocked_proxy(
+        self,
+        *,
+        upstream_base_url,
+        upstream_path,
+        method,
+        query_string,
+        body,
+        incoming_headers,
+        context_headers,
+        request_id,
+        stream=False,
+        timeout=None,
+    ):
+        service = upstream_base_url.split("//", 1)[1].split(":", 1)[0]
+        self.calls.append(service)
+        self.assertTrue(stream)
+        self.assertEqual(context_headers["X-User-Id"], self.user_id)
+        if service in self.failing_services:
+            return httpx.Response(503), lambda: iter(()), lambda: None
+        chunks = [b'{"service": "', service.encode(), b'", "items": [', b"1, " * 2000, b"1]}"]
+        return httpx.Response(200), lambda: iter(chunks), lambda: None
+
+    def _start_job(self):
+        with self.settings(
+            BFF_TENANT_HOST_SUFFIX="updspace.com",
+            BFF_DSAR_JOBS_EAGER=True,
+            STORAGES=self.storages,
+            **self.UPSTREAMS,
+        ), patch("bff.dsar_jobs.proxy_request", side_effect=self._mocked_proxy), self.captureOnCommitCallbacks(
+            execute=True
+        ):
+            resp = self.client.post(
+                "/api/v1/account/me/export/jobs",
+                HTTP_HOST=self.host,
+                HTTP_X_CSRF_TOKEN="csrf-token",
+            )
+        self.assertEqual(resp.status_code, 202)
+        return resp.json()["id"]
+
+    def _get(self, path, **extra):
+        with self.settings(BFF_TENANT_HOST_SUFFIX="updspace.com", STORAGES=self.storages):
+            return self.client.get(f"/api/v1/account/me/export/jobs/{path}", HTTP_HOST=self.host, **extra)
+
+    def test_export_job_builds_zip_archive(self):
+        job_id = self._start_job()
+
+        status = self._get(job_id).json()
+        self.assertEqual(status["status"], "succeeded")
+        self.assertEqual(status["download_path"], f"/account/me/export/jobs/{job_id}/download")
+        self.assertEqual(
+            sorted(self.calls),
+            ["access", "activity", "events", "gamification", "portal", "voting"],
+        )
+
+        resp = self._get(f"{job_id}/download")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["Accept-Ranges"], "bytes")
+        body = b"".join(resp.streaming_content)
+        self.assertEqual(len(body), status["size"])
+        with zipfile.ZipFile(BytesIO(body)) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()),
+                sorted(["manifest.json", "bff.json", "portal.json", "activity.json", "access.json",
+                        "events.json", "gamification.json", "voting.json"]),
+            )
+            self.assertEqual(json.loads(archive.read("voting.json"))["service"], "voting")
+            manifest = json.loads(archive.read("manifest.json"))
+            self.assertEqual(manifest["user_id"], self.user_id)
+            self.assertEqual(manifest["services"]["portal"]["status"], "done")
+
+        from bff.audit import BffAuditEvent
+
+        audit = BffAuditEvent.objects.get(action="dsar.exported")
+        self.assertEqual(audit.metadata["job_id"], job_id)
+
+    def test_download_supports_ranges(self):
+        job_id = self._start_job()
+        full = b"".join(self._get(f"{job_id}/download").streaming_content)
+        etag = BffDsarJob.objects.get(id=job_id).artifact_sha256[:32]
+
+        partial = self._get(f"{job_id}/download", HTTP_RANGE="bytes=10-19")
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial["Content-Range"], f"bytes 10-19/{len(full)}")
+        self.assertEqual(b"".join(partial.streaming_content), full[10:20])
+
+        tail = self._get(f"{job_id}/download", HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(tail.streaming_content), full[-5:])
+
+        resumed = self._get(f"{job_id}/download", HTTP_RANGE="bytes=100-", HTTP_IF_RANGE=f'"{etag}"')
+        self.assertEqual(resumed.status_code, 206)
+        self.assertEqual(b"".join(resumed.streaming_content), full[100:])
+
+        changed = self._get(f"{job_id}/download", HTTP_RANGE="bytes=100-", HTTP_IF_RANGE='"other"')
+        self.assertEqual(changed.status_code, 200)
+
+        outside = self._get(f"{job_id}/download", HTTP_RANGE=f"bytes={len(full)}-")
+        self.assertEqual(outside.status_code, 416)
+        self.assertEqual(outside["Content-Range"], f"bytes */{len(full)}")
+
+    def test_upstream_failure_fails_job(self):
+        self.failing_services = {"events"}
+        job_id = self._start_job()
+
+        status = self._get(job_id).json()
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["services"]["events"], {"status": "failed", "detail": "status 503"})
+        self.assertIsNone(status["download_path"])
+        self.assertEqual(self._get(f"{job_id}/download").status_code, 409)
+
+    def test_active_job_is_reused(self):
+        with self.settings(BFF_TENANT_HOST_SUFFIX="updspace.com", STORAGES=self.storages):
+            first = self.client.post("/api/v1/account/me/export/jobs", HTTP_HOST=self.host)
+            second = self.client.post("/api/v1/account/me/export/jobs", HTTP_HOST=self.host)
+
+        self.assertEqual(first.json()["status"], "pending")
+        self.assertEqual(first.json()["id"], second.json()["id"])
+
+    def test_export_requires_shared_storage(self):
+        storages_without_exports = {k: v for k, v in settings.STORAGES.items() if k != "dsar_exports"}
+        with self.settings(BFF_TENANT_HOST_SUFFIX="updspace.com", STORAGES=storages_without_exports):
+            resp = self.client.post("/api/v1/account/me/export/jobs", HTTP_HOST=self.host)
+            with self.assertRaises(ImproperlyConfigured):
+                dsar_jobs.export_storage()
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp.json()["error"]["code"], "DSAR_EXPORT_UNAVAILABLE")
+        self.assertFalse(BffDsarJob.objects.exists())
+
+    def test_queued_job_is_run_by_the_task(self):
+        with self.settings(BFF_TENANT_HOST_SUFFIX="updspace.com", STORAGES=self.storages), (
+            self.captureOnCommitCallbacks(execute=True)
+        ):
+            job_id = self.client.post(
+                "/api/v1/account/me/export/jobs",
+                HTTP_HOST=self.host,
+                HTTP_USER_AGENT="dsar-test",
+            ).json()["id"]
+        self.assertEqual(BffDsarJob.objects.get(id=job_id).status, BffDsarJob.Status.PENDING)
+        self.assertEqual(self.calls, [])
+
+        out = StringIO()
+        with self.settings(STORAGES=self.storages, **self.UPSTREAMS), patch(
+            "bff.dsar_jobs.proxy_request", side_effect=self._mocked_proxy
+        ):
+            call_command("process_dsar_jobs", stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue()), {"abandoned": 0, "processed": 1})
+        job = BffDsarJob.objects.get(id=job_id)
+        self.assertEqual(job.status, BffDsarJob.Status.SUCCEEDED)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(job.upstream["incoming_headers"].get("User-Agent"), "dsar-test")
+        self.assertEqual(len(self.calls), 6)
+
+    def test_stale_running_job_is_retried_then_abandoned(self):
+        job = BffDsarJob.objects.create(
+            tenant_id=self.tenant.id,
+            user_id=self.user_id,
+            kind=BffDsarJob.Kind.EXPORT,
+            status=BffDsarJob.Status.RUNNING,
+            attempts=1,
+            upstream={"context_headers": {"X-User-Id": self.user_id}},
+        )
+        stale = timezone.now() - timedelta(hours=2)
+        BffDsarJob.objects.filter(id=job.id).update(updated_at=stale)
+
+        with self.settings(STORAGES=self.storages, BFF_DSAR_JOB_MAX_ATTEMPTS=2, **self.UPSTREAMS), patch(
+            "bff.dsar_jobs.proxy_request", side_effect=self._mocked_proxy
+        ):
+            self.assertEqual(dsar_jobs.process_pending_jobs(), {"processed": 1, "abandoned": 0})
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (BffDsarJob.Status.SUCCEEDED, 2))
+
+            BffDsarJob.objects.filter(id=job.id).update(status=BffDsarJob.Status.RUNNING, updated_at=stale)
+            self.assertEqual(dsar_jobs.process_pending_jobs(), {"processed": 0, "abandoned": 1})
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), (BffDsarJob.Status.FAILED, "abandoned"))
+
+    def test_erase_user_data_deletes_jobs_and_archives(self):
+        job_id = self._start_job()
+        archive = os.path.join(self.export_dir, BffDsarJob.objects.get(id=job_id).artifact_name)
+        other = BffDsarJob.objects.create(tenant_id=self.tenant.id, user_id=uuid.uuid4(), kind=BffDsarJob.Kind.EXPORT)
+
+        with self.settings(STORAGES=self.storages):
+            result = erase_bff_user_data(tenant_id=self.tenant.id, user_id=self.user_id)
+
+        self.assertEqual(result["counts"]["dsar_jobs_deleted"], 1)
+        self.assertEqual(result["counts"]["dsar_archives_deleted"], 1)
+        self.assertFalse(os.path.exists(archive))
+        self.assertEqual(list(BffDsarJob.objects.values_list("id", flat=True)), [other.id])
+
+    def test_jobs_of_other_users_are_hidden(self):
+        job = BffDsarJob.objects.create(
+            tenant_id=self.tenant.id,
+            user_id=uuid.uuid4(),
+            kind=BffDsarJob.Kind.EXPORT,
+        )
+
+        self.assertEqual(self._get(str(job.id)).status_code, 404)
+        self.assertEqual(self._get("not-a-uuid").status_code, 404)
+
+    def test_purge_retention_removes_expired_archives(self):
+        job_id = self._start_job()
+        job = BffDsarJob.objects.get(id=job_id)
+        archive = os.path.join(self.export_dir, job.artifact_name)
+        self.assertTrue(os.path.exists(archive))
+        BffDsarJob.objects.filter(id=job_id).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+        with self.settings(STORAGES=self.storages):
+            call_command("purge_retention", stdout=StringIO())
+
+        self.assertFalse(BffDsarJob.objects.filter(id=job_id).exists())
+        self.assertFalse(os.path.exists(archive))
+
+
+class BffDsarEraseJobTests(TestCase):
+    UPSTREAMS = BffDsarExportJobTests.UPSTREAMS
+
+    def setUp(self):
+        self.client = Client()
+        self.tenant = Tenant.objects.create(slug="aef")
+        self.user_id = str(uuid.uuid4())
+        session = SessionStore().create(
+            tenant_id=str(self.tenant.id),
+            user_id=self.user_id,
+            master_flags={"email_verified": True},
+            ttl=timedelta(minutes=10),
+        )
+        self.client.cookies["updspace_session"] = session.session_id
+        self.client.cookies["updspace_csrf"] = "csrf-token"
+        self.host = "aef.updspace.com"
+        self.failing_services: set[str] = set()
+        self.calls: list[tuple[str, str, str]] = []
+        self.activity_passes = 0
+
+    def _mocked_proxy(
+        self,
+        *,
+        upstream_base_url,
+        upstream_path,
+        method,
+        query_string,
+        body,
+        incoming_headers,
+        context_headers,
+        request_id,
+        stream=False,
+        timeout=None,
+    ):
+        service = upstream_base_url.split("//", 1)[1].split(":", 1)[0]
+        self.calls.append((service, method, upstream_path))
+        if service in self.failing_services:
+            return httpx.Response(503)
+        if upstream_path.endswith("/erasure"):
+            self.assertEqual(query_string, "max_seconds=10")
+            self.activity_passes += 1
+            done = self.activity_passes >= 2
+            return httpx.Response(
+                200,
+                json={
+                    "status": "completed" if done else "running",
+                    "step": None if done else "activity_events",
+                    "counts": {"news_posts_redacted": 3},
+                },
+            )
+        if upstream_path == "auth/me":
+            return httpx.Response(204, content=b"")
+        return httpx.Response(200, json={"counts": {"rows": 1}})
+
+    def _start_job(self):
+        with self.settings(
+            BFF_TENANT_HOST_SUFFIX="updspace.com",
+            BFF_DSAR_JOBS_EAGER=True,
+            **self.UPSTREAMS,
+        ), patch("bff.dsar_jobs.proxy_request", side_effect=self._mocked_proxy), self.captureOnCommitCallbacks(
+            execute=True
+        ):
+            resp = self.client.post(
+                "/api/v1/account/me/erase/jobs",
+                HTTP_HOST=self.host,
+                HTTP_X_CSRF_TOKEN="csrf-token",
+            )
+        self.assertEqual(resp.status_code, 202)
+        return resp.json()["id"]
+
+    def _status(self, job_id):
+        with self.settings(BFF_TENANT_HOST_SUFFIX="updspace.com"):
+            return self.client.get(f"/api/v1/account/me/erase/jobs/{job_id}", HTTP_HOST=self.host).json()
+
+    def test_erase_job_drives_chunked_activity_erase(self):
+        job_id = self._start_job()
+
+        status = self._status(job_id)
+        self.assertEqual(status["status"], "succeeded")
+        self.assertIsNone(status["download_path"])
+        self.assertEqual(
+            status["services"]["activity"],
+            {"status": "done", "step": None, "counts": {"news_posts_redacted": 3}},
+        )
+        self.assertEqual(status["services"]["voting"], {"status": "done", "counts": {"rows": 1}})
+        self.assertEqual(self.activity_passes, 2)
+        self.assertEqual(
+            [service for service, _, _ in self.calls],
+            ["portal", "activity", "activity", "access", "events", "gamification", "voting"],
+        )
+
+        from bff.audit import BffAuditEvent
+
+        audit = BffAuditEvent.objects.get(action="dsar.erased")
+        self.assertEqual(audit.metadata["job_id"], job_id)
+
+        # Account deletion still repeats every upstream erase.
+        self.calls.clear()
+        with self.settings(
+            BFF_TENANT_HOST_SUFFIX="updspace.com",
+            BFF_UPSTREAM_ID_URL="http://id:8001/api/v1",
+            **self.UPSTREAMS,
+        ), patch("bff.api.proxy_request", side_effect=self._mocked_proxy):
+            resp = self.client.delete("/api/v1/account/me", HTTP_HOST=self.host, HTTP_X_CSRF_TOKEN="csrf-token")
+        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(
+            [service for service, _, _ in self.calls],
+            ["portal", "activity", "access", "events", "gamification", "voting", "id"],
+        )
+        self.assertFalse(BffDsarJob.objects.filter(id=job_id).exists())
+
+    def test_upstream_failure_stops_erase_job(self):
+        self.failing_services = {"access"}
+        job_id = self._start_job()
+
+        status = self._status(job_id)
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["error"], "upstream_failed: access")
+        self.assertEqual(status["services"]["access"], {"status": "failed", "detail": "status 503"})
+        self.assertNotIn("events", status["services"])
+
+    def test_chunked_erase_past_its_deadline_fails_the_job(self):
+        self.activity_passes = -100  # activity keeps reporting "running"
+        clock = MagicMock()
+        clock.monotonic.side_effect = [0.0, 1.0, 2.0, 1000.0]
+        with patch.object(dsar_jobs, "time", clock):
+            job_id = self._start_job()
+
+        status = self._status(job_id)
+        self.assertEqual(status["status"], "failed")
+        self.assertEqual(status["error"], "upstream_failed: activity")
+        self.assertEqual(status["services"]["activity"], {"status": "failed", "detail": "deadline exceeded"})
+        self.assertEqual(self.activity_passes, -98)
+
+
 class BffSessionProfileSyncTests(TestCase):
     def setUp(self):
+        feature_flags_client.reset()
         self.client = Client()
         self.tenant = Tenant.objects.create(slug="aef")
         self.user_id = str(uuid.uuid4())
@@ -833,6 +1338,77 @@ class BffSessionProfileSyncTests(TestCase):
         self.assertEqual(payload["error"]["code"], "NO_ACTIVE_MEMBERSHIP")
 
 
+class BffFeatureFlagsClientTests(SimpleTestCase):
+    def setUp(self):
+        self.flags_client = FeatureFlagsClient(refresh_seconds=60)
+        self.calls: list[int | None] = []
+        self.responses: list[httpx.Response] = []
+
+    def _fetch(self, since):
+        self.calls.append(since)
+        return self.responses.pop(0)
+
+    def test_first_read_fetches_then_serves_local_copy(self):
+        self.responses.append(
+            httpx.Response(200, json={"feature_flags": {"a": True}, "version": 4, "delta": False})
+        )
+        self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True})
+        self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True})
+        self.assertEqual(self.calls, [None])
+        self.assertEqual(self.flags_client.version, 4)
+
+    def test_refresh_applies_not_modified_and_delta(self):
+        self.responses += [
+            httpx.Response(200, json={"feature_flags": {"a": True, "b": False}, "version": 4}),
+            httpx.Response(304),
+            httpx.Response(200, json={"feature_flags": {"b": True}, "version": 6, "delta": True}),
+        ]
+        self.flags_client.refresh(self._fetch)
+        self.assertTrue(self.flags_client.refresh(self._fetch))
+        self.assertTrue(self.flags_client.refresh(self._fetch))
+
+        self.assertEqual(self.calls, [None, 4, 4])
+        self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True, "b": True})
+        self.assertEqual(self.flags_client.version, 6)
+
+    def test_failed_refresh_keeps_previous_copy(self):
+        self.responses += [
+            httpx.Response(200, json={"feature_flags": {"a": True}, "version": 1}),
+            httpx.Response(503),
+        ]
+        self.flags_client.refresh(self._fetch)
+        self.assertFalse(self.flags_client.refresh(self._fetch))
+        self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True})
+
+    def test_outbox_events_apply_in_order_and_mark_gaps_stale(self):
+        self.responses.append(
+            httpx.Response(200, json={"feature_flags": {"a": False}, "version": 1})
+        )
+        self.flags_client.refresh(self._fetch)
+
+        self.flags_client.apply_event(
+            "feature_flag.updated",
+            {"flag_key": "a", "enabled": True, "rollout": 100, "version": 2},
+        )
+        self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True})
+
+        # Version 4 skips 3: the copy is left alone but refreshed on next read.
+        self.flags_client.apply_event(
+            "feature_flag.created",
+            {"flag_key": "c", "enabled": True, "rollout": 100, "version": 4},
+        )
+        self.responses.append(
+            httpx.Response(200, json={"feature_flags": {"c": True}, "version": 4, "delta": True})
+        )
+        with patch("bff.featureflags.threading.Thread") as thread_cls:
+            self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True})
+        thread_cls.assert_called_once()
+        thread_cls.call_args.kwargs["target"](*thread_cls.call_args.kwargs["args"])
+
+        self.assertEqual(self.calls, [None, 2])
+        self.assertEqual(self.flags_client.snapshot(self._fetch), {"a": True, "c": True})
+
+
 class OidcAuthLoginTests(TestCase):
     """Tests for GET /auth/login OIDC redirect endpoint."""
 
@@ -1769,6 +2345,121 @@ class BffSessionAuditTests(TestCase):
         self.assertIn("bff", audits[0].metadata["services_exported"])
 
 
+@override_settings(BFF_AUDIT_ASYNC=True, BFF_AUDIT_FLUSH_SECONDS=0, BFF_AUDIT_BATCH_SIZE=3)
+class BffAuditWriterTests(TestCase):
+    def setUp(self):
+        from bff.audit import audit_writer
+
+        self.writer = audit_writer
+        self.writer.clear()
+        self.addCleanup(self.writer.clear)
+        self.tenant_id = str(uuid.uuid4())
+        self.user_id = str(uuid.uuid4())
+
+    def _log(self, action: str = "session.created", **kwargs):
+        from bff.audit import log_audit_event
+
+        return log_audit_event(
+            tenant_id=self.tenant_id,
+            actor_user_id=self.user_id,
+            action=action,
+            target_type="bff_session",
+            target_id="s-1",
+            **kwargs,
+        )
+
+    def test_events_are_queued_until_commit_and_flushed_in_batches(self):
+        from bff.audit import BffAuditEvent
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self._log()
+            second = self._log(action="session.revoked")
+            self.assertEqual(len(self.writer), 0)
+        self.assertEqual(len(self.writer), 2)
+        self.assertFalse(BffAuditEvent.objects.exists())
+
+        self.assertEqual(self.writer.flush(), 2)
+
+        stored = BffAuditEvent.objects.get(id=first.id)
+        self.assertEqual(stored.created_at, first.created_at)
+        self.assertTrue(BffAuditEvent.objects.filter(id=second.id).exists())
+        self.assertEqual(len(self.writer), 0)
+
+    def test_full_batch_is_written_by_the_caller_without_a_thread(self):
+        from bff.audit import BffAuditEvent
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self._log()
+
+        self.assertEqual(BffAuditEvent.objects.count(), 3)
+        self.assertEqual(len(self.writer), 0)
+
+    def test_rolled_back_change_is_not_audited(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self._log()
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(len(self.writer), 0)
+
+    def test_sync_events_are_written_immediately(self):
+        from bff.audit import BffAuditEvent
+
+        event = self._log(action="dsar.exported", sync=True)
+
+        self.assertTrue(BffAuditEvent.objects.filter(id=event.id).exists())
+        self.assertEqual(len(self.writer), 0)
+
+    def test_failed_flush_keeps_rows_for_retry(self):
+        from bff.audit import BffAuditEvent
+
+        with self.captureOnCommitCallbacks(execute=True):
+            event = self._log()
+
+        with patch.object(BffAuditEvent.objects, "bulk_create", side_effect=DatabaseError("down")):
+            self.assertEqual(self.writer.flush(), 0)
+        self.assertEqual(len(self.writer), 1)
+
+        self.assertEqual(self.writer.flush(), 1)
+        self.assertTrue(BffAuditEvent.objects.filter(id=event.id).exists())
+
+    @override_settings(BFF_AUDIT_QUEUE_MAX=2, BFF_AUDIT_BATCH_SIZE=10)
+    def test_full_queue_writes_in_the_caller_instead_of_dropping(self):
+        from bff.audit import BffAuditEvent
+
+        with self.captureOnCommitCallbacks(execute=True):
+            queued = [self._log(), self._log()]
+            overflow = self._log(action="session.revoked")
+
+        self.assertEqual(len(self.writer), 2)
+        self.assertEqual(list(BffAuditEvent.objects.values_list("id", flat=True)), [overflow.id])
+
+        with patch.object(BffAuditEvent, "save", side_effect=DatabaseError("down")), (
+            self.captureOnCommitCallbacks(execute=True)
+        ):
+            kept = self._log()
+        self.assertEqual(len(self.writer), 3)
+
+        self.assertEqual(self.writer.flush(), 3)
+        self.assertEqual(
+            set(BffAuditEvent.objects.values_list("id", flat=True)),
+            {overflow.id, kept.id, *(event.id for event in queued)},
+        )
+
+    @override_settings(BFF_AUDIT_ASYNC=False)
+    def test_rows_are_inserted_synchronously_by_default(self):
+        from bff.audit import BffAuditEvent
+
+        event = self._log()
+
+        self.assertTrue(BffAuditEvent.objects.filter(id=event.id).exists())
+        self.assertEqual(len(self.writer), 0)
+
+
 class BffRetentionCommandTests(TestCase):
     def setUp(self):
         self.tenant = Tenant.objects.create(slug="aef")
@@ -1841,6 +2532,32 @@ class BffRetentionCommandTests(TestCase):
         self.assertFalse(BffAuditEvent.objects.filter(id=old_audit.id).exists())
         self.assertTrue(BffAuditEvent.objects.filter(id=fresh_audit.id).exists())
 
+    def test_purge_retention_runs_without_export_storage(self):
+        expired = timezone.now() - timedelta(minutes=1)
+        BffOauthState.objects.create(
+            state="expired-state",
+            tenant_id=self.tenant.id,
+            next_path="/dashboard",
+            expires_at=expired,
+        )
+        failed_job = BffDsarJob.objects.create(
+            tenant_id=self.tenant.id,
+            user_id=self.user_id,
+            kind=BffDsarJob.Kind.EXPORT,
+            status=BffDsarJob.Status.FAILED,
+            expires_at=expired,
+        )
+        storages_without_exports = {k: v for k, v in settings.STORAGES.items() if k != "dsar_exports"}
+
+        out = StringIO()
+        with self.settings(DEBUG=False, STORAGES=storages_without_exports):
+            call_command("purge_retention", stdout=out)
+
+        counts = json.loads(out.getvalue())["counts"]
+        self.assertEqual(counts["oauth_states_deleted"], 1)
+        self.assertEqual(counts["dsar_jobs_deleted"], 1)
+        self.assertFalse(BffDsarJob.objects.filter(id=failed_job.id).exists())
+
 
 class BffPrivateInvokeProxyTests(SimpleTestCase):
     def test_private_invoke_uses_bearer_token(self):
@@ -138,3 +138,10 @@ PORTAL_SERVICE_URL = os.getenv("PORTAL_SERVICE_URL", "http://portal:8003/api/v1"
 EVENTS_RETENTION_PUBLISHED_OUTBOX_DAYS = int(
     os.getenv("EVENTS_RETENTION_PUBLISHED_OUTBOX_DAYS", "30")
 )
+
+# Calendar subscription feeds: token signing key (defaults to SECRET_KEY),
+# token lifetime, how far back feeds reach, and rendered-blob cache TTL.
+EVENTS_CALENDAR_TOKEN_SECRET = os.getenv("EVENTS_CALENDAR_TOKEN_SECRET", "")
+EVENTS_CALENDAR_TOKEN_MAX_AGE_DAYS = int(os.getenv("EVENTS_CALENDAR_TOKEN_MAX_AGE_DAYS", "365"))
+EVENTS_CALENDAR_PAST_DAYS = int(os.getenv("EVENTS_CALENDAR_PAST_DAYS", "30"))
+EVENTS_CALENDAR_CACHE_TTL_SECONDS = int(os.getenv("EVENTS_CALENDAR_CACHE_TTL_SECONDS", "3600"))
@@ -1 +1,14 @@
+from django.db import models
 
+
+class RetentionCheckpoint(models.Model):
+    """Progress of a resumable ``purge_retention`` run (see core.retention)."""
+
+    name = models.CharField(max_length=128, primary_key=True)
+    started_at = models.DateTimeField()
+    # Per-target progress: {"audit": {"deleted": 10, "last_key": [...], ...}}.
+    targets = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "events_retention_checkpoint"
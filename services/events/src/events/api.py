@@ -2,39 +2,55 @@ from __future__ import annotations
 
 import logging
 import uuid
-from datetime import datetime
-from datetime import timezone as dt_timezone
+from datetime import datetime, timedelta
 from typing import Any, cast
 from uuid import UUID
 
 from django.db import transaction
-from django.db.models import Count
-from django.http import HttpResponse, JsonResponse
+from django.db.models import Count, Q, Sum
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone as dj_timezone
+from django.utils.http import quote_etag
 from django.utils.timezone import is_naive, make_aware
 from ninja import NinjaAPI, Query, Router
 from ninja.errors import HttpError
 
+from . import calendar
 from .context import InternalContext, require_internal_context
 from .dsar import erase_user_data, export_user_data
-from .models import RSVP, Event, RSVPStatus
+from .models import (
+    RSVP,
+    CalendarSubscription,
+    Event,
+    EventScopeType,
+    EventStats,
+    RSVPStatus,
+)
 from .permissions import has_permission, has_scope_membership
-from .portal_client import PortalServiceUnavailable, portal_client
+from .portal_client import PortalMemberships, PortalServiceUnavailable, portal_client
 from .schemas import (
     AttendanceMarkIn,
+    AttendanceRollupItemOut,
+    AttendanceRollupOut,
+    CalendarSubscriptionIn,
+    CalendarSubscriptionOut,
     EventCreateIn,
     EventListOut,
     EventOut,
     EventUpdateIn,
     RsvpSetIn,
 )
+from .security import require_internal_signature
 from .service import create_event, mark_attendance, set_rsvp, update_event
+from .time_index import overlapping_events
 
 logger = logging.getLogger(__name__)
 
 api = NinjaAPI(title="UpdSpace Events", version="1", urls_namespace="events")
 router = Router(tags=["events"])
 
+MY_CALENDAR_MAX_DAYS = 92
+
 
 # =========================
 # Common helpers
@@ -194,78 +210,168 @@ def _format_event(
     return _camelize_keys(event_out.model_dump())
 
 
-def _event_visible_for_user(event: Event, *, ctx: InternalContext) -> bool:
-    tenant_id = ctx.tenant_id
-    tenant_slug = ctx.tenant_slug
-    request_id = ctx.request_id
-    user_id = ctx.user_id
-    master_flags = ctx.master_flags
+class _ViewerVisibility:
+    """
+    Per-request view of which scopes the viewer may see.
 
-    if str(event.tenant_id) != str(tenant_id):
-        return False
+    Portal memberships are fetched once per request (one bulk call) and
+    access decisions are memoized per scope, so both single-event checks and
+    the SQL filter for ``list_events`` cost a bounded number of round trips.
+    """
 
-    if event.visibility == "public":
-        return True
-
-    if event.visibility == "private":
-        return str(event.created_by) == str(user_id)
-
-    if event.visibility == "community" and event.scope_type == "COMMUNITY":
-        try:
-            if portal_client.is_community_member(ctx, str(event.scope_id)):
-                return True
-        except PortalServiceUnavailable as exc:
-            logger.warning(
-                "Portal membership lookup failed",
-                extra={
-                    "tenant_id": tenant_id,
-                    "community_id": str(event.scope_id),
-                    "request_id": request_id,
-                    "error": str(exc),
-                },
+    def __init__(self, ctx: InternalContext) -> None:
+        self.ctx = ctx
+        self._memberships: PortalMemberships | None = None
+        self._memberships_loaded = False
+        self._scope_membership: dict[tuple[str, str], bool] = {}
+        self._scope_read: dict[tuple[str, str], bool] = {}
+
+    def memberships(self) -> PortalMemberships | None:
+        if not self._memberships_loaded:
+            self._memberships_loaded = True
+            try:
+                self._memberships = portal_client.list_memberships(self.ctx)
+            except PortalServiceUnavailable as exc:
+                logger.warning(
+                    "Portal membership lookup failed",
+                    extra={
+                        "tenant_id": self.ctx.tenant_id,
+                        "request_id": self.ctx.request_id,
+                        "error": str(exc),
+                    },
+                )
+        return self._memberships
+
+    def _member_ids(self, scope_type: str) -> frozenset[str]:
+        memberships = self.memberships()
+        if memberships is None:
+            return frozenset()
+        if scope_type == "COMMUNITY":
+            return memberships.community_ids
+        return memberships.team_ids
+
+    def has_scope_membership(self, scope_type: str, scope_id: str) -> bool:
+        key = (scope_type, str(scope_id))
+        if key not in self._scope_membership:
+            self._scope_membership[key] = has_scope_membership(
+                tenant_id=self.ctx.tenant_id,
+                tenant_slug=self.ctx.tenant_slug,
+                user_id=self.ctx.user_id,
+                scope_type=scope_type,
+                scope_id=str(scope_id),
+                request_id=self.ctx.request_id,
             )
-        return has_scope_membership(
-            tenant_id=tenant_id,
-            tenant_slug=tenant_slug,
-            user_id=user_id,
-            scope_type="COMMUNITY",
-            scope_id=event.scope_id,
-            request_id=request_id,
+        return self._scope_membership[key]
+
+    def can_read_scope(self, scope_type: str, scope_id: str) -> bool:
+        key = (scope_type, str(scope_id))
+        if key not in self._scope_read:
+            self._scope_read[key] = has_permission(
+                tenant_id=self.ctx.tenant_id,
+                tenant_slug=self.ctx.tenant_slug,
+                user_id=self.ctx.user_id,
+                master_flags=self.ctx.master_flags,
+                permission_key="events.event.read",
+                scope_type=scope_type,
+                scope_id=str(scope_id),
+                request_id=self.ctx.request_id,
+            )
+        return self._scope_read[key]
+
+    def _allowed_scopes(
+        self,
+        scopes: set[tuple[str, str]],
+        check: Any,
+    ) -> set[tuple[str, str]] | None:
+        """
+        Return the allowed subset of ``scopes``, or ``None`` if all are allowed.
+
+        A tenant-wide role binding matches every scope in access, so with more
+        than one scope to resolve a single tenant-level check usually settles
+        them all.
+        """
+        if len(scopes) > 1 and check("TENANT", self.ctx.tenant_id):
+            return None
+        return {scope for scope in scopes if check(*scope)}
+
+    def is_visible(self, event: Event) -> bool:
+        if str(event.tenant_id) != str(self.ctx.tenant_id):
+            return False
+        if event.visibility == "public":
+            return True
+        if event.visibility == "private":
+            return str(event.created_by) == str(self.ctx.user_id)
+        if (event.visibility, event.scope_type) in {("community", "COMMUNITY"), ("team", "TEAM")}:
+            return self.is_scope_member(event.scope_type, event.scope_id)
+        return self.can_read_scope(event.scope_type, event.scope_id)
+
+    def is_scope_member(self, scope_type: str, scope_id: str) -> bool:
+        if str(scope_id) in self._member_ids(scope_type):
+            return True
+        return self.has_scope_membership(scope_type, scope_id)
+
+    def filter_queryset(self, qs):
+        """
+        Restrict ``qs`` to events the viewer may see, as one SQL predicate.
+
+        Mirrors :meth:`is_visible`; scopes that need an access fallback are
+        collected with two DISTINCT queries and resolved once each.
+        """
+        community_q = Q(visibility="community", scope_type="COMMUNITY")
+        team_q = Q(visibility="team", scope_type="TEAM")
+        other_q = ~Q(visibility__in=["public", "private"]) & ~community_q & ~team_q
+
+        membership_scopes = set(
+            qs.filter(community_q | team_q).values_list("scope_type", "scope_id").distinct()
         )
+        # Portal is only asked when the result can contain community/team events.
+        community_ids = self._member_ids("COMMUNITY") if membership_scopes else frozenset()
+        team_ids = self._member_ids("TEAM") if membership_scopes else frozenset()
+        pending_membership = {
+            (scope_type, scope_id)
+            for scope_type, scope_id in membership_scopes
+            if scope_id not in self._member_ids(scope_type)
+        }
+        pending_read = set(qs.filter(other_q).values_list("scope_type", "scope_id").distinct())
 
-    if event.visibility == "team" and event.scope_type == "TEAM":
-        try:
-            if portal_client.is_team_member(ctx, str(event.scope_id)):
-                return True
-        except PortalServiceUnavailable as exc:
-            logger.warning(
-                "Portal membership lookup failed",
-                extra={
-                    "tenant_id": tenant_id,
-                    "team_id": str(event.scope_id),
-                    "request_id": request_id,
-                    "error": str(exc),
-                },
+        visible_q = Q(visibility="public") | Q(visibility="private", created_by=self.ctx.user_id)
+
+        granted = self._allowed_scopes(pending_membership, self.has_scope_membership)
+        if granted is None:
+            visible_q |= community_q | team_q
+        else:
+            visible_q |= community_q & Q(
+                scope_id__in=set(community_ids) | {sid for st, sid in granted if st == "COMMUNITY"}
+            )
+            visible_q |= team_q & Q(
+                scope_id__in=set(team_ids) | {sid for st, sid in granted if st == "TEAM"}
             )
-        return has_scope_membership(
-            tenant_id=tenant_id,
-            tenant_slug=tenant_slug,
-            user_id=user_id,
-            scope_type="TEAM",
-            scope_id=event.scope_id,
-            request_id=request_id,
-        )
 
-    return has_permission(
-        tenant_id=tenant_id,
-        tenant_slug=tenant_slug,
-        user_id=user_id,
-        master_flags=master_flags,
-        permission_key="events.event.read",
-        scope_type=event.scope_type,
-        scope_id=event.scope_id,
-        request_id=request_id,
-    )
+        readable = self._allowed_scopes(pending_read, self.can_read_scope)
+        if readable is None:
+            visible_q |= other_q
+        else:
+            for scope_type, scope_id in readable:
+                visible_q |= other_q & Q(scope_type=scope_type, scope_id=scope_id)
+
+        return qs.filter(visible_q)
+
+
+def _viewer_visibility(request, ctx: InternalContext) -> _ViewerVisibility:
+    viewer = getattr(request, "_events_viewer_visibility", None)
+    if viewer is None or viewer.ctx != ctx:
+        viewer = _ViewerVisibility(ctx)
+        request._events_viewer_visibility = viewer
+    return viewer
+
+
+def _event_visible_for_user(
+    event: Event,
+    *,
+    ctx: InternalContext,
+    viewer: _ViewerVisibility | None = None,
+) -> bool:
+    return (viewer or _ViewerVisibility(ctx)).is_visible(event)
 
 
 def _get_rsvp_counts_map(*, ctx: InternalContext, event_ids: list[str]) -> dict[str, dict[str, int]]:
@@ -273,15 +379,28 @@ def _get_rsvp_counts_map(*, ctx: InternalContext, event_ids: list[str]) -> dict[
         return {}
 
     counts_map: dict[str, dict[str, int]] = {}
-    rows = (
-        RSVP.objects.filter(tenant_id=ctx.tenant_id, event_id__in=event_ids)
-        .values("event_id", "status")
-        .annotate(count=Count("id"))
-    )
-    for row in rows:
-        key = str(row["event_id"])
-        counts_map.setdefault(key, _empty_rsvp_counts())
-        counts_map[key][row["status"]] = row["count"]
+    for row in EventStats.objects.filter(tenant_id=ctx.tenant_id, event_id__in=event_ids).values(
+        "event_id", "going_count", "interested_count", "not_going_count"
+    ):
+        counts_map[str(row["event_id"])] = {
+            RSVPStatus.GOING: row["going_count"],
+            RSVPStatus.INTERESTED: row["interested_count"],
+            RSVPStatus.NOT_GOING: row["not_going_count"],
+        }
+
+    # Events without materialized counters yet (before rebuild_event_stats
+    # has run) fall back to aggregating RSVP rows.
+    missing = [eid for eid in event_ids if eid not in counts_map]
+    if missing:
+        rows = (
+            RSVP.objects.filter(tenant_id=ctx.tenant_id, event_id__in=missing)
+            .values("event_id", "status")
+            .annotate(count=Count("id"))
+        )
+        for row in rows:
+            key = str(row["event_id"])
+            counts_map.setdefault(key, _empty_rsvp_counts())
+            counts_map[key][row["status"]] = row["count"]
 
     for eid in event_ids:
         counts_map.setdefault(eid, _empty_rsvp_counts())
@@ -307,62 +426,6 @@ def _get_my_rsvp_map(*, ctx: InternalContext, event_ids: list[str]) -> dict[str,
     return my_rsvp_map
 
 
-# =========================
-# ICS helpers (RFC5545)
-# =========================
-def _ics_escape_text(value: str) -> str:
-    """
-    RFC5545 TEXT escaping:
-      - backslash -> \\,
-      - semicolon -> \\;,
-      - comma -> \\,
-      - newline -> \\n
-    """
-    value = value.replace("\r\n", "\n").replace("\r", "\n")
-    value = value.replace("\\", "\\\\")
-    value = value.replace(";", "\\;")
-    value = value.replace(",", "\\,")
-    value = value.replace("\n", "\\n")
-    return value
-
-
-def _ics_sanitize_uri(value: str) -> str:
-    """
-    URI fields (URL): не применяем TEXT escaping, но убираем CR/LF.
-    """
-    return value.replace("\r", "").replace("\n", "")
-
-
-def _ics_fold_line(line: str, *, limit: int = 75) -> list[str]:
-    """
-    RFC5545 line folding: max 75 octets per line, continuation lines start with a single space.
-    Считаем по UTF-8 octets и не режем посередине multibyte символов.
-    """
-    out: list[str] = []
-    cur = ""
-    cur_octets = 0
-
-    for ch in line:
-        ch_octets = len(ch.encode("utf-8"))
-        if cur and (cur_octets + ch_octets) > limit:
-            out.append(cur)
-            cur = " " + ch
-            cur_octets = 1 + ch_octets
-        else:
-            cur += ch
-            cur_octets += ch_octets
-
-    out.append(cur)
-    return out
-
-
-def _ics_render(lines: list[str]) -> str:
-    folded: list[str] = []
-    for line in lines:
-        folded.extend(_ics_fold_line(line))
-    return "\r\n".join(folded) + "\r\n"
-
-
 # =========================
 # Routes
 # =========================
@@ -386,18 +449,77 @@ def list_events(
     if scope_type and scope_id:
         qs = qs.filter(scope_type=scope_type, scope_id=scope_id)
 
-    if from_:
-        dt_from = _parse_iso_datetime(from_, code="INVALID_FROM", message="from must be ISO datetime")
+    dt_from = _parse_iso_datetime(from_, code="INVALID_FROM", message="from must be ISO datetime") if from_ else None
+    dt_to = _parse_iso_datetime(to, code="INVALID_TO", message="to must be ISO datetime") if to else None
+    if dt_from and dt_to:
+        qs = overlapping_events(qs, tenant_id=ctx.tenant_id, start=dt_from, end=dt_to)
+    elif dt_from:
         qs = qs.filter(ends_at__gte=dt_from)
-
-    if to:
-        dt_to = _parse_iso_datetime(to, code="INVALID_TO", message="to must be ISO datetime")
+    elif dt_to:
         qs = qs.filter(starts_at__lte=dt_to)
 
+    # Visibility is applied in SQL so that total and paging count only
+    # events the viewer can actually see.
+    qs = _viewer_visibility(request, ctx).filter_queryset(qs)
+    return _event_page_response(ctx, qs, limit=limit, offset=offset)
+
+
+@router.get("/my-calendar", response=EventListOut)
+def my_calendar(
+    request,
+    from_: str = Query(..., alias="from"),
+    to: str = Query(..., alias="to"),
+    limit: int = Query(250, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Events in ``[from, to]`` across the tenant and every community and team
+    the viewer belongs to, merged into one time-ordered page.
+    """
+    ctx = require_internal_context(request)
+    _require_perm_ctx(ctx, "events.event.read", EventScopeType.TENANT, ctx.tenant_id)
+
+    dt_from = _parse_iso_datetime(from_, code="INVALID_FROM", message="from must be ISO datetime")
+    dt_to = _parse_iso_datetime(to, code="INVALID_TO", message="to must be ISO datetime")
+    if dt_from > dt_to:
+        raise HttpError(
+            400,
+            cast(Any, {"code": "INVALID_TIME_RANGE", "message": "from must be before to"}),
+        )
+    if dt_to - dt_from > timedelta(days=MY_CALENDAR_MAX_DAYS):
+        raise HttpError(
+            400,
+            cast(
+                Any,
+                {
+                    "code": "RANGE_TOO_LARGE",
+                    "message": f"Range must not exceed {MY_CALENDAR_MAX_DAYS} days",
+                },
+            ),
+        )
+
+    viewer = _viewer_visibility(request, ctx)
+    scopes = {(EventScopeType.TENANT.value, str(ctx.tenant_id))}
+    memberships = viewer.memberships()
+    if memberships is not None:
+        scopes |= {(EventScopeType.COMMUNITY.value, cid) for cid in memberships.community_ids}
+        scopes |= {(EventScopeType.TEAM.value, tid) for tid in memberships.team_ids}
+
+    qs = overlapping_events(
+        Event.objects.filter(tenant_id=ctx.tenant_id),
+        tenant_id=ctx.tenant_id,
+        start=dt_from,
+        end=dt_to,
+        scopes=scopes,
+    )
+    qs = viewer.filter_queryset(qs)
+    return _event_page_response(ctx, qs, limit=limit, offset=offset)
+
+
+def _event_page_response(ctx: InternalContext, qs, *, limit: int, offset: int) -> JsonResponse:
     total = qs.count()
 
-    events = list(qs.order_by("starts_at", "id")[offset : offset + limit])
-    visible = [e for e in events if _event_visible_for_user(e, ctx=ctx)]
+    visible = list(qs.order_by("starts_at", "id")[offset : offset + limit])
 
     event_ids = [str(e.id) for e in visible]
     counts_map = _get_rsvp_counts_map(ctx=ctx, event_ids=event_ids)
@@ -439,6 +561,211 @@ def create_event_api(request, payload: EventCreateIn):
     return JsonResponse(_format_event(event, rsvp_counts=_empty_rsvp_counts(), my_rsvp=None))
 
 
+def _calendar_token_error() -> HttpError:
+    return HttpError(401, cast(Any, {"code": "INVALID_CALENDAR_TOKEN", "message": "Invalid calendar token"}))
+
+
+def _subscription_out(sub) -> JsonResponse:
+    token = calendar.issue_feed_token(sub)
+    return JsonResponse(
+        _camelize_keys(
+            CalendarSubscriptionOut(
+                id=str(sub.id),
+                token=token,
+                path=f"/events/calendar.ics?token={token}",
+            ).model_dump()
+        )
+    )
+
+
+def _require_feed_access(request, ctx: InternalContext, feed: calendar.CalendarFeed) -> None:
+    if feed.kind == calendar.FEED_KIND_USER:
+        _require_perm_ctx(ctx, "events.event.read", "TENANT", ctx.tenant_id)
+        return
+    _require_perm_ctx(ctx, "events.event.read", feed.scope_type, feed.scope_id)
+    if feed.scope_type != "TENANT" and not _viewer_visibility(request, ctx).is_scope_member(
+        feed.scope_type, feed.scope_id
+    ):
+        raise HttpError(403, cast(Any, {"code": "FORBIDDEN", "message": "Not a member of this scope"}))
+
+
+@router.post("/calendar/subscriptions", response=CalendarSubscriptionOut)
+def create_calendar_subscription(request, payload: CalendarSubscriptionIn):
+    """
+    Issue a long-lived token for a calendar subscription feed.
+
+    One subscription exists per user and feed; asking again returns a token
+    for the current version. Rotate or delete it to cut off a leaked URL.
+    """
+    ctx = require_internal_context(request)
+
+    if payload.kind == calendar.FEED_KIND_USER:
+        feed = calendar.CalendarFeed(
+            kind=calendar.FEED_KIND_USER,
+            tenant_id=ctx.tenant_id,
+            tenant_slug=ctx.tenant_slug,
+            user_id=ctx.user_id,
+        )
+    else:
+        scope_type = payload.scope_type or "TENANT"
+        scope_id = ctx.tenant_id if scope_type == "TENANT" else (payload.scope_id or "")
+        if scope_type not in EventScopeType.values or not scope_id:
+            raise HttpError(
+                400,
+                cast(Any, {"code": "INVALID_SCOPE", "message": "scope_type and scope_id are required"}),
+            )
+        feed = calendar.CalendarFeed(
+            kind=calendar.FEED_KIND_SCOPE,
+            tenant_id=ctx.tenant_id,
+            tenant_slug=ctx.tenant_slug,
+            user_id=ctx.user_id,
+            scope_type=scope_type,
+            scope_id=scope_id,
+        )
+    _require_feed_access(request, ctx, feed)
+
+    return _subscription_out(calendar.subscribe(feed))
+
+
+def _get_own_subscription(ctx: InternalContext, subscription_id: str) -> CalendarSubscription:
+    sub_uuid = _parse_uuid(subscription_id, code="INVALID_SUBSCRIPTION_ID", message="Invalid subscription id")
+    sub = CalendarSubscription.objects.filter(id=sub_uuid, tenant_id=ctx.tenant_id, user_id=ctx.user_id).first()
+    if sub is None:
+        raise HttpError(404, cast(Any, {"code": "NOT_FOUND", "message": "Calendar subscription not found"}))
+    return sub
+
+
+@router.post("/calendar/subscriptions/{subscription_id}/rotate", response=CalendarSubscriptionOut)
+def rotate_calendar_subscription(request, subscription_id: str):
+    """Invalidate the current feed token and issue a new one."""
+    ctx = require_internal_context(request)
+    sub = _get_own_subscription(ctx, subscription_id)
+    return _subscription_out(calendar.rotate(sub))
+
+
+@router.delete("/calendar/subscriptions/{subscription_id}")
+def revoke_calendar_subscription(request, subscription_id: str):
+    """Disable a calendar feed; its tokens are rejected from now on."""
+    ctx = require_internal_context(request)
+    calendar.revoke(_get_own_subscription(ctx, subscription_id))
+    return HttpResponse(status=204)
+
+
+def _not_modified(request, state: calendar.FeedState) -> bool:
+    # ETag only: ``last_modified`` does not move when an event is deleted.
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    return quote_etag(state.etag) in {tag.strip() for tag in if_none_match.split(",")} or (
+        if_none_match.strip() == "*"
+    )
+
+
+@router.get("/calendar.ics")
+def calendar_feed(request, token: str = Query(...)):
+    """
+    Subscription feed polled by calendar clients.
+
+    Authenticated by the feed token alone (the BFF forwards it without a
+    session), so it only requires the internal signature. The subscriber's
+    read access and scope membership are re-checked on every poll.
+    """
+    require_internal_signature(request)
+    try:
+        feed = calendar.read_feed_token(token)
+    except calendar.CalendarTokenError as exc:
+        raise _calendar_token_error() from exc
+    header_tenant = request.headers.get("X-Tenant-Id")
+    if header_tenant and header_tenant != feed.tenant_id:
+        raise _calendar_token_error()
+
+    ctx = InternalContext(
+        request_id=request.headers.get("X-Request-Id") or str(uuid.uuid4()),
+        tenant_id=feed.tenant_id,
+        tenant_slug=feed.tenant_slug,
+        user_id=feed.user_id,
+        master_flags={},
+    )
+    _require_feed_access(request, ctx, feed)
+
+    state = calendar.feed_state(feed)
+    if _not_modified(request, state):
+        resp = HttpResponse(status=304)
+    else:
+        blob = calendar.cached_feed(state)
+        if blob is not None:
+            resp = HttpResponse(blob, content_type="text/calendar; charset=utf-8")
+        else:
+            resp = StreamingHttpResponse(
+                calendar.stream_feed(feed, state),
+                content_type="text/calendar; charset=utf-8",
+            )
+    resp["ETag"] = quote_etag(state.etag)
+    resp["Cache-Control"] = "private, max-age=300"
+    return resp
+
+
+def _attendance_rate(attended: int, going: int) -> float | None:
+    if going <= 0:
+        return None
+    return round(attended / going, 4)
+
+
+@router.get("/stats/attendance", response=AttendanceRollupOut)
+def attendance_rollup(
+    request,
+    scope_type: str | None = Query(None, alias="scope_type"),
+    scope_id: str | None = Query(None, alias="scope_id"),
+    from_: str | None = Query(None, alias="from"),
+    to: str | None = Query(None, alias="to"),
+):
+    """
+    Per-scope attendance rollup for organizer dashboards, aggregated from
+    ``EventStats`` counters rather than RSVP/Attendance rows.
+    """
+    ctx = require_internal_context(request)
+
+    perm_scope_type = scope_type or EventScopeType.TENANT
+    perm_scope_id = scope_id or ctx.tenant_id
+    _require_perm_ctx(ctx, "events.event.manage", perm_scope_type, perm_scope_id)
+
+    qs = EventStats.objects.filter(tenant_id=ctx.tenant_id)
+    if scope_type and scope_id:
+        qs = qs.filter(event__scope_type=scope_type, event__scope_id=scope_id)
+    if from_:
+        dt_from = _parse_iso_datetime(from_, code="INVALID_FROM", message="from must be ISO datetime")
+        qs = qs.filter(event__starts_at__gte=dt_from)
+    if to:
+        dt_to = _parse_iso_datetime(to, code="INVALID_TO", message="to must be ISO datetime")
+        qs = qs.filter(event__starts_at__lte=dt_to)
+
+    rows = (
+        qs.values("event__scope_type", "event__scope_id")
+        .annotate(
+            events=Count("event_id"),
+            going=Sum("going_count"),
+            interested=Sum("interested_count"),
+            attended=Sum("attended_count"),
+        )
+        .order_by("event__scope_type", "event__scope_id")
+    )
+    items = []
+    for row in rows:
+        going = row["going"] or 0
+        attended = row["attended"] or 0
+        item = AttendanceRollupItemOut(
+            scope_type=row["event__scope_type"],
+            scope_id=row["event__scope_id"],
+            events=row["events"],
+            going=going,
+            interested=row["interested"] or 0,
+            attended=attended,
+            attendance_rate=_attendance_rate(attended, going),
+        )
+        items.append(_camelize_keys(item.model_dump()))
+    return JsonResponse({"items": items})
+
+
 @router.get("/{event_id}", response=EventOut)
 def get_event(request, event_id: str):
     ctx = require_internal_context(request)
@@ -446,16 +773,10 @@ def get_event(request, event_id: str):
 
     _require_perm_ctx(ctx, "events.event.read", event.scope_type, event.scope_id)
 
-    if not _event_visible_for_user(event, ctx=ctx):
+    if not _event_visible_for_user(event, ctx=ctx, viewer=_viewer_visibility(request, ctx)):
         raise HttpError(404, cast(Any, {"code": "NOT_FOUND", "message": "Event not found"}))
 
-    counts = _empty_rsvp_counts()
-    for row in (
-        RSVP.objects.filter(tenant_id=ctx.tenant_id, event=event)
-        .values("status")
-        .annotate(count=Count("id"))
-    ):
-        counts[row["status"]] = row["count"]
+    counts = _get_rsvp_counts_map(ctx=ctx, event_ids=[str(event.id)])[str(event.id)]
 
     my_rsvp = (
         RSVP.objects.filter(tenant_id=ctx.tenant_id, event=event, user_id=ctx.user_id)
@@ -495,13 +816,7 @@ def update_event_api(request, event_id: str, payload: EventUpdateIn):
 
     updated = update_event(event=event, data=data)
 
-    counts = _empty_rsvp_counts()
-    for row in (
-        RSVP.objects.filter(tenant_id=ctx.tenant_id, event=updated)
-        .values("status")
-        .annotate(count=Count("id"))
-    ):
-        counts[row["status"]] = row["count"]
+    counts = _get_rsvp_counts_map(ctx=ctx, event_ids=[str(updated.id)])[str(updated.id)]
 
     my_rsvp = (
         RSVP.objects.filter(tenant_id=ctx.tenant_id, event=updated, user_id=ctx.user_id)
@@ -557,38 +872,16 @@ def event_ics(request, event_id: str):
 
     _require_perm_ctx(ctx, "events.event.read", event.scope_type, event.scope_id)
 
-    if not _event_visible_for_user(event, ctx=ctx):
+    if not _event_visible_for_user(event, ctx=ctx, viewer=_viewer_visibility(request, ctx)):
         raise HttpError(404, cast(Any, {"code": "NOT_FOUND", "message": "Event not found"}))
 
-    def fmt(dt: datetime) -> str:
-        dt = _to_aware(dt)
-        dt = dt.astimezone(dt_timezone.utc)
-        return dt.strftime("%Y%m%dT%H%M%SZ")
-
-    uid = f"{event.id}@{ctx.tenant_slug}.updspace"
-
     lines = [
-        "BEGIN:VCALENDAR",
-        "VERSION:2.0",
-        "PRODID:-//UpdSpace//Events//EN",
-        "CALSCALE:GREGORIAN",
-        "BEGIN:VEVENT",
-        f"UID:{uid}",
-        f"DTSTAMP:{fmt(dj_timezone.now())}",
-        f"DTSTART:{fmt(event.starts_at)}",
-        f"DTEND:{fmt(event.ends_at)}",
-        f"SUMMARY:{_ics_escape_text(event.title)}",
+        *calendar.CALENDAR_HEADER,
+        *calendar.vevent_lines(event, tenant_slug=ctx.tenant_slug, dtstamp=dj_timezone.now()),
+        *calendar.CALENDAR_FOOTER,
     ]
-    if event.description:
-        lines.append(f"DESCRIPTION:{_ics_escape_text(event.description)}")
-    if event.location_text:
-        lines.append(f"LOCATION:{_ics_escape_text(event.location_text)}")
-    if event.location_url:
-        lines.append(f"URL:{_ics_sanitize_uri(event.location_url)}")
-
-    lines += ["END:VEVENT", "END:VCALENDAR"]
 
-    body = _ics_render(lines)
+    body = calendar.render(lines)
     resp = HttpResponse(body, content_type="text/calendar; charset=utf-8")
     resp["Content-Disposition"] = f"attachment; filename=event-{event.id}.ics"
     return resp
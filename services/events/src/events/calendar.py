@@ -0,0 +1,353 @@
+"""
+iCalendar (RFC 5545) rendering and subscription feeds.
+
+Calendar clients poll ``/events/calendar.ics`` every few minutes with a
+long-lived signed token instead of a session. The token names a stored
+``CalendarSubscription`` (user RSVPs or a tenant/scope) and its version, so
+feeds can be rotated or revoked one by one. A feed is rendered by streaming
+over a keyset-paged query and cached as a blob under the feed's watermark,
+which doubles as the ETag so an unchanged calendar costs one aggregate query.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Q, QuerySet
+from django.utils import timezone
+from django.utils.timezone import is_naive, make_aware
+
+from .models import (
+    RSVP,
+    CalendarSubscription,
+    Event,
+    EventScopeType,
+    EventVisibility,
+    RSVPStatus,
+)
+
+FEED_KIND_USER = "user"
+FEED_KIND_SCOPE = "scope"
+
+_TOKEN_SALT = "events.calendar.feed"
+_CACHE_PREFIX = "events:calendar"
+_FEED_PAGE_SIZE = 500
+
+_SCOPE_VISIBILITY = {
+    EventScopeType.COMMUNITY: EventVisibility.COMMUNITY,
+    EventScopeType.TEAM: EventVisibility.TEAM,
+}
+
+
+class CalendarTokenError(ValueError):
+    """Raised when a feed token is malformed, tampered with, expired or revoked."""
+
+
+# =========================
+# ICS helpers (RFC5545)
+# =========================
+def escape_text(value: str) -> str:
+    """
+    RFC5545 TEXT escaping:
+      - backslash -> \\,
+      - semicolon -> \\;,
+      - comma -> \\,
+      - newline -> \\n
+    """
+    value = value.replace("\r\n", "\n").replace("\r", "\n")
+    value = value.replace("\\", "\\\\")
+    value = value.replace(";", "\\;")
+    value = value.replace(",", "\\,")
+    value = value.replace("\n", "\\n")
+    return value
+
+
+def sanitize_uri(value: str) -> str:
+    """
+    URI fields (URL): не применяем TEXT escaping, но убираем CR/LF.
+    """
+    return value.replace("\r", "").replace("\n", "")
+
+
+def fold_line(line: str, *, limit: int = 75) -> list[str]:
+    """
+    RFC5545 line folding: max 75 octets per line, continuation lines start with a single space.
+    Считаем по UTF-8 octets и не режем посередине multibyte символов.
+    """
+    out: list[str] = []
+    cur = ""
+    cur_octets = 0
+
+    for ch in line:
+        ch_octets = len(ch.encode("utf-8"))
+        if cur and (cur_octets + ch_octets) > limit:
+            out.append(cur)
+            cur = " " + ch
+            cur_octets = 1 + ch_octets
+        else:
+            cur += ch
+            cur_octets += ch_octets
+
+    out.append(cur)
+    return out
+
+
+def render(lines: list[str]) -> str:
+    folded: list[str] = []
+    for line in lines:
+        folded.extend(fold_line(line))
+    return "\r\n".join(folded) + "\r\n"
+
+
+def format_utc(dt: datetime) -> str:
+    if is_naive(dt):
+        dt = make_aware(dt)
+    return dt.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+CALENDAR_HEADER = [
+    "BEGIN:VCALENDAR",
+    "VERSION:2.0",
+    "PRODID:-//UpdSpace//Events//EN",
+    "CALSCALE:GREGORIAN",
+]
+CALENDAR_FOOTER = ["END:VCALENDAR"]
+
+
+def vevent_lines(event: Event, *, tenant_slug: str, dtstamp: datetime) -> list[str]:
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event.id}@{tenant_slug}.updspace",
+        f"DTSTAMP:{format_utc(dtstamp)}",
+        f"DTSTART:{format_utc(event.starts_at)}",
+        f"DTEND:{format_utc(event.ends_at)}",
+        f"SUMMARY:{escape_text(event.title)}",
+    ]
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+    if event.location_text:
+        lines.append(f"LOCATION:{escape_text(event.location_text)}")
+    if event.location_url:
+        lines.append(f"URL:{sanitize_uri(event.location_url)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+# =========================
+# Subscription feeds
+# =========================
+@dataclass(frozen=True)
+class CalendarFeed:
+    kind: str
+    tenant_id: str
+    tenant_slug: str
+    user_id: str
+    scope_type: str = ""
+    scope_id: str = ""
+    version: int = 0
+
+    @classmethod
+    def from_subscription(cls, sub: CalendarSubscription) -> CalendarFeed:
+        return cls(
+            kind=sub.kind,
+            tenant_id=str(sub.tenant_id),
+            tenant_slug=sub.tenant_slug,
+            user_id=str(sub.user_id),
+            scope_type=sub.scope_type,
+            scope_id=sub.scope_id,
+            version=sub.version,
+        )
+
+
+def _token_key() -> str:
+    return str(getattr(settings, "EVENTS_CALENDAR_TOKEN_SECRET", "") or settings.SECRET_KEY)
+
+
+def subscribe(feed: CalendarFeed) -> CalendarSubscription:
+    """
+    Get or create the subscription for ``feed``; a revoked one is reactivated
+    under a new version so its old tokens stay dead.
+    """
+    sub, created = CalendarSubscription.objects.get_or_create(
+        tenant_id=feed.tenant_id,
+        user_id=feed.user_id,
+        kind=feed.kind,
+        scope_type=feed.scope_type,
+        scope_id=feed.scope_id,
+        defaults={"tenant_slug": feed.tenant_slug},
+    )
+    if not created and sub.revoked_at is not None:
+        sub.revoked_at = None
+        sub.version += 1
+        sub.tenant_slug = feed.tenant_slug
+        sub.save(update_fields=["revoked_at", "version", "tenant_slug"])
+    return sub
+
+
+def rotate(sub: CalendarSubscription) -> CalendarSubscription:
+    sub.version += 1
+    sub.revoked_at = None
+    sub.save(update_fields=["version", "revoked_at"])
+    return sub
+
+
+def revoke(sub: CalendarSubscription) -> None:
+    if sub.revoked_at is None:
+        sub.revoked_at = timezone.now()
+        sub.save(update_fields=["revoked_at"])
+
+
+def issue_feed_token(sub: CalendarSubscription) -> str:
+    payload = {"sid": str(sub.id), "v": sub.version}
+    return signing.dumps(payload, key=_token_key(), salt=_TOKEN_SALT, compress=True)
+
+
+def read_feed_token(token: str) -> CalendarFeed:
+    """
+    Resolve ``token`` to its feed. The signature and age are checked first,
+    then the stored subscription must exist, be active and match the version.
+    """
+    max_age = timedelta(days=int(getattr(settings, "EVENTS_CALENDAR_TOKEN_MAX_AGE_DAYS", 365)))
+    try:
+        data = signing.loads(token, key=_token_key(), salt=_TOKEN_SALT, max_age=max_age)
+        sub_id, version = str(data["sid"]), int(data["v"])
+    except (signing.BadSignature, TypeError, KeyError, ValueError) as exc:
+        raise CalendarTokenError("Invalid calendar token") from exc
+    try:
+        sub = CalendarSubscription.objects.filter(id=sub_id).first()
+    except ValidationError as exc:
+        raise CalendarTokenError("Invalid calendar token") from exc
+    if sub is None or sub.revoked_at is not None or sub.version != version:
+        raise CalendarTokenError("Calendar token has been revoked")
+    if sub.kind not in {FEED_KIND_USER, FEED_KIND_SCOPE}:
+        raise CalendarTokenError("Unknown calendar feed kind")
+    return CalendarFeed.from_subscription(sub)
+
+
+def _window_start() -> datetime:
+    past_days = int(getattr(settings, "EVENTS_CALENDAR_PAST_DAYS", 30))
+    today = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return today - timedelta(days=past_days)
+
+
+def feed_queryset(feed: CalendarFeed, *, window_start: datetime) -> QuerySet[Event]:
+    qs = Event.objects.filter(tenant_id=feed.tenant_id, ends_at__gte=window_start)
+    if feed.kind == FEED_KIND_USER:
+        attending = RSVP.objects.filter(
+            tenant_id=feed.tenant_id,
+            user_id=feed.user_id,
+            status__in=[RSVPStatus.GOING, RSVPStatus.INTERESTED],
+        ).values("event_id")
+        return qs.filter(id__in=attending).filter(
+            ~Q(visibility=EventVisibility.PRIVATE) | Q(created_by=feed.user_id)
+        )
+
+    if feed.scope_type == EventScopeType.TENANT:
+        return qs.filter(visibility=EventVisibility.PUBLIC)
+    visibilities = [EventVisibility.PUBLIC]
+    if feed.scope_type in _SCOPE_VISIBILITY:
+        visibilities.append(_SCOPE_VISIBILITY[feed.scope_type])
+    return qs.filter(
+        scope_type=feed.scope_type,
+        scope_id=feed.scope_id,
+        visibility__in=visibilities,
+    )
+
+
+@dataclass(frozen=True)
+class FeedState:
+    etag: str
+    last_modified: datetime | None
+    window_start: datetime
+
+
+def feed_state(feed: CalendarFeed) -> FeedState:
+    """
+    Watermark of a feed: event count and latest ``updated_at`` in the window,
+    plus the latest RSVP change for user feeds. Any edit, new event or RSVP
+    moves it; a deletion only lowers the count, so the ETag is the validator
+    and ``last_modified`` is just the DTSTAMP, never a Last-Modified header.
+    The day-granular window start rolls old events off daily.
+    """
+    window_start = _window_start()
+    row = feed_queryset(feed, window_start=window_start).aggregate(
+        total=Count("id"),
+        latest=Max("updated_at"),
+    )
+    last_modified = row["latest"]
+    parts = [
+        *map(str, asdict(feed).values()),
+        window_start.date().isoformat(),
+        str(row["total"]),
+        last_modified.isoformat() if last_modified else "-",
+    ]
+    if feed.kind == FEED_KIND_USER:
+        rsvp_latest = RSVP.objects.filter(
+            tenant_id=feed.tenant_id, user_id=feed.user_id
+        ).aggregate(latest=Max("updated_at"))["latest"]
+        parts.append(rsvp_latest.isoformat() if rsvp_latest else "-")
+        if rsvp_latest and (last_modified is None or rsvp_latest > last_modified):
+            last_modified = rsvp_latest
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:32]
+    return FeedState(etag=digest, last_modified=last_modified, window_start=window_start)
+
+
+def _iter_feed_events(qs: QuerySet[Event]) -> Iterator[Event]:
+    # Keyset paging on (starts_at, id): constant memory and no OFFSET scans.
+    qs = qs.order_by("starts_at", "id")
+    cursor: tuple[datetime, object] | None = None
+    while True:
+        page_qs = qs
+        if cursor is not None:
+            page_qs = qs.filter(
+                Q(starts_at__gt=cursor[0]) | Q(starts_at=cursor[0], id__gt=cursor[1])
+            )
+        page = list(page_qs[:_FEED_PAGE_SIZE])
+        yield from page
+        if len(page) < _FEED_PAGE_SIZE:
+            return
+        cursor = (page[-1].starts_at, page[-1].id)
+
+
+def _cache_key(state: FeedState) -> str:
+    return f"{_CACHE_PREFIX}:{state.etag}"
+
+
+def cached_feed(state: FeedState) -> bytes | None:
+    return cache.get(_cache_key(state))
+
+
+def stream_feed(feed: CalendarFeed, state: FeedState) -> Iterator[bytes]:
+    """
+    Yield the rendered calendar chunk by chunk and cache the full blob once
+    the last chunk has been produced.
+    """
+    dtstamp = state.last_modified or timezone.now()
+    chunks: list[bytes] = []
+
+    def emit(lines: list[str]) -> bytes:
+        chunk = render(lines).encode("utf-8")
+        chunks.append(chunk)
+        return chunk
+
+    yield emit(CALENDAR_HEADER)
+    batch: list[str] = []
+    for event in _iter_feed_events(feed_queryset(feed, window_start=state.window_start)):
+        batch.extend(vevent_lines(event, tenant_slug=feed.tenant_slug, dtstamp=dtstamp))
+        if len(batch) >= 200:
+            yield emit(batch)
+            batch = []
+    if batch:
+        yield emit(batch)
+    yield emit(CALENDAR_FOOTER)
+
+    ttl = int(getattr(settings, "EVENTS_CALENDAR_CACHE_TTL_SECONDS", 3600))
+    cache.set(_cache_key(state), b"".join(chunks), ttl)
@@ -7,6 +7,7 @@ from django.db.models import Q
 from django.utils import timezone
 
 from events.models import RSVP, Attendance, Event, OutboxMessage
+from events.service import rebuild_event_stats
 
 ANONYMIZED_USER_ID = UUID("00000000-0000-0000-0000-000000000000")
 REDACTED_VALUE = "[redacted]"
@@ -132,8 +133,13 @@ def erase_user_data(*, tenant_id: UUID, user_id: UUID) -> dict[str, Any]:
     events_anonymized = Event.objects.filter(tenant_id=tenant_id, created_by=user_id).update(
         created_by=ANONYMIZED_USER_ID,
     )
+    touched_event_ids = set(
+        RSVP.objects.filter(tenant_id=tenant_id, user_id=user_id).values_list("event_id", flat=True)
+    ) | set(Attendance.objects.filter(tenant_id=tenant_id, user_id=user_id).values_list("event_id", flat=True))
     rsvps_deleted, _ = RSVP.objects.filter(tenant_id=tenant_id, user_id=user_id).delete()
     attendance_deleted, _ = Attendance.objects.filter(tenant_id=tenant_id, user_id=user_id).delete()
+    if touched_event_ids:
+        rebuild_event_stats(event_ids=touched_event_ids)
     attendance_marked_by_redacted = Attendance.objects.filter(
         tenant_id=tenant_id,
         marked_by=user_id,
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import json
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from events.service import rebuild_event_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized RSVP/attendance counters (EventStats) from source rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant-id", default=None, help="Limit rebuild to a single tenant")
+
+    def handle(self, *args, **options):
+        tenant_id = options["tenant_id"]
+        if tenant_id:
+            try:
+                tenant_id = UUID(str(tenant_id))
+            except ValueError as exc:
+                raise CommandError("--tenant-id must be a UUID") from exc
+
+        started_at = timezone.now()
+        processed = rebuild_event_stats(tenant_id=tenant_id)
+
+        payload = {
+            "service": "events",
+            "executed_at": started_at.isoformat(),
+            "tenant_id": str(tenant_id) if tenant_id else None,
+            "counts": {
+                "events_processed": processed,
+            },
+        }
+        self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
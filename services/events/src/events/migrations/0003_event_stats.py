@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_outbox_claim_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventStats",
+            fields=[
+                ("event", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="stats", serialize=False, to="events.event")),
+                ("tenant_id", models.UUIDField(db_index=True)),
+                ("going_count", models.PositiveIntegerField(default=0)),
+                ("interested_count", models.PositiveIntegerField(default=0)),
+                ("not_going_count", models.PositiveIntegerField(default=0)),
+                ("attended_count", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "events_event_stats",
+            },
+        ),
+    ]
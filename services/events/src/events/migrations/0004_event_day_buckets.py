@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:37
+
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+LONG_SPAN_DAYS = 62
+CHUNK_SIZE = 1000
+
+
+def backfill_day_buckets(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventDayBucket = apps.get_model("events", "EventDayBucket")
+
+    last_id = None
+    while True:
+        qs = Event.objects.order_by("id")
+        if last_id is not None:
+            qs = qs.filter(id__gt=last_id)
+        page = list(qs.only("id", "tenant_id", "scope_type", "scope_id", "starts_at", "ends_at")[:CHUNK_SIZE])
+        if not page:
+            return
+        last_id = page[-1].id
+
+        rows = []
+        for event in page:
+            first_day = event.starts_at.astimezone(dt_timezone.utc).date()
+            last_day = max(event.ends_at.astimezone(dt_timezone.utc).date(), first_day)
+            common = {
+                "event_id": event.id,
+                "tenant_id": event.tenant_id,
+                "scope_type": event.scope_type,
+                "scope_id": event.scope_id,
+                "end_day": last_day,
+            }
+            span = (last_day - first_day).days
+            if span >= LONG_SPAN_DAYS:
+                rows.append(EventDayBucket(day=first_day, long_span=True, **common))
+            else:
+                rows.extend(
+                    EventDayBucket(day=first_day + timedelta(days=offset), **common)
+                    for offset in range(span + 1)
+                )
+        EventDayBucket.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventDayBucket",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("scope_type", models.CharField(choices=[("TENANT", "TENANT"), ("COMMUNITY", "COMMUNITY"), ("TEAM", "TEAM")], max_length=16)),
+                ("scope_id", models.CharField(max_length=128)),
+                ("day", models.DateField()),
+                ("end_day", models.DateField()),
+                ("long_span", models.BooleanField(default=False)),
+                ("event", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="day_buckets", to="events.event")),
+            ],
+            options={
+                "db_table": "events_event_day_bucket",
+                "indexes": [models.Index(fields=["tenant_id", "day"], name="events_bucket_tenant_day_idx"), models.Index(fields=["tenant_id", "scope_type", "scope_id", "day"], name="events_bucket_scope_day_idx"), models.Index(fields=["tenant_id", "long_span", "day"], name="events_bucket_long_idx")],
+                "constraints": [models.UniqueConstraint(fields=("event", "day"), name="events_day_bucket_unique")],
+            },
+        ),
+        migrations.RunPython(backfill_day_buckets, migrations.RunPython.noop),
+    ]
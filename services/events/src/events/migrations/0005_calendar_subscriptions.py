@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:41
+
+import uuid
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0004_event_day_buckets"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CalendarSubscription",
+            fields=[
+                ("id", models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("tenant_slug", models.CharField(max_length=64)),
+                ("user_id", models.UUIDField()),
+                ("kind", models.CharField(max_length=16)),
+                ("scope_type", models.CharField(blank=True, default="", max_length=16)),
+                ("scope_id", models.CharField(blank=True, default="", max_length=128)),
+                ("version", models.PositiveIntegerField(default=1)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("revoked_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "db_table": "events_calendar_subscription",
+                "constraints": [models.UniqueConstraint(fields=("tenant_id", "user_id", "kind", "scope_type", "scope_id"), name="events_calendar_sub_unique")],
+            },
+        ),
+    ]
@@ -109,6 +109,104 @@ class Attendance(models.Model):
         ]
 
 
+class EventStats(models.Model):
+    """
+    Materialized RSVP and attendance counters, one row per event.
+
+    Maintained by ``set_rsvp`` / ``mark_attendance`` in the same transaction
+    as the source rows; ``rebuild_event_stats`` recomputes them from scratch.
+    """
+
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    tenant_id = models.UUIDField(db_index=True)
+
+    going_count = models.PositiveIntegerField(default=0)
+    interested_count = models.PositiveIntegerField(default=0)
+    not_going_count = models.PositiveIntegerField(default=0)
+    attended_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "events_event_stats"
+
+
+class EventDayBucket(models.Model):
+    """
+    Day-bucketed interval index over ``Event``.
+
+    One row per UTC day an event touches, so "events overlapping [from, to]"
+    becomes an equality/range scan on ``(tenant_id, day)`` instead of two
+    half-open range predicates. Events longer than ``LONG_SPAN_DAYS`` get a
+    single ``long_span`` row covering ``day..end_day``. Kept in sync by
+    ``events.time_index.sync_event_buckets``.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="day_buckets")
+    tenant_id = models.UUIDField()
+
+    scope_type = models.CharField(max_length=16, choices=EventScopeType.choices)
+    scope_id = models.CharField(max_length=128)
+
+    day = models.DateField()
+    end_day = models.DateField()
+    long_span = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "events_event_day_bucket"
+        constraints = [
+            models.UniqueConstraint(fields=["event", "day"], name="events_day_bucket_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["tenant_id", "day"], name="events_bucket_tenant_day_idx"),
+            models.Index(
+                fields=["tenant_id", "scope_type", "scope_id", "day"],
+                name="events_bucket_scope_day_idx",
+            ),
+            models.Index(fields=["tenant_id", "long_span", "day"], name="events_bucket_long_idx"),
+        ]
+
+
+class CalendarSubscription(models.Model):
+    """
+    Server-side state behind a calendar feed token.
+
+    Tokens only carry the subscription id and ``version``; bumping the
+    version rotates the token and setting ``revoked_at`` disables the feed,
+    so a leaked URL can be cut off without touching the signing secret.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    tenant_id = models.UUIDField()
+    tenant_slug = models.CharField(max_length=64)
+    user_id = models.UUIDField()
+
+    kind = models.CharField(max_length=16)
+    scope_type = models.CharField(max_length=16, blank=True, default="")
+    scope_id = models.CharField(max_length=128, blank=True, default="")
+
+    version = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "events_calendar_subscription"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant_id", "user_id", "kind", "scope_type", "scope_id"],
+                name="events_calendar_sub_unique",
+            ),
+        ]
+
+
 class OutboxMessage(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
@@ -5,7 +5,9 @@ import hmac
 import json
 import logging
 import time
+from dataclasses import dataclass
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 from django.conf import settings
@@ -27,6 +29,14 @@ class PortalServiceUnavailable(PortalClientError):
     """Raised when the portal service cannot be reached."""
 
 
+@dataclass(frozen=True)
+class PortalMemberships:
+    """Community and team ids the viewer belongs to, as strings."""
+
+    community_ids: frozenset[str]
+    team_ids: frozenset[str]
+
+
 def _master_flags_header(flags: dict[str, Any]) -> str | None:
     if not flags:
         return None
@@ -71,8 +81,10 @@ class PortalClient:
         *,
         body: bytes = b"",
     ) -> dict[str, Any]:
+        url = f"{self._base_url}{path}"
         try:
-            ts, sig = self._sign(method, path, body, ctx.request_id)
+            # Portal verifies against request.path, which includes the /api/v1 prefix.
+            ts, sig = self._sign(method, urlsplit(url).path, body, ctx.request_id)
         except PortalClientError as exc:
             logger.error("Portal client signing failed", extra={"error": str(exc)})
             raise
@@ -89,7 +101,6 @@ class PortalClient:
         if (flags := _master_flags_header(ctx.master_flags)):
             headers["X-Master-Flags"] = flags
 
-        url = f"{self._base_url}{path}"
         try:
             resp = self._client.request(method, url, headers=headers, content=body)
         except httpx.TimeoutException as exc:
@@ -135,5 +146,17 @@ class PortalClient:
         except PortalMembershipNotFound:
             return False
 
+    def list_memberships(self, ctx: InternalContext) -> PortalMemberships:
+        """All community and team memberships of ``ctx.user_id`` in one call."""
+        data = self._request("GET", "/portal/me/memberships", ctx)
+        return PortalMemberships(
+            community_ids=frozenset(
+                str(item["id"]) for item in data.get("communities") or [] if item.get("id")
+            ),
+            team_ids=frozenset(
+                str(item["id"]) for item in data.get("teams") or [] if item.get("id")
+            ),
+        )
+
 
 portal_client = PortalClient()
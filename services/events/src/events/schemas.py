@@ -83,3 +83,29 @@ class RsvpSetIn(CamelSchema):
 
 class AttendanceMarkIn(CamelSchema):
     user_id: str
+
+
+class CalendarSubscriptionIn(CamelSchema):
+    kind: Literal["user", "scope"] = "user"
+    scope_type: ScopeType | None = None
+    scope_id: str | None = None
+
+
+class CalendarSubscriptionOut(CamelSchema):
+    id: str
+    token: str
+    path: str
+
+
+class AttendanceRollupItemOut(CamelSchema):
+    scope_type: ScopeType
+    scope_id: str
+    events: int
+    going: int
+    interested: int
+    attended: int
+    attendance_rate: float | None = None
+
+
+class AttendanceRollupOut(CamelSchema):
+    items: list[AttendanceRollupItemOut]
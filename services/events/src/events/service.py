@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from django.conf import settings
 from django.db import transaction
+from django.db.models import Count, F
 from django.utils import timezone
 
 from core.ymq import schedule_outbox_wakeup
 
-from .models import RSVP, Attendance, Event, EventVisibility, OutboxMessage
+from .models import (
+    RSVP,
+    Attendance,
+    Event,
+    EventStats,
+    EventVisibility,
+    OutboxMessage,
+    RSVPStatus,
+)
+from .time_index import sync_event_buckets
+
+STATS_REBUILD_CHUNK_SIZE = 500
+
+_RSVP_COUNTER_FIELDS = {
+    RSVPStatus.GOING: "going_count",
+    RSVPStatus.INTERESTED: "interested_count",
+    RSVPStatus.NOT_GOING: "not_going_count",
+}
 
 
 def _is_ydb_mode() -> bool:
@@ -31,6 +51,76 @@ def _emit_outbox(*, tenant_id, event_type: str, payload: dict) -> None:
     )
 
 
+def _compute_stats(event_ids: list) -> dict:
+    fields = (*_RSVP_COUNTER_FIELDS.values(), "attended_count")
+    stats = {event_id: dict.fromkeys(fields, 0) for event_id in event_ids}
+    for row in (
+        RSVP.objects.filter(event_id__in=event_ids).values("event_id", "status").annotate(count=Count("id"))
+    ):
+        field = _RSVP_COUNTER_FIELDS.get(row["status"])
+        if field:
+            stats[row["event_id"]][field] = row["count"]
+    for row in Attendance.objects.filter(event_id__in=event_ids).values("event_id").annotate(count=Count("id")):
+        stats[row["event_id"]]["attended_count"] = row["count"]
+    return stats
+
+
+def rebuild_event_stats(*, tenant_id=None, event_ids: Iterable | None = None) -> int:
+    """
+    Recompute ``EventStats`` from RSVP/Attendance rows in chunks.
+
+    Restricted to ``event_ids`` or ``tenant_id`` when given; returns the
+    number of events processed.
+    """
+    qs = Event.objects.all()
+    if tenant_id is not None:
+        qs = qs.filter(tenant_id=tenant_id)
+    if event_ids is not None:
+        qs = qs.filter(id__in=list(event_ids))
+
+    processed = 0
+    last_id = None
+    while True:
+        page_qs = qs.order_by("id")
+        if last_id is not None:
+            page_qs = page_qs.filter(id__gt=last_id)
+        page = list(page_qs.values_list("id", "tenant_id")[:STATS_REBUILD_CHUNK_SIZE])
+        if not page:
+            return processed
+        last_id = page[-1][0]
+
+        tenants = dict(page)
+        computed = _compute_stats(list(tenants))
+        with transaction.atomic():
+            existing = set(EventStats.objects.filter(event_id__in=list(tenants)).values_list("event_id", flat=True))
+            # bulk_update bypasses auto_now, so stamp updated_at explicitly.
+            now = timezone.now()
+            rows = [
+                EventStats(event_id=event_id, tenant_id=tenants[event_id], updated_at=now, **counters)
+                for event_id, counters in computed.items()
+            ]
+            EventStats.objects.bulk_create([row for row in rows if row.event_id not in existing])
+            EventStats.objects.bulk_update(
+                [row for row in rows if row.event_id in existing],
+                fields=[*_RSVP_COUNTER_FIELDS.values(), "attended_count", "updated_at"],
+            )
+        processed += len(page)
+
+
+def _apply_stats_delta(event: Event, deltas: dict[str, int]) -> None:
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updated = EventStats.objects.filter(event_id=event.id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()},
+    )
+    if not updated:
+        # Events created before counters existed: materialize from the source
+        # rows, which already include the change being applied.
+        rebuild_event_stats(event_ids=[event.id])
+
+
 @transaction.atomic
 def create_event(*, tenant_id, created_by, data: dict) -> Event:
     event = Event.objects.create(
@@ -47,6 +137,8 @@ def create_event(*, tenant_id, created_by, data: dict) -> Event:
         visibility=data.get("visibility") or EventVisibility.PUBLIC,
         created_by=created_by,
     )
+    EventStats.objects.create(event=event, tenant_id=tenant_id)
+    sync_event_buckets(event)
     _emit_outbox(
         tenant_id=tenant_id,
         event_type="event.created",
@@ -55,6 +147,9 @@ def create_event(*, tenant_id, created_by, data: dict) -> Event:
             "tenant_id": str(tenant_id),
             "scope_type": event.scope_type,
             "scope_id": event.scope_id,
+            "visibility": event.visibility,
+            "title": event.title,
+            "starts_at": event.starts_at.isoformat(),
             "created_by": str(created_by),
             "created_at": event.created_at.isoformat(),
         },
@@ -87,7 +182,11 @@ def update_event(*, event: Event, data: dict) -> Event:
 
     for field, value in updates.items():
         setattr(event, field, value)
-    event.save(update_fields=list(updates.keys()))
+    # auto_now only fires for fields in update_fields; the calendar feed
+    # ETag is built from updated_at.
+    event.save(update_fields=[*updates.keys(), "updated_at"])
+    if "starts_at" in updates or "ends_at" in updates:
+        sync_event_buckets(event)
 
     _emit_outbox(
         tenant_id=event.tenant_id,
@@ -119,8 +218,13 @@ def set_rsvp(*, tenant_id, event: Event, user_id, status: str) -> RSVP:
     )
     changed = created or (rsvp.status != status)
     if changed:
+        deltas = {_RSVP_COUNTER_FIELDS[status]: 1}
+        if not created:
+            old_field = _RSVP_COUNTER_FIELDS[rsvp.status]
+            deltas[old_field] = deltas.get(old_field, 0) - 1
         rsvp.status = status
         rsvp.save(update_fields=["status", "updated_at"])
+        _apply_stats_delta(event, deltas)
 
         _emit_outbox(
             tenant_id=tenant_id,
@@ -142,11 +246,13 @@ def mark_attendance(*, tenant_id, event: Event, user_id, marked_by) -> Attendanc
     if not _is_ydb_mode():
         queryset = queryset.select_for_update()
 
-    att, _ = queryset.get_or_create(
+    att, created = queryset.get_or_create(
         tenant_id=tenant_id,
         event=event,
         user_id=user_id,
         defaults={"marked_by": marked_by, "marked_at": timezone.now()},
     )
     # If already exists, keep original (idempotent)
+    if created:
+        _apply_stats_delta(event, {"attended_count": 1})
     return att
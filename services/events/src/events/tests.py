@@ -25,6 +25,9 @@ from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
 from django.test import Client, SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
+from django.utils.http import http_date
+
+from events.portal_client import PortalMemberships
 
 API_PREFIX = "/api/v1"
 EVENTS_ROOT = f"{API_PREFIX}/events"
@@ -350,8 +353,9 @@ class EventsApiTests(TestCase):
         hdrs = self._get_list_headers(request_id=request_id, path=EVENTS_LIST)
 
         mock_client = mock.Mock()
-        mock_client.is_community_member.return_value = False
-        mock_client.is_team_member.return_value = False
+        mock_client.list_memberships.return_value = PortalMemberships(
+            community_ids=frozenset(), team_ids=frozenset()
+        )
         with mock.patch("events.api.portal_client", mock_client), \
              mock.patch("events.api.has_scope_membership", return_value=False):
             resp = self.client.get(path_with_qs, **hdrs)
@@ -384,8 +388,9 @@ class EventsApiTests(TestCase):
         hdrs = self._get_list_headers(request_id=request_id, path=EVENTS_LIST)
 
         mock_client = mock.Mock()
-        mock_client.is_community_member.return_value = True
-        mock_client.is_team_member.return_value = False
+        mock_client.list_memberships.return_value = PortalMemberships(
+            community_ids=frozenset({community_id}), team_ids=frozenset()
+        )
         with mock.patch("events.api.portal_client", mock_client):
             resp = self.client.get(path_with_qs, **hdrs)
 
@@ -417,8 +422,9 @@ class EventsApiTests(TestCase):
         hdrs = self._get_list_headers(request_id=request_id, path=EVENTS_LIST)
 
         mock_client = mock.Mock()
-        mock_client.is_community_member.return_value = False
-        mock_client.is_team_member.return_value = False
+        mock_client.list_memberships.return_value = PortalMemberships(
+            community_ids=frozenset(), team_ids=frozenset()
+        )
         with mock.patch("events.api.portal_client", mock_client), \
              mock.patch("events.api.has_scope_membership", return_value=False):
             resp = self.client.get(path_with_qs, **hdrs)
@@ -451,14 +457,60 @@ class EventsApiTests(TestCase):
         hdrs = self._get_list_headers(request_id=request_id, path=EVENTS_LIST)
 
         mock_client = mock.Mock()
-        mock_client.is_community_member.return_value = False
-        mock_client.is_team_member.return_value = True
+        mock_client.list_memberships.return_value = PortalMemberships(
+            community_ids=frozenset(), team_ids=frozenset({team_id})
+        )
         with mock.patch("events.api.portal_client", mock_client):
             resp = self.client.get(path_with_qs, **hdrs)
 
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(len(resp.json()["items"]), 1)
 
+    @patch("events.api.has_permission", side_effect=_mock_has_permission_read_only)
+    @patch("events.permissions.has_permission", side_effect=_mock_has_permission_read_only)
+    def test_list_filters_visibility_before_paging(self, mock_perm1, mock_perm2):
+        """Total and pages count only visible events; memberships are fetched once."""
+        member_of = str(uuid.uuid4())
+        not_member_of = str(uuid.uuid4())
+        base = datetime(2026, 3, 1, 10, 0, 0, tzinfo=UTC)
+        layout = [
+            ("COMMUNITY", not_member_of, "community"),
+            ("TENANT", self.tenant_id, "public"),
+            ("COMMUNITY", not_member_of, "community"),
+            ("COMMUNITY", member_of, "community"),
+            ("TENANT", self.tenant_id, "private"),
+            ("TENANT", self.tenant_id, "public"),
+        ]
+        for index, (scope_type, scope_id, visibility) in enumerate(layout):
+            self.Event.objects.create(
+                tenant_id=self.tenant_id,
+                title=f"Event {index}",
+                scope_type=scope_type,
+                scope_id=scope_id,
+                visibility=visibility,
+                created_by=str(uuid.uuid4()),
+                description="",
+                starts_at=base + timedelta(hours=index),
+                ends_at=base + timedelta(hours=index + 1),
+            )
+
+        mock_client = mock.Mock()
+        mock_client.list_memberships.return_value = PortalMemberships(
+            community_ids=frozenset({member_of}), team_ids=frozenset()
+        )
+        path = f"{EVENTS_LIST}?limit=2&offset=2"
+        hdrs = self._get_list_headers(request_id=str(uuid.uuid4()), path=EVENTS_LIST)
+        with mock.patch("events.api.portal_client", mock_client), \
+             mock.patch("events.api.has_scope_membership", return_value=False) as mock_scope:
+            resp = self.client.get(path, **hdrs)
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(data["meta"]["total"], 3)
+        self.assertEqual([item["title"] for item in data["items"]], ["Event 5"])
+        mock_client.list_memberships.assert_called_once()
+        mock_scope.assert_called_once()
+
     @patch("events.api.has_permission", side_effect=_mock_has_permission_read_only)
     @patch("events.permissions.has_permission", side_effect=_mock_has_permission_read_only)
     def test_update_event_requires_manage_permission(self, mock_perm1, mock_perm2):
@@ -622,6 +674,239 @@ class EventsApiMissingSecretTests(TestCase):
         self.assertEqual(resp.status_code, 500)
 
 
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret")
+class CalendarFeedTests(TestCase):
+    FEED_PATH = f"{EVENTS_ROOT}/calendar.ics"
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client()
+        self.tenant_id = str(uuid.uuid4())
+        self.user_id = str(uuid.uuid4())
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def _event(self, title: str, *, days: int, visibility: str = "public"):
+        from events.models import Event
+
+        starts = timezone.now() + timedelta(days=days)
+        return Event.objects.create(
+            tenant_id=self.tenant_id,
+            scope_type="TENANT",
+            scope_id=self.tenant_id,
+            title=title,
+            visibility=visibility,
+            created_by=str(uuid.uuid4()),
+            starts_at=starts,
+            ends_at=starts + timedelta(hours=2),
+        )
+
+    def _rsvp(self, event, status: str = "going"):
+        from events.service import set_rsvp
+
+        set_rsvp(tenant_id=self.tenant_id, event=event, user_id=self.user_id, status=status)
+
+    @patch("events.api.has_permission", side_effect=_mock_has_permission_read_only)
+    def _issue(self, body: dict, _mock_perm) -> str:
+        path = f"{EVENTS_ROOT}/calendar/subscriptions"
+        raw = json.dumps(body).encode("utf-8")
+        hdrs = _headers(
+            method="POST",
+            path=path,
+            body=raw,
+            tenant_id=self.tenant_id,
+            tenant_slug="aef",
+            user_id=self.user_id,
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+        resp = self.client.post(path, data=raw, content_type="application/json", **hdrs)
+        self.assertEqual(resp.status_code, 200)
+        self.last_subscription_id = resp.json()["id"]
+        return resp.json()["token"]
+
+    def _manage(self, method: str, path: str):
+        hdrs = _headers(
+            method=method,
+            path=path,
+            body=b"",
+            tenant_id=self.tenant_id,
+            tenant_slug="aef",
+            user_id=self.user_id,
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+        return self.client.generic(method, path, **hdrs)
+
+    def _fetch(self, token: str, *, allowed: bool = True, **extra):
+        request_id = str(uuid.uuid4())
+        signed = sign_internal_request(method="GET", path=self.FEED_PATH, body=b"", request_id=request_id)
+        with patch("events.api.has_permission", return_value=allowed):
+            return self.client.get(
+                self.FEED_PATH,
+                {"token": token},
+                HTTP_X_REQUEST_ID=request_id,
+                HTTP_X_UPDSPACE_TIMESTAMP=signed.timestamp,
+                HTTP_X_UPDSPACE_SIGNATURE=signed.signature,
+                **extra,
+            )
+
+    @staticmethod
+    def _body(resp) -> str:
+        if resp.streaming:
+            return b"".join(resp.streaming_content).decode("utf-8")
+        return resp.content.decode("utf-8")
+
+    def test_user_feed_lists_rsvped_events_and_honours_etag(self):
+        going = self._event("Going", days=1)
+        self._event("Not mine", days=2)
+        self._rsvp(going)
+        token = self._issue({"kind": "user"})
+
+        first = self._fetch(token)
+        self.assertEqual(first.status_code, 200)
+        body = self._body(first)
+        self.assertIn("SUMMARY:Going", body)
+        self.assertNotIn("Not mine", body)
+        etag = first["ETag"]
+        self.assertFalse(first.has_header("Last-Modified"))
+
+        cached = self._fetch(token)
+        self.assertFalse(cached.streaming)
+        self.assertEqual(cached.content.decode("utf-8"), body)
+
+        unchanged = self._fetch(token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(unchanged.status_code, 304)
+
+        later = self._event("Later", days=3)
+        self._rsvp(later, status="interested")
+        changed = self._fetch(token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertIn("SUMMARY:Later", self._body(changed))
+
+    def test_event_edit_changes_feed_etag(self):
+        from events.service import update_event
+
+        event = self._event("Original", days=1)
+        token = self._issue({"kind": "scope", "scopeType": "TENANT"})
+        first = self._fetch(token)
+        etag = first["ETag"]
+
+        update_event(event=event, data={"title": "Renamed"})
+
+        changed = self._fetch(token, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        self.assertIn("SUMMARY:Renamed", self._body(changed))
+
+    def test_tenant_feed_pages_through_all_public_events(self):
+        for day in range(5):
+            self._event(f"Public {day}", days=day + 1)
+        self._event("Hidden", days=1, visibility="private")
+        token = self._issue({"kind": "scope", "scopeType": "TENANT"})
+
+        with patch("events.calendar._FEED_PAGE_SIZE", 2):
+            body = self._body(self._fetch(token))
+
+        self.assertEqual(body.count("BEGIN:VEVENT"), 5)
+        self.assertNotIn("Hidden", body)
+        self.assertTrue(body.startswith("BEGIN:VCALENDAR") and body.endswith("END:VCALENDAR\r\n"))
+
+    def test_tampered_token_is_rejected(self):
+        token = self._issue({"kind": "user"})
+
+        resp = self._fetch(token[:-2] + "xx")
+
+        self.assertEqual(resp.status_code, 401)
+        self.assertEqual(resp.json()["error"]["code"], "INVALID_CALENDAR_TOKEN")
+
+    def test_rotated_and_revoked_tokens_are_rejected(self):
+        old = self._issue({"kind": "user"})
+        first_id = self.last_subscription_id
+        self._issue({"kind": "user"})
+        self.assertEqual(self.last_subscription_id, first_id)
+        sub_path = f"{EVENTS_ROOT}/calendar/subscriptions/{self.last_subscription_id}"
+
+        rotated = self._manage("POST", f"{sub_path}/rotate")
+        self.assertEqual(rotated.status_code, 200)
+        new = rotated.json()["token"]
+        self.assertEqual(self._fetch(old).status_code, 401)
+        self.assertEqual(self._fetch(new).status_code, 200)
+
+        self.assertEqual(self._manage("DELETE", sub_path).status_code, 204)
+        self.assertEqual(self._fetch(new).status_code, 401)
+
+        reissued = self._issue({"kind": "user"})
+        self.assertNotIn(reissued, {old, new})
+        self.assertEqual(self._fetch(new).status_code, 401)
+        self.assertEqual(self._fetch(reissued).status_code, 200)
+
+    def test_feed_rechecks_access_on_every_read(self):
+        token = self._issue({"kind": "scope", "scopeType": "TENANT"})
+
+        self.assertEqual(self._fetch(token).status_code, 200)
+        resp = self._fetch(token, allowed=False)
+
+        self.assertEqual(resp.status_code, 403)
+
+    def test_deleted_event_invalidates_validators(self):
+        self._event("Stays", days=1)
+        removed = self._event("Removed", days=2)
+        token = self._issue({"kind": "scope", "scopeType": "TENANT"})
+        first = self._fetch(token)
+        etag = first["ETag"]
+
+        removed.delete()
+        later = http_date(time.time() + 60)
+        resp = self._fetch(token, HTTP_IF_NONE_MATCH=etag, HTTP_IF_MODIFIED_SINCE=later)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+        self.assertNotIn("Removed", self._body(resp))
+
+        # If-Modified-Since alone cannot see deletions, so it never yields a 304.
+        self.assertEqual(self._fetch(token, HTTP_IF_MODIFIED_SINCE=later).status_code, 200)
+
+
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret", PORTAL_SERVICE_URL="http://portal:8003/api/v1")
+class PortalClientTests(SimpleTestCase):
+    def test_list_memberships_signs_full_request_path(self):
+        import httpx
+
+        from events.context import InternalContext
+        from events.portal_client import PortalClient
+
+        seen: dict[str, str] = {}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen["path"] = request.url.path
+            seen["ts"] = request.headers["X-Updspace-Timestamp"]
+            seen["sig"] = request.headers["X-Updspace-Signature"]
+            return httpx.Response(
+                200,
+                json={"communities": [{"id": "c1"}], "teams": [{"id": "t1", "community_id": "c1"}]},
+            )
+
+        client = PortalClient()
+        client._client = httpx.Client(transport=httpx.MockTransport(handler))
+        ctx = InternalContext(
+            request_id="req-1",
+            tenant_id=str(uuid.uuid4()),
+            tenant_slug="aef",
+            user_id=str(uuid.uuid4()),
+            master_flags={},
+        )
+
+        memberships = client.list_memberships(ctx)
+
+        self.assertEqual(memberships, PortalMemberships(frozenset({"c1"}), frozenset({"t1"})))
+        self.assertEqual(seen["path"], "/api/v1/portal/me/memberships")
+        msg = f"GET\n/api/v1/portal/me/memberships\n{hashlib.sha256(b'').hexdigest()}\nreq-1\n{seen['ts']}"
+        expected = hmac.new(b"test-secret", msg.encode(), hashlib.sha256).hexdigest()
+        self.assertEqual(seen["sig"], expected)
+
+
 class EventModelTests(TestCase):
     """Test Event model."""
 
@@ -667,6 +952,221 @@ class EventModelTests(TestCase):
         self.assertIn(str(event.id), str(event))
 
 
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret")
+class EventStatsTests(TestCase):
+    def setUp(self):
+        from events.service import create_event
+
+        self.client = Client()
+        self.tenant_id = uuid.UUID(str(uuid.uuid4()))
+        self.organizer_id = uuid.uuid4()
+        now = timezone.now()
+        self.event = create_event(
+            tenant_id=self.tenant_id,
+            created_by=self.organizer_id,
+            data={
+                "scope_type": "COMMUNITY",
+                "scope_id": "c1",
+                "title": "Meetup",
+                "starts_at": now,
+                "ends_at": now + timedelta(hours=1),
+            },
+        )
+
+    def _stats(self):
+        from events.models import EventStats
+
+        return EventStats.objects.get(event=self.event)
+
+    def test_rsvp_and_attendance_keep_counters_in_sync(self):
+        from events.service import mark_attendance, set_rsvp
+
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=alice, status="going")
+        set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=bob, status="interested")
+        set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=bob, status="going")
+        set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=alice, status="not_going")
+        set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=alice, status="not_going")
+        for _ in range(2):
+            mark_attendance(tenant_id=self.tenant_id, event=self.event, user_id=bob, marked_by=self.organizer_id)
+
+        stats = self._stats()
+        self.assertEqual(
+            (stats.going_count, stats.interested_count, stats.not_going_count, stats.attended_count),
+            (1, 0, 1, 1),
+        )
+
+    def test_rebuild_restores_counters_and_legacy_events_materialize_on_write(self):
+        from events.models import RSVP, EventStats
+        from events.service import set_rsvp
+
+        RSVP.objects.create(tenant_id=self.tenant_id, event=self.event, user_id=uuid.uuid4(), status="going")
+        EventStats.objects.filter(event=self.event).delete()
+
+        set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=uuid.uuid4(), status="going")
+        self.assertEqual(self._stats().going_count, 2)
+
+        stale = timezone.now() - timedelta(days=1)
+        EventStats.objects.filter(event=self.event).update(going_count=99, updated_at=stale)
+        out = StringIO()
+        call_command("rebuild_event_stats", "--tenant-id", str(self.tenant_id), stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())["counts"]["events_processed"], 1)
+        self.assertEqual(self._stats().going_count, 2)
+        self.assertGreater(self._stats().updated_at, stale)
+
+    @patch("events.api.has_permission", return_value=True)
+    def test_attendance_rollup_per_scope(self, _mock_perm):
+        from events.service import mark_attendance, set_rsvp
+
+        attendees = [uuid.uuid4() for _ in range(4)]
+        for user_id in attendees:
+            set_rsvp(tenant_id=self.tenant_id, event=self.event, user_id=user_id, status="going")
+        mark_attendance(
+            tenant_id=self.tenant_id, event=self.event, user_id=attendees[0], marked_by=self.organizer_id
+        )
+
+        path = f"{EVENTS_ROOT}/stats/attendance"
+        hdrs = _headers(
+            method="GET",
+            path=path,
+            body=b"",
+            tenant_id=str(self.tenant_id),
+            tenant_slug="aef",
+            user_id=str(self.organizer_id),
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+        with self.assertNumQueries(1):
+            resp = self.client.get(path, {"scope_type": "COMMUNITY", "scope_id": "c1"}, **hdrs)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(
+            resp.json()["items"],
+            [
+                {
+                    "scopeType": "COMMUNITY",
+                    "scopeId": "c1",
+                    "events": 1,
+                    "going": 4,
+                    "interested": 0,
+                    "attended": 1,
+                    "attendanceRate": 0.25,
+                }
+            ],
+        )
+        self.assertEqual(_mock_perm.call_args.kwargs["permission_key"], "events.event.manage")
+
+
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret")
+class EventTimeIndexTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.tenant_id = uuid.uuid4()
+        self.user_id = uuid.uuid4()
+
+    def _create(self, title: str, starts: datetime, ends: datetime, *, scope_type="TENANT", scope_id=None):
+        from events.service import create_event
+
+        return create_event(
+            tenant_id=self.tenant_id,
+            created_by=self.user_id,
+            data={
+                "scope_type": scope_type,
+                "scope_id": scope_id or str(self.tenant_id),
+                "title": title,
+                "starts_at": starts,
+                "ends_at": ends,
+            },
+        )
+
+    def _get(self, path: str, params: dict):
+        hdrs = _headers(
+            method="GET",
+            path=path,
+            body=b"",
+            tenant_id=str(self.tenant_id),
+            tenant_slug="aef",
+            user_id=str(self.user_id),
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+        return self.client.get(path, params, **hdrs)
+
+    def test_buckets_follow_event_times(self):
+        from events.models import EventDayBucket
+        from events.service import update_event
+
+        event = self._create(
+            "Weekend jam",
+            datetime(2026, 3, 6, 20, 0, tzinfo=UTC),
+            datetime(2026, 3, 8, 2, 0, tzinfo=UTC),
+        )
+        long_event = self._create(
+            "Season",
+            datetime(2026, 1, 1, tzinfo=UTC),
+            datetime(2026, 12, 31, tzinfo=UTC),
+        )
+
+        days = list(EventDayBucket.objects.filter(event=event).order_by("day").values_list("day", flat=True))
+        self.assertEqual([d.isoformat() for d in days], ["2026-03-06", "2026-03-07", "2026-03-08"])
+        self.assertEqual(EventDayBucket.objects.filter(event=long_event, long_span=True).count(), 1)
+
+        update_event(event=event, data={"ends_at": datetime(2026, 3, 6, 23, 0, tzinfo=UTC)})
+        self.assertEqual(EventDayBucket.objects.filter(event=event).count(), 1)
+
+    @patch("events.api.has_permission", side_effect=_mock_has_permission_read_only)
+    def test_month_view_returns_overlapping_events(self, _mock_perm):
+        self._create("Before", datetime(2026, 2, 10, tzinfo=UTC), datetime(2026, 2, 10, 2, tzinfo=UTC))
+        self._create("Straddles", datetime(2026, 2, 28, 22, tzinfo=UTC), datetime(2026, 3, 1, 3, tzinfo=UTC))
+        self._create("Inside", datetime(2026, 3, 15, 18, tzinfo=UTC), datetime(2026, 3, 15, 20, tzinfo=UTC))
+        self._create("Season", datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 12, 31, tzinfo=UTC))
+        self._create("After", datetime(2026, 4, 2, tzinfo=UTC), datetime(2026, 4, 2, 2, tzinfo=UTC))
+
+        resp = self._get(
+            EVENTS_LIST,
+            {"from": "2026-03-01T00:00:00Z", "to": "2026-03-31T23:59:59Z"},
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([item["title"] for item in resp.json()["items"]], ["Season", "Straddles", "Inside"])
+
+    @patch("events.api.portal_client")
+    @patch("events.api.has_permission", side_effect=_mock_has_permission_read_only)
+    def test_my_calendar_merges_member_scopes(self, _mock_perm, mock_client):
+        mock_client.list_memberships.return_value = PortalMemberships(
+            community_ids=frozenset({"c1"}),
+            team_ids=frozenset({"t1"}),
+        )
+        starts = datetime(2026, 5, 5, 18, tzinfo=UTC)
+        ends = starts + timedelta(hours=2)
+        self._create("Tenant", starts, ends)
+        self._create("Community", starts + timedelta(days=1), ends + timedelta(days=1), scope_type="COMMUNITY", scope_id="c1")
+        self._create("Team", starts + timedelta(days=2), ends + timedelta(days=2), scope_type="TEAM", scope_id="t1")
+        self._create("Other team", starts, ends, scope_type="TEAM", scope_id="t2")
+
+        resp = self._get(
+            f"{EVENTS_ROOT}/my-calendar",
+            {"from": "2026-05-01T00:00:00Z", "to": "2026-05-31T00:00:00Z"},
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual([item["title"] for item in data["items"]], ["Tenant", "Community", "Team"])
+        self.assertEqual(data["meta"]["total"], 3)
+        mock_client.list_memberships.assert_called_once()
+
+    @patch("events.api.has_permission", side_effect=_mock_has_permission_read_only)
+    def test_my_calendar_rejects_oversized_range(self, _mock_perm):
+        resp = self._get(
+            f"{EVENTS_ROOT}/my-calendar",
+            {"from": "2026-01-01T00:00:00Z", "to": "2026-12-31T00:00:00Z"},
+        )
+
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.json()["error"]["code"], "RANGE_TOO_LARGE")
+
+
 class EventsSettingsSecurityTests(SimpleTestCase):
     @staticmethod
     def _import_settings(env: dict[str, str]):
@@ -0,0 +1,86 @@
+"""
+Interval index for calendar range queries.
+
+``(tenant_id, starts_at)`` and ``(tenant_id, ends_at)`` indexes can only
+answer one side of the overlap predicate ``ends_at >= from AND starts_at <=
+to``; the other side is a filter over every past (or future) event of the
+tenant. ``EventDayBucket`` stores one row per UTC day an event touches, so a
+month view reads ~31 index ranges regardless of tenant history. The bucket
+hit list is then re-checked against the exact timestamps.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db.models import Q, QuerySet
+from django.utils.timezone import is_naive, make_aware
+
+from .models import Event, EventDayBucket
+
+LONG_SPAN_DAYS = 62
+
+
+def _utc_day(value: datetime) -> date:
+    if is_naive(value):
+        value = make_aware(value)
+    return value.astimezone(dt_timezone.utc).date()
+
+
+def bucket_rows(event: Event) -> list[EventDayBucket]:
+    first_day = _utc_day(event.starts_at)
+    last_day = max(_utc_day(event.ends_at), first_day)
+    common = {
+        "event_id": event.id,
+        "tenant_id": event.tenant_id,
+        "scope_type": event.scope_type,
+        "scope_id": event.scope_id,
+        "end_day": last_day,
+    }
+    span = (last_day - first_day).days
+    if span >= LONG_SPAN_DAYS:
+        return [EventDayBucket(day=first_day, long_span=True, **common)]
+    return [EventDayBucket(day=first_day + timedelta(days=offset), **common) for offset in range(span + 1)]
+
+
+def sync_event_buckets(event: Event) -> None:
+    """Replace the bucket rows of ``event``; call after create or a time change."""
+    EventDayBucket.objects.filter(event_id=event.id).delete()
+    EventDayBucket.objects.bulk_create(bucket_rows(event))
+
+
+def overlapping_events(
+    qs: QuerySet[Event],
+    *,
+    tenant_id,
+    start: datetime,
+    end: datetime,
+    scopes: Iterable[tuple[str, str]] | None = None,
+) -> QuerySet[Event]:
+    """
+    Restrict ``qs`` to events overlapping ``[start, end]`` via day buckets.
+
+    ``scopes`` narrows the bucket scan to the given (scope_type, scope_id)
+    pairs so multi-scope calendars use the scope/day index.
+    """
+    first_day = _utc_day(start)
+    last_day = _utc_day(end)
+    buckets = EventDayBucket.objects.filter(tenant_id=tenant_id).filter(
+        Q(long_span=False, day__gte=first_day, day__lte=last_day)
+        | Q(long_span=True, day__lte=last_day, end_day__gte=first_day)
+    )
+    if scopes is not None:
+        by_type: dict[str, set[str]] = {}
+        for scope_type, scope_id in scopes:
+            by_type.setdefault(scope_type, set()).add(str(scope_id))
+        scope_q = Q(pk__in=[])
+        for scope_type, scope_ids in by_type.items():
+            scope_q |= Q(scope_type=scope_type, scope_id__in=scope_ids)
+        buckets = buckets.filter(scope_q)
+    return qs.filter(
+        id__in=buckets.values("event_id"),
+        ends_at__gte=start,
+        starts_at__lte=end,
+    )
@@ -1,10 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime
 from typing import Any, cast
 
-from django.db import models
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from ninja import NinjaAPI, Router
 from ninja.errors import HttpError
 
@@ -16,7 +14,7 @@ from .schemas import (
     FeatureFlagsEvaluationOut,
     FeatureFlagUpdateIn,
 )
-from .service import create_or_update_flag, evaluate_flags, patch_flag
+from .service import create_or_update_flag, current_snapshot, patch_flag
 
 api = NinjaAPI(
     title="UpdSpace Feature Flags",
@@ -83,17 +81,26 @@ def _require_system_admin(ctx: InternalContext) -> None:
 
 
 @router.get("/flags/evaluate", response=FeatureFlagsEvaluationOut)
-def evaluate(request: Any):
+def evaluate(request: Any, since: int | None = None):
+    """
+    Evaluated flag snapshot. With ``since`` (a version the caller already
+    holds) returns 304 when nothing changed, or only the flags changed after
+    it with ``delta=true``; a ``since`` ahead of the server gets a full
+    snapshot.
+    """
     require_internal_context(request)
-    flags = list(FeatureFlag.objects.all().order_by("key"))
-    mapping = evaluate_flags(flags)
-    latest_updated_at: datetime | None = (
-        FeatureFlag.objects.aggregate(max_updated=models.Max("updated_at"))["max_updated"]
-        if flags else None
-    )
+    snapshot = current_snapshot()
+    if since is not None and since == snapshot.version:
+        response = HttpResponse(status=304)
+        response["ETag"] = f'"{snapshot.version}"'
+        return response
+
+    delta = since is not None and 0 <= since < snapshot.version
     return FeatureFlagsEvaluationOut(
-        feature_flags=mapping,
-        updated_at=latest_updated_at,
+        feature_flags=snapshot.changed_since(since) if delta else snapshot.values(),
+        updated_at=snapshot.updated_at,
+        version=snapshot.version,
+        delta=delta,
     )
 
 
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+BACKFILL_CHUNK = 500
+
+
+def backfill_versions(apps, schema_editor):
+    FeatureFlag = apps.get_model("featureflags", "FeatureFlag")
+    FlagSnapshotVersion = apps.get_model("featureflags", "FlagSnapshotVersion")
+
+    version = 0
+    last_key = ""
+    while True:
+        chunk = list(
+            FeatureFlag.objects.filter(key__gt=last_key).order_by("key")[:BACKFILL_CHUNK]
+        )
+        if not chunk:
+            break
+        for flag in chunk:
+            version += 1
+            flag.version = version
+        FeatureFlag.objects.bulk_update(chunk, ["version"])
+        last_key = chunk[-1].key
+    FlagSnapshotVersion.objects.update_or_create(id=1, defaults={"version": version})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("featureflags", "0003_rename_outbox_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FlagSnapshotVersion",
+            fields=[
+                ("id", models.PositiveSmallIntegerField(default=1, primary_key=True, serialize=False)),
+                ("version", models.BigIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                "db_table": "feature_flag_snapshot_version",
+            },
+        ),
+        migrations.AddField(
+            model_name="featureflag",
+            name="version",
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="featureflag",
+            index=models.Index(fields=["version"], name="feature_flags_version_idx"),
+        ),
+        migrations.RunPython(backfill_versions, migrations.RunPython.noop),
+    ]
@@ -16,15 +16,31 @@ class FeatureFlag(models.Model):
     updated_by = models.UUIDField()
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # Snapshot version of the last change to this flag (see FlagSnapshotVersion).
+    version = models.BigIntegerField(default=0)
 
     class Meta:
         db_table = "feature_flags"
         indexes = [
             models.Index(fields=["enabled"], name="feature_flags_enabled_idx"),
             models.Index(fields=["updated_at"], name="feature_flags_updated_idx"),
+            models.Index(fields=["version"], name="feature_flags_version_idx"),
         ]
 
 
+class FlagSnapshotVersion(models.Model):
+    """Single-row counter bumped on every flag write; flags record the value."""
+
+    SINGLETON_ID = 1
+
+    id = models.PositiveSmallIntegerField(primary_key=True, default=SINGLETON_ID)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "feature_flag_snapshot_version"
+
+
 class FeatureFlagAuditEvent(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     actor_user_id = models.UUIDField(db_index=True)
@@ -32,3 +32,5 @@ class FeatureFlagUpdateIn(CamelSchema):
 class FeatureFlagsEvaluationOut(CamelSchema):
     feature_flags: dict[str, bool]
     updated_at: datetime | None = None
+    version: int = 0
+    delta: bool = False
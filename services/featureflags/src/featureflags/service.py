@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import threading
 from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
 
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 
 from core.ymq import schedule_outbox_wakeup
 
-from .models import FeatureFlag, FeatureFlagAuditEvent, OutboxMessage
+from .models import (
+    FeatureFlag,
+    FeatureFlagAuditEvent,
+    FlagSnapshotVersion,
+    OutboxMessage,
+)
 
 
 def _normalize_flag_key(key: str) -> str:
@@ -23,6 +32,84 @@ def evaluate_flags(flags: Iterable[FeatureFlag]) -> dict[str, bool]:
     return {flag.key: bool(flag.enabled and flag.rollout > 0) for flag in flags}
 
 
+# ---------------------------------------------------------------------------
+# Versioned snapshot
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class FlagSnapshot:
+    version: int
+    updated_at: datetime | None
+    # key -> (evaluated value, version of the flag's last change)
+    flags: dict[str, tuple[bool, int]]
+
+    def values(self) -> dict[str, bool]:
+        return {key: value for key, (value, _) in self.flags.items()}
+
+    def changed_since(self, version: int) -> dict[str, bool]:
+        return {key: value for key, (value, changed) in self.flags.items() if changed > version}
+
+
+_snapshot: FlagSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def _next_snapshot_version() -> int:
+    """Bump the snapshot counter inside the caller's transaction.
+
+    The UPDATE holds the counter row until commit, so concurrent writers get
+    distinct, ordered versions.
+    """
+    now = timezone.now()
+    singleton = FlagSnapshotVersion.SINGLETON_ID
+    updated = FlagSnapshotVersion.objects.filter(id=singleton).update(
+        version=F("version") + 1, updated_at=now
+    )
+    if not updated:
+        FlagSnapshotVersion.objects.get_or_create(id=singleton)
+        FlagSnapshotVersion.objects.filter(id=singleton).update(
+            version=F("version") + 1, updated_at=now
+        )
+    return FlagSnapshotVersion.objects.values_list("version", flat=True).get(id=singleton)
+
+
+def current_snapshot_version() -> int:
+    return (
+        FlagSnapshotVersion.objects.filter(id=FlagSnapshotVersion.SINGLETON_ID)
+        .values_list("version", flat=True)
+        .first()
+        or 0
+    )
+
+
+def current_snapshot() -> FlagSnapshot:
+    """Snapshot at the current version; rebuilt only when the counter moved."""
+    global _snapshot
+    version = current_snapshot_version()
+    cached = _snapshot
+    if cached is not None and cached.version == version:
+        return cached
+
+    flags = list(FeatureFlag.objects.all().order_by("key"))
+    values = evaluate_flags(flags)
+    snapshot = FlagSnapshot(
+        version=version,
+        updated_at=max((flag.updated_at for flag in flags), default=None),
+        flags={flag.key: (values[flag.key], flag.version) for flag in flags},
+    )
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.version <= version:
+            _snapshot = snapshot
+    return snapshot
+
+
+def reset_snapshot_cache() -> None:
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
 @transaction.atomic
 def create_or_update_flag(
     *,
@@ -54,6 +141,7 @@ def create_or_update_flag(
         flag.enabled = enabled
         flag.rollout = rollout
 
+    flag.version = _next_snapshot_version()
     flag.save()
 
     metadata = {
@@ -61,6 +149,7 @@ def create_or_update_flag(
         "rollout": flag.rollout,
         "description": flag.description,
         "updated_at": now.isoformat(),
+        "version": flag.version,
     }
 
     FeatureFlagAuditEvent.objects.create(
@@ -112,6 +201,7 @@ def patch_flag(
         flag.rollout = rollout
 
     flag.updated_by = actor_user_id
+    flag.version = _next_snapshot_version()
     flag.save()
 
     metadata = {
@@ -119,6 +209,7 @@ def patch_flag(
         "rollout": flag.rollout,
         "description": flag.description,
         "updated_at": timezone.now().isoformat(),
+        "version": flag.version,
     }
 
     FeatureFlagAuditEvent.objects.create(
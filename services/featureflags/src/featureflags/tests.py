@@ -11,6 +11,7 @@ from django.conf import settings
 from django.test import Client, TestCase, override_settings
 
 from .models import FeatureFlag
+from .service import reset_snapshot_cache
 
 
 def _sign(
@@ -34,6 +35,7 @@ def _sign(
 @override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret-for-featureflags")
 class FeatureFlagsApiTests(TestCase):
     def setUp(self):
+        reset_snapshot_cache()
         self.client = Client()
         self.request_id = str(uuid.uuid4())
         self.tenant_id = str(uuid.uuid4())
@@ -115,3 +117,52 @@ class FeatureFlagsApiTests(TestCase):
 
         refreshed = FeatureFlag.objects.get(key="beta_feed")
         self.assertTrue(refreshed.enabled)
+
+    def _create_flag(self, key: str, *, enabled: bool = True) -> None:
+        path = "/api/v1/flags"
+        body = json.dumps({"key": key, "enabled": enabled, "rollout": 100}).encode("utf-8")
+        response = self.client.post(
+            path,
+            data=body,
+            content_type="application/json",
+            **cast(Any, self._headers("POST", path, body)),
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_evaluate_since_returns_not_modified_or_delta(self):
+        self._create_flag("alpha")
+        self._create_flag("beta", enabled=False)
+
+        eval_path = "/api/v1/flags/evaluate"
+        full = self.client.get(eval_path, **cast(Any, self._headers("GET", eval_path)))
+        data = full.json()
+        self.assertEqual(data["version"], 2)
+        self.assertFalse(data["delta"])
+        self.assertEqual(data["feature_flags"], {"alpha": True, "beta": False})
+
+        unchanged = self.client.get(
+            eval_path, {"since": 2}, **cast(Any, self._headers("GET", eval_path))
+        )
+        self.assertEqual(unchanged.status_code, 304)
+
+        patch_path = "/api/v1/flags/beta"
+        body = json.dumps({"enabled": True}).encode("utf-8")
+        self.client.patch(
+            patch_path,
+            data=body,
+            content_type="application/json",
+            **cast(Any, self._headers("PATCH", patch_path, body)),
+        )
+        delta = self.client.get(
+            eval_path, {"since": 2}, **cast(Any, self._headers("GET", eval_path))
+        ).json()
+        self.assertEqual(delta["version"], 3)
+        self.assertTrue(delta["delta"])
+        self.assertEqual(delta["feature_flags"], {"beta": True})
+
+        # A client ahead of the server (e.g. after a restore) resyncs fully.
+        ahead = self.client.get(
+            eval_path, {"since": 99}, **cast(Any, self._headers("GET", eval_path))
+        ).json()
+        self.assertFalse(ahead["delta"])
+        self.assertEqual(ahead["feature_flags"], {"alpha": True, "beta": True})
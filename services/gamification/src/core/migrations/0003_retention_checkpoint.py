@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_alter_usersessiontoken_unique_together_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RetentionCheckpoint",
+            fields=[
+                ("name", models.CharField(max_length=128, primary_key=True, serialize=False)),
+                ("started_at", models.DateTimeField()),
+                ("targets", models.JSONField(blank=True, default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "gamification_retention_checkpoint",
+            },
+        ),
+    ]
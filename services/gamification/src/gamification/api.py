@@ -12,6 +12,7 @@ from ninja.errors import HttpError
 
 from core.errors import error_payload
 
+from . import search
 from .context import InternalContext, require_internal_context
 from .dsar import erase_user_data, export_user_data
 from .models import (
@@ -20,22 +21,38 @@ from .models import (
     AchievementGrant,
     AchievementStatus,
     GrantVisibility,
+    UserAchievementStats,
+    UserCategoryStats,
 )
-from .permissions import has_permission
+from .permissions import fetch_permissions
 from .schemas import (
     AchievementCreateIn,
     AchievementListOut,
     AchievementOut,
+    AchievementSearchOut,
     AchievementUpdateIn,
     CategoriesListOut,
     CategoryCreateIn,
     CategoryOut,
     CategoryUpdateIn,
+    GrantBulkIn,
+    GrantBulkOut,
     GrantCreateIn,
     GrantListOut,
     GrantOut,
+    LeaderboardOut,
+    UserAchievementSummaryOut,
 )
-from .services import PaginatedResult, create_grant, paginate_queryset, revoke_grant
+from .services import (
+    BULK_GRANT_MAX_RECIPIENTS,
+    BULK_STATUS_CREATED,
+    PaginatedResult,
+    create_grant,
+    create_grants_bulk,
+    paginate_queryset,
+    revoke_grant,
+)
+from .stats import LeaderboardEntry, rank_for_score, rebuild_user_stats, top_users
 
 api = NinjaAPI(title="UpdSpace Gamification", version="1", urls_namespace="gamification")
 router = Router(tags=["gamification"])
@@ -48,6 +65,16 @@ PERM_ASSIGN = "gamification.achievements.assign"
 PERM_REVOKE = "gamification.achievements.revoke"
 PERM_VIEW_PRIVATE = "gamification.achievements.view_private"
 
+GAMIFICATION_PERMISSIONS = (
+    PERM_CREATE,
+    PERM_EDIT,
+    PERM_PUBLISH,
+    PERM_HIDE,
+    PERM_ASSIGN,
+    PERM_REVOKE,
+    PERM_VIEW_PRIVATE,
+)
+
 
 def _error_response(
     request,
@@ -92,31 +119,37 @@ def _parse_uuid(value: str, *, code: str, message: str) -> uuid.UUID:
         raise HttpError(400, cast(Any, {"code": code, "message": message})) from exc
 
 
-def _require_perm_ctx(ctx: InternalContext, permission_key: str) -> None:
-    if not has_permission(
+def _permissions(request, ctx: InternalContext) -> frozenset[str]:
+    """
+    The viewer's granted gamification permissions at tenant scope.
+
+    Fetched with one access round trip and memoized on the request, so
+    endpoints that need several keys do not pay one HTTP call per key.
+    """
+    cached = getattr(request, "_gamification_permissions", None)
+    if cached is not None and cached[0] == ctx:
+        return cached[1]
+    granted = fetch_permissions(
         tenant_id=ctx.tenant_id,
         tenant_slug=ctx.tenant_slug,
         user_id=ctx.user_id,
         master_flags=ctx.master_flags,
-        permission_key=permission_key,
+        permission_keys=GAMIFICATION_PERMISSIONS,
         scope_type="TENANT",
         scope_id=str(ctx.tenant_id),
         request_id=ctx.request_id,
-    ):
+    )
+    request._gamification_permissions = (ctx, granted)
+    return granted
+
+
+def _require_perm_ctx(request, ctx: InternalContext, permission_key: str) -> None:
+    if permission_key not in _permissions(request, ctx):
         raise HttpError(403, cast(Any, error_payload("FORBIDDEN", "Permission denied")))
 
 
-def _has_perm_ctx(ctx: InternalContext, permission_key: str) -> bool:
-    return has_permission(
-        tenant_id=ctx.tenant_id,
-        tenant_slug=ctx.tenant_slug,
-        user_id=ctx.user_id,
-        master_flags=ctx.master_flags,
-        permission_key=permission_key,
-        scope_type="TENANT",
-        scope_id=str(ctx.tenant_id),
-        request_id=ctx.request_id,
-    )
+def _has_perm_ctx(request, ctx: InternalContext, permission_key: str) -> bool:
+    return permission_key in _permissions(request, ctx)
 
 
 def _ensure_dsar_subject(ctx: InternalContext, target_user_id: UUID) -> None:
@@ -202,6 +235,29 @@ def dsar_erase(request, target_user_id: str):
     return erase_user_data(tenant_id=uuid.UUID(ctx.tenant_id), user_id=parsed_user_id)
 
 
+def _visible_statuses(request, ctx: InternalContext, status: list[str] | None) -> list[str]:
+    can_view_private = _has_perm_ctx(request, ctx, PERM_VIEW_PRIVATE)
+    statuses = status or []
+    if statuses:
+        allowed = {choice.value for choice in AchievementStatus}
+        invalid = [s for s in statuses if s not in allowed]
+        if invalid:
+            raise HttpError(422, cast(Any, {"code": "INVALID_STATUS", "message": "Invalid status"}))
+        if not can_view_private and any(s in {"draft", "hidden"} for s in statuses):
+            raise HttpError(403, cast(Any, {"code": "FORBIDDEN", "message": "Permission denied"}))
+    elif not can_view_private:
+        statuses = [AchievementStatus.PUBLISHED, AchievementStatus.ACTIVE]
+    return list(statuses)
+
+
+def _request_locale(request, locale: str | None) -> str | None:
+    if locale:
+        return locale
+    accept = request.headers.get("Accept-Language", "")
+    primary = accept.split(",", 1)[0].split(";", 1)[0].strip()
+    return primary.split("-", 1)[0].lower() or None
+
+
 @router.get("/gamification/achievements", response=AchievementListOut)
 def list_achievements(
     request,
@@ -213,21 +269,11 @@ def list_achievements(
     cursor: str | None = None,
 ):
     ctx = require_internal_context(request)
-    can_view_private = _has_perm_ctx(ctx, PERM_VIEW_PRIVATE)
-    perm_edit = _has_perm_ctx(ctx, PERM_EDIT)
-    perm_publish = _has_perm_ctx(ctx, PERM_PUBLISH)
-    perm_hide = _has_perm_ctx(ctx, PERM_HIDE)
+    perm_edit = _has_perm_ctx(request, ctx, PERM_EDIT)
+    perm_publish = _has_perm_ctx(request, ctx, PERM_PUBLISH)
+    perm_hide = _has_perm_ctx(request, ctx, PERM_HIDE)
 
-    statuses = status or []
-    if statuses:
-        allowed = {choice.value for choice in AchievementStatus}
-        invalid = [s for s in statuses if s not in allowed]
-        if invalid:
-            raise HttpError(422, cast(Any, {"code": "INVALID_STATUS", "message": "Invalid status"}))
-        if not can_view_private and any(s in {"draft", "hidden"} for s in statuses):
-            raise HttpError(403, cast(Any, {"code": "FORBIDDEN", "message": "Permission denied"}))
-    elif not can_view_private:
-        statuses = [AchievementStatus.PUBLISHED, AchievementStatus.ACTIVE]
+    statuses = _visible_statuses(request, ctx, status)
 
     qs = Achievement.objects.select_related("category").filter(tenant_id=ctx.tenant_id)
     if statuses:
@@ -235,7 +281,9 @@ def list_achievements(
     if category:
         qs = qs.filter(category__slug__in=category)
     if q:
-        qs = qs.filter(name_i18n__icontains=q)
+        ids = search.matching_ids(tenant_id=ctx.tenant_id, q=q)
+        # Single-character queries are not indexed; keep the old substring scan.
+        qs = qs.filter(name_i18n__icontains=q) if ids is None else qs.filter(id__in=ids)
     if created_by == "me":
         qs = qs.filter(created_by=ctx.user_id)
 
@@ -261,7 +309,7 @@ def list_achievements(
 @router.post("/gamification/achievements", response=AchievementOut)
 def create_achievement(request, payload: AchievementCreateIn):
     ctx = require_internal_context(request)
-    _require_perm_ctx(ctx, PERM_CREATE)
+    _require_perm_ctx(request, ctx, PERM_CREATE)
 
     if not payload.name_i18n:
         raise HttpError(422, cast(Any, {"code": "VALIDATION_ERROR", "message": "name_i18n is required"}))
@@ -284,23 +332,70 @@ def create_achievement(request, payload: AchievementCreateIn):
                 cast(Any, {"code": "IMAGES_REQUIRED", "message": "Images are required for published achievements"}),
             )
 
-    achievement = Achievement.objects.create(
-        tenant_id=ctx.tenant_id,
-        name_i18n=payload.name_i18n,
-        description=payload.description or "",
-        category=category,
-        status=status,
-        images=(payload.images.model_dump() if payload.images else {}),
-        created_by=ctx.user_id,
-    )
+    with transaction.atomic():
+        achievement = Achievement.objects.create(
+            tenant_id=ctx.tenant_id,
+            name_i18n=payload.name_i18n,
+            description=payload.description or "",
+            category=category,
+            status=status,
+            images=(payload.images.model_dump() if payload.images else {}),
+            created_by=ctx.user_id,
+        )
+        search.index_achievement(achievement)
 
     return _achievement_to_out(
         achievement,
         ctx=ctx,
         perm_edit=True,
-        perm_publish=_has_perm_ctx(ctx, PERM_PUBLISH),
-        perm_hide=_has_perm_ctx(ctx, PERM_HIDE),
+        perm_publish=_has_perm_ctx(request, ctx, PERM_PUBLISH),
+        perm_hide=_has_perm_ctx(request, ctx, PERM_HIDE),
+    )
+
+
+@router.get("/gamification/achievements/search", response=AchievementSearchOut)
+def search_achievements_api(
+    request,
+    q: str,
+    locale: str | None = None,
+    status: list[str] | None = Query(default=None),
+    category: list[str] | None = Query(default=None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Ranked name search with per-category facet counts."""
+    ctx = require_internal_context(request)
+    statuses = _visible_statuses(request, ctx, status)
+
+    visible = Achievement.objects.filter(tenant_id=ctx.tenant_id)
+    if statuses:
+        visible = visible.filter(status__in=statuses)
+
+    result = search.search_achievements(
+        tenant_id=ctx.tenant_id,
+        q=q,
+        locale=_request_locale(request, locale),
+        achievements=visible,
+        categories=category,
+        limit=limit,
+        offset=offset,
     )
+    by_id = Achievement.objects.select_related("category").in_bulk(result.achievement_ids)
+    perm_edit = _has_perm_ctx(request, ctx, PERM_EDIT)
+    perm_publish = _has_perm_ctx(request, ctx, PERM_PUBLISH)
+    perm_hide = _has_perm_ctx(request, ctx, PERM_HIDE)
+    items = [
+        _achievement_to_out(
+            by_id[achievement_id],
+            ctx=ctx,
+            perm_edit=perm_edit,
+            perm_publish=perm_publish,
+            perm_hide=perm_hide,
+        )
+        for achievement_id in result.achievement_ids
+        if achievement_id in by_id
+    ]
+    return {"items": items, "total": result.total, "facets": result.facets}
 
 
 @router.get("/gamification/achievements/{achievement_id}", response=AchievementOut)
@@ -315,13 +410,13 @@ def get_achievement(request, achievement_id: str):
     if not achievement:
         raise HttpError(404, cast(Any, {"code": "NOT_FOUND", "message": "Achievement not found"}))
 
-    can_view_private = _has_perm_ctx(ctx, PERM_VIEW_PRIVATE)
+    can_view_private = _has_perm_ctx(request, ctx, PERM_VIEW_PRIVATE)
     if achievement.status in {AchievementStatus.DRAFT, AchievementStatus.HIDDEN} and not can_view_private:
         raise HttpError(403, cast(Any, {"code": "FORBIDDEN", "message": "Permission denied"}))
 
-    perm_edit = _has_perm_ctx(ctx, PERM_EDIT)
-    perm_publish = _has_perm_ctx(ctx, PERM_PUBLISH)
-    perm_hide = _has_perm_ctx(ctx, PERM_HIDE)
+    perm_edit = _has_perm_ctx(request, ctx, PERM_EDIT)
+    perm_publish = _has_perm_ctx(request, ctx, PERM_PUBLISH)
+    perm_hide = _has_perm_ctx(request, ctx, PERM_HIDE)
 
     return _achievement_to_out(
         achievement,
@@ -344,9 +439,9 @@ def update_achievement(request, achievement_id: str, payload: AchievementUpdateI
     if not achievement:
         raise HttpError(404, cast(Any, {"code": "NOT_FOUND", "message": "Achievement not found"}))
 
-    perm_edit = _has_perm_ctx(ctx, PERM_EDIT)
-    perm_publish = _has_perm_ctx(ctx, PERM_PUBLISH)
-    perm_hide = _has_perm_ctx(ctx, PERM_HIDE)
+    perm_edit = _has_perm_ctx(request, ctx, PERM_EDIT)
+    perm_publish = _has_perm_ctx(request, ctx, PERM_PUBLISH)
+    perm_hide = _has_perm_ctx(request, ctx, PERM_HIDE)
     can_manage_any = perm_publish or perm_hide
     if not perm_edit:
         raise HttpError(403, cast(Any, {"code": "FORBIDDEN", "message": "Permission denied"}))
@@ -379,12 +474,14 @@ def update_achievement(request, achievement_id: str, payload: AchievementUpdateI
                     ),
                 )
 
+    category_changed = False
     if payload.category:
         category = AchievementCategory.objects.filter(
             tenant_id=ctx.tenant_id, slug=payload.category
         ).first()
         if not category:
             raise HttpError(422, cast(Any, {"code": "INVALID_CATEGORY", "message": "Category not found"}))
+        category_changed = category.id != achievement.category_id
         achievement.category = category
 
     if payload.name_i18n is not None:
@@ -405,7 +502,18 @@ def update_achievement(request, achievement_id: str, payload: AchievementUpdateI
         achievement.status = payload.status
 
     achievement.updated_at = timezone.now()
-    achievement.save()
+    with transaction.atomic():
+        achievement.save()
+        if payload.name_i18n is not None:
+            search.index_achievement(achievement)
+        if category_changed:
+            # Per-category counters of every holder move with the achievement.
+            rebuild_user_stats(
+                tenant_id=achievement.tenant_id,
+                user_ids=AchievementGrant.objects.filter(
+                    achievement=achievement, revoked_at__isnull=True
+                ).values_list("recipient_id", flat=True),
+            )
 
     return _achievement_to_out(
         achievement,
@@ -416,11 +524,7 @@ def update_achievement(request, achievement_id: str, payload: AchievementUpdateI
     )
 
 
-@router.post("/gamification/achievements/{achievement_id}/grants", response=GrantOut)
-def create_achievement_grant(request, achievement_id: str, payload: GrantCreateIn):
-    ctx = require_internal_context(request)
-    _require_perm_ctx(ctx, PERM_ASSIGN)
-
+def _grantable_achievement(ctx: InternalContext, achievement_id: str) -> Achievement:
     achievement_uuid = _parse_uuid(
         achievement_id, code="INVALID_ACHIEVEMENT_ID", message="Invalid achievement id"
     )
@@ -433,11 +537,24 @@ def create_achievement_grant(request, achievement_id: str, payload: GrantCreateI
             409,
             cast(Any, {"code": "ACHIEVEMENT_NOT_PUBLISHED", "message": "Achievement is not publishable"}),
         )
+    return achievement
 
-    recipient_id = _parse_uuid(payload.recipient_id, code="INVALID_USER_ID", message="Invalid recipient id")
-    visibility = payload.visibility or GrantVisibility.PUBLIC
+
+def _grant_visibility(value: str | None) -> str:
+    visibility = value or GrantVisibility.PUBLIC
     if visibility not in {choice.value for choice in GrantVisibility}:
         raise HttpError(422, cast(Any, {"code": "INVALID_VISIBILITY", "message": "Invalid visibility"}))
+    return visibility
+
+
+@router.post("/gamification/achievements/{achievement_id}/grants", response=GrantOut)
+def create_achievement_grant(request, achievement_id: str, payload: GrantCreateIn):
+    ctx = require_internal_context(request)
+    _require_perm_ctx(request, ctx, PERM_ASSIGN)
+
+    achievement = _grantable_achievement(ctx, achievement_id)
+    recipient_id = _parse_uuid(payload.recipient_id, code="INVALID_USER_ID", message="Invalid recipient id")
+    visibility = _grant_visibility(payload.visibility)
 
     grant = create_grant(
         achievement=achievement,
@@ -449,6 +566,63 @@ def create_achievement_grant(request, achievement_id: str, payload: GrantCreateI
     return _grant_to_out(grant)
 
 
+@router.post("/gamification/achievements/{achievement_id}/grants:bulk", response=GrantBulkOut)
+def create_achievement_grants_bulk(request, achievement_id: str, payload: GrantBulkIn):
+    """
+    Grant an achievement to up to ``BULK_GRANT_MAX_RECIPIENTS`` users at once
+    (e.g. an event roster). Malformed ids are reported per item; duplicates
+    collapse into one result.
+    """
+    ctx = require_internal_context(request)
+    _require_perm_ctx(request, ctx, PERM_ASSIGN)
+
+    if len(payload.recipient_ids) > BULK_GRANT_MAX_RECIPIENTS:
+        raise HttpError(
+            422,
+            cast(
+                Any,
+                {
+                    "code": "TOO_MANY_RECIPIENTS",
+                    "message": f"At most {BULK_GRANT_MAX_RECIPIENTS} recipients per request",
+                },
+            ),
+        )
+    achievement = _grantable_achievement(ctx, achievement_id)
+    visibility = _grant_visibility(payload.visibility)
+
+    valid: list[UUID] = []
+    invalid: list[str] = []
+    for raw in payload.recipient_ids:
+        try:
+            valid.append(UUID(str(raw)))
+        except ValueError:
+            invalid.append(raw)
+
+    results = create_grants_bulk(
+        achievement=achievement,
+        recipient_ids=valid,
+        issuer_id=_parse_uuid(ctx.user_id, code="INVALID_USER_ID", message="Invalid issuer id"),
+        reason=payload.reason,
+        visibility=visibility,
+    )
+    items = [
+        {
+            "recipient_id": str(result.recipient_id),
+            "status": result.status,
+            "grant": _grant_to_out(result.grant) if result.grant else None,
+        }
+        for result in results
+    ]
+    items.extend({"recipient_id": raw, "status": "invalid", "grant": None} for raw in dict.fromkeys(invalid))
+    created = sum(1 for result in results if result.status == BULK_STATUS_CREATED)
+    return {
+        "items": items,
+        "created": created,
+        "existing": len(results) - created,
+        "invalid": len(items) - len(results),
+    }
+
+
 @router.get("/gamification/achievements/{achievement_id}/grants", response=GrantListOut)
 def list_achievement_grants(
     request,
@@ -465,7 +639,7 @@ def list_achievement_grants(
     if not achievement:
         raise HttpError(404, cast(Any, {"code": "NOT_FOUND", "message": "Achievement not found"}))
 
-    can_view_private = _has_perm_ctx(ctx, PERM_VIEW_PRIVATE)
+    can_view_private = _has_perm_ctx(request, ctx, PERM_VIEW_PRIVATE)
     if achievement.status in {AchievementStatus.DRAFT, AchievementStatus.HIDDEN} and not can_view_private:
         raise HttpError(403, cast(Any, {"code": "FORBIDDEN", "message": "Permission denied"}))
 
@@ -500,7 +674,7 @@ def list_achievement_grants(
 @router.post("/gamification/grants/{grant_id}/revoke", response=GrantOut)
 def revoke_achievement_grant(request, grant_id: str):
     ctx = require_internal_context(request)
-    _require_perm_ctx(ctx, PERM_REVOKE)
+    _require_perm_ctx(request, ctx, PERM_REVOKE)
 
     grant_uuid = _parse_uuid(grant_id, code="INVALID_GRANT_ID", message="Invalid grant id")
     grant = AchievementGrant.objects.filter(id=grant_uuid, tenant_id=ctx.tenant_id).first()
@@ -514,6 +688,69 @@ def revoke_achievement_grant(request, grant_id: str):
     return _grant_to_out(grant)
 
 
+def _leaderboard_entry_out(entry: LeaderboardEntry) -> dict[str, Any]:
+    return {"user_id": str(entry.user_id), "score": entry.score, "rank": entry.rank}
+
+
+@router.get("/gamification/leaderboard", response=LeaderboardOut)
+def leaderboard(
+    request,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+):
+    """Top collectors by public grants, plus the viewer's own position."""
+    ctx = require_internal_context(request)
+    items = [_leaderboard_entry_out(entry) for entry in top_users(ctx.tenant_id, limit=limit, offset=offset)]
+
+    me = None
+    score = (
+        UserAchievementStats.objects.filter(tenant_id=ctx.tenant_id, user_id=ctx.user_id)
+        .values_list("public_grants", flat=True)
+        .first()
+    )
+    rank = rank_for_score(ctx.tenant_id, score or 0)
+    if rank is not None:
+        me = {"user_id": str(ctx.user_id), "score": score, "rank": rank}
+    return {"items": items, "me": me}
+
+
+@router.get("/gamification/users/{user_id}/summary", response=UserAchievementSummaryOut)
+def user_achievement_summary(request, user_id: str):
+    """
+    Grant totals, per-category counts, latest grant and leaderboard rank of
+    a user (``me`` for the viewer). Others see public grants only unless the
+    viewer may view private achievements.
+    """
+    ctx = require_internal_context(request)
+    target = ctx.user_id if user_id == "me" else user_id
+    target_uuid = _parse_uuid(target, code="INVALID_USER_ID", message="Invalid user id")
+    include_private = str(target_uuid) == str(ctx.user_id) or _has_perm_ctx(request, ctx, PERM_VIEW_PRIVATE)
+
+    stats = UserAchievementStats.objects.filter(tenant_id=ctx.tenant_id, user_id=target_uuid).first()
+    count_field = "total_grants" if include_private else "public_grants"
+    categories = [
+        {"category": slug, "count": count}
+        for slug, count in UserCategoryStats.objects.filter(
+            tenant_id=ctx.tenant_id,
+            user_id=target_uuid,
+            **{f"{count_field}__gt": 0},
+        )
+        .order_by("category__order", "category__slug")
+        .values_list("category__slug", count_field)
+    ]
+    score = stats.public_grants if stats else 0
+    return {
+        "user_id": str(target_uuid),
+        "total_grants": getattr(stats, count_field) if stats else 0,
+        "categories": categories,
+        # The latest grant may be private; only disclose it to privileged viewers.
+        "latest_grant_id": str(stats.latest_grant_id) if stats and include_private and stats.latest_grant_id else None,
+        "latest_grant_at": stats.latest_grant_at if stats and include_private else None,
+        "score": score,
+        "rank": rank_for_score(ctx.tenant_id, score),
+    }
+
+
 @router.get("/gamification/categories", response=CategoriesListOut)
 def list_categories(request):
     ctx = require_internal_context(request)
@@ -526,7 +763,7 @@ def list_categories(request):
 @router.post("/gamification/categories", response=CategoryOut)
 def create_category(request, payload: CategoryCreateIn):
     ctx = require_internal_context(request)
-    _require_perm_ctx(ctx, PERM_EDIT)
+    _require_perm_ctx(request, ctx, PERM_EDIT)
 
     if not payload.id:
         raise HttpError(422, cast(Any, {"code": "VALIDATION_ERROR", "message": "id is required"}))
@@ -552,7 +789,7 @@ def create_category(request, payload: CategoryCreateIn):
 @router.patch("/gamification/categories/{category_id}", response=CategoryOut)
 def update_category(request, category_id: str, payload: CategoryUpdateIn):
     ctx = require_internal_context(request)
-    _require_perm_ctx(ctx, PERM_EDIT)
+    _require_perm_ctx(request, ctx, PERM_EDIT)
 
     category = AchievementCategory.objects.filter(
         tenant_id=ctx.tenant_id, slug=category_id
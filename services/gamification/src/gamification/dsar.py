@@ -6,6 +6,7 @@ from uuid import UUID
 from django.utils import timezone
 
 from gamification.models import Achievement, AchievementGrant, OutboxMessage
+from gamification.stats import rebuild_user_stats
 
 ANONYMIZED_USER_ID = UUID("00000000-0000-0000-0000-000000000000")
 REDACTED_VALUE = "[redacted]"
@@ -55,12 +56,30 @@ def _serialize_grant(item: AchievementGrant) -> dict[str, Any]:
     }
 
 
-def _serialize_outbox(item: OutboxMessage) -> dict[str, Any]:
+def _own_grant_entries(payload: Any, *, user_token: str, grant_ids: set[str]) -> Any:
+    """Drop other recipients' entries from a bulk grant event's ``grants``."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("grants"), list):
+        return payload
+    return {
+        **payload,
+        "grants": [
+            entry
+            for entry in payload["grants"]
+            if isinstance(entry, dict)
+            and (
+                str(entry.get("grant_id") or "") in grant_ids
+                or str(entry.get("recipient_id") or "").strip() == user_token
+            )
+        ],
+    }
+
+
+def _serialize_outbox(item: OutboxMessage, *, user_token: str, grant_ids: set[str]) -> dict[str, Any]:
     return {
         "id": str(item.id),
         "tenant_id": str(item.tenant_id),
         "event_type": item.event_type,
-        "payload": item.payload or {},
+        "payload": _own_grant_entries(item.payload or {}, user_token=user_token, grant_ids=grant_ids),
         "occurred_at": _iso(item.occurred_at),
         "published_at": _iso(item.published_at),
     }
@@ -83,6 +102,13 @@ def _matches_outbox(
     for key in ("recipient_id", "issuer_id", "revoked_by"):
         if str(payload.get(key) or "").strip() == user_token:
             return True
+    # Bulk grant events carry one {grant_id, recipient_id} entry per recipient.
+    for entry in payload.get("grants") or []:
+        if isinstance(entry, dict) and (
+            str(entry.get("grant_id") or "") in grant_ids
+            or str(entry.get("recipient_id") or "").strip() == user_token
+        ):
+            return True
     return False
 
 
@@ -131,7 +157,9 @@ def export_user_data(*, tenant_id: UUID, user_id: UUID) -> dict[str, Any]:
         "grants_received": [_serialize_grant(item) for item in grants_received],
         "grants_issued": [_serialize_grant(item) for item in grants_issued],
         "grants_revoked": [_serialize_grant(item) for item in grants_revoked],
-        "outbox": [_serialize_outbox(item) for item in outbox_items],
+        "outbox": [
+            _serialize_outbox(item, user_token=user_token, grant_ids=grant_ids) for item in outbox_items
+        ],
     }
 
 
@@ -150,6 +178,7 @@ def erase_user_data(*, tenant_id: UUID, user_id: UUID) -> dict[str, Any]:
         tenant_id=tenant_id,
         recipient_id=user_id,
     ).delete()
+    rebuild_user_stats(tenant_id=tenant_id, user_ids=[user_id])
     grants_issued_anonymized = AchievementGrant.objects.filter(
         tenant_id=tenant_id,
         issuer_id=user_id,
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import json
+from uuid import UUID
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from gamification.models import AchievementGrant
+from gamification.stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute per-user achievement aggregates and the leaderboard from grants"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tenant-id", default=None, help="Limit rebuild to a single tenant")
+
+    def handle(self, *args, **options):
+        if options["tenant_id"]:
+            try:
+                tenant_ids = [UUID(str(options["tenant_id"]))]
+            except ValueError as exc:
+                raise CommandError("--tenant-id must be a UUID") from exc
+        else:
+            tenant_ids = list(AchievementGrant.objects.values_list("tenant_id", flat=True).distinct())
+
+        started_at = timezone.now()
+        users = {str(tenant_id): rebuild_user_stats(tenant_id=tenant_id) for tenant_id in tenant_ids}
+
+        payload = {
+            "service": "gamification",
+            "executed_at": started_at.isoformat(),
+            "counts": {
+                "tenants": len(users),
+                "users_with_grants": users,
+            },
+        }
+        self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from gamification.search import build_terms
+
+CHUNK_SIZE = 500
+
+
+def backfill_search_terms(apps, schema_editor):
+    Achievement = apps.get_model("gamification", "Achievement")
+    AchievementSearchTerm = apps.get_model("gamification", "AchievementSearchTerm")
+
+    last_id = None
+    while True:
+        qs = Achievement.objects.order_by("id")
+        if last_id is not None:
+            qs = qs.filter(id__gt=last_id)
+        page = list(qs.only("id", "tenant_id", "name_i18n")[:CHUNK_SIZE])
+        if not page:
+            return
+        last_id = page[-1].id
+        AchievementSearchTerm.objects.bulk_create(
+            [
+                AchievementSearchTerm(
+                    tenant_id=achievement.tenant_id,
+                    achievement_id=achievement.id,
+                    locale=locale,
+                    term=term,
+                    exact=exact,
+                )
+                for achievement in page
+                for (locale, term), exact in build_terms(achievement.name_i18n).items()
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0002_outbox_claim_fields"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AchievementSearchTerm",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("locale", models.CharField(max_length=16)),
+                ("term", models.CharField(max_length=32)),
+                ("exact", models.BooleanField(default=False)),
+                ("achievement", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="search_terms", to="gamification.achievement")),
+            ],
+            options={
+                "db_table": "gamification_achievement_search_term",
+                "indexes": [models.Index(fields=["tenant_id", "term"], name="g_ach_search_tenant_term_idx")],
+                "constraints": [models.UniqueConstraint(fields=("achievement", "locale", "term"), name="g_ach_search_term_unique")],
+            },
+        ),
+        migrations.RunPython(backfill_search_terms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("gamification", "0003_achievement_search_terms"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LeaderboardScore",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("score", models.PositiveIntegerField()),
+                ("users", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "gamification_leaderboard_score",
+                "constraints": [models.UniqueConstraint(fields=("tenant_id", "score"), name="g_leaderboard_score_unique")],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserAchievementStats",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("user_id", models.UUIDField()),
+                ("total_grants", models.PositiveIntegerField(default=0)),
+                ("public_grants", models.PositiveIntegerField(default=0)),
+                ("latest_grant_id", models.UUIDField(blank=True, null=True)),
+                ("latest_grant_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "gamification_user_stats",
+                "indexes": [models.Index(fields=["tenant_id", "-public_grants", "user_id"], name="g_user_stats_rank_idx")],
+                "constraints": [models.UniqueConstraint(fields=("tenant_id", "user_id"), name="g_user_stats_unique")],
+            },
+        ),
+        migrations.CreateModel(
+            name="UserCategoryStats",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("tenant_id", models.UUIDField()),
+                ("user_id", models.UUIDField()),
+                ("total_grants", models.PositiveIntegerField(default=0)),
+                ("public_grants", models.PositiveIntegerField(default=0)),
+                ("category", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="user_stats", to="gamification.achievementcategory")),
+            ],
+            options={
+                "db_table": "gamification_user_category_stats",
+                "constraints": [models.UniqueConstraint(fields=("tenant_id", "user_id", "category"), name="g_user_category_stats_unique")],
+            },
+        ),
+    ]
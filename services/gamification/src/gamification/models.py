@@ -73,6 +73,39 @@ class Achievement(models.Model):
         ]
 
 
+class AchievementSearchTerm(models.Model):
+    """
+    Inverted index over achievement names, one row per (locale, term).
+
+    Terms are normalized words plus their edge prefixes, so a prefix search
+    is an equality lookup on ``(tenant_id, term)``. Maintained by
+    ``gamification.search.index_achievement``.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    tenant_id = models.UUIDField()
+    achievement = models.ForeignKey(
+        Achievement,
+        on_delete=models.CASCADE,
+        related_name="search_terms",
+    )
+    locale = models.CharField(max_length=16)
+    term = models.CharField(max_length=32)
+    exact = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "gamification_achievement_search_term"
+        indexes = [
+            models.Index(fields=["tenant_id", "term"], name="g_ach_search_tenant_term_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["achievement", "locale", "term"],
+                name="g_ach_search_term_unique",
+            ),
+        ]
+
+
 class AchievementGrant(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant_id = models.UUIDField(db_index=True)
@@ -118,6 +151,78 @@ class AchievementGrant(models.Model):
         return super().save(*args, **kwargs)
 
 
+class UserAchievementStats(models.Model):
+    """
+    Per-(tenant, user) grant aggregates over active (non-revoked) grants.
+
+    Maintained by ``create_grant`` / ``revoke_grant`` through
+    ``gamification.stats``; ``rebuild_achievement_stats`` recomputes them.
+    ``public_grants`` is the leaderboard score.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    tenant_id = models.UUIDField()
+    user_id = models.UUIDField()
+    total_grants = models.PositiveIntegerField(default=0)
+    public_grants = models.PositiveIntegerField(default=0)
+    latest_grant_id = models.UUIDField(null=True, blank=True)
+    latest_grant_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "gamification_user_stats"
+        constraints = [
+            models.UniqueConstraint(fields=["tenant_id", "user_id"], name="g_user_stats_unique"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["tenant_id", "-public_grants", "user_id"],
+                name="g_user_stats_rank_idx",
+            ),
+        ]
+
+
+class UserCategoryStats(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    tenant_id = models.UUIDField()
+    user_id = models.UUIDField()
+    category = models.ForeignKey(
+        AchievementCategory,
+        on_delete=models.CASCADE,
+        related_name="user_stats",
+    )
+    total_grants = models.PositiveIntegerField(default=0)
+    public_grants = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "gamification_user_category_stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["tenant_id", "user_id", "category"],
+                name="g_user_category_stats_unique",
+            ),
+        ]
+
+
+class LeaderboardScore(models.Model):
+    """
+    Score histogram: how many users of a tenant hold exactly ``score``
+    public grants. A rank is one plus the users above, i.e. a sum over
+    distinct scores (bounded by the catalog size), not over all users.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    tenant_id = models.UUIDField()
+    score = models.PositiveIntegerField()
+    users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "gamification_leaderboard_score"
+        constraints = [
+            models.UniqueConstraint(fields=["tenant_id", "score"], name="g_leaderboard_score_unique"),
+        ]
+
+
 class OutboxMessage(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
 
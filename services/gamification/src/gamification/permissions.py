@@ -26,50 +26,26 @@ def _is_system_admin(master_flags: dict) -> bool:
     )
 
 
-def has_permission(
+def _access_headers(
     *,
+    path: str,
+    body: bytes,
     tenant_id: str,
     tenant_slug: str,
     user_id: str,
     master_flags: dict,
-    permission_key: str,
-    scope_type: str,
-    scope_id: str,
     request_id: str,
-) -> bool:
-    if _is_suspended_or_banned(master_flags):
-        return False
-    if _is_system_admin(master_flags):
-        return True
-
-    base_url = str(getattr(settings, "ACCESS_BASE_URL", "http://access:8002/api/v1")).rstrip("/")
-    path = "/api/v1/access/check"
-    url = f"{base_url}/access/check"
-
-    payload = {
-        "tenant_id": tenant_id,
-        "user_id": user_id,
-        "action": permission_key,
-        "scope": {"type": scope_type, "id": scope_id},
-        "master_flags": {
-            "suspended": bool(master_flags.get("suspended", False)),
-            "banned": bool(master_flags.get("banned", False)),
-            "system_admin": bool(master_flags.get("system_admin", False)),
-            "membership_status": master_flags.get("membership_status"),
-        },
-    }
-    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
-
+) -> dict[str, str] | None:
     ts = str(int(time.time()))
     secret = getattr(settings, "BFF_INTERNAL_HMAC_SECRET", "")
     if not secret:
-        return False
+        return None
     msg = "\n".join(
         ["POST", path, hashlib.sha256(body).hexdigest(), str(request_id), ts]
     ).encode("utf-8")
     sig = hmac.new(secret.encode("utf-8"), msg, digestmod=hashlib.sha256).hexdigest()
 
-    headers = {
+    return {
         "Content-Type": "application/json",
         "X-Request-Id": str(request_id),
         "X-Tenant-Id": str(tenant_id),
@@ -81,19 +57,129 @@ def has_permission(
         "X-Updspace-Signature": sig,
     }
 
+
+def _master_flags_payload(master_flags: dict) -> dict:
+    return {
+        "suspended": bool(master_flags.get("suspended", False)),
+        "banned": bool(master_flags.get("banned", False)),
+        "system_admin": bool(master_flags.get("system_admin", False)),
+        "membership_status": master_flags.get("membership_status"),
+    }
+
+
+def _post_access(
+    *,
+    endpoint: str,
+    payload: dict,
+    tenant_id: str,
+    tenant_slug: str,
+    user_id: str,
+    master_flags: dict,
+    request_id: str,
+) -> dict | None:
+    base_url = str(getattr(settings, "ACCESS_BASE_URL", "http://access:8002/api/v1")).rstrip("/")
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    headers = _access_headers(
+        path=f"/api/v1/access/{endpoint}",
+        body=body,
+        tenant_id=tenant_id,
+        tenant_slug=tenant_slug,
+        user_id=user_id,
+        master_flags=master_flags,
+        request_id=request_id,
+    )
+    if headers is None:
+        return None
+
     try:
-        resp = httpx.post(url, content=body, headers=headers, timeout=5.0)
+        resp = httpx.post(f"{base_url}/access/{endpoint}", content=body, headers=headers, timeout=5.0)
     except Exception:
         # Fail-closed: при сбое проверки доступа запрещаем, но логируем причину,
         # чтобы ошибка не была немой.
         logger.warning("Access check request failed; denying", exc_info=True)
-        return False
+        return None
 
     if resp.status_code != 200:
-        return False
+        return None
     try:
         data = resp.json()
     except Exception:
         logger.warning("Access check returned non-JSON; denying", exc_info=True)
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def has_permission(
+    *,
+    tenant_id: str,
+    tenant_slug: str,
+    user_id: str,
+    master_flags: dict,
+    permission_key: str,
+    scope_type: str,
+    scope_id: str,
+    request_id: str,
+) -> bool:
+    if _is_suspended_or_banned(master_flags):
         return False
-    return bool(data.get("allowed"))
+    if _is_system_admin(master_flags):
+        return True
+
+    data = _post_access(
+        endpoint="check",
+        payload={
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "action": permission_key,
+            "scope": {"type": scope_type, "id": scope_id},
+            "master_flags": _master_flags_payload(master_flags),
+        },
+        tenant_id=tenant_id,
+        tenant_slug=tenant_slug,
+        user_id=user_id,
+        master_flags=master_flags,
+        request_id=request_id,
+    )
+    return bool(data and data.get("allowed"))
+
+
+def fetch_permissions(
+    *,
+    tenant_id: str,
+    tenant_slug: str,
+    user_id: str,
+    master_flags: dict,
+    permission_keys: tuple[str, ...],
+    scope_type: str,
+    scope_id: str,
+    request_id: str,
+) -> frozenset[str]:
+    """
+    Resolve several permission keys with one ``/access/check-bulk`` call.
+
+    Returns the granted subset; any failure denies everything (fail-closed).
+    """
+    if _is_suspended_or_banned(master_flags):
+        return frozenset()
+    if _is_system_admin(master_flags):
+        return frozenset(permission_keys)
+
+    data = _post_access(
+        endpoint="check-bulk",
+        payload={
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "actions": list(permission_keys),
+            "scope": {"type": scope_type, "id": scope_id},
+            "master_flags": _master_flags_payload(master_flags),
+        },
+        tenant_id=tenant_id,
+        tenant_slug=tenant_slug,
+        user_id=user_id,
+        master_flags=master_flags,
+        request_id=request_id,
+    )
+    permissions = data.get("permissions") if data else None
+    if not isinstance(permissions, dict):
+        return frozenset()
+    return frozenset(key for key in permission_keys if permissions.get(key) is True)
@@ -52,6 +52,12 @@ class AchievementListOut(Schema):
     next_cursor: str | None
 
 
+class AchievementSearchOut(Schema):
+    items: list[AchievementOut]
+    total: int
+    facets: dict[str, int]
+
+
 class GrantCreateIn(Schema):
     recipient_id: str
     reason: str | None = None
@@ -69,6 +75,25 @@ class GrantOut(Schema):
     revoked_at: datetime | None = None
 
 
+class GrantBulkIn(Schema):
+    recipient_ids: list[str]
+    reason: str | None = None
+    visibility: str = "public"
+
+
+class GrantBulkItemOut(Schema):
+    recipient_id: str
+    status: str
+    grant: GrantOut | None = None
+
+
+class GrantBulkOut(Schema):
+    items: list[GrantBulkItemOut]
+    created: int
+    existing: int
+    invalid: int
+
+
 class GrantListOut(Schema):
     items: list[GrantOut]
     next_cursor: str | None
@@ -102,3 +127,29 @@ class CategoriesListOut(Schema):
 
 class ErrorResponse(Schema):
     error: dict[str, Any]
+
+
+class LeaderboardEntryOut(Schema):
+    user_id: str
+    score: int
+    rank: int
+
+
+class LeaderboardOut(Schema):
+    items: list[LeaderboardEntryOut]
+    me: LeaderboardEntryOut | None = None
+
+
+class UserCategoryCountOut(Schema):
+    category: str
+    count: int
+
+
+class UserAchievementSummaryOut(Schema):
+    user_id: str
+    total_grants: int
+    categories: list[UserCategoryCountOut]
+    latest_grant_id: str | None = None
+    latest_grant_at: datetime | None = None
+    score: int
+    rank: int | None = None
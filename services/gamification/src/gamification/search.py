@@ -0,0 +1,172 @@
+"""
+Achievement catalog search.
+
+Names are stored per locale in ``name_i18n`` (JSON), which a database can
+only search by decoding every row. ``AchievementSearchTerm`` keeps an
+inverted index instead: each normalized word of each localized name plus
+its edge prefixes (``ach``, ``achi``, ... ``achiever``), so both whole-word
+and prefix queries are equality lookups on ``(tenant_id, term)``.
+
+Ranking: all query terms must match; results named in the requested
+locale come first, then those with more whole-word hits, then newest.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Max, Q, QuerySet, When
+
+from .models import Achievement, AchievementSearchTerm
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 32
+MAX_QUERY_TERMS = 8
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text: str) -> str:
+    """Casefold and strip diacritics (``Ёлка`` -> ``елка``, ``Café`` -> ``cafe``)."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize("NFKC", stripped).casefold()
+
+
+def query_terms(q: str) -> list[str]:
+    terms: list[str] = []
+    for word in _WORD_RE.findall(normalize(q)):
+        term = word[:MAX_TERM_LENGTH]
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def build_terms(name_i18n: dict) -> dict[tuple[str, str], bool]:
+    """Map ``(locale, term)`` to whether the term is a whole word."""
+    terms: dict[tuple[str, str], bool] = {}
+    for locale, text in (name_i18n or {}).items():
+        if not isinstance(text, str):
+            continue
+        locale_key = str(locale)[:16]
+        for word in _WORD_RE.findall(normalize(text)):
+            word = word[:MAX_TERM_LENGTH]
+            for size in range(MIN_TERM_LENGTH, len(word) + 1):
+                key = (locale_key, word[:size])
+                terms[key] = terms.get(key, False) or size == len(word)
+    return terms
+
+
+def index_achievement(achievement: Achievement) -> None:
+    """Replace the index rows for ``achievement``; call after name changes."""
+    rows = [
+        AchievementSearchTerm(
+            tenant_id=achievement.tenant_id,
+            achievement_id=achievement.id,
+            locale=locale,
+            term=term,
+            exact=exact,
+        )
+        for (locale, term), exact in build_terms(achievement.name_i18n).items()
+    ]
+    with transaction.atomic():
+        AchievementSearchTerm.objects.filter(achievement_id=achievement.id).delete()
+        AchievementSearchTerm.objects.bulk_create(rows)
+
+
+def _ranked_matches(
+    *,
+    tenant_id,
+    terms: list[str],
+    locale: str | None,
+    achievements: QuerySet[Achievement],
+):
+    return (
+        AchievementSearchTerm.objects.filter(
+            tenant_id=tenant_id,
+            term__in=terms,
+            achievement__in=achievements,
+        )
+        .values("achievement_id")
+        .annotate(
+            matched=Count("term", distinct=True),
+            exact_hits=Count("term", filter=Q(exact=True), distinct=True),
+            locale_hit=Max(
+                Case(When(locale=locale or "", then=1), default=0, output_field=IntegerField())
+            ),
+        )
+        .filter(matched=len(terms))
+    )
+
+
+def matching_ids(*, tenant_id, q: str, locale: str | None = None):
+    """
+    Subquery of achievement ids whose name matches every term of ``q``.
+
+    Returns ``None`` when ``q`` has no indexable term (shorter than
+    ``MIN_TERM_LENGTH``); callers decide how to treat such queries.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return None
+    return _ranked_matches(
+        tenant_id=tenant_id,
+        terms=terms,
+        locale=locale,
+        achievements=Achievement.objects.filter(tenant_id=tenant_id),
+    ).values("achievement_id")
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    achievement_ids: list[UUID]
+    total: int
+    facets: dict[str, int]
+
+
+def search_achievements(
+    *,
+    tenant_id,
+    q: str,
+    locale: str | None,
+    achievements: QuerySet[Achievement],
+    categories: list[str] | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> SearchResult:
+    """
+    Ranked search over ``achievements`` (already restricted to what the
+    viewer may see). ``facets`` counts matches per category slug before the
+    category filter is applied, so clients can render filter chips.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return SearchResult(achievement_ids=[], total=0, facets={})
+
+    matches = _ranked_matches(tenant_id=tenant_id, terms=terms, locale=locale, achievements=achievements)
+    facets = {
+        row["category__slug"]: row["count"]
+        for row in achievements.filter(id__in=matches.values("achievement_id"))
+        .values("category__slug")
+        .annotate(count=Count("id"))
+        .order_by()
+    }
+
+    if categories:
+        matches = matches.filter(achievement__category__slug__in=categories)
+    total = matches.count()
+    ranked = matches.order_by(
+        "-locale_hit",
+        "-exact_hits",
+        "-achievement__created_at",
+        "-achievement_id",
+    )[offset : offset + limit]
+    return SearchResult(
+        achievement_ids=[row["achievement_id"] for row in ranked],
+        total=total,
+        facets=facets,
+    )
@@ -13,6 +13,7 @@ from django.utils import timezone
 
 from core.ymq import schedule_outbox_wakeup
 
+from . import stats
 from .models import Achievement, AchievementGrant, OutboxMessage
 
 
@@ -117,6 +118,7 @@ def create_grant(
         visibility=visibility,
     )
     if grant:
+        stats.apply_grant(grant, achievement=achievement, delta=1)
         create_outbox_event(
             tenant_id=str(achievement.tenant_id),
             event_type="gamification.grant.created",
@@ -133,6 +135,107 @@ def create_grant(
     return grant
 
 
+BULK_GRANT_MAX_RECIPIENTS = 5000
+_BULK_GRANT_CHUNK = 500
+
+BULK_STATUS_CREATED = "created"
+BULK_STATUS_EXISTING = "existing"
+
+
+@dataclass(frozen=True)
+class BulkGrantResult:
+    recipient_id: UUID
+    status: str
+    grant: AchievementGrant | None
+
+
+@transaction.atomic
+def create_grants_bulk(
+    *,
+    achievement: Achievement,
+    recipient_ids: list[UUID],
+    issuer_id: UUID,
+    reason: str | None,
+    visibility: str,
+) -> list[BulkGrantResult]:
+    """
+    Grant ``achievement`` to many recipients in one transaction.
+
+    Existing active grants are found with chunked ``IN`` queries, new ones are
+    inserted with ``bulk_create`` and announced with a single
+    ``gamification.grant.bulk_created`` outbox event (one wake-up). Returns one
+    result per distinct recipient, in input order.
+    """
+    recipients = list(dict.fromkeys(recipient_ids))
+    existing: dict[UUID, AchievementGrant] = {}
+    for start in range(0, len(recipients), _BULK_GRANT_CHUNK):
+        for grant in AchievementGrant.objects.filter(
+            tenant_id=achievement.tenant_id,
+            achievement=achievement,
+            recipient_id__in=recipients[start : start + _BULK_GRANT_CHUNK],
+            revoked_at__isnull=True,
+        ):
+            existing[grant.recipient_id] = grant
+
+    pending = [
+        AchievementGrant(
+            tenant_id=achievement.tenant_id,
+            achievement=achievement,
+            recipient_id=recipient_id,
+            issuer_id=issuer_id,
+            reason=reason or "",
+            visibility=visibility,
+        )
+        for recipient_id in recipients
+        if recipient_id not in existing
+    ]
+    # ignore_conflicts: a concurrent single grant for the same recipient wins,
+    # and is reported below as existing instead of failing the whole batch.
+    AchievementGrant.objects.bulk_create(pending, batch_size=_BULK_GRANT_CHUNK, ignore_conflicts=True)
+
+    created: dict[UUID, AchievementGrant] = {}
+    pending_ids = [grant.id for grant in pending]
+    for start in range(0, len(pending_ids), _BULK_GRANT_CHUNK):
+        for grant in AchievementGrant.objects.filter(id__in=pending_ids[start : start + _BULK_GRANT_CHUNK]):
+            created[grant.recipient_id] = grant
+    lost = [grant.recipient_id for grant in pending if grant.recipient_id not in created]
+    if lost:
+        for grant in AchievementGrant.objects.filter(
+            tenant_id=achievement.tenant_id,
+            achievement=achievement,
+            recipient_id__in=lost,
+            revoked_at__isnull=True,
+        ):
+            existing[grant.recipient_id] = grant
+
+    if created:
+        stats.apply_bulk_grants(list(created.values()), achievement=achievement)
+        new_grants = sorted(created.values(), key=lambda grant: (grant.created_at, str(grant.id)))
+        create_outbox_event(
+            tenant_id=str(achievement.tenant_id),
+            event_type="gamification.grant.bulk_created",
+            payload={
+                "achievement_id": str(achievement.id),
+                "issuer_id": str(issuer_id),
+                "visibility": visibility,
+                "reason": reason or "",
+                "created_at": new_grants[0].created_at.isoformat(),
+                "grants": [
+                    {"grant_id": str(grant.id), "recipient_id": str(grant.recipient_id)}
+                    for grant in new_grants
+                ],
+            },
+        )
+
+    results: list[BulkGrantResult] = []
+    for recipient_id in recipients:
+        if recipient_id in created:
+            results.append(BulkGrantResult(recipient_id, BULK_STATUS_CREATED, created[recipient_id]))
+        else:
+            results.append(BulkGrantResult(recipient_id, BULK_STATUS_EXISTING, existing.get(recipient_id)))
+    return results
+
+
 @transaction.atomic
 def revoke_grant(
     *,
@@ -144,6 +247,7 @@ def revoke_grant(
     grant.revoked_at = timezone.now()
     grant.revoked_by = revoked_by
     grant.save(update_fields=["revoked_at", "revoked_by"])
+    stats.apply_grant(grant, achievement=grant.achievement, delta=-1)
     create_outbox_event(
         tenant_id=str(grant.tenant_id),
         event_type="gamification.grant.revoked",
@@ -0,0 +1,301 @@
+"""
+Per-user achievement aggregates and the tenant leaderboard.
+
+``UserAchievementStats`` / ``UserCategoryStats`` hold active-grant counts per
+user, updated with F() deltas inside the grant transaction. The leaderboard
+score is ``public_grants``: top-N is an index range scan on
+``(tenant_id, -public_grants, user_id)`` and a rank is computed from the
+``LeaderboardScore`` histogram, so neither scans ``AchievementGrant``.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from .models import (
+    Achievement,
+    AchievementGrant,
+    GrantVisibility,
+    LeaderboardScore,
+    UserAchievementStats,
+    UserCategoryStats,
+)
+
+REBUILD_CHUNK_SIZE = 500
+
+
+def _is_ydb_mode() -> bool:
+    return getattr(settings, "DB_DRIVER", "postgres") == "ydb"
+
+
+def _move_scores(tenant_id, moves: Counter) -> None:
+    """Apply net per-score user deltas to the histogram, one query per score."""
+    for score, delta in sorted(moves.items()):
+        if score <= 0 or delta == 0:
+            continue
+        if delta < 0:
+            LeaderboardScore.objects.filter(tenant_id=tenant_id, score=score).update(users=F("users") + delta)
+            LeaderboardScore.objects.filter(tenant_id=tenant_id, score=score, users=0).delete()
+            continue
+        bucket, created = LeaderboardScore.objects.get_or_create(
+            tenant_id=tenant_id,
+            score=score,
+            defaults={"users": delta},
+        )
+        if not created:
+            LeaderboardScore.objects.filter(pk=bucket.pk).update(users=F("users") + delta)
+
+
+def _move_score(tenant_id, old: int, new: int) -> None:
+    if old == new:
+        return
+    _move_scores(tenant_id, Counter({old: -1, new: 1}))
+
+
+def _latest_active_grant(tenant_id, user_id) -> AchievementGrant | None:
+    return (
+        AchievementGrant.objects.filter(tenant_id=tenant_id, recipient_id=user_id, revoked_at__isnull=True)
+        .order_by("-created_at", "-id")
+        .only("id", "created_at")
+        .first()
+    )
+
+
+@transaction.atomic
+def apply_grant(grant: AchievementGrant, *, achievement: Achievement, delta: int) -> None:
+    """Account for ``grant`` being created (``delta=1``) or revoked (``-1``)."""
+    tenant_id = grant.tenant_id
+    user_id = grant.recipient_id
+    public = 1 if grant.visibility == GrantVisibility.PUBLIC else 0
+
+    queryset = UserAchievementStats.objects
+    if not _is_ydb_mode():
+        queryset = queryset.select_for_update()
+    stats, _ = queryset.get_or_create(
+        tenant_id=tenant_id,
+        user_id=user_id,
+    )
+    old_score = stats.public_grants
+    stats.total_grants = max(0, stats.total_grants + delta)
+    stats.public_grants = max(0, stats.public_grants + delta * public)
+    if delta > 0 and (stats.latest_grant_at is None or grant.created_at >= stats.latest_grant_at):
+        stats.latest_grant_id = grant.id
+        stats.latest_grant_at = grant.created_at
+    elif delta < 0 and stats.latest_grant_id == grant.id:
+        latest = _latest_active_grant(tenant_id, user_id)
+        stats.latest_grant_id = latest.id if latest else None
+        stats.latest_grant_at = latest.created_at if latest else None
+    stats.save()
+
+    category_stats, created = UserCategoryStats.objects.get_or_create(
+        tenant_id=tenant_id,
+        user_id=user_id,
+        category_id=achievement.category_id,
+        defaults={"total_grants": max(0, delta), "public_grants": max(0, delta * public)},
+    )
+    if not created:
+        UserCategoryStats.objects.filter(pk=category_stats.pk).update(
+            total_grants=F("total_grants") + delta,
+            public_grants=F("public_grants") + delta * public,
+        )
+
+    _move_score(tenant_id, old_score, stats.public_grants)
+
+
+@transaction.atomic
+def apply_bulk_grants(grants: list[AchievementGrant], *, achievement: Achievement) -> None:
+    """
+    Account for newly created ``grants`` of one achievement, one per user.
+
+    Same deltas as :func:`apply_grant`, batched: the affected stats rows are
+    locked in user order, updated with one ``bulk_update`` and the histogram
+    moves by net per-score deltas, so nothing outside these users is touched.
+    """
+    if not grants:
+        return
+    tenant_id = achievement.tenant_id
+    by_user = {grant.recipient_id: grant for grant in grants}
+    user_ids = sorted(by_user, key=str)
+
+    UserAchievementStats.objects.bulk_create(
+        [UserAchievementStats(tenant_id=tenant_id, user_id=user_id) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    UserCategoryStats.objects.bulk_create(
+        [
+            UserCategoryStats(tenant_id=tenant_id, user_id=user_id, category_id=achievement.category_id)
+            for user_id in user_ids
+        ],
+        ignore_conflicts=True,
+    )
+
+    queryset = UserAchievementStats.objects.filter(tenant_id=tenant_id, user_id__in=user_ids).order_by("user_id")
+    if not _is_ydb_mode():
+        queryset = queryset.select_for_update()
+    moves: Counter = Counter()
+    now = timezone.now()
+    rows = list(queryset)
+    for stats in rows:
+        grant = by_user[stats.user_id]
+        public = 1 if grant.visibility == GrantVisibility.PUBLIC else 0
+        old_score = stats.public_grants
+        stats.total_grants += 1
+        stats.public_grants += public
+        if stats.latest_grant_at is None or grant.created_at >= stats.latest_grant_at:
+            stats.latest_grant_id = grant.id
+            stats.latest_grant_at = grant.created_at
+        stats.updated_at = now
+        if public:
+            moves[old_score] -= 1
+            moves[stats.public_grants] += 1
+    UserAchievementStats.objects.bulk_update(
+        rows,
+        fields=["total_grants", "public_grants", "latest_grant_id", "latest_grant_at", "updated_at"],
+        batch_size=REBUILD_CHUNK_SIZE,
+    )
+
+    for public in (0, 1):
+        users = [user_id for user_id in user_ids if (by_user[user_id].visibility == GrantVisibility.PUBLIC) == public]
+        if users:
+            UserCategoryStats.objects.filter(
+                tenant_id=tenant_id,
+                user_id__in=users,
+                category_id=achievement.category_id,
+            ).update(total_grants=F("total_grants") + 1, public_grants=F("public_grants") + public)
+
+    _move_scores(tenant_id, moves)
+
+
+def _aggregate_users(tenant_id, user_ids: list[UUID]) -> tuple[list[UserAchievementStats], list[UserCategoryStats]]:
+    active = AchievementGrant.objects.filter(
+        tenant_id=tenant_id,
+        recipient_id__in=user_ids,
+        revoked_at__isnull=True,
+    )
+    public_q = Q(visibility=GrantVisibility.PUBLIC)
+    latest_id = (
+        AchievementGrant.objects.filter(
+            tenant_id=tenant_id,
+            recipient_id=OuterRef("recipient_id"),
+            revoked_at__isnull=True,
+        )
+        .order_by("-created_at", "-id")
+        .values("id")[:1]
+    )
+    user_rows = [
+        UserAchievementStats(
+            tenant_id=tenant_id,
+            user_id=row["recipient_id"],
+            total_grants=row["total"],
+            public_grants=row["public"],
+            latest_grant_id=row["latest_id"],
+            latest_grant_at=row["latest_at"],
+        )
+        for row in active.values("recipient_id")
+        .annotate(
+            total=Count("id"),
+            public=Count("id", filter=public_q),
+            latest_at=Max("created_at"),
+            latest_id=Subquery(latest_id),
+        )
+        .order_by()
+    ]
+    category_rows = [
+        UserCategoryStats(
+            tenant_id=tenant_id,
+            user_id=row["recipient_id"],
+            category_id=row["achievement__category_id"],
+            total_grants=row["total"],
+            public_grants=row["public"],
+        )
+        for row in active.values("recipient_id", "achievement__category_id")
+        .annotate(total=Count("id"), public=Count("id", filter=public_q))
+        .order_by()
+    ]
+    return user_rows, category_rows
+
+
+@transaction.atomic
+def rebuild_user_stats(*, tenant_id, user_ids: Iterable[UUID] | None = None) -> int:
+    """
+    Recompute aggregates from ``AchievementGrant`` for ``user_ids`` (or the
+    whole tenant) and re-derive the leaderboard histogram. Returns the
+    number of users with at least one active grant.
+    """
+    if user_ids is None:
+        targets = list(
+            AchievementGrant.objects.filter(tenant_id=tenant_id, revoked_at__isnull=True)
+            .values_list("recipient_id", flat=True)
+            .distinct()
+        )
+        UserAchievementStats.objects.filter(tenant_id=tenant_id).delete()
+        UserCategoryStats.objects.filter(tenant_id=tenant_id).delete()
+    else:
+        targets = list(dict.fromkeys(user_ids))
+        UserAchievementStats.objects.filter(tenant_id=tenant_id, user_id__in=targets).delete()
+        UserCategoryStats.objects.filter(tenant_id=tenant_id, user_id__in=targets).delete()
+
+    users_with_grants = 0
+    for start in range(0, len(targets), REBUILD_CHUNK_SIZE):
+        user_rows, category_rows = _aggregate_users(tenant_id, targets[start : start + REBUILD_CHUNK_SIZE])
+        UserAchievementStats.objects.bulk_create(user_rows)
+        UserCategoryStats.objects.bulk_create(category_rows)
+        users_with_grants += len(user_rows)
+
+    LeaderboardScore.objects.filter(tenant_id=tenant_id).delete()
+    LeaderboardScore.objects.bulk_create(
+        LeaderboardScore(tenant_id=tenant_id, score=row["public_grants"], users=row["users"])
+        for row in UserAchievementStats.objects.filter(tenant_id=tenant_id, public_grants__gt=0)
+        .values("public_grants")
+        .annotate(users=Count("id"))
+        .order_by()
+    )
+    return users_with_grants
+
+
+def rank_for_score(tenant_id, score: int) -> int | None:
+    if score <= 0:
+        return None
+    above = LeaderboardScore.objects.filter(tenant_id=tenant_id, score__gt=score).aggregate(
+        users=Sum("users")
+    )["users"]
+    return 1 + (above or 0)
+
+
+@dataclass(frozen=True)
+class LeaderboardEntry:
+    user_id: UUID
+    score: int
+    rank: int
+
+
+def top_users(tenant_id, *, limit: int, offset: int = 0) -> list[LeaderboardEntry]:
+    rows = list(
+        UserAchievementStats.objects.filter(tenant_id=tenant_id, public_grants__gt=0)
+        .order_by("-public_grants", "user_id")
+        .values_list("user_id", "public_grants")[offset : offset + limit]
+    )
+    if not rows:
+        return []
+    # One histogram read ranks the whole page (competition ranking: ties share a rank).
+    above_by_score: dict[int, int] = {}
+    running = 0
+    for score, users in (
+        LeaderboardScore.objects.filter(tenant_id=tenant_id, score__gte=rows[-1][1])
+        .order_by("-score")
+        .values_list("score", "users")
+    ):
+        above_by_score[score] = running
+        running += users
+    return [
+        LeaderboardEntry(user_id=user_id, score=score, rank=1 + above_by_score.get(score, 0))
+        for user_id, score in rows
+    ]
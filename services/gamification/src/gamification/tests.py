@@ -21,6 +21,9 @@ from .models import (
     AchievementGrant,
     AchievementStatus,
     GrantVisibility,
+    LeaderboardScore,
+    UserAchievementStats,
+    UserCategoryStats,
 )
 from .services import create_grant, revoke_grant
 
@@ -87,13 +90,15 @@ def _headers(
     }
 
 
-def _mock_has_permission(allowed: set[str]):
-    def _inner(**kwargs) -> bool:
-        permission_key = kwargs.get("permission_key", "")
+def _mock_fetch_permissions(allowed: set[str]):
+    def _inner(**kwargs) -> frozenset[str]:
+        permission_keys = kwargs.get("permission_keys", ())
         master_flags = kwargs.get("master_flags", {})
         if master_flags.get("suspended") or master_flags.get("banned"):
-            return False
-        return permission_key in allowed or master_flags.get("system_admin") is True
+            return frozenset()
+        if master_flags.get("system_admin") is True:
+            return frozenset(permission_keys)
+        return frozenset(key for key in permission_keys if key in allowed)
     return _inner
 
 
@@ -112,7 +117,7 @@ class GamificationApiTests(TestCase):
             is_active=True,
         )
 
-    @mock.patch("gamification.api.has_permission", side_effect=_mock_has_permission(set()))
+    @mock.patch("gamification.api.fetch_permissions", side_effect=_mock_fetch_permissions(set()))
     def test_list_achievements_public_only(self, _mock_perm):
         Achievement.objects.create(
             tenant_id=self.tenant_id,
@@ -149,10 +154,12 @@ class GamificationApiTests(TestCase):
         data = resp.json()
         self.assertEqual(len(data["items"]), 1)
         self.assertEqual(data["items"][0]["status"], "published")
+        # One bundled access lookup for view_private/edit/publish/hide.
+        _mock_perm.assert_called_once()
 
     @mock.patch(
-        "gamification.api.has_permission",
-        side_effect=_mock_has_permission(
+        "gamification.api.fetch_permissions",
+        side_effect=_mock_fetch_permissions(
             {
                 "gamification.achievements.create",
                 "gamification.achievements.edit",
@@ -205,8 +212,8 @@ class GamificationApiTests(TestCase):
         self.assertEqual(update_resp.json()["status"], "published")
 
     @mock.patch(
-        "gamification.api.has_permission",
-        side_effect=_mock_has_permission(
+        "gamification.api.fetch_permissions",
+        side_effect=_mock_fetch_permissions(
             {
                 "gamification.achievements.assign",
                 "gamification.achievements.revoke",
@@ -264,8 +271,8 @@ class GamificationApiTests(TestCase):
         self.assertIsNotNone(revoke_resp.json()["revoked_at"])
 
     @mock.patch(
-        "gamification.api.has_permission",
-        side_effect=_mock_has_permission(
+        "gamification.api.fetch_permissions",
+        side_effect=_mock_fetch_permissions(
             {
                 "gamification.achievements.edit",
                 "gamification.achievements.view_private",
@@ -309,7 +316,7 @@ class GamificationApiTests(TestCase):
         items = list_resp.json()["items"]
         self.assertTrue(any(item["id"] == "fun" for item in items))
 
-    @mock.patch("gamification.api.has_permission", side_effect=_mock_has_permission(set()))
+    @mock.patch("gamification.api.fetch_permissions", side_effect=_mock_fetch_permissions(set()))
     def test_create_category_requires_permission(self, _mock_perm):
         payload = {
             "id": "blocked",
@@ -331,8 +338,8 @@ class GamificationApiTests(TestCase):
         self.assertEqual(resp.status_code, 403)
 
     @mock.patch(
-        "gamification.api.has_permission",
-        side_effect=_mock_has_permission(
+        "gamification.api.fetch_permissions",
+        side_effect=_mock_fetch_permissions(
             {
                 "gamification.achievements.assign",
                 "gamification.achievements.view_private",
@@ -386,6 +393,334 @@ class GamificationApiTests(TestCase):
 
 
 @override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret")
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret")
+class AchievementSearchTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.tenant_id = str(uuid.uuid4())
+        self.user_id = str(uuid.uuid4())
+        self.events = AchievementCategory.objects.create(tenant_id=self.tenant_id, slug="event", name_i18n={})
+        self.sport = AchievementCategory.objects.create(tenant_id=self.tenant_id, slug="sport", name_i18n={})
+
+    def _achievement(self, name_i18n: dict, *, category=None, status=AchievementStatus.PUBLISHED, days_ago=0):
+        from .search import index_achievement
+
+        achievement = Achievement.objects.create(
+            tenant_id=self.tenant_id,
+            name_i18n=name_i18n,
+            category=category or self.events,
+            status=status,
+            images={"small": "s.png"},
+            created_by=self.user_id,
+            created_at=timezone.now() - timedelta(days=days_ago),
+        )
+        index_achievement(achievement)
+        return achievement
+
+    def _get(self, path: str, params: dict):
+        headers = _headers(
+            method="GET",
+            path=path,
+            body=b"",
+            tenant_id=self.tenant_id,
+            tenant_slug="aef",
+            user_id=self.user_id,
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+        return self.client.get(path, params, **headers)
+
+    def test_terms_are_normalized_with_prefixes(self):
+        from .search import build_terms, query_terms
+
+        terms = build_terms({"ru": "Ёлка", "en": "Café"})
+
+        self.assertTrue(terms[("ru", "елка")])
+        self.assertFalse(terms[("ru", "ел")])
+        self.assertIn(("en", "cafe"), terms)
+        self.assertEqual(query_terms("  CAFÉ, x ёл "), ["cafe", "ел"])
+
+    @mock.patch("gamification.api.fetch_permissions", side_effect=_mock_fetch_permissions(set()))
+    def test_search_ranks_by_locale_and_whole_words_with_facets(self, _mock_perm):
+        dust = self._achievement({"en": "Stardust collector"})
+        rising = self._achievement({"ru": "Восходящая звезда", "en": "Rising star"}, category=self.sport)
+        player = self._achievement({"de": "Star Spieler"}, days_ago=1)
+        self._achievement({"en": "Star draft"}, status=AchievementStatus.DRAFT)
+        self._achievement({"en": "Night owl"})
+
+        resp = self._get(f"{ACHIEVEMENTS_ROOT}/search", {"q": "star", "locale": "en"})
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(
+            [item["id"] for item in data["items"]],
+            [str(rising.id), str(dust.id), str(player.id)],
+        )
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["facets"], {"event": 2, "sport": 1})
+
+        filtered = self._get(
+            f"{ACHIEVEMENTS_ROOT}/search",
+            {"q": "звезд", "category": "sport", "locale": "ru"},
+        ).json()
+        self.assertEqual([item["id"] for item in filtered["items"]], [str(rising.id)])
+
+    @mock.patch("gamification.api.fetch_permissions", side_effect=_mock_fetch_permissions(set()))
+    def test_list_filter_uses_index_and_requires_all_terms(self, _mock_perm):
+        match = self._achievement({"en": "Night owl"})
+        self._achievement({"en": "Night runner"})
+
+        data = self._get(ACHIEVEMENTS_ROOT, {"q": "owl nig"}).json()
+
+        self.assertEqual([item["id"] for item in data["items"]], [str(match.id)])
+
+
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret", ACCESS_BASE_URL="http://access:8002/api/v1")
+class PermissionBundleTests(TestCase):
+    def _fetch(self, master_flags: dict):
+        from .permissions import fetch_permissions
+
+        return fetch_permissions(
+            tenant_id="t1",
+            tenant_slug="aef",
+            user_id="u1",
+            master_flags=master_flags,
+            permission_keys=("a.read", "a.edit", "a.hide"),
+            scope_type="TENANT",
+            scope_id="t1",
+            request_id="req-1",
+        )
+
+    @mock.patch("gamification.permissions.httpx.post")
+    def test_single_bulk_call_returns_granted_subset(self, mock_post):
+        mock_post.return_value = mock.Mock(
+            status_code=200,
+            json=mock.Mock(return_value={"permissions": {"a.read": True, "a.edit": False}}),
+        )
+
+        self.assertEqual(self._fetch({}), frozenset({"a.read"}))
+
+        mock_post.assert_called_once()
+        args, kwargs = mock_post.call_args
+        self.assertEqual(args[0], "http://access:8002/api/v1/access/check-bulk")
+        body = kwargs["content"]
+        self.assertEqual(json.loads(body)["actions"], ["a.read", "a.edit", "a.hide"])
+        msg = "\n".join(
+            [
+                "POST",
+                "/api/v1/access/check-bulk",
+                hashlib.sha256(body).hexdigest(),
+                "req-1",
+                kwargs["headers"]["X-Updspace-Timestamp"],
+            ]
+        ).encode("utf-8")
+        expected = hmac.new(b"test-secret", msg, digestmod=hashlib.sha256).hexdigest()
+        self.assertEqual(kwargs["headers"]["X-Updspace-Signature"], expected)
+
+    @mock.patch("gamification.permissions.httpx.post", side_effect=RuntimeError("down"))
+    def test_failures_deny_and_master_flags_short_circuit(self, mock_post):
+        self.assertEqual(self._fetch({}), frozenset())
+        self.assertEqual(self._fetch({"suspended": True}), frozenset())
+        self.assertEqual(self._fetch({"system_admin": True}), frozenset({"a.read", "a.edit", "a.hide"}))
+        self.assertEqual(mock_post.call_count, 1)
+
+
+@override_settings(BFF_INTERNAL_HMAC_SECRET="test-secret")
+class AchievementStatsTests(TestCase):
+    def setUp(self):
+        self.client = Client()
+        self.tenant_id = str(uuid.uuid4())
+        self.issuer_id = uuid.uuid4()
+        self.category = AchievementCategory.objects.create(tenant_id=self.tenant_id, slug="event", name_i18n={})
+        self.sport = AchievementCategory.objects.create(tenant_id=self.tenant_id, slug="sport", name_i18n={})
+        self.achievements = [
+            Achievement.objects.create(
+                tenant_id=self.tenant_id,
+                name_i18n={"en": f"A{i}"},
+                category=self.sport if i == 2 else self.category,
+                status=AchievementStatus.PUBLISHED,
+                images={},
+                created_by=self.issuer_id,
+            )
+            for i in range(3)
+        ]
+
+    def _grant(self, user_id, index: int, visibility=GrantVisibility.PUBLIC):
+        return create_grant(
+            achievement=self.achievements[index],
+            recipient_id=user_id,
+            issuer_id=self.issuer_id,
+            reason=None,
+            visibility=visibility,
+        )
+
+    def _histogram(self) -> dict[int, int]:
+        return dict(LeaderboardScore.objects.filter(tenant_id=self.tenant_id).values_list("score", "users"))
+
+    def _get(self, path: str, *, user_id: str, params: dict | None = None):
+        headers = _headers(
+            method="GET",
+            path=path,
+            body=b"",
+            tenant_id=self.tenant_id,
+            tenant_slug="aef",
+            user_id=user_id,
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+        return self.client.get(path, params or {}, **headers)
+
+    def test_grant_and_revoke_maintain_counters_and_histogram(self):
+        user = uuid.uuid4()
+        self._grant(user, 0)
+        private = self._grant(user, 2, visibility=GrantVisibility.PRIVATE)
+
+        stats = UserAchievementStats.objects.get(tenant_id=self.tenant_id, user_id=user)
+        self.assertEqual((stats.total_grants, stats.public_grants), (2, 1))
+        self.assertEqual(stats.latest_grant_id, private.id)
+        self.assertEqual(self._histogram(), {1: 1})
+
+        revoke_grant(grant=private, revoked_by=self.issuer_id)
+        stats.refresh_from_db()
+        self.assertEqual((stats.total_grants, stats.public_grants), (1, 1))
+        self.assertNotEqual(stats.latest_grant_id, private.id)
+        self.assertEqual(
+            UserCategoryStats.objects.get(tenant_id=self.tenant_id, user_id=user, category=self.sport).total_grants,
+            0,
+        )
+
+    def test_leaderboard_ranks_ties_together(self):
+        first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        for index in range(3):
+            self._grant(first, index)
+        for index in range(2):
+            self._grant(second, index)
+            self._grant(third, index)
+        self.assertEqual(self._histogram(), {3: 1, 2: 2})
+
+        path = f"{API_PREFIX}/gamification/leaderboard"
+        with mock.patch("gamification.api.fetch_permissions", side_effect=_mock_fetch_permissions(set())):
+            response = self._get(path, user_id=str(third))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([item["rank"] for item in data["items"]], [1, 2, 2])
+        self.assertEqual(data["items"][0]["user_id"], str(first))
+        self.assertEqual(data["me"], {"user_id": str(third), "score": 2, "rank": 2})
+
+    def test_summary_hides_private_grants_from_other_users(self):
+        user = uuid.uuid4()
+        self._grant(user, 0)
+        self._grant(user, 2, visibility=GrantVisibility.PRIVATE)
+        path = f"{API_PREFIX}/gamification/users/{user}/summary"
+
+        with mock.patch("gamification.api.fetch_permissions", side_effect=_mock_fetch_permissions(set())):
+            own = self._get(f"{API_PREFIX}/gamification/users/me/summary", user_id=str(user)).json()
+            other = self._get(path, user_id=str(uuid.uuid4())).json()
+
+        self.assertEqual(own["total_grants"], 2)
+        self.assertEqual({c["category"]: c["count"] for c in own["categories"]}, {"event": 1, "sport": 1})
+        self.assertIsNotNone(own["latest_grant_id"])
+        self.assertEqual(other["total_grants"], 1)
+        self.assertEqual(other["categories"], [{"category": "event", "count": 1}])
+        self.assertIsNone(other["latest_grant_id"])
+        self.assertEqual((other["score"], other["rank"]), (1, 1))
+
+    def test_bulk_grant_dedupes_and_emits_one_outbox_event(self):
+        from .models import OutboxMessage
+
+        holder, fresh_a, fresh_b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        self._grant(holder, 0)
+        OutboxMessage.objects.all().delete()
+        path = f"{ACHIEVEMENTS_ROOT}/{self.achievements[0].id}/grants:bulk"
+        body = json.dumps(
+            {"recipient_ids": [str(holder), str(fresh_a), "nope", str(fresh_b), str(fresh_a)]}
+        ).encode("utf-8")
+        headers = _headers(
+            method="POST",
+            path=path,
+            body=body,
+            tenant_id=self.tenant_id,
+            tenant_slug="aef",
+            user_id=str(self.issuer_id),
+            master_flags={},
+            request_id=str(uuid.uuid4()),
+        )
+
+        with (
+            mock.patch(
+                "gamification.api.fetch_permissions",
+                side_effect=_mock_fetch_permissions({"gamification.achievements.assign"}),
+            ),
+            mock.patch("gamification.services.schedule_outbox_wakeup") as wakeup,
+        ):
+            response = self.client.post(path, data=body, content_type="application/json", **headers)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data["created"], data["existing"], data["invalid"]), (2, 1, 1))
+        self.assertEqual(
+            [(item["recipient_id"], item["status"]) for item in data["items"]],
+            [(str(holder), "existing"), (str(fresh_a), "created"), (str(fresh_b), "created"), ("nope", "invalid")],
+        )
+        self.assertEqual(wakeup.call_count, 1)
+        outbox = OutboxMessage.objects.get()
+        self.assertEqual(outbox.event_type, "gamification.grant.bulk_created")
+        self.assertEqual(
+            {entry["recipient_id"] for entry in outbox.payload["grants"]},
+            {str(fresh_a), str(fresh_b)},
+        )
+        self.assertEqual(self._histogram(), {1: 3})
+
+    def test_bulk_grant_moves_only_recipient_scores(self):
+        from .services import create_grants_bulk
+
+        veteran, newcomer, private_user, bystander = (uuid.uuid4() for _ in range(4))
+        self._grant(veteran, 1)
+        self._grant(bystander, 1)
+        self._grant(bystander, 2)
+        # Drift elsewhere in the histogram must survive: no tenant-wide rebuild.
+        LeaderboardScore.objects.create(tenant_id=self.tenant_id, score=7, users=1)
+
+        with mock.patch("gamification.services.schedule_outbox_wakeup"):
+            create_grants_bulk(
+                achievement=self.achievements[0],
+                recipient_ids=[veteran, newcomer],
+                issuer_id=self.issuer_id,
+                reason=None,
+                visibility=GrantVisibility.PUBLIC,
+            )
+            create_grants_bulk(
+                achievement=self.achievements[0],
+                recipient_ids=[private_user],
+                issuer_id=self.issuer_id,
+                reason=None,
+                visibility=GrantVisibility.PRIVATE,
+            )
+
+        self.assertEqual(self._histogram(), {1: 1, 2: 2, 7: 1})
+        stats = {row.user_id: row for row in UserAchievementStats.objects.filter(tenant_id=self.tenant_id)}
+        self.assertEqual((stats[veteran].total_grants, stats[veteran].public_grants), (2, 2))
+        self.assertEqual((stats[private_user].total_grants, stats[private_user].public_grants), (1, 0))
+        self.assertIsNotNone(stats[newcomer].latest_grant_id)
+        category = UserCategoryStats.objects.get(tenant_id=self.tenant_id, user_id=veteran, category=self.category)
+        self.assertEqual((category.total_grants, category.public_grants), (2, 2))
+
+    def test_rebuild_command_restores_drifted_counters(self):
+        user = uuid.uuid4()
+        self._grant(user, 0)
+        self._grant(user, 1)
+        UserAchievementStats.objects.filter(user_id=user).update(total_grants=9, public_grants=9)
+        LeaderboardScore.objects.filter(tenant_id=self.tenant_id).delete()
+
+        out = StringIO()
+        call_command("rebuild_achievement_stats", "--tenant-id", self.tenant_id, stdout=out)
+
+        self.assertEqual(json.loads(out.getvalue())["counts"]["users_with_grants"], {self.tenant_id: 1})
+        stats = UserAchievementStats.objects.get(tenant_id=self.tenant_id, user_id=user)
+        self.assertEqual((stats.total_grants, stats.public_grants), (2, 2))
+        self.assertEqual(self._histogram(), {2: 1})
+
+
 class GamificationDsarApiTests(TestCase):
     def setUp(self):
         self.client = Client()
@@ -457,6 +792,26 @@ class GamificationDsarApiTests(TestCase):
         self.assertEqual(len(data["grants_revoked"]), 1)
         self.assertGreaterEqual(len(data["outbox"]), 3)
 
+    def test_dsar_export_keeps_only_own_entries_of_bulk_grants(self):
+        from .dsar import export_user_data
+        from .services import create_grants_bulk
+
+        subject, other = uuid.uuid4(), uuid.uuid4()
+        create_grants_bulk(
+            achievement=self.achievement,
+            recipient_ids=[subject, other],
+            issuer_id=uuid.UUID(self.other_user_id),
+            reason=None,
+            visibility=GrantVisibility.PUBLIC,
+        )
+
+        data = export_user_data(tenant_id=uuid.UUID(self.tenant_id), user_id=subject)
+
+        bulk = [item for item in data["outbox"] if item["event_type"] == "gamification.grant.bulk_created"]
+        self.assertEqual(len(bulk), 1)
+        self.assertEqual([entry["recipient_id"] for entry in bulk[0]["payload"]["grants"]], [str(subject)])
+        self.assertNotIn(str(other), json.dumps(data))
+
     def test_dsar_erase_anonymizes_issuer_and_deletes_received_grants(self):
         path = f"/api/v1/gamification/internal/dsar/users/{self.user_id}/erase"
         response = self.client.post(
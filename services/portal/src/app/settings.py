@@ -83,6 +83,16 @@ BFF_INTERNAL_HMAC_SECRET = require_env(
     insecure_default="portal-internal-hmac-secret",
 )
 PORTAL_RETENTION_AUDIT_DAYS = int(os.getenv("PORTAL_RETENTION_AUDIT_DAYS", "365"))
+# Audit rows are inserted in the request by default. Long-lived workers may
+# opt in to queueing them for a background thread that bulk-inserts them;
+# never enable it on serverless containers, which freeze between requests.
+PORTAL_AUDIT_ASYNC = read_env_flag("PORTAL_AUDIT_ASYNC", False)
+PORTAL_AUDIT_BATCH_SIZE = int(os.getenv("PORTAL_AUDIT_BATCH_SIZE", "200"))
+PORTAL_AUDIT_FLUSH_SECONDS = float(os.getenv("PORTAL_AUDIT_FLUSH_SECONDS", "1"))
+PORTAL_AUDIT_QUEUE_MAX = int(os.getenv("PORTAL_AUDIT_QUEUE_MAX", "10000"))
+# In-process tenant resolution cache (ensure_tenant); TTL 0 disables it.
+PORTAL_TENANT_CACHE_TTL_SECONDS = float(os.getenv("PORTAL_TENANT_CACHE_TTL_SECONDS", "60"))
+PORTAL_TENANT_CACHE_SIZE = int(os.getenv("PORTAL_TENANT_CACHE_SIZE", "1024"))
 
 INSTALLED_APPS = [
     "django.contrib.auth",
@@ -25,18 +25,23 @@ from portal.models import (
 )
 from portal.schemas import (
     CommunityCreateIn,
+    CommunityMembershipItemOut,
     CommunityOut,
     MembershipCheckOut,
     MembershipUpsertIn,
     ModuleItem,
     ModulesOut,
+    MyMembershipsOut,
     PortalProfileOut,
+    PortalProfilePageOut,
     PortalProfileUpdateIn,
     PostCreateIn,
     PostOut,
     TeamCreateIn,
+    TeamMembershipItemOut,
     TeamOut,
 )
+from portal.search import index_profile, search_profiles
 from portal.security import bff_context_auth
 from portal.services import ensure_tenant
 
@@ -168,6 +173,8 @@ def portal_me_patch(request, payload: PortalProfileUpdateIn = REQUIRED_BODY):
         updates["bio"] = payload.bio
     PortalProfile.objects.filter(id=profile.id).update(**updates)
     profile.refresh_from_db()
+    if {"username", "display_name", "first_name", "last_name"} & updates.keys():
+        index_profile(profile)
 
     # Audit: log which fields were changed (no PII values)
     changed_fields = sorted(k for k in updates if k != "updated_at")
@@ -195,6 +202,35 @@ def portal_me_patch(request, payload: PortalProfileUpdateIn = REQUIRED_BODY):
     )
 
 
+@router.get(
+    "/portal/me/memberships",
+    response={200: MyMembershipsOut, 401: ErrorOut, 400: ErrorOut},
+    operation_id="portal_me_memberships_get",
+)
+def portal_me_memberships_get(request):
+    """
+    Все членства текущего пользователя в сообществах и командах тенанта.
+
+    Сервисы-потребители (events) строят по этому списку фильтр видимости
+    одним запросом вместо проверки членства на каждый скоуп.
+    """
+    ctx = _ctx(request)
+    tenant = ensure_tenant(ctx)
+    communities = [
+        CommunityMembershipItemOut(id=community_id, role_hint=role_hint)
+        for community_id, role_hint in CommunityMembership.objects.filter(
+            tenant=tenant, user_id=ctx.user_id
+        ).values_list("community_id", "role_hint")
+    ]
+    teams = [
+        TeamMembershipItemOut(id=team_id, community_id=community_id, role_hint=role_hint)
+        for team_id, community_id, role_hint in TeamMembership.objects.filter(
+            tenant=tenant, user_id=ctx.user_id
+        ).values_list("team_id", "team__community_id", "role_hint")
+    ]
+    return MyMembershipsOut(communities=communities, teams=teams)
+
+
 @router.get(
     "/portal/internal/dsar/users/{target_user_id}/export",
     response={200: dict, 401: ErrorOut, 403: ErrorOut, 400: ErrorOut},
@@ -219,6 +255,7 @@ def portal_dsar_export(request, target_user_id: str):
         target_id=audit_target_id,
         metadata={"subject_scope": subject_scope},
         request_id=ctx.request_id,
+        sync=True,
     )
     return payload
 
@@ -248,6 +285,7 @@ def portal_dsar_erase(request, target_user_id: str):
         target_id=audit_target_id,
         metadata={"subject_scope": subject_scope},
         request_id=ctx.request_id,
+        sync=True,
     )
     return payload
 
@@ -307,6 +345,37 @@ def portal_internal_profiles_list(
     ]
 
 
+def _profile_to_out(profile: PortalProfile) -> PortalProfileOut:
+    return PortalProfileOut(
+        tenant_id=profile.tenant_id,
+        user_id=profile.user_id,
+        username=profile.username or None,
+        display_name=profile.display_name or None,
+        first_name=profile.first_name,
+        last_name=profile.last_name,
+        bio=profile.bio,
+        created_at=profile.created_at,
+        updated_at=profile.updated_at,
+    )
+
+
+def _require_directory_access(ctx: PortalContext) -> None:
+    _check_any_permissions(
+        ctx,
+        ["portal.roles.read", "gamification.achievements.assign"],
+        scope_type="TENANT",
+        scope_id=str(ctx.tenant_id),
+    )
+
+
+def _profile_by_user_id(tenant, q: str) -> list[PortalProfile] | None:
+    try:
+        parsed_user_id = uuid.UUID(q)
+    except ValueError:
+        return None
+    return list(PortalProfile.objects.filter(tenant=tenant, user_id=parsed_user_id))
+
+
 @router.get(
     "/portal/profiles",
     response={200: list[PortalProfileOut], 401: ErrorOut, 400: ErrorOut, 403: ErrorOut},
@@ -319,48 +388,61 @@ def portal_profiles_list(
 ):
     ctx = _ctx(request)
     tenant = ensure_tenant(ctx)
-    _check_any_permissions(
-        ctx,
-        ["portal.roles.read", "gamification.achievements.assign"],
-        scope_type="TENANT",
-        scope_id=str(ctx.tenant_id),
-    )
+    _require_directory_access(ctx)
 
-    qs = PortalProfile.objects.filter(tenant=tenant)
+    q = (q or "").strip()
     if q:
-        q = q.strip()
-        if q:
-            filters = (
-                Q(first_name__icontains=q)
-                | Q(last_name__icontains=q)
-                | Q(username__icontains=q)
-                | Q(display_name__icontains=q)
-            )
-            try:
-                parsed_user_id = uuid.UUID(q)
-            except ValueError:
-                parsed_user_id = None
-            if parsed_user_id:
-                filters = filters | Q(user_id=parsed_user_id)
-            qs = qs.filter(filters)
-
-    profiles = qs.order_by("last_name", "first_name", "user_id")[:limit]
-    return [
-        PortalProfileOut(
-            tenant_id=profile.tenant_id,
-            user_id=profile.user_id,
-            username=profile.username or None,
-            display_name=profile.display_name or None,
-            first_name=profile.first_name,
-            last_name=profile.last_name,
-            bio=profile.bio,
-            created_at=profile.created_at,
-            updated_at=profile.updated_at,
+        by_user_id = _profile_by_user_id(tenant, q)
+        if by_user_id is not None:
+            return [_profile_to_out(profile) for profile in by_user_id]
+        page = search_profiles(tenant=tenant, q=q, limit=limit)
+        if page is not None:
+            return [_profile_to_out(profile) for profile in page.profiles]
+        # Single-character queries are not indexed: fall back to a bounded prefix match.
+        profiles = PortalProfile.objects.filter(tenant=tenant).filter(
+            Q(first_name__istartswith=q)
+            | Q(last_name__istartswith=q)
+            | Q(username__istartswith=q)
+            | Q(display_name__istartswith=q)
         )
-        for profile in profiles
+    else:
+        profiles = PortalProfile.objects.filter(tenant=tenant)
+
+    return [
+        _profile_to_out(profile)
+        for profile in profiles.order_by("last_name", "first_name", "user_id")[:limit]
     ]
 
 
+@router.get(
+    "/portal/profiles/search",
+    response={200: PortalProfilePageOut, 401: ErrorOut, 400: ErrorOut, 403: ErrorOut},
+    operation_id="portal_profiles_search",
+)
+def portal_profiles_search(
+    request,
+    q: str = Query(...),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = Query(None),
+):
+    """Ranked member-picker search with keyset pagination (``nextCursor``)."""
+    ctx = _ctx(request)
+    tenant = ensure_tenant(ctx)
+    _require_directory_access(ctx)
+
+    q = q.strip()
+    by_user_id = _profile_by_user_id(tenant, q)
+    if by_user_id is not None:
+        return PortalProfilePageOut(items=[_profile_to_out(profile) for profile in by_user_id])
+    page = search_profiles(tenant=tenant, q=q, limit=limit, cursor=cursor)
+    if page is None:
+        raise HttpError(400, error_payload("QUERY_TOO_SHORT", "Search query must have at least 2 characters"))
+    return PortalProfilePageOut(
+        items=[_profile_to_out(profile) for profile in page.profiles],
+        next_cursor=page.next_cursor,
+    )
+
+
 @router.get(
     "/portal/modules",
     response={200: ModulesOut, 401: ErrorOut, 400: ErrorOut},
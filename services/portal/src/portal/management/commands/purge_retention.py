@@ -5,8 +5,8 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
+from core.retention import PurgeTarget, RetentionPurge, add_purge_arguments
 from portal.audit import PortalAuditEvent
 
 
@@ -20,11 +20,19 @@ class Command(BaseCommand):
             default=int(getattr(settings, "PORTAL_RETENTION_AUDIT_DAYS", 365)),
             help="Retention window for portal audit events in days",
         )
+        add_purge_arguments(parser)
 
     def handle(self, *args, **options):
-        now = timezone.now()
+        purge = RetentionPurge.from_options(options)
+        now = purge.started_at
         audit_cutoff = now - timedelta(days=int(options["audit_days"]))
-        audit_deleted, _ = PortalAuditEvent.objects.filter(created_at__lt=audit_cutoff).delete()
+        audit_deleted = purge.run(
+            PurgeTarget(
+                "portal_audit",
+                PortalAuditEvent.objects.filter(created_at__lt=audit_cutoff),
+                order_field="created_at",
+            )
+        )
 
         payload = {
             "service": "portal",
@@ -35,5 +43,6 @@ class Command(BaseCommand):
             "counts": {
                 "portal_audit_deleted": audit_deleted,
             },
+            "purge": purge.finish(),
         }
         self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 09:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from portal.search import build_terms
+
+CHUNK_SIZE = 500
+
+
+def backfill_search_terms(apps, schema_editor):
+    PortalProfile = apps.get_model("portal", "PortalProfile")
+    ProfileSearchTerm = apps.get_model("portal", "ProfileSearchTerm")
+
+    last_id = 0
+    while True:
+        page = list(
+            PortalProfile.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "tenant_id", "first_name", "last_name", "username", "display_name")[:CHUNK_SIZE]
+        )
+        if not page:
+            return
+        last_id = page[-1].id
+        ProfileSearchTerm.objects.bulk_create(
+            [
+                ProfileSearchTerm(
+                    tenant_id=profile.tenant_id,
+                    profile_id=profile.id,
+                    term=term,
+                    exact=exact,
+                )
+                for profile in page
+                for term, exact in build_terms(
+                    profile.first_name,
+                    profile.last_name,
+                    profile.username,
+                    profile.display_name,
+                ).items()
+            ]
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("portal", "0005_portalauditevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileSearchTerm",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("term", models.CharField(max_length=32)),
+                ("exact", models.BooleanField(default=False)),
+                ("profile", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="search_terms", to="portal.portalprofile")),
+                ("tenant", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="profile_search_terms", to="portal.tenant")),
+            ],
+            options={
+                "db_table": "portal_profile_search_term",
+                "indexes": [models.Index(fields=["tenant", "term"], name="p_prof_search_tnt_term_idx")],
+                "constraints": [models.UniqueConstraint(fields=("profile", "term"), name="p_prof_search_term_uniq")],
+            },
+        ),
+        migrations.RunPython(backfill_search_terms, migrations.RunPython.noop),
+    ]
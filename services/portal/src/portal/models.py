@@ -46,6 +46,31 @@ class PortalProfile(models.Model):
         ]
 
 
+class ProfileSearchTerm(models.Model):
+    """
+    Inverted index over profile names for the member directory.
+
+    One row per normalized (case-folded, transliterated) name word and each
+    of its edge prefixes, so a prefix search is an equality lookup on
+    ``(tenant, term)``. Maintained by ``portal.search.index_profile``.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="profile_search_terms")
+    profile = models.ForeignKey(PortalProfile, on_delete=models.CASCADE, related_name="search_terms")
+    term = models.CharField(max_length=32)
+    exact = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = "portal_profile_search_term"
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "term"], name="p_prof_search_term_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["tenant", "term"], name="p_prof_search_tnt_term_idx"),
+        ]
+
+
 class Community(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     tenant = models.ForeignKey(Tenant, on_delete=models.CASCADE, related_name="communities")
@@ -176,6 +201,7 @@ __all__ = [
     "PortalAuditEvent",
     "PortalProfile",
     "Post",
+    "ProfileSearchTerm",
     "Team",
     "TeamMembership",
     "Tenant",
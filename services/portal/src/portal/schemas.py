@@ -17,6 +17,11 @@ class PortalProfileOut(CamelSchema):
     updated_at: datetime
 
 
+class PortalProfilePageOut(CamelSchema):
+    items: list[PortalProfileOut]
+    next_cursor: str | None = None
+
+
 class PortalProfileUpdateIn(CamelSchema):
     username: str | None = None
     display_name: str | None = None
@@ -51,6 +56,22 @@ class MembershipCheckOut(CamelSchema):
     role_hint: str | None = None
 
 
+class CommunityMembershipItemOut(CamelSchema):
+    id: uuid.UUID
+    role_hint: str | None = None
+
+
+class TeamMembershipItemOut(CamelSchema):
+    id: uuid.UUID
+    community_id: uuid.UUID
+    role_hint: str | None = None
+
+
+class MyMembershipsOut(CamelSchema):
+    communities: list[CommunityMembershipItemOut]
+    teams: list[TeamMembershipItemOut]
+
+
 class TeamOut(CamelSchema):
     id: uuid.UUID
     tenant_id: uuid.UUID
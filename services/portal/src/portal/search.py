@@ -0,0 +1,174 @@
+"""
+Member directory search.
+
+``ProfileSearchTerm`` stores every word of a profile's first/last name,
+username and display name, normalized (case-folded, diacritics stripped,
+Cyrillic transliterated to Latin) together with its edge prefixes. A query
+is normalized the same way, so ``иван``, ``Ivan`` and ``iva`` all hit the
+same ``(tenant, term)`` rows and a keystroke in the member picker is a
+handful of index lookups instead of a scan of the tenant's profiles.
+
+Ranking: every query term must match; profiles with more whole-word hits
+come first, then by last name, first name and user id. Pages are keyset
+cursors over that ordering.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import re
+import unicodedata
+from dataclasses import dataclass
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from portal.models import PortalProfile, ProfileSearchTerm, Tenant
+
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 32
+MAX_QUERY_TERMS = 6
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_CYRILLIC_TO_LATIN = str.maketrans(
+    {
+        "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "е": "e", "ж": "zh",
+        "з": "z", "и": "i", "й": "i", "к": "k", "л": "l", "м": "m", "н": "n",
+        "о": "o", "п": "p", "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f",
+        "х": "kh", "ц": "ts", "ч": "ch", "ш": "sh", "щ": "shch", "ъ": "", "ы": "y",
+        "ь": "", "э": "e", "ю": "yu", "я": "ya", "і": "i", "ї": "i", "є": "ye",
+        "ґ": "g",
+    }
+)  # fmt: skip
+
+
+def normalize(text: str) -> str:
+    """Casefold, strip diacritics and transliterate (``Ёлкин`` -> ``elkin``)."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return unicodedata.normalize("NFKC", stripped).casefold().translate(_CYRILLIC_TO_LATIN)
+
+
+def query_terms(q: str) -> list[str]:
+    terms: list[str] = []
+    for word in _WORD_RE.findall(normalize(q)):
+        term = word[:MAX_TERM_LENGTH]
+        if len(term) >= MIN_TERM_LENGTH and term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def build_terms(*names: str) -> dict[str, bool]:
+    """Map each indexed term to whether it is a whole word."""
+    terms: dict[str, bool] = {}
+    for name in names:
+        for word in _WORD_RE.findall(normalize(name)):
+            word = word[:MAX_TERM_LENGTH]
+            for size in range(MIN_TERM_LENGTH, len(word) + 1):
+                term = word[:size]
+                terms[term] = terms.get(term, False) or size == len(word)
+    return terms
+
+
+def index_profile(profile: PortalProfile) -> None:
+    """Replace the index rows for ``profile``; call after any name change."""
+    rows = [
+        ProfileSearchTerm(tenant_id=profile.tenant_id, profile_id=profile.id, term=term, exact=exact)
+        for term, exact in build_terms(
+            profile.first_name,
+            profile.last_name,
+            profile.username,
+            profile.display_name,
+        ).items()
+    ]
+    with transaction.atomic():
+        ProfileSearchTerm.objects.filter(profile_id=profile.id).delete()
+        ProfileSearchTerm.objects.bulk_create(rows)
+
+
+def _encode_cursor(exact_hits: int, last_name: str, first_name: str, user_id: str) -> str:
+    raw = json.dumps([exact_hits, last_name, first_name, user_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("utf-8")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, str, str, str] | None:
+    try:
+        exact_hits, last_name, first_name, user_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("utf-8")).decode("utf-8")
+        )
+        return int(exact_hits), str(last_name), str(first_name), str(user_id)
+    except (binascii.Error, UnicodeError, ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True)
+class ProfileSearchPage:
+    profiles: list[PortalProfile]
+    next_cursor: str | None
+
+
+def search_profiles(
+    *,
+    tenant: Tenant,
+    q: str,
+    limit: int,
+    cursor: str | None = None,
+) -> ProfileSearchPage | None:
+    """
+    One page of profiles matching every term of ``q``.
+
+    Returns ``None`` when ``q`` has no indexable term (shorter than
+    ``MIN_TERM_LENGTH``); callers decide how to treat such queries.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return None
+
+    matches = (
+        ProfileSearchTerm.objects.filter(tenant=tenant, term__in=terms)
+        .values("profile_id", "profile__last_name", "profile__first_name", "profile__user_id")
+        .annotate(
+            matched=Count("term", distinct=True),
+            exact_hits=Count("term", filter=Q(exact=True), distinct=True),
+        )
+        .filter(matched=len(terms))
+    )
+    position = _decode_cursor(cursor) if cursor else None
+    if position:
+        exact_hits, last_name, first_name, user_id = position
+        matches = matches.filter(
+            Q(exact_hits__lt=exact_hits)
+            | Q(exact_hits=exact_hits, profile__last_name__gt=last_name)
+            | Q(exact_hits=exact_hits, profile__last_name=last_name, profile__first_name__gt=first_name)
+            | Q(
+                exact_hits=exact_hits,
+                profile__last_name=last_name,
+                profile__first_name=first_name,
+                profile__user_id__gt=user_id,
+            )
+        )
+
+    rows = list(
+        matches.order_by("-exact_hits", "profile__last_name", "profile__first_name", "profile__user_id")[
+            : limit + 1
+        ]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(
+            last["exact_hits"],
+            last["profile__last_name"],
+            last["profile__first_name"],
+            str(last["profile__user_id"]),
+        )
+
+    by_id = PortalProfile.objects.in_bulk([row["profile_id"] for row in rows])
+    return ProfileSearchPage(
+        profiles=[by_id[row["profile_id"]] for row in rows if row["profile_id"] in by_id],
+        next_cursor=next_cursor,
+    )
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+import copy
+import threading
+import time
+from collections import OrderedDict
+from uuid import UUID
+
+from django.conf import settings
 from django.db import IntegrityError, transaction
 from django.utils import timezone
 
@@ -7,6 +14,74 @@ from portal.context import PortalContext
 from portal.models import Tenant
 
 
+class TenantCache:
+    """
+    Bounded in-process LRU of resolved tenants keyed by ``(tenant_id, slug)``.
+
+    Only tenants already in sync with the context slug are stored, so a hit
+    skips both the lookup and the sync write path. A slug change in the
+    context is a different key (a miss), and the sync that follows drops the
+    stale entries of that tenant id.
+    """
+
+    def __init__(self, *, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max(0, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Tenant]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, tenant_id: UUID | str, slug: str) -> Tenant | None:
+        if not self.enabled:
+            return None
+        key = (str(tenant_id), slug)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, tenant = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        # Callers may mutate the instance; never hand out the shared one.
+        return copy.copy(tenant)
+
+    def put(self, tenant: Tenant, *, tenant_id: UUID | str, slug: str) -> None:
+        if not self.enabled:
+            return
+        key = (str(tenant_id), slug)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.copy(tenant))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tenant_id: UUID | str) -> None:
+        tenant_id = str(tenant_id)
+        with self._lock:
+            stale = [
+                key
+                for key, (_, tenant) in self._entries.items()
+                if tenant_id in (key[0], str(tenant.id))
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+tenant_cache = TenantCache(
+    max_size=int(getattr(settings, "PORTAL_TENANT_CACHE_SIZE", 1024)),
+    ttl_seconds=float(getattr(settings, "PORTAL_TENANT_CACHE_TTL_SECONDS", 60)),
+)
+
+
 def _sync_tenant_fields(tenant: Tenant, tenant_slug: str) -> Tenant:
     updates: dict[str, str] = {}
     if tenant.name != tenant_slug:
@@ -21,22 +96,35 @@ def _sync_tenant_fields(tenant: Tenant, tenant_slug: str) -> Tenant:
         updates["updated_at"] = timezone.now()
         Tenant.objects.filter(id=tenant.id).update(**updates)
         tenant.refresh_from_db()
+        tenant_cache.invalidate(tenant.id)
+    return tenant
+
+
+def _remember(ctx: PortalContext, tenant: Tenant) -> Tenant:
+    # A tenant whose slug is taken by another row stays out of sync; keep
+    # retrying the sync for it rather than caching the mismatch.
+    if tenant.slug == ctx.tenant_slug and tenant.name == ctx.tenant_slug:
+        tenant_cache.put(tenant, tenant_id=ctx.tenant_id, slug=ctx.tenant_slug)
     return tenant
 
 
 def ensure_tenant(ctx: PortalContext) -> Tenant:
+    cached = tenant_cache.get(ctx.tenant_id, ctx.tenant_slug)
+    if cached is not None:
+        return cached
+
     by_id = Tenant.objects.filter(id=ctx.tenant_id).first()
     if by_id:
-        return _sync_tenant_fields(by_id, ctx.tenant_slug)
+        return _remember(ctx, _sync_tenant_fields(by_id, ctx.tenant_slug))
 
     by_slug = Tenant.objects.filter(slug=ctx.tenant_slug).first()
     if by_slug:
-        return _sync_tenant_fields(by_slug, ctx.tenant_slug)
+        return _remember(ctx, _sync_tenant_fields(by_slug, ctx.tenant_slug))
 
     now = timezone.now()
     try:
         with transaction.atomic():
-            return Tenant.objects.create(
+            tenant = Tenant.objects.create(
                 id=ctx.tenant_id,
                 slug=ctx.tenant_slug,
                 name=ctx.tenant_slug,
@@ -50,5 +138,9 @@ def ensure_tenant(ctx: PortalContext) -> Tenant:
             or Tenant.objects.filter(slug=ctx.tenant_slug).first()
         )
         if existing:
-            return _sync_tenant_fields(existing, ctx.tenant_slug)
+            return _remember(ctx, _sync_tenant_fields(existing, ctx.tenant_slug))
         raise
+    # Cache only after commit so a rolled-back outer transaction cannot leave
+    # a tenant that does not exist in the cache.
+    transaction.on_commit(lambda: _remember(ctx, tenant))
+    return tenant
@@ -31,7 +31,8 @@ from portal.models import (
     TeamMembership,
     Tenant,
 )
-from portal.services import ensure_tenant
+from portal.search import index_profile
+from portal.services import ensure_tenant, tenant_cache
 
 
 def _host_headers(
@@ -66,6 +67,19 @@ def _host_headers(
 
 
 class PortalEnsureTenantTests(TestCase):
+    def setUp(self):
+        tenant_cache.clear()
+        self.addCleanup(tenant_cache.clear)
+
+    def _ctx(self, tenant_id, slug: str) -> PortalContext:
+        return PortalContext(
+            request_id="rid",
+            tenant_id=tenant_id,
+            tenant_slug=slug,
+            user_id=uuid.uuid4(),
+            master_flags=frozenset(),
+        )
+
     def test_reuses_existing_tenant_by_slug_when_context_tenant_id_differs(self):
         existing = Tenant.objects.create(slug="aef", name="AEF")
         ctx = PortalContext(
@@ -99,6 +113,43 @@ class PortalEnsureTenantTests(TestCase):
         self.assertEqual(tenant.name, "new-slug")
 
 
+    def test_repeat_resolution_is_served_from_cache(self):
+        tenant_id = uuid.uuid4()
+        Tenant.objects.create(id=tenant_id, slug="aef", name="aef")
+        ctx = self._ctx(tenant_id, "aef")
+
+        first = ensure_tenant(ctx)
+        with self.assertNumQueries(0):
+            second = ensure_tenant(ctx)
+
+        self.assertEqual(second.id, first.id)
+        self.assertIsNot(second, first)
+
+    def test_slug_change_bypasses_and_invalidates_cached_entry(self):
+        tenant_id = uuid.uuid4()
+        Tenant.objects.create(id=tenant_id, slug="old-slug", name="old-slug")
+        ensure_tenant(self._ctx(tenant_id, "old-slug"))
+
+        renamed = ensure_tenant(self._ctx(tenant_id, "new-slug"))
+
+        self.assertEqual(renamed.slug, "new-slug")
+        self.assertIsNone(tenant_cache.get(tenant_id, "old-slug"))
+        self.assertEqual(tenant_cache.get(tenant_id, "new-slug").slug, "new-slug")
+
+    def test_entries_expire_and_size_is_bounded(self):
+        tenant_id = uuid.uuid4()
+        Tenant.objects.create(id=tenant_id, slug="aef", name="aef")
+        ensure_tenant(self._ctx(tenant_id, "aef"))
+
+        with mock.patch("portal.services.time.monotonic", return_value=time.monotonic() + 3600):
+            self.assertIsNone(tenant_cache.get(tenant_id, "aef"))
+
+        tenant = Tenant.objects.get(id=tenant_id)
+        for _ in range(tenant_cache.max_size + 5):
+            tenant_cache.put(tenant, tenant_id=uuid.uuid4(), slug="aef")
+        self.assertEqual(len(tenant_cache._entries), tenant_cache.max_size)
+
+
 @mock.patch.dict("os.environ", {}, clear=False)
 class PortalTenantIsolationTests(TestCase):
     @classmethod
@@ -336,6 +387,59 @@ class PortalMembershipApiTests(TestCase):
             )
         self.assertEqual(resp.status_code, 404)
 
+    def test_my_memberships_lists_communities_and_teams(self):
+        other_community = Community.objects.create(
+            tenant=self.tenant,
+            name="Other",
+            description="",
+            created_by=self.user_id,
+        )
+        CommunityMembership.objects.create(
+            tenant=self.tenant,
+            community=self.community,
+            user_id=self.user_id,
+            role_hint="member",
+        )
+        TeamMembership.objects.create(
+            tenant=self.tenant,
+            team=self.team,
+            user_id=self.user_id,
+            role_hint="player",
+        )
+        CommunityMembership.objects.create(
+            tenant=self.tenant,
+            community=other_community,
+            user_id=uuid.uuid4(),
+        )
+
+        resp = self.client.get(
+            "/api/v1/portal/me/memberships",
+            **_host_headers(
+                path="/api/v1/portal/me/memberships",
+                tenant_id=self.tenant_id,
+                slug="aef",
+                user_id=self.user_id,
+            ),
+        )
+
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual(
+            data["communities"],
+            [{"id": str(self.community.id), "role_hint": "member"}],
+        )
+        self.assertEqual(
+            data["teams"],
+            [
+                {
+                    "id": str(self.team.id),
+                    "community_id": str(self.community.id),
+                    "role_hint": "player",
+                }
+            ],
+        )
+
+
 
 @mock.patch.dict("os.environ", {}, clear=False)
 class PortalCreatorProvisioningTests(TestCase):
@@ -450,20 +554,20 @@ class PortalProfilesApiTests(TestCase):
 
         self.alice_id = uuid.uuid4()
         self.bob_id = uuid.uuid4()
-        PortalProfile.objects.create(
-            tenant=self.tenant,
-            user_id=self.alice_id,
-            first_name="Alice",
-            last_name="Wonder",
-            bio=None,
-        )
-        PortalProfile.objects.create(
-            tenant=self.tenant,
-            user_id=self.bob_id,
-            first_name="Bob",
-            last_name="Builder",
-            bio=None,
-        )
+        self._profile(self.alice_id, first_name="Alice", last_name="Wonder")
+        self._profile(self.bob_id, first_name="Bob", last_name="Builder")
+
+    def _profile(self, user_id, **fields) -> PortalProfile:
+        profile = PortalProfile.objects.create(tenant=self.tenant, user_id=user_id, bio=None, **fields)
+        index_profile(profile)
+        return profile
+
+    def _get(self, path: str):
+        with mock.patch("portal.api.AccessService.check"):
+            return self.client.get(
+                path,
+                **_host_headers(path=path, tenant_id=self.tenant_id, slug="aef", user_id=self.user_id),
+            )
 
     def test_profiles_list_returns_all(self):
         with mock.patch("portal.api.AccessService.check") as mock_check:
@@ -499,6 +603,7 @@ class PortalProfilesApiTests(TestCase):
 
     def test_profiles_list_filters_by_username(self):
         PortalProfile.objects.filter(user_id=self.alice_id).update(username="m4tveevm")
+        index_profile(PortalProfile.objects.get(user_id=self.alice_id))
         with mock.patch("portal.api.AccessService.check"):
             resp = self.client.get(
                 "/api/v1/portal/profiles?q=m4tveevm",
@@ -514,6 +619,55 @@ class PortalProfilesApiTests(TestCase):
         self.assertEqual(len(data), 1)
         self.assertEqual(data[0]["user_id"], str(self.alice_id))
 
+    def test_profiles_search_matches_across_scripts_and_ranks_whole_words_first(self):
+        ivan = self._profile(uuid.uuid4(), first_name="Иван", last_name="Петров")
+        ivanka = self._profile(uuid.uuid4(), first_name="Ivanka", last_name="Adams")
+
+        latin = self._get("/api/v1/portal/profiles/search?q=ivan").json()
+        cyrillic = self._get("/api/v1/portal/profiles/search?q=%D0%B8%D0%B2%D0%B0").json()
+
+        self.assertEqual([item["user_id"] for item in latin["items"]], [str(ivan.user_id), str(ivanka.user_id)])
+        self.assertEqual(
+            {item["user_id"] for item in cyrillic["items"]},
+            {str(ivan.user_id), str(ivanka.user_id)},
+        )
+
+    def test_profiles_search_pages_with_keyset_cursor(self):
+        for index in range(5):
+            self._profile(uuid.uuid4(), first_name="Sam", last_name=f"Member{index}")
+
+        seen: list[str] = []
+        path = "/api/v1/portal/profiles/search?q=sam&limit=2"
+        while path:
+            data = self._get(path).json()
+            seen.extend(item["last_name"] for item in data["items"])
+            cursor = data["next_cursor"]
+            path = f"/api/v1/portal/profiles/search?q=sam&limit=2&cursor={cursor}" if cursor else ""
+
+        self.assertEqual(seen, [f"Member{index}" for index in range(5)])
+
+    def test_profile_patch_reindexes_names(self):
+        body = json.dumps({"lastName": "Liddell"}).encode("utf-8")
+        with mock.patch("portal.api.AccessService.check"):
+            resp = self.client.patch(
+                "/api/v1/portal/me",
+                data=body,
+                content_type="application/json",
+                **_host_headers(
+                    path="/api/v1/portal/me",
+                    tenant_id=self.tenant_id,
+                    slug="aef",
+                    user_id=self.alice_id,
+                    method="PATCH",
+                    body=body,
+                ),
+            )
+        self.assertEqual(resp.status_code, 200)
+
+        self.assertEqual(self._get("/api/v1/portal/profiles/search?q=wonder").json()["items"], [])
+        found = self._get("/api/v1/portal/profiles/search?q=lidd").json()["items"]
+        self.assertEqual([item["user_id"] for item in found], [str(self.alice_id)])
+
     def test_internal_profiles_list_returns_requested_profiles_without_rbac_check(self):
         with mock.patch("portal.api.AccessService.check") as mock_check:
             path = f"/api/v1/portal/internal/profiles?user_ids={self.bob_id},{self.alice_id}"
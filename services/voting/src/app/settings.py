@@ -183,6 +183,12 @@ VOTING_RETENTION_PUBLISHED_OUTBOX_DAYS = int(
     os.getenv("VOTING_RETENTION_PUBLISHED_OUTBOX_DAYS", "30")
 )
 
+# Metrics: label names allowed on Prometheus series (others collapse to "all")
+# and the per-tenant size of the on-demand top-K poll sketch.
+VOTING_METRICS_LABELS = os.getenv("VOTING_METRICS_LABELS", "tenant")
+VOTING_METRICS_TOP_POLLS_CAPACITY = int(os.getenv("VOTING_METRICS_TOP_POLLS_CAPACITY", "64"))
+VOTING_COMPAT_CATALOG_TTL_SECONDS = int(os.getenv("VOTING_COMPAT_CATALOG_TTL_SECONDS", "300"))
+
 # Rate Limiting Configuration
 RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True") == "True"
 RATE_LIMIT_VOTE_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_VOTE_WINDOW_SECONDS", "60"))
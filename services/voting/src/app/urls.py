@@ -6,6 +6,7 @@ from ninja.errors import HttpError
 from core.health import detailed_health_check, health_check, readiness_check
 from nominations.api import router as nominations_router
 from tenant_voting.api import router as tenant_voting_router
+from tenant_voting.metrics import metrics_view
 from votings.api import router as votings_router
 
 
@@ -51,4 +52,5 @@ urlpatterns = [
     path("health", health_check),
     path("health/ready", readiness_check),
     path("health/detailed", detailed_health_check),
+    path("metrics", metrics_view),
 ]
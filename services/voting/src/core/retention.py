@@ -0,0 +1,320 @@
+"""Chunked, resumable retention purges.
+
+``QuerySet.delete()`` on a retention window loads every row into the delete
+collector and runs as one long transaction. ``RetentionPurge`` instead walks
+the matching rows in keyset order (``order_field`` then primary key), reads
+only the keys of one chunk at a time and deletes that chunk in its own short
+statement: a raw ``DELETE ... WHERE pk IN (...)`` when the model has no
+cascades or delete signals, Django's collector limited to the chunk otherwise.
+
+Chunk sizes adapt to ``chunk_seconds``, ``sleep_seconds`` throttles between
+chunks and ``max_runtime_seconds`` stops the run early. With ``--checkpoint``
+the keyset position and the run's start time are written to a
+``RetentionCheckpoint`` row after every chunk, so an interrupted or
+time-boxed run resumes against the same cutoffs, also from another container.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.db import connections, transaction
+from django.db.models import Model, Q, QuerySet
+from django.db.models.deletion import Collector
+from django.utils import timezone
+
+from .models import RetentionCheckpoint
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_MAX_CHUNK_SIZE = 10000
+MIN_CHUNK_SIZE = 50
+DEFAULT_CHUNK_SECONDS = 0.5
+
+
+def add_purge_arguments(parser) -> None:
+    """Register the options shared by every ``purge_retention`` command."""
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows deleted per statement to start with (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--max-chunk-size",
+        type=int,
+        default=DEFAULT_MAX_CHUNK_SIZE,
+        help=f"Upper bound for adaptive chunk growth (default: {DEFAULT_MAX_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=DEFAULT_CHUNK_SECONDS,
+        help="Time budget per chunk; slower chunks shrink the next one (default: 0.5)",
+    )
+    parser.add_argument(
+        "--sleep-seconds",
+        type=float,
+        default=0.0,
+        help="Pause between chunks to leave room for live traffic (default: 0)",
+    )
+    parser.add_argument(
+        "--max-runtime-seconds",
+        type=float,
+        default=0.0,
+        help="Stop after this many seconds; resume later with --checkpoint (default: no limit)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        default=None,
+        help="Name of a checkpoint stored in the database; an unfinished one is resumed",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report how many rows would be deleted without changing data",
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class PurgeTarget:
+    """Rows of one table to purge.
+
+    ``order_field`` should be the indexed, non-null column the retention
+    predicate ranges over, so chunks are read along that index.
+    """
+
+    name: str
+    queryset: QuerySet
+    order_field: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PurgeSettings:
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+    max_chunk_size: int = DEFAULT_MAX_CHUNK_SIZE
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS
+    sleep_seconds: float = 0.0
+    max_runtime_seconds: float = 0.0
+    dry_run: bool = False
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> PurgeSettings:
+        chunk_size = max(1, int(options.get("chunk_size") or DEFAULT_CHUNK_SIZE))
+        return cls(
+            chunk_size=chunk_size,
+            max_chunk_size=max(chunk_size, int(options.get("max_chunk_size") or DEFAULT_MAX_CHUNK_SIZE)),
+            chunk_seconds=max(0.0, float(options.get("chunk_seconds") or DEFAULT_CHUNK_SECONDS)),
+            sleep_seconds=max(0.0, float(options.get("sleep_seconds") or 0.0)),
+            max_runtime_seconds=max(0.0, float(options.get("max_runtime_seconds") or 0.0)),
+            dry_run=bool(options.get("dry_run")),
+        )
+
+
+class PurgeCheckpoint:
+    """Progress of a purge run, saved to its ``RetentionCheckpoint`` row after every chunk."""
+
+    def __init__(self, name: str | None) -> None:
+        self.name = name
+        self.started_at: datetime | None = None
+        self.targets: dict[str, dict[str, Any]] = {}
+        row = RetentionCheckpoint.objects.filter(name=name).first() if name else None
+        if row is not None:
+            self.started_at = row.started_at
+            self.targets = dict(row.targets or {})
+
+    @property
+    def resumed(self) -> bool:
+        return self.started_at is not None
+
+    def state(self, name: str) -> dict[str, Any]:
+        return self.targets.setdefault(name, {"deleted": 0, "chunks": 0, "last_key": None, "completed": False})
+
+    def save(self, started_at: datetime) -> None:
+        if not self.name:
+            return
+        # Update first, insert on the first chunk: no select_for_update on YDB.
+        fields = {"started_at": started_at, "targets": self.targets, "updated_at": timezone.now()}
+        if not RetentionCheckpoint.objects.filter(name=self.name).update(**fields):
+            RetentionCheckpoint.objects.create(name=self.name, **fields)
+
+    def discard(self) -> None:
+        if self.name:
+            RetentionCheckpoint.objects.filter(name=self.name).delete()
+
+
+@dataclass(slots=True)
+class PurgeProgress:
+    name: str
+    deleted: int = 0
+    chunks: int = 0
+    seconds: float = 0.0
+    chunk_size: int = 0
+    completed: bool = False
+    fast_path: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "deleted": self.deleted,
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.deleted / self.seconds, 1) if self.seconds > 0 else None,
+            "chunk_size": self.chunk_size,
+            "completed": self.completed,
+            "raw_delete": self.fast_path,
+        }
+
+
+def _encode_key(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, int | str) or value is None:
+        return value
+    return str(value)
+
+
+def _decode_key(model: type[Model], order_field: str | None, key: list[Any]) -> tuple[Any, ...]:
+    fields = [model._meta.pk] if order_field is None else [model._meta.get_field(order_field), model._meta.pk]
+    return tuple(item.to_python(value) for item, value in zip(fields, key, strict=True))
+
+
+def _after(queryset: QuerySet, order_field: str | None, key: tuple[Any, ...] | None) -> QuerySet:
+    if key is None:
+        return queryset
+    if order_field is None:
+        return queryset.filter(pk__gt=key[0])
+    ordered, pk = key
+    return queryset.filter(Q(**{f"{order_field}__gt": ordered}) | Q(**{order_field: ordered, "pk__gt": pk}))
+
+
+def _raw_delete(model: type[Model], pks: list[Any], using: str) -> int:
+    connection = connections[using]
+    pk = model._meta.pk
+    quote = connection.ops.quote_name
+    values = [pk.get_db_prep_value(value, connection) for value in pks]
+    placeholders = ", ".join(["%s"] * len(values))
+    sql = f"DELETE FROM {quote(model._meta.db_table)} WHERE {quote(pk.column)} IN ({placeholders})"
+    with connection.cursor() as cursor:
+        cursor.execute(sql, values)
+        return max(cursor.rowcount, 0)
+
+
+def _collector_delete(model: type[Model], pks: list[Any], using: str) -> int:
+    with transaction.atomic(using=using):
+        _, per_model = model._base_manager.using(using).filter(pk__in=pks).delete()
+    return per_model.get(model._meta.label, 0)
+
+
+class RetentionPurge:
+    """Runs ``PurgeTarget``s one after another under shared limits."""
+
+    def __init__(self, settings: PurgeSettings, checkpoint: PurgeCheckpoint | None = None) -> None:
+        self.settings = settings
+        self.checkpoint = checkpoint or PurgeCheckpoint(None)
+        # A resumed run keeps its original clock so the cutoffs do not move.
+        self.started_at = self.checkpoint.started_at or timezone.now()
+        self.progress: dict[str, PurgeProgress] = {}
+        self._deadline = (
+            time.monotonic() + settings.max_runtime_seconds if settings.max_runtime_seconds > 0 else None
+        )
+
+    @classmethod
+    def from_options(cls, options: dict[str, Any]) -> RetentionPurge:
+        settings = PurgeSettings.from_options(options)
+        # A dry run never writes a checkpoint, but may preview a resumed one.
+        return cls(settings, PurgeCheckpoint(options.get("checkpoint")))
+
+    @property
+    def completed(self) -> bool:
+        return all(item.completed for item in self.progress.values())
+
+    def _out_of_time(self) -> bool:
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def run(self, target: PurgeTarget) -> int:
+        """Purge ``target`` and return the rows deleted (or, on a dry run, matched)."""
+        model = target.queryset.model
+        using = target.queryset.db
+        state = self.checkpoint.state(target.name)
+        key = _decode_key(model, target.order_field, state["last_key"]) if state["last_key"] is not None else None
+        progress = PurgeProgress(
+            name=target.name,
+            deleted=int(state["deleted"]),
+            chunks=int(state["chunks"]),
+            chunk_size=self.settings.chunk_size,
+            completed=bool(state["completed"]),
+            fast_path=Collector(using=using).can_fast_delete(model),
+        )
+        self.progress[target.name] = progress
+        if progress.completed:
+            return progress.deleted
+
+        if self.settings.dry_run:
+            progress.deleted = _after(target.queryset, target.order_field, key).count()
+            progress.completed = True
+            return progress.deleted
+
+        fields = ("pk",) if target.order_field is None else (target.order_field, "pk")
+        delete = _raw_delete if progress.fast_path else _collector_delete
+        size = self.settings.chunk_size
+        while not self._out_of_time():
+            started = time.monotonic()
+            rows = list(
+                _after(target.queryset, target.order_field, key).order_by(*fields).values_list(*fields)[:size]
+            )
+            if not rows:
+                progress.completed = True
+                break
+            deleted = delete(model, [row[-1] for row in rows], using)
+            elapsed = time.monotonic() - started
+            key = tuple(rows[-1])
+
+            progress.deleted += deleted
+            progress.chunks += 1
+            progress.seconds += elapsed
+            progress.chunk_size = size
+            state.update(
+                deleted=progress.deleted,
+                chunks=progress.chunks,
+                last_key=[_encode_key(value) for value in key],
+            )
+            self.checkpoint.save(self.started_at)
+            logger.info(
+                "retention purge: %s chunk=%d size=%d deleted=%d total=%d in %.3fs",
+                target.name,
+                progress.chunks,
+                len(rows),
+                deleted,
+                progress.deleted,
+                elapsed,
+                extra={"purge_target": target.name, "purge_deleted": progress.deleted},
+            )
+
+            if len(rows) < size:
+                progress.completed = True
+                break
+            if elapsed > self.settings.chunk_seconds:
+                size = max(MIN_CHUNK_SIZE, min(size, int(size * self.settings.chunk_seconds / elapsed)))
+            elif elapsed < self.settings.chunk_seconds / 4:
+                size = min(self.settings.max_chunk_size, size * 2)
+            if self.settings.sleep_seconds:
+                time.sleep(self.settings.sleep_seconds)
+
+        state["completed"] = progress.completed
+        self.checkpoint.save(self.started_at)
+        return progress.deleted
+
+    def finish(self) -> dict[str, Any]:
+        """Drop a finished checkpoint and return the run's progress report."""
+        if self.completed and not self.settings.dry_run:
+            self.checkpoint.discard()
+        return {
+            "dry_run": self.settings.dry_run,
+            "resumed": self.checkpoint.resumed,
+            "completed": self.completed,
+            "targets": {name: item.as_dict() for name, item in self.progress.items()},
+        }
@@ -3,6 +3,8 @@ from __future__ import annotations
 import json
 import logging
 import os
+import socket
+import time
 from functools import lru_cache
 from typing import Any
 
@@ -14,6 +16,14 @@ logger = logging.getLogger(__name__)
 
 YMQ_ENDPOINT_URL = "https://message-queue.api.cloud.yandex.net"
 DEFAULT_REGION = "ru-central1"
+# SQS caps a single long-poll at 20 seconds.
+MAX_RECEIVE_WAIT_SECONDS = 20
+LOCAL_WAKEUP_SOCKET_ENV = "OUTBOX_WAKEUP_SOCKET"
+# The outbox queue (YMQ_OUTBOX_QUEUE) feeds the serverless trigger that runs
+# the relay task; long-running relays listen on a queue of their own so they
+# never consume the trigger's messages.
+TRIGGER_QUEUE_ENV = "YMQ_OUTBOX_QUEUE"
+LISTENER_QUEUE_ENV = "YMQ_OUTBOX_WAKEUP_QUEUE"
 
 
 @lru_cache(maxsize=16)
@@ -36,19 +46,45 @@ def _resolve_queue_url(queue_ref: str, access_key: str, secret_key: str, region:
     return client.get_queue_url(QueueName=queue_ref)["QueueUrl"]
 
 
+def _ymq_credentials(queue_env: str) -> tuple[str, str, str, str] | None:
+    queue_ref = os.getenv(queue_env, "").strip()
+    access_key = os.getenv("S3_ACCESS_KEY_ID", "").strip()
+    secret_key = os.getenv("S3_SECRET_ACCESS_KEY", "").strip()
+    region = os.getenv("S3_REGION", DEFAULT_REGION).strip() or DEFAULT_REGION
+    if not queue_ref or not access_key or not secret_key:
+        return None
+    return queue_ref, access_key, secret_key, region
+
+
+def _notify_local_socket(message_body: str) -> None:
+    path = os.getenv(LOCAL_WAKEUP_SOCKET_ENV, "").strip()
+    if not path:
+        return
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.setblocking(False)
+            sock.sendto(message_body.encode("utf-8")[:1024], path)
+    except OSError:
+        # Nobody is listening (relay not running) or the buffer is full:
+        # the relay's safety-net poll picks the rows up.
+        logger.debug("Local outbox wake-up not delivered to %s", path)
+
+
 def schedule_outbox_wakeup(
     *,
     service_name: str,
     event_type: str,
     tenant_id: str,
     payload: dict[str, Any],
-    queue_env: str = "YMQ_OUTBOX_QUEUE",
+    queue_env: str = TRIGGER_QUEUE_ENV,
 ) -> None:
-    queue_ref = os.getenv(queue_env, "").strip()
-    access_key = os.getenv("S3_ACCESS_KEY_ID", "").strip()
-    secret_key = os.getenv("S3_SECRET_ACCESS_KEY", "").strip()
-    region = os.getenv("S3_REGION", DEFAULT_REGION).strip() or DEFAULT_REGION
-    if not queue_ref or not access_key or not secret_key:
+    targets = [
+        credentials
+        for credentials in (_ymq_credentials(queue_env), _ymq_credentials(LISTENER_QUEUE_ENV))
+        if credentials is not None
+    ]
+    local_socket = os.getenv(LOCAL_WAKEUP_SOCKET_ENV, "").strip()
+    if not targets and not local_socket:
         logger.debug(
             "Skipping YMQ wake-up for %s: queue or credentials are missing",
             service_name,
@@ -67,19 +103,147 @@ def schedule_outbox_wakeup(
     )
 
     def _publish() -> None:
+        _notify_local_socket(message_body)
+        for queue_ref, access_key, secret_key, region in targets:
+            try:
+                client = _build_client(access_key, secret_key, region)
+                queue_url = _resolve_queue_url(queue_ref, access_key, secret_key, region)
+                client.send_message(QueueUrl=queue_url, MessageBody=message_body)
+            except Exception:
+                logger.warning(
+                    "Failed to publish YMQ wake-up",
+                    extra={
+                        "service": service_name,
+                        "event_type": event_type,
+                        "tenant_id": tenant_id,
+                        "queue": queue_ref,
+                    },
+                    exc_info=True,
+                )
+
+    transaction.on_commit(_publish)
+
+
+class OutboxWakeupListener:
+    """
+    Blocks an outbox relay until a wake-up arrives or ``timeout`` elapses.
+
+    Uses a YMQ long-poll on ``YMQ_OUTBOX_WAKEUP_QUEUE`` when it is configured,
+    otherwise a UNIX datagram socket at ``OUTBOX_WAKEUP_SOCKET`` (local runs),
+    otherwise plain sleep. Wake-ups carry no data the relay depends on: they
+    are deleted on receipt and the relay re-reads the outbox table. The
+    trigger's ``YMQ_OUTBOX_QUEUE`` is never read here, even when the two
+    settings name the same queue.
+    """
+
+    def __init__(self, *, queue_env: str = LISTENER_QUEUE_ENV) -> None:
+        self._credentials = _ymq_credentials(queue_env)
+        trigger = _ymq_credentials(TRIGGER_QUEUE_ENV)
+        if self._credentials is not None and trigger is not None and trigger[0] == self._credentials[0]:
+            logger.warning(
+                "%s names the trigger's outbox queue; not listening on it",
+                queue_env,
+            )
+            self._credentials = None
+        self._socket: socket.socket | None = None
+        self._socket_path = ""
+        if self._credentials is None:
+            self._socket_path = os.getenv(LOCAL_WAKEUP_SOCKET_ENV, "").strip()
+            if self._socket_path:
+                self._bind_socket()
+
+    @property
+    def mode(self) -> str:
+        if self._credentials is not None:
+            return "ymq"
+        if self._socket is not None:
+            return "socket"
+        return "sleep"
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "sleep"
+
+    def _bind_socket(self) -> None:
         try:
-            client = _build_client(access_key, secret_key, region)
-            queue_url = _resolve_queue_url(queue_ref, access_key, secret_key, region)
-            client.send_message(QueueUrl=queue_url, MessageBody=message_body)
-        except Exception:
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.bind(self._socket_path)
+        except OSError:
             logger.warning(
-                "Failed to publish YMQ wake-up",
-                extra={
-                    "service": service_name,
-                    "event_type": event_type,
-                    "tenant_id": tenant_id,
-                },
+                "Cannot bind outbox wake-up socket, falling back to polling",
+                extra={"path": self._socket_path},
                 exc_info=True,
             )
+            return
+        self._socket = sock
 
-    transaction.on_commit(_publish)
+    def wait(self, timeout: float) -> bool:
+        """Return True when woken up, False when the timeout elapsed."""
+        timeout = max(0.0, float(timeout))
+        if self._credentials is not None:
+            return self._wait_ymq(timeout)
+        if self._socket is not None:
+            return self._wait_socket(timeout)
+        time.sleep(timeout)
+        return False
+
+    def _wait_ymq(self, timeout: float) -> bool:
+        queue_ref, access_key, secret_key, region = self._credentials
+        deadline = time.monotonic() + timeout
+        try:
+            client = _build_client(access_key, secret_key, region)
+            queue_url = _resolve_queue_url(queue_ref, access_key, secret_key, region)
+            while True:
+                remaining = deadline - time.monotonic()
+                wait_seconds = int(min(MAX_RECEIVE_WAIT_SECONDS, max(0.0, remaining)))
+                response = client.receive_message(
+                    QueueUrl=queue_url,
+                    MaxNumberOfMessages=10,
+                    WaitTimeSeconds=wait_seconds,
+                )
+                messages = response.get("Messages") or []
+                if messages:
+                    client.delete_message_batch(
+                        QueueUrl=queue_url,
+                        Entries=[
+                            {"Id": str(index), "ReceiptHandle": item["ReceiptHandle"]}
+                            for index, item in enumerate(messages)
+                        ],
+                    )
+                    return True
+                if deadline - time.monotonic() < 1:
+                    return False
+        except Exception:
+            logger.warning("YMQ wake-up receive failed, polling instead", exc_info=True)
+            time.sleep(max(0.0, deadline - time.monotonic()))
+            return False
+
+    def _wait_socket(self, timeout: float) -> bool:
+        sock = self._socket
+        if timeout <= 0:
+            return False
+        sock.settimeout(timeout)
+        try:
+            sock.recv(1024)
+        except TimeoutError:
+            return False
+        # Coalesce a burst of commits into one wake-up.
+        sock.setblocking(False)
+        try:
+            while True:
+                sock.recv(1024)
+        except (BlockingIOError, OSError):
+            pass
+        return True
+
+    def close(self) -> None:
+        if self._socket is None:
+            return
+        self._socket.close()
+        self._socket = None
+        try:
+            os.unlink(self._socket_path)
+        except OSError:
+            pass
@@ -2,11 +2,15 @@ from __future__ import annotations
 
 import uuid
 from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
 from typing import Any
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Count, Prefetch
+from django.db.models import Count, Max, Prefetch
 from django.utils import timezone
 
 from tenant_voting.api import _access_check_allowed
@@ -53,6 +57,40 @@ NOMINATIONS_PREFETCH = Prefetch(
 )
 
 
+CATALOG_CACHE_PREFIX = "voting:compat:catalog"
+
+
+@dataclass(frozen=True)
+class CatalogNomination:
+    id: uuid.UUID
+    title: str
+    description: str
+    kind: str
+    sort_order: int
+
+
+@dataclass(frozen=True)
+class CatalogPoll:
+    """
+    Лёгкая копия Poll для обзорных ручек: только поля, нужные для
+    сериализации и проверки доступа, плюс краткий список номинаций.
+    Атрибуты совпадают с Poll, поэтому к ней применимы те же хелперы.
+    """
+
+    id: uuid.UUID
+    tenant_id: uuid.UUID
+    title: str
+    description: str
+    status: str
+    scope_type: str
+    scope_id: str
+    visibility: str
+    settings: dict[str, Any]
+    starts_at: datetime | None
+    ends_at: datetime | None
+    nominations: tuple[CatalogNomination, ...]
+
+
 def _is_ydb_mode() -> bool:
     return getattr(settings, "DB_DRIVER", "postgres") == "ydb"
 
@@ -70,7 +108,7 @@ def is_global_admin(ctx: InternalContext) -> bool:
     )
 
 
-def _scope_for_poll(poll: Poll, *, tenant_id: str) -> tuple[str, str]:
+def _scope_for_poll(poll: Poll | CatalogPoll, *, tenant_id: str) -> tuple[str, str]:
     if poll.scope_type in {
         PollScopeType.TENANT,
         PollScopeType.COMMUNITY,
@@ -80,7 +118,7 @@ def _scope_for_poll(poll: Poll, *, tenant_id: str) -> tuple[str, str]:
     return "TENANT", str(tenant_id)
 
 
-def _access_allowed(ctx: InternalContext, poll: Poll, *, action: str) -> bool:
+def _access_allowed(ctx: InternalContext, poll: Poll | CatalogPoll, *, action: str) -> bool:
     scope_type, scope_id = _scope_for_poll(poll, tenant_id=ctx.tenant_id)
     return _access_check_allowed(
         tenant_id=ctx.tenant_id,
@@ -94,13 +132,13 @@ def _access_allowed(ctx: InternalContext, poll: Poll, *, action: str) -> bool:
     )
 
 
-def _settings_dict(poll: Poll) -> dict[str, Any]:
+def _settings_dict(poll: Poll | CatalogPoll) -> dict[str, Any]:
     if isinstance(poll.settings, dict):
         return dict(poll.settings)
     return {}
 
 
-def legacy_code_for_poll(poll: Poll) -> str:
+def legacy_code_for_poll(poll: Poll | CatalogPoll) -> str:
     settings = _settings_dict(poll)
     code = settings.get("legacy_code")
     if isinstance(code, str) and code.strip():
@@ -108,7 +146,7 @@ def legacy_code_for_poll(poll: Poll) -> str:
     return str(poll.id)
 
 
-def _legacy_rules(poll: Poll) -> dict[str, Any]:
+def _legacy_rules(poll: Poll | CatalogPoll) -> dict[str, Any]:
     settings = _settings_dict(poll)
     raw = settings.get("legacy_rules") or settings.get("rules") or {}
     if isinstance(raw, dict):
@@ -116,7 +154,7 @@ def _legacy_rules(poll: Poll) -> dict[str, Any]:
     return {}
 
 
-def _show_vote_counts(poll: Poll) -> bool:
+def _show_vote_counts(poll: Poll | CatalogPoll) -> bool:
     settings = _settings_dict(poll)
     if "show_vote_counts" in settings:
         return bool(settings.get("show_vote_counts"))
@@ -124,11 +162,11 @@ def _show_vote_counts(poll: Poll) -> bool:
     return bool(rules.get("show_vote_counts", False))
 
 
-def _is_public_poll(poll: Poll) -> bool:
+def _is_public_poll(poll: Poll | CatalogPoll) -> bool:
     return str(poll.visibility) == "public"
 
 
-def _is_poll_open(poll: Poll) -> bool:
+def _is_poll_open(poll: Poll | CatalogPoll) -> bool:
     if poll.status != PollStatus.ACTIVE:
         return False
     now = timezone.now()
@@ -146,14 +184,43 @@ def _can_read_poll(
 ) -> bool:
     if str(poll.tenant_id) != str(ctx.tenant_id):
         return False
-    if not _access_allowed(ctx, poll, action=action):
+    if not include_non_public and not _is_public_poll(poll):
         return False
-    if include_non_public:
-        return True
-    return _is_public_poll(poll)
+    return _access_allowed(ctx, poll, action=action)
 
 
-def _serialize_voting(poll: Poll) -> dict[str, Any]:
+def _filter_readable(
+    ctx: InternalContext,
+    polls: Iterable[Any],
+    *,
+    include_non_public: bool,
+    action: str = "voting.poll.read",
+    limit: int | None = None,
+) -> list[Any]:
+    """
+    Фильтрует опросы по правам, спрашивая access один раз на скоуп.
+
+    Решение зависит только от (action, scope), поэтому десятки опросов
+    одного сообщества стоят одного запроса в access, а не десятка.
+    """
+    decisions: dict[tuple[str, str], bool] = {}
+    visible: list[Any] = []
+    for poll in polls:
+        if limit is not None and len(visible) >= limit:
+            break
+        if str(poll.tenant_id) != str(ctx.tenant_id):
+            continue
+        if not include_non_public and not _is_public_poll(poll):
+            continue
+        scope = _scope_for_poll(poll, tenant_id=ctx.tenant_id)
+        if scope not in decisions:
+            decisions[scope] = _access_allowed(ctx, poll, action=action)
+        if decisions[scope]:
+            visible.append(poll)
+    return visible
+
+
+def _serialize_voting(poll: Poll | CatalogPoll) -> dict[str, Any]:
     return {
         "id": legacy_code_for_poll(poll),
         "title": poll.title,
@@ -226,34 +293,104 @@ def _build_nomination_payload(
     }
 
 
-def _polls_queryset(*, active_only: bool) -> Any:
-    queryset = Poll.objects.all().prefetch_related(NOMINATIONS_PREFETCH)
-    if active_only:
-        queryset = queryset.filter(status=PollStatus.ACTIVE)
-    return queryset.order_by("ends_at", "created_at", "id")
+def _catalog_watermark(tenant_id: str) -> str:
+    # Любая запись опроса (и вопросов — см. tenant_voting.services._touch_poll)
+    # двигает updated_at, удаление меняет количество.
+    row = Poll.objects.filter(tenant_id=tenant_id).aggregate(
+        total=Count("id"),
+        latest=Max("updated_at"),
+    )
+    latest = row["latest"].isoformat() if row["latest"] else "-"
+    return f"{row['total']}:{latest}"
+
+
+def _build_catalog(tenant_id: str) -> list[CatalogPoll]:
+    nominations_by_poll: dict[uuid.UUID, list[CatalogNomination]] = defaultdict(list)
+    nomination_rows = (
+        TenantNomination.objects.filter(tenant_id=tenant_id)
+        .order_by("sort_order", "id")
+        .values_list("id", "poll_id", "title", "description", "kind", "sort_order")
+    )
+    for nomination_id, poll_id, title, description, kind, sort_order in nomination_rows:
+        nominations_by_poll[poll_id].append(
+            CatalogNomination(
+                id=nomination_id,
+                title=title,
+                description=description,
+                kind=kind,
+                sort_order=sort_order,
+            )
+        )
+
+    poll_rows = (
+        Poll.objects.filter(tenant_id=tenant_id)
+        .order_by("ends_at", "created_at", "id")
+        .values(
+            "id",
+            "tenant_id",
+            "title",
+            "description",
+            "status",
+            "scope_type",
+            "scope_id",
+            "visibility",
+            "settings",
+            "starts_at",
+            "ends_at",
+        )
+    )
+    return [
+        CatalogPoll(
+            **row,
+            nominations=tuple(nominations_by_poll.get(row["id"], ())),
+        )
+        for row in poll_rows
+    ]
+
+
+def _load_catalog(tenant_id: str) -> list[CatalogPoll]:
+    """
+    Каталог опросов тенанта для обзорных ручек.
 
+    Кэшируется по водяной отметке тенанта, так что запись в любом воркере
+    сразу даёт новый ключ; TTL лишь ограничивает жизнь старых ключей.
+    """
+    key = f"{CATALOG_CACHE_PREFIX}:{tenant_id}:{_catalog_watermark(tenant_id)}"
+    catalog = cache.get(key)
+    if catalog is None:
+        catalog = _build_catalog(tenant_id)
+        ttl = int(getattr(settings, "VOTING_COMPAT_CATALOG_TTL_SECONDS", 300))
+        cache.set(key, catalog, ttl)
+    return catalog
 
-def _load_visible_polls(
+
+def _load_visible_catalog(
     ctx: InternalContext,
     *,
     include_non_public: bool,
     active_only: bool,
-) -> list[Poll]:
-    polls = list(
-        _polls_queryset(active_only=active_only).filter(
-            tenant_id=ctx.tenant_id,
-        )
+    limit: int | None = None,
+) -> list[CatalogPoll]:
+    catalog: Iterable[CatalogPoll] = _load_catalog(ctx.tenant_id)
+    if active_only:
+        catalog = (poll for poll in catalog if poll.status == PollStatus.ACTIVE)
+    return _filter_readable(
+        ctx,
+        catalog,
+        include_non_public=include_non_public,
+        action="voting.poll.read",
+        limit=limit,
     )
-    return [
-        poll
-        for poll in polls
-        if _can_read_poll(
-            ctx,
-            poll,
-            include_non_public=include_non_public,
-            action="voting.poll.read",
+
+
+def _load_full_polls(poll_ids: list[uuid.UUID]) -> list[Poll]:
+    by_id = {
+        poll.id: poll
+        for poll in Poll.objects.filter(id__in=poll_ids).prefetch_related(
+            NOMINATIONS_PREFETCH
         )
-    ]
+    }
+    return [by_id[poll_id] for poll_id in poll_ids if poll_id in by_id]
 
 
 def _vote_counts_map(nomination_ids: list[uuid.UUID]) -> dict[str, VoteCounts]:
@@ -289,14 +426,14 @@ def _get_user_vote_map(
 def list_votings_overview(
     ctx: InternalContext, *, include_non_public: bool = False
 ) -> list[dict[str, Any]]:
-    polls = _load_visible_polls(
+    polls = _load_visible_catalog(
         ctx,
         include_non_public=include_non_public,
         active_only=False,
     )
     result: list[dict[str, Any]] = []
     for poll in polls:
-        nominations = list(poll.nominations.all())
+        nominations = poll.nominations
         result.append(
             {
                 **_serialize_voting(poll),
@@ -313,15 +450,16 @@ def list_votings_overview(
 def list_votings_feed(
     ctx: InternalContext, *, limit: int = 20, include_non_public: bool = False
 ) -> list[dict[str, Any]]:
-    polls = _load_visible_polls(
+    polls = _load_visible_catalog(
         ctx,
         include_non_public=include_non_public,
         active_only=True,
+        limit=max(1, limit),
     )
     result: list[dict[str, Any]] = []
-    for poll in polls[: max(1, limit)]:
+    for poll in polls:
         payload = _serialize_voting(poll)
-        payload["nomination_count"] = len(poll.nominations.all())
+        payload["nomination_count"] = len(poll.nominations)
         result.append(payload)
     return result
 
@@ -330,15 +468,18 @@ def list_nominations(
     ctx: InternalContext, *, voting_code: str | None = None
 ) -> list[dict[str, Any]]:
     include_non_public = is_global_admin(ctx)
-    polls = _load_visible_polls(
+    catalog: Iterable[CatalogPoll] = _load_catalog(ctx.tenant_id)
+    if voting_code:
+        catalog = [
+            poll for poll in catalog if legacy_code_for_poll(poll) == voting_code
+        ]
+    visible = _filter_readable(
         ctx,
+        catalog,
         include_non_public=include_non_public,
-        active_only=False,
+        action="voting.poll.read",
     )
-    if voting_code:
-        polls = [
-            poll for poll in polls if legacy_code_for_poll(poll) == voting_code
-        ]
+    polls = _load_full_polls([poll.id for poll in visible])
 
     items = [
         (poll, nomination)
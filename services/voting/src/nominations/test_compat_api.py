@@ -8,6 +8,8 @@ from unittest.mock import patch
 
 from django.test import Client, TestCase, override_settings
 
+from nominations import compat
+from tenant_voting.context import InternalContext
 from tenant_voting.models import (
     Nomination,
     Option,
@@ -16,6 +18,8 @@ from tenant_voting.models import (
     PollStatus,
     Vote,
 )
+from tenant_voting.schemas import NominationUpdateIn
+from tenant_voting.services import update_nomination
 
 BFF_SRC = Path(__file__).resolve().parents[4] / "services" / "bff" / "src"
 if str(BFF_SRC) not in sys.path:
@@ -212,3 +216,68 @@ class LegacyCompatApiTests(TestCase):
 
         self.assertEqual(response.status_code, 404)
         self.assertEqual(response.json()["error"]["code"], "NOT_FOUND")
+
+
+class LegacyCatalogTests(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tenant_id = str(uuid.uuid4())
+        self.user_id = str(uuid.uuid4())
+        self.ctx = InternalContext(
+            tenant_id=self.tenant_id,
+            tenant_slug="aef",
+            user_id=self.user_id,
+            request_id=str(uuid.uuid4()),
+            master_flags={},
+        )
+        self.polls = []
+        for index in range(3):
+            poll = Poll.objects.create(
+                tenant_id=self.tenant_id,
+                title=f"Poll {index}",
+                status=PollStatus.ACTIVE if index else PollStatus.DRAFT,
+                scope_type=PollScopeType.TENANT,
+                scope_id=self.tenant_id,
+                visibility="public",
+                created_by=self.user_id,
+            )
+            for question in range(2):
+                Nomination.objects.create(
+                    tenant_id=self.tenant_id,
+                    poll=poll,
+                    title=f"Q{question}",
+                    sort_order=question,
+                )
+            self.polls.append(poll)
+
+    @patch("nominations.compat._access_check_allowed", return_value=True)
+    def test_overview_checks_access_once_per_scope(self, mock_access):
+        with self.assertNumQueries(3):
+            overview = compat.list_votings_overview(self.ctx)
+
+        self.assertEqual(len(overview), 3)
+        self.assertEqual([item["nomination_count"] for item in overview], [2, 2, 2])
+        self.assertEqual(mock_access.call_count, 1)
+
+    @patch("nominations.compat._access_check_allowed", return_value=True)
+    def test_catalog_is_served_from_cache_until_a_write(self, _mock_access):
+        compat.list_votings_overview(self.ctx)
+
+        with self.assertNumQueries(1):
+            feed = compat.list_votings_feed(self.ctx, limit=1)
+        self.assertEqual(len(feed), 1)
+
+        nomination = self.polls[0].nominations.order_by("sort_order").first()
+        update_nomination(
+            nomination=nomination,
+            payload=NominationUpdateIn(title="Renamed"),
+        )
+
+        overview = compat.list_votings_overview(self.ctx)
+        titles = [nom["title"] for item in overview for nom in item["nominations"]]
+        self.assertIn("Renamed", titles)
+
+    @patch("nominations.compat._access_check_allowed", return_value=False)
+    def test_denied_scope_hides_all_its_polls(self, mock_access):
+        self.assertEqual(compat.list_votings_overview(self.ctx), [])
+        self.assertEqual(mock_access.call_count, 1)
@@ -13,7 +13,7 @@ from django.http import JsonResponse
 from django.utils import timezone
 from ninja import Router
 
-from . import services
+from . import metrics, services
 
 # events.models.OutboxMessage import removed (moved to services)
 from .context import InternalContext, require_internal_context
@@ -45,6 +45,7 @@ from .schemas import (
     PollResultsOut,
     PollTemplateOut,
     PollUpdateIn,
+    TopPollsOut,
     VoteCastIn,
     VoteOut,
 )
@@ -133,21 +134,28 @@ def _access_check_allowed(
     }
     headers.update(_internal_hmac_headers(method="POST", path=path, body=body, request_id=request_id))
 
+    started = time.perf_counter()
     try:
         resp = httpx.post(url, content=body, headers=headers, timeout=5.0)
     except Exception:
         # Fail-closed: запрещаем при сбое проверки доступа, но логируем причину.
+        metrics.observe_access_check(time.perf_counter() - started, outcome="error")
         logger.warning("Access check request failed; denying", exc_info=True)
         return False
 
+    elapsed = time.perf_counter() - started
     if resp.status_code != 200:
+        metrics.observe_access_check(elapsed, outcome="error")
         return False
     try:
         data = resp.json()
     except Exception:
+        metrics.observe_access_check(elapsed, outcome="error")
         logger.warning("Access check returned non-JSON; denying", exc_info=True)
         return False
-    return bool(data.get("allowed"))
+    allowed = bool(data.get("allowed"))
+    metrics.observe_access_check(elapsed, outcome="allowed" if allowed else "denied")
+    return allowed
 
 
 def _scope_for_poll(poll: Poll, *, tenant_id: str) -> tuple[str, str]:
@@ -1103,3 +1111,25 @@ def remove_participant(request, poll_id: uuid.UUID, user_id: uuid.UUID):
             message=exc.message,
         )
     return {"ok": True}
+
+
+@router.get("/metrics/top-polls", response={200: TopPollsOut})
+def top_polls(request, metric: str = "votes_submitted", limit: int = 10):
+    ctx = require_internal_context(request)
+    if metric not in metrics.POLL_SKETCH_METRICS:
+        return _error_response(
+            request,
+            status=400,
+            code="INVALID_METRIC",
+            message="Unknown per-poll metric",
+            details={"allowed": sorted(metrics.POLL_SKETCH_METRICS)},
+        )
+    if not _is_global_admin(ctx):
+        return _error_response(
+            request, status=403, code="FORBIDDEN", message="Permission denied"
+        )
+    limit = min(max(1, limit), 100)
+    return {
+        "metric": metric,
+        "items": metrics.top_polls(metric=metric, tenant_id=ctx.tenant_id, limit=limit),
+    }
@@ -1,36 +1,49 @@
 """
 Django management command to publish outbox messages.
 
-Reads unpublished OutboxMessage records and sends them to the Activity service
-via HTTP POST. Marks messages as published once successfully delivered.
+Reads unpublished OutboxMessage records and sends each claimed batch to the
+Activity service in a single signed HTTP POST to ``/events/ingest``. Marks
+messages as published once Activity reports them created, duplicate or ignored.
 
 Usage:
     # Run once
     python manage.py publish_outbox
     
-    # Run continuously with polling interval
-    python manage.py publish_outbox --daemon --interval=5
+    # Run continuously; wakes on outbox commits (YMQ_OUTBOX_WAKEUP_QUEUE
+    # long-poll or the OUTBOX_WAKEUP_SOCKET stand-in) and re-polls every --wakeup-timeout
+    # seconds (default 60) as a safety net
+    python manage.py publish_outbox --daemon
     
-    # Process specific number of messages
-    python manage.py publish_outbox --batch-size=100
+    # Messages per batch request to Activity's /events/ingest
+    python manage.py publish_outbox --batch-size=500
     
     # Retry failed messages (older than 1 hour)
     python manage.py publish_outbox --retry-failed --retry-age=3600
+
+Messages Activity rejects, and whole batches that fail to deliver, count an
+attempt and back off exponentially (--retry-backoff, doubling up to
+--max-backoff) before they are claimed again; after --max-retries attempts
+they are no longer claimed.
 """
 
+import hashlib
+import hmac
+import json
 import logging
 import signal
 import time
 import uuid
 from datetime import timedelta
+from urllib.parse import urlsplit
 
 import httpx
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import DatabaseError, models, transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
 
+from core.ymq import OutboxWakeupListener
 from tenant_voting.models import OutboxMessage
 
 logger = logging.getLogger(__name__)
@@ -48,13 +61,16 @@ class Command(BaseCommand):
         self.running = True
         self.messages_published = 0
         self.messages_failed = 0
+        self.max_retries = 10
+        self.retry_backoff = 30
+        self.max_backoff = 3600
     
     def add_arguments(self, parser):
         parser.add_argument(
             "--batch-size",
             type=int,
-            default=50,
-            help="Number of messages to process per batch (default: 50)",
+            default=200,
+            help="Number of messages to send per batch request (default: 200)",
         )
         parser.add_argument(
             "--daemon",
@@ -65,7 +81,16 @@ class Command(BaseCommand):
             "--interval",
             type=int,
             default=5,
-            help="Polling interval in seconds for daemon mode (default: 5)",
+            help="Polling interval in seconds for daemon mode without a wake-up channel (default: 5)",
+        )
+        parser.add_argument(
+            "--wakeup-timeout",
+            type=int,
+            default=60,
+            help=(
+                "Safety-net poll in seconds while waiting for outbox wake-ups (default: 60); "
+                "lower it, e.g. to 5, only if wake-ups are unreliable"
+            ),
         )
         parser.add_argument(
             "--retry-failed",
@@ -78,6 +103,24 @@ class Command(BaseCommand):
             default=3600,
             help="Retry messages failed more than N seconds ago (default: 3600)",
         )
+        parser.add_argument(
+            "--max-retries",
+            type=int,
+            default=10,
+            help="Stop claiming a message after this many failed attempts (default: 10)",
+        )
+        parser.add_argument(
+            "--retry-backoff",
+            type=int,
+            default=30,
+            help="Seconds before the first retry of a failed message; doubles per attempt (default: 30)",
+        )
+        parser.add_argument(
+            "--max-backoff",
+            type=int,
+            default=3600,
+            help="Upper bound for the retry backoff in seconds (default: 3600)",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
@@ -98,6 +141,10 @@ class Command(BaseCommand):
         retry_age = options["retry_age"]
         dry_run = options["dry_run"]
         lease_seconds = options["lease_seconds"]
+        wakeup_timeout = options["wakeup_timeout"]
+        self.max_retries = options["max_retries"]
+        self.retry_backoff = options["retry_backoff"]
+        self.max_backoff = options["max_backoff"]
         
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self._handle_signal)
@@ -114,9 +161,14 @@ class Command(BaseCommand):
         
         if dry_run:
             self.stdout.write(self.style.WARNING("DRY RUN MODE - no messages will be sent"))
+
+        listener = OutboxWakeupListener() if daemon else None
+        if listener is not None:
+            self.stdout.write(f"Waiting for outbox wake-ups via {listener.mode}")
         
         while self.running:
             try:
+                published_before = self.messages_published
                 count = self._process_batch(
                     batch_size=batch_size,
                     events_endpoint=events_endpoint,
@@ -134,14 +186,20 @@ class Command(BaseCommand):
                 if not daemon:
                     break
                 
-                # Sleep before next poll
-                time.sleep(interval)
+                # Keep draining while full batches get through; wait otherwise,
+                # so a failing Activity or a run of rejected messages cannot
+                # turn the loop into a busy spin.
+                if count < batch_size or self.messages_published == published_before:
+                    self._wait_for_work(listener, interval, wakeup_timeout)
                 
             except Exception:
                 logger.exception("Error in outbox publisher")
                 if not daemon:
                     raise
                 time.sleep(interval)
+
+        if listener is not None:
+            listener.close()
         
         self.stdout.write(
             self.style.SUCCESS(
@@ -171,39 +229,37 @@ class Command(BaseCommand):
             return 0
         
         self.stdout.write(f"Processing {len(messages)} messages...")
-        
-        with httpx.Client(timeout=10.0) as client:
+
+        if dry_run:
             for msg in messages:
-                try:
-                    if dry_run:
-                        self.stdout.write(
-                            f"  [DRY RUN] Would publish {msg.event_type} ({msg.id})"
-                        )
-                        msg.claimed_at = None
-                        msg.claim_token = None
-                        msg.save(update_fields=["claimed_at", "claim_token"])
-                        continue
-                    
-                    self._publish_message(
-                        client=client,
-                        message=msg,
-                        events_endpoint=events_endpoint,
-                        hmac_secret=hmac_secret,
-                    )
-                    self.messages_published += 1
-                    
-                except (DatabaseError, httpx.HTTPError, OutboxPublishError):
-                    self.messages_failed += 1
-                    logger.exception(
-                        "Failed to publish message %s",
-                        msg.id,
-                        extra={
-                            "message_id": str(msg.id),
-                            "event_type": msg.event_type,
-                            "tenant_id": str(msg.tenant_id),
-                        }
-                    )
-        
+                self.stdout.write(
+                    f"  [DRY RUN] Would publish {msg.event_type} ({msg.id})"
+                )
+            OutboxMessage.objects.filter(id__in=[msg.id for msg in messages]).update(
+                claimed_at=None,
+                claim_token=None,
+            )
+            return len(messages)
+
+        try:
+            with httpx.Client(timeout=30.0) as client:
+                self._publish_batch(
+                    client=client,
+                    messages=messages,
+                    events_endpoint=events_endpoint,
+                    hmac_secret=hmac_secret,
+                )
+        except (DatabaseError, httpx.HTTPError, OutboxPublishError) as exc:
+            self.messages_failed += len(messages)
+            logger.exception(
+                "Failed to publish outbox batch",
+                extra={
+                    "batch_size": len(messages),
+                    "first_message_id": str(messages[0].id),
+                },
+            )
+            self._mark_failed([msg.id for msg in messages], error=str(exc))
+
         return len(messages)
 
     def _claim_batch(
@@ -224,6 +280,9 @@ class Command(BaseCommand):
                 models.Q(published_at__isnull=True)
                 | models.Q(published_at__lt=cutoff, occurred_at__gt=cutoff)
             )
+        else:
+            queryset = queryset.filter(retry_count__lt=self.max_retries)
+        queryset = queryset.filter(Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
         candidate_ids = list(
             queryset.filter(claimable_filter)
             .order_by("occurred_at")
@@ -241,71 +300,124 @@ class Command(BaseCommand):
             OutboxMessage.objects.filter(claim_token=claim_token).order_by("occurred_at")
         )
     
-    def _publish_message(
+    def _publish_batch(
         self,
         client: httpx.Client,
-        message: OutboxMessage,
+        messages: list[OutboxMessage],
         events_endpoint: str,
         hmac_secret: str,
     ) -> None:
-        """Publish a single outbox message to Activity service."""
-        
-        event_payload = {
-            "event_id": str(message.id),
-            "event_type": message.event_type,
-            "tenant_id": str(message.tenant_id),
-            "occurred_at": message.occurred_at.isoformat(),
-            "payload": message.payload,
-            "source": "voting",
-        }
-        
+        """Publish a claimed batch to Activity's batch ingest endpoint in one request."""
+
+        body = json.dumps(
+            {
+                "events": [
+                    {
+                        "event_id": str(message.id),
+                        "event_type": message.event_type,
+                        "tenant_id": str(message.tenant_id),
+                        "occurred_at": message.occurred_at.isoformat(),
+                        "payload": message.payload,
+                    }
+                    for message in messages
+                ]
+            },
+            separators=(",", ":"),
+            default=str,
+        ).encode("utf-8")
+
+        request_id = f"outbox-{uuid.uuid4()}"
         headers = {
             "Content-Type": "application/json",
+            "X-Request-Id": request_id,
             "X-Source-Service": "voting",
             "X-Forwarded-Proto": "https",
         }
-        
-        # Add HMAC signature if configured
         if hmac_secret:
-            import hashlib
-            import hmac as hmac_lib
-            import json
-            
-            body_json = json.dumps(event_payload, sort_keys=True)
-            signature = hmac_lib.new(
-                hmac_secret.encode(),
-                body_json.encode(),
-                hashlib.sha256
+            ts = str(int(time.time()))
+            path = urlsplit(events_endpoint).path
+            msg = "\n".join(
+                ["POST", path, hashlib.sha256(body).hexdigest(), request_id, ts]
+            ).encode("utf-8")
+            headers["X-Updspace-Timestamp"] = ts
+            headers["X-Updspace-Signature"] = hmac.new(
+                hmac_secret.encode("utf-8"), msg, hashlib.sha256
             ).hexdigest()
-            headers["X-Updspace-Signature"] = signature
-        
-        response = client.post(
-            events_endpoint,
-            json=event_payload,
-            headers=headers,
-        )
-        
+
+        response = client.post(events_endpoint, content=body, headers=headers)
+
         if response.status_code >= 400:
             raise OutboxPublishError(
                 f"Activity service returned {response.status_code}: {response.text}"
             )
-        
-        # Mark as published
+
+        # Activity reports one status per item; only invalid items stay pending.
+        items = response.json().get("items") or []
+        statuses = {str(item.get("event_id")): item.get("status") for item in items}
+        errors = {str(item.get("event_id")): item.get("error") for item in items}
+        delivered_ids = [
+            message.id
+            for message in messages
+            if statuses.get(str(message.id)) in {"created", "duplicate", "ignored"}
+        ]
+        delivered = set(delivered_ids)
+        rejected_ids = [message.id for message in messages if message.id not in delivered]
+
         with transaction.atomic():
-            message.published_at = timezone.now()
-            message.claimed_at = None
-            message.claim_token = None
-            message.save(update_fields=["published_at", "claimed_at", "claim_token"])
-        
+            OutboxMessage.objects.filter(id__in=delivered_ids).update(
+                published_at=timezone.now(),
+                claimed_at=None,
+                claim_token=None,
+                next_attempt_at=None,
+                last_error="",
+            )
+            by_error: dict[str, list] = {}
+            for message_id in rejected_ids:
+                key = str(message_id)
+                error = errors.get(key) or f"status {statuses.get(key) or 'missing'}"
+                by_error.setdefault(error, []).append(message_id)
+            for error, message_ids in by_error.items():
+                self._mark_failed(message_ids, error=error)
+
+        self.messages_published += len(delivered_ids)
+        self.messages_failed += len(rejected_ids)
         logger.info(
-            f"Published event {message.event_type}",
+            "Published outbox batch",
             extra={
-                "message_id": str(message.id),
-                "event_type": message.event_type,
-                "tenant_id": str(message.tenant_id),
-            }
+                "published": len(delivered_ids),
+                "rejected": len(rejected_ids),
+            },
         )
-    
+
+    def _mark_failed(self, message_ids: list, *, error: str) -> None:
+        """Release the claim, count the attempt and schedule the next one."""
+        now = timezone.now()
+        base = max(self.retry_backoff, 0)
+        cap = max(self.max_backoff, base)
+        for retry_count in set(
+            OutboxMessage.objects.filter(id__in=message_ids).values_list("retry_count", flat=True)
+        ):
+            delay = min(base * 2 ** min(retry_count, 16), cap)
+            OutboxMessage.objects.filter(id__in=message_ids, retry_count=retry_count).update(
+                retry_count=F("retry_count") + 1,
+                last_error=error[:1000],
+                next_attempt_at=now + timedelta(seconds=delay),
+                claimed_at=None,
+                claim_token=None,
+            )
+
+    def _wait_for_work(
+        self,
+        listener: OutboxWakeupListener,
+        interval: int,
+        wakeup_timeout: int,
+    ) -> None:
+        """Block until a commit wakes the relay; fall back to fixed polling."""
+        if listener.enabled:
+            listener.wait(wakeup_timeout)
+        else:
+            time.sleep(interval)
+
     def _handle_signal(self, signum, frame):
         """Handle shutdown signals gracefully."""
         self.stdout.write(
@@ -5,8 +5,8 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.utils import timezone
 
+from core.retention import PurgeTarget, RetentionPurge, add_purge_arguments
 from tenant_voting.models import OutboxMessage
 
 
@@ -20,14 +20,19 @@ class Command(BaseCommand):
             default=int(getattr(settings, "VOTING_RETENTION_PUBLISHED_OUTBOX_DAYS", 30)),
             help="Retention window for published outbox rows in days",
         )
+        add_purge_arguments(parser)
 
     def handle(self, *args, **options):
-        now = timezone.now()
+        purge = RetentionPurge.from_options(options)
+        now = purge.started_at
         outbox_cutoff = now - timedelta(days=int(options["published_outbox_days"]))
-        outbox_deleted, _ = OutboxMessage.objects.filter(
-            published_at__isnull=False,
-            published_at__lt=outbox_cutoff,
-        ).delete()
+        outbox_deleted = purge.run(
+            PurgeTarget(
+                "published_outbox",
+                OutboxMessage.objects.filter(published_at__isnull=False, published_at__lt=outbox_cutoff),
+                order_field="published_at",
+            )
+        )
 
         payload = {
             "service": "voting",
@@ -38,5 +43,6 @@ class Command(BaseCommand):
             "counts": {
                 "published_outbox_deleted": outbox_deleted,
             },
+            "purge": purge.finish(),
         }
         self.stdout.write(json.dumps(payload, indent=2, sort_keys=True, ensure_ascii=False))
@@ -1,51 +1,235 @@
+"""
+Voting metrics with bounded label cardinality.
+
+Prometheus series are labelled by tenant only (subject to the
+``VOTING_METRICS_LABELS`` allowlist), so a scrape costs the same no matter how
+many polls exist. Per-poll detail lives in an in-process top-K sketch that is
+read on demand through ``GET /metrics/top-polls``.
+"""
+
 from __future__ import annotations
 
-from prometheus_client import Counter
+import functools
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+AGGREGATED_LABEL_VALUE = "all"
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 VOTES_SUBMITTED = Counter(
     "voting_votes_submitted_total",
     "Total number of votes submitted",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 VOTES_DELETED = Counter(
     "voting_votes_deleted_total",
     "Number of votes revoked",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 POLL_RESULTS_QUERIES = Counter(
     "voting_poll_results_queries_total",
     "Number of times poll results were requested",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 INVITES_CREATED = Counter(
     "voting_poll_invites_created_total",
     "Number of poll invitations created",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 PARTICIPANTS_MANAGED = Counter(
     "voting_poll_participants_managed_total",
     "Number of participant role changes",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 POLLS_CREATED = Counter(
     "voting_polls_created_total",
     "Total number of polls created",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 NOMINATIONS_CREATED = Counter(
     "voting_nominations_created_total",
     "Total number of nominations created",
-    ["tenant", "poll"],
+    ["tenant"],
 )
 
 OPTIONS_CREATED = Counter(
     "voting_options_created_total",
     "Total number of options created",
-    ["tenant", "poll"],
+    ["tenant"],
+)
+
+CAST_VOTE_SECONDS = Histogram(
+    "voting_cast_vote_seconds",
+    "Latency of cast_vote",
+    ["tenant"],
+)
+
+POLL_RESULTS_SECONDS = Histogram(
+    "voting_poll_results_seconds",
+    "Latency of get_poll_results",
+    ["tenant"],
 )
+
+ACCESS_CHECK_SECONDS = Histogram(
+    "voting_access_check_seconds",
+    "Latency of access service permission checks",
+    ["outcome"],
+)
+
+
+_parsed_labels: tuple[object, frozenset[str]] | None = None
+
+
+def _allowed_labels() -> frozenset[str]:
+    """``VOTING_METRICS_LABELS`` as a set, parsed once per settings value."""
+    global _parsed_labels
+    raw = getattr(settings, "VOTING_METRICS_LABELS", "tenant")
+    parsed = _parsed_labels
+    if parsed is not None and parsed[0] is raw:
+        return parsed[1]
+    items = raw.split(",") if isinstance(raw, str) else raw
+    labels = frozenset(str(item).strip() for item in items if str(item).strip())
+    _parsed_labels = (raw, labels)
+    return labels
+
+
+def _label(name: str, value: object) -> str:
+    if name not in _allowed_labels():
+        return AGGREGATED_LABEL_VALUE
+    return str(value)
+
+
+class TopKSketch:
+    """
+    Space-Saving heavy-hitters sketch.
+
+    Keeps at most ``capacity`` keys; when full, the least frequent key is
+    replaced and its count inherited, so reported counts are upper bounds
+    with error at most the evicted minimum.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            if key in self._counts:
+                self._counts[key] += amount
+                return
+            if len(self._counts) < self.capacity:
+                self._counts[key] = amount
+                self._errors[key] = 0
+                return
+            victim = min(self._counts, key=self._counts.__getitem__)
+            floor = self._counts.pop(victim)
+            self._errors.pop(victim, None)
+            self._counts[key] = floor + amount
+            self._errors[key] = floor
+
+    def top(self, limit: int) -> list[tuple[str, int, int]]:
+        with self._lock:
+            ranked = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)
+            return [(key, count, self._errors[key]) for key, count in ranked[:limit]]
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+
+_poll_sketches: dict[tuple[str, str], TopKSketch] = {}
+_poll_sketches_lock = threading.Lock()
+
+POLL_SKETCH_METRICS = frozenset(
+    {
+        "votes_submitted",
+        "votes_deleted",
+        "poll_results_queries",
+        "invites_created",
+        "participants_managed",
+        "nominations_created",
+        "options_created",
+    }
+)
+
+
+def _poll_sketch(metric: str, tenant_id: str) -> TopKSketch:
+    key = (metric, str(tenant_id))
+    sketch = _poll_sketches.get(key)
+    if sketch is not None:
+        return sketch
+    with _poll_sketches_lock:
+        sketch = _poll_sketches.get(key)
+        if sketch is None:
+            capacity = int(getattr(settings, "VOTING_METRICS_TOP_POLLS_CAPACITY", 64))
+            sketch = TopKSketch(capacity)
+            _poll_sketches[key] = sketch
+        return sketch
+
+
+def record(counter: Counter, *, metric: str, tenant_id: str, poll_id: str | None = None) -> None:
+    """Increment a tenant-level counter and the per-poll sketch for ``metric``."""
+    counter.labels(tenant=_label("tenant", tenant_id)).inc()
+    if poll_id is not None and metric in POLL_SKETCH_METRICS:
+        _poll_sketch(metric, tenant_id).add(str(poll_id))
+
+
+def top_polls(*, metric: str, tenant_id: str, limit: int = 10) -> list[dict[str, object]]:
+    sketch = _poll_sketches.get((metric, str(tenant_id)))
+    if sketch is None:
+        return []
+    return [
+        {"poll_id": key, "count": count, "max_error": error}
+        for key, count, error in sketch.top(limit)
+    ]
+
+
+def reset_poll_sketches() -> None:
+    with _poll_sketches_lock:
+        _poll_sketches.clear()
+
+
+@contextmanager
+def observe_latency(histogram: Histogram, *, tenant_id: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(tenant=_label("tenant", tenant_id)).observe(time.perf_counter() - started)
+
+
+def timed(histogram: Histogram, *, tenant_of: Callable[..., object]) -> Callable[[F], F]:
+    """Decorator form of :func:`observe_latency`; ``tenant_of`` receives the call arguments."""
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with observe_latency(histogram, tenant_id=str(tenant_of(*args, **kwargs))):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def observe_access_check(seconds: float, *, outcome: str) -> None:
+    ACCESS_CHECK_SECONDS.labels(outcome=outcome).observe(seconds)
+
+
+def metrics_view(request) -> HttpResponse:
+    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
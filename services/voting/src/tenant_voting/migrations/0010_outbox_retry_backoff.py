@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tenant_voting", "0009_outbox_claim_fields"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="last_error",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="outboxmessage",
+            name="retry_count",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -190,3 +190,15 @@ class PaginatedPollsOut(Schema):
     """Paginated response for polls list."""
     items: list[PollOut]
     pagination: PaginationMeta
+
+
+class TopPollOut(Schema):
+    poll_id: str
+    count: int
+    max_error: int
+
+
+class TopPollsOut(Schema):
+    """Heavy-hitter polls for one metric, from the in-process top-K sketch."""
+    metric: str
+    items: list[TopPollOut]
@@ -101,6 +101,7 @@ def _user_votes_for_nomination(nomination: Nomination, user_id: str):
     return Vote.objects.filter(nomination=nomination, user_id=user_id)
 
 
+@metrics.timed(metrics.CAST_VOTE_SECONDS, tenant_of=lambda **kwargs: kwargs["tenant_id"])
 def cast_vote(
     *,
     tenant_id: str,
@@ -164,7 +165,12 @@ def cast_vote(
                 user_id=user_id,
                 created_at=timezone.now(),
             )
-            metrics.VOTES_SUBMITTED.labels(tenant=tenant_id, poll=str(poll.id)).inc()
+            metrics.record(
+                metrics.VOTES_SUBMITTED,
+                metric="votes_submitted",
+                tenant_id=tenant_id,
+                poll_id=str(poll.id),
+            )
 
             emit_outbox_message(
                 tenant_id=tenant_id,
@@ -213,6 +219,12 @@ def delete_vote(
         raise VotingServiceError(code="POLL_ENDED", message="Poll has ended", status=409)
 
     vote.delete()
+    metrics.record(
+        metrics.VOTES_DELETED,
+        metric="votes_deleted",
+        tenant_id=str(tenant_id),
+        poll_id=str(poll.id),
+    )
     emit_outbox_message(
         tenant_id=tenant_id,
         event_type="voting.vote.revoked",
@@ -227,8 +239,14 @@ def delete_vote(
     )
 
 
+@metrics.timed(metrics.POLL_RESULTS_SECONDS, tenant_of=lambda poll: poll.tenant_id)
 def get_poll_results(poll: Poll) -> PollResultsOut:
-    metrics.POLL_RESULTS_QUERIES.labels(tenant=str(poll.tenant_id), poll=str(poll.id)).inc()
+    metrics.record(
+        metrics.POLL_RESULTS_QUERIES,
+        metric="poll_results_queries",
+        tenant_id=str(poll.tenant_id),
+        poll_id=str(poll.id),
+    )
     rows = (
         Vote.objects.filter(poll=poll)
         .values("nomination_id", "option_id")
@@ -311,8 +329,18 @@ def assign_participant_role(
             "status": PollInviteStatus.ACCEPTED,
         },
     )
-    metrics.INVITES_CREATED.labels(tenant=str(poll.tenant_id), poll=str(poll.id)).inc()
-    metrics.PARTICIPANTS_MANAGED.labels(tenant=str(poll.tenant_id), poll=str(poll.id)).inc()
+    metrics.record(
+        metrics.INVITES_CREATED,
+        metric="invites_created",
+        tenant_id=str(poll.tenant_id),
+        poll_id=str(poll.id),
+    )
+    metrics.record(
+        metrics.PARTICIPANTS_MANAGED,
+        metric="participants_managed",
+        tenant_id=str(poll.tenant_id),
+        poll_id=str(poll.id),
+    )
     return participant
 
 
@@ -327,7 +355,12 @@ def remove_participant(*, poll: Poll, actor_id: str, user_id: str) -> None:
     PollInvite.objects.filter(poll=poll, user_id=user_id).update(
         status=PollInviteStatus.DECLINED
     )
-    metrics.PARTICIPANTS_MANAGED.labels(tenant=str(poll.tenant_id), poll=str(poll.id)).inc()
+    metrics.record(
+        metrics.PARTICIPANTS_MANAGED,
+        metric="participants_managed",
+        tenant_id=str(poll.tenant_id),
+        poll_id=str(poll.id),
+    )
 
 
 def list_participants(poll: Poll) -> list[PollParticipant]:
@@ -364,7 +397,12 @@ def _create_option_from_input(nomination: Nomination, payload: object, index: in
         created_at=timezone.now(),
         updated_at=timezone.now(),
     )
-    metrics.OPTIONS_CREATED.labels(tenant=str(nomination.tenant_id), poll=str(nomination.poll_id)).inc()
+    metrics.record(
+        metrics.OPTIONS_CREATED,
+        metric="options_created",
+        tenant_id=str(nomination.tenant_id),
+        poll_id=str(nomination.poll_id),
+    )
     return option
 
 
@@ -385,7 +423,12 @@ def _create_nomination_from_input(poll: Poll, payload: object, index: int) -> No
         created_at=timezone.now(),
         updated_at=timezone.now(),
     )
-    metrics.NOMINATIONS_CREATED.labels(tenant=str(poll.tenant_id), poll=str(poll.id)).inc()
+    metrics.record(
+        metrics.NOMINATIONS_CREATED,
+        metric="nominations_created",
+        tenant_id=str(poll.tenant_id),
+        poll_id=str(poll.id),
+    )
     options = _value(payload, "options", []) or []
     for option_index, option_payload in enumerate(options):
         _create_option_from_input(nomination, option_payload, option_index)
@@ -442,7 +485,7 @@ def create_poll(
         invited_by=user_id,
         status=PollInviteStatus.ACCEPTED,
     )
-    metrics.POLLS_CREATED.labels(tenant=str(tenant_id), poll=str(poll.id)).inc()
+    metrics.record(metrics.POLLS_CREATED, metric="polls_created", tenant_id=str(tenant_id))
 
     nomination_inputs: list[object] = []
     if template:
@@ -452,6 +495,8 @@ def create_poll(
 
     for index, nomination_payload in enumerate(nomination_inputs):
         _create_nomination_from_input(poll, nomination_payload, index)
+    if nomination_inputs:
+        _touch_poll(poll.id)
 
     return poll
 
@@ -533,6 +578,11 @@ def update_poll(*, poll: Poll, payload: PollUpdateIn) -> Poll:
     return poll
 
 
+def _touch_poll(poll_id: uuid.UUID) -> None:
+    # Bumps the poll watermark so cached compat catalogs see question changes.
+    Poll.objects.filter(id=poll_id).update(updated_at=timezone.now())
+
+
 def delete_poll(*, poll: Poll) -> None:
     _ensure_poll_draft(poll, action="delete this poll")
     poll.delete()
@@ -540,7 +590,9 @@ def delete_poll(*, poll: Poll) -> None:
 
 def create_nomination(*, poll: Poll, payload: NominationIn) -> Nomination:
     _ensure_poll_draft(poll, action="add questions")
-    return _create_nomination_from_input(poll, payload, index=Nomination.objects.filter(poll=poll).count())
+    nomination = _create_nomination_from_input(poll, payload, index=Nomination.objects.filter(poll=poll).count())
+    _touch_poll(poll.id)
+    return nomination
 
 
 def update_nomination(*, nomination: Nomination, payload: NominationUpdateIn) -> Nomination:
@@ -560,6 +612,7 @@ def update_nomination(*, nomination: Nomination, payload: NominationUpdateIn) ->
     if payload.config is not None:
         nomination.config = payload.config
     nomination.save()
+    _touch_poll(nomination.poll_id)
     return nomination
 
 
@@ -571,7 +624,9 @@ def delete_nomination(*, nomination: Nomination) -> None:
             message="Cannot remove a question with recorded votes",
             status=409,
         )
+    poll_id = nomination.poll_id
     nomination.delete()
+    _touch_poll(poll_id)
 
 
 def create_option(*, nomination: Nomination, payload: OptionIn) -> Option:
@@ -2,9 +2,10 @@ import uuid
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils import timezone
 
+from . import metrics
 from .models import (
     Nomination,
     Option,
@@ -134,3 +135,62 @@ class VotingServiceTests(TestCase):
         opts_map = {o.option_id: o.votes for o in res_nom.options}
         self.assertEqual(opts_map[self.option1.id], 1)
         self.assertEqual(opts_map[self.option2.id], 1)
+
+
+class VotingMetricsTests(TestCase):
+    def setUp(self):
+        metrics.reset_poll_sketches()
+        self.addCleanup(metrics.reset_poll_sketches)
+        self.tenant_id = str(uuid.uuid4())
+
+    def test_counters_carry_no_poll_label(self):
+        self.assertEqual(metrics.VOTES_SUBMITTED._labelnames, ("tenant",))
+        self.assertNotIn("poll", metrics.POLL_RESULTS_QUERIES._labelnames)
+
+    def test_sketch_reports_heavy_hitters_within_capacity(self):
+        sketch = metrics.TopKSketch(capacity=3)
+        for key, hits in (("a", 50), ("b", 30), ("c", 5)):
+            for _ in range(hits):
+                sketch.add(key)
+        for index in range(20):
+            sketch.add(f"noise-{index}")
+
+        self.assertEqual(len(sketch), 3)
+        top = sketch.top(2)
+        self.assertEqual([key for key, _, _ in top], ["a", "b"])
+        self.assertEqual(top[0][1], 50)
+
+    def test_record_feeds_per_tenant_top_polls(self):
+        hot_poll, cold_poll = str(uuid.uuid4()), str(uuid.uuid4())
+        for _ in range(3):
+            metrics.record(
+                metrics.VOTES_SUBMITTED,
+                metric="votes_submitted",
+                tenant_id=self.tenant_id,
+                poll_id=hot_poll,
+            )
+        metrics.record(
+            metrics.VOTES_SUBMITTED,
+            metric="votes_submitted",
+            tenant_id=self.tenant_id,
+            poll_id=cold_poll,
+        )
+
+        top = metrics.top_polls(metric="votes_submitted", tenant_id=self.tenant_id, limit=1)
+        self.assertEqual(top, [{"poll_id": hot_poll, "count": 3, "max_error": 0}])
+        self.assertEqual(metrics.top_polls(metric="votes_submitted", tenant_id="other"), [])
+
+    @override_settings(VOTING_METRICS_LABELS="")
+    def test_label_allowlist_collapses_tenant(self):
+        before = metrics.VOTES_DELETED.labels(tenant=metrics.AGGREGATED_LABEL_VALUE)._value.get()
+        metrics.record(metrics.VOTES_DELETED, metric="votes_deleted", tenant_id=self.tenant_id)
+        after = metrics.VOTES_DELETED.labels(tenant=metrics.AGGREGATED_LABEL_VALUE)._value.get()
+        self.assertEqual(after, before + 1)
+
+    def test_label_allowlist_is_parsed_once_per_setting(self):
+        with override_settings(VOTING_METRICS_LABELS="tenant, outcome"):
+            first = metrics._allowed_labels()
+            self.assertIs(metrics._allowed_labels(), first)
+            self.assertEqual(first, {"tenant", "outcome"})
+        with override_settings(VOTING_METRICS_LABELS=""):
+            self.assertEqual(metrics._allowed_labels(), frozenset())
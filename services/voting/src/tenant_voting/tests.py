@@ -752,3 +752,86 @@ class VotingDsarApiTests(TestCase):
         self.assertIsNone(message.published_at)
         self.assertIsNone(message.claimed_at)
         self.assertIsNone(message.claim_token)
+
+    @override_settings(ACTIVITY_SERVICE_URL="http://activity:8006/api/v1")
+    @patch("tenant_voting.management.commands.publish_outbox.httpx.Client")
+    def test_publish_outbox_sends_one_signed_batch(self, mock_client):
+        delivered = OutboxMessage.objects.create(
+            tenant_id=self.tenant_id,
+            event_type="voting.vote.cast",
+            payload={"user_id": self.user_id},
+        )
+        rejected = OutboxMessage.objects.create(
+            tenant_id=self.tenant_id,
+            event_type="voting.vote.cast",
+            payload={},
+        )
+        post = mock_client.return_value.__enter__.return_value.post
+        post.return_value.status_code = 200
+        post.return_value.json.return_value = {
+            "items": [
+                {"event_id": str(delivered.id), "status": "created"},
+                {"event_id": str(rejected.id), "status": "invalid"},
+            ]
+        }
+
+        call_command("publish_outbox", "--batch-size=10", stdout=StringIO())
+
+        post.assert_called_once()
+        self.assertEqual(post.call_args.args[0], "http://activity:8006/api/v1/events/ingest")
+        body = post.call_args.kwargs["content"]
+        headers = post.call_args.kwargs["headers"]
+        sent_ids = {item["event_id"] for item in json.loads(body)["events"]}
+        self.assertTrue({str(delivered.id), str(rejected.id)} <= sent_ids)
+        msg = "\n".join(
+            [
+                "POST",
+                "/api/v1/events/ingest",
+                _body_sha256(body),
+                headers["X-Request-Id"],
+                headers["X-Updspace-Timestamp"],
+            ]
+        ).encode("utf-8")
+        expected = hmac.new(b"test-secret", msg, digestmod=hashlib.sha256).hexdigest()
+        self.assertEqual(headers["X-Updspace-Signature"], expected)
+        delivered.refresh_from_db()
+        rejected.refresh_from_db()
+        self.assertIsNotNone(delivered.published_at)
+        self.assertIsNone(rejected.published_at)
+        self.assertIsNone(rejected.claim_token)
+        self.assertEqual(rejected.retry_count, 1)
+        self.assertEqual(rejected.last_error, "status invalid")
+        self.assertGreater(rejected.next_attempt_at, timezone.now())
+
+        # A rejected message is not claimed again until its backoff expires.
+        post.reset_mock()
+        call_command("publish_outbox", "--batch-size=10", stdout=StringIO())
+        post.assert_not_called()
+
+    @override_settings(ACTIVITY_SERVICE_URL="http://activity:8006/api/v1")
+    @patch("tenant_voting.management.commands.publish_outbox.httpx.Client")
+    def test_publish_outbox_backs_off_failed_batch(self, mock_client):
+        message = OutboxMessage.objects.create(
+            tenant_id=self.tenant_id,
+            event_type="voting.vote.cast",
+            payload={},
+            retry_count=2,
+        )
+        post = mock_client.return_value.__enter__.return_value.post
+        post.return_value.status_code = 503
+        post.return_value.text = "unavailable"
+
+        call_command("publish_outbox", "--batch-size=10", "--retry-backoff=10", stdout=StringIO())
+
+        message.refresh_from_db()
+        self.assertIsNone(message.published_at)
+        self.assertIsNone(message.claim_token)
+        self.assertEqual(message.retry_count, 3)
+        self.assertIn("503", message.last_error)
+        delay = (message.next_attempt_at - timezone.now()).total_seconds()
+        self.assertTrue(30 < delay <= 40)
+
+        OutboxMessage.objects.filter(id=message.id).update(next_attempt_at=None)
+        post.reset_mock()
+        call_command("publish_outbox", "--batch-size=10", "--max-retries=3", stdout=StringIO())
+        post.assert_not_called()
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from votings.services import IMPORT_CHUNK_SIZE, export_voting_ndjson
+
+
+class Command(BaseCommand):
+    help = "Stream a voting catalog (nominations, options, games) as NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("code", help="Voting code")
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="Output file path, '-' for stdout",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        lines = export_voting_ndjson(
+            str(options["code"]), chunk_size=int(options["chunk_size"])
+        )
+        if lines is None:
+            raise CommandError(f"Voting {options['code']} not found")
+
+        output = str(options["output"])
+        if output == "-":
+            sys.stdout.writelines(lines)
+            return
+        with open(output, "w", encoding="utf-8") as handle:
+            handle.writelines(lines)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from votings.services import IMPORT_CHUNK_SIZE, import_voting_ndjson
+
+
+class Command(BaseCommand):
+    help = "Import a voting catalog from NDJSON produced by export_voting_catalog"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="NDJSON file path, '-' for stdin")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Replace an existing voting with the same code",
+        )
+        parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+
+    def _progress(self, stats: dict[str, int]) -> None:
+        self.stderr.write(
+            "nominations={nominations} options={options} "
+            "games_created={created_games} games_updated={updated_games}".format(
+                **stats
+            )
+        )
+
+    def _run(self, lines, options):
+        return import_voting_ndjson(
+            lines,
+            force=bool(options["force"]),
+            chunk_size=int(options["chunk_size"]),
+            progress=self._progress,
+        )
+
+    def handle(self, *args, **options):
+        path = str(options["path"])
+        try:
+            if path == "-":
+                result = self._run(sys.stdin, options)
+            else:
+                with open(path, encoding="utf-8") as handle:
+                    result = self._run(handle, options)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(json.dumps(result, sort_keys=True, ensure_ascii=False))
@@ -1,17 +1,30 @@
 from __future__ import annotations
 
+import json
 import logging
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
-from django.db.models import Prefetch
+from django.db.models import Prefetch, Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
 
 from nominations.data import DEFAULT_VOTING_CODE
 from nominations.models import Game, Nomination, NominationOption, Voting
 
 logger = logging.getLogger(__name__)
 
+IMPORT_CHUNK_SIZE = 500
+
+NDJSON_VOTING = "voting"
+NDJSON_NOMINATION = "nomination"
+NDJSON_OPTION = "option"
+
+ImportProgressCallback = Callable[[dict[str, int]], None]
+
 
 def _clean_str(value: Any) -> str:
     if value is None:
@@ -136,16 +149,9 @@ def _validate_duplicates(nominations: list[dict[str, Any]]) -> None:
             option_ids.add(option_id)
 
 
-def _check_external_conflicts(
-    nominations: list[dict[str, Any]], voting_code: str, *, db_alias: str
+def _check_nomination_conflicts(
+    nomination_ids: list[str], voting_code: str, *, db_alias: str
 ) -> None:
-    nomination_ids = [nom["id"] for nom in nominations]
-    option_ids = [
-        option["id"]
-        for nomination in nominations
-        for option in nomination.get("options", [])
-    ]
-
     conflicting_nominations = (
         Nomination.objects.using(db_alias)
         .filter(id__in=nomination_ids)
@@ -155,6 +161,10 @@ def _check_external_conflicts(
         example = conflicting_nominations.first()
         raise ValueError(f"Номинация {example.id} уже существует в другом голосовании")
 
+
+def _check_option_conflicts(
+    option_ids: list[str], voting_code: str, *, db_alias: str
+) -> None:
     conflicting_options = (
         NominationOption.objects.using(db_alias)
         .filter(id__in=option_ids)
@@ -165,20 +175,25 @@ def _check_external_conflicts(
         raise ValueError(f"Карточка {example.id} уже используется в другом голосовании")
 
 
-def _apply_game_updates(game: Game, defaults: dict[str, Any]) -> bool:
-    updated_fields: list[str] = []
-    for field, value in defaults.items():
-        if getattr(game, field) != value:
-            setattr(game, field, value)
-            updated_fields.append(field)
-    if updated_fields:
-        game.save(update_fields=updated_fields)
-        return True
-    return False
+def _check_external_conflicts(
+    nominations: list[dict[str, Any]], voting_code: str, *, db_alias: str
+) -> None:
+    _check_nomination_conflicts(
+        [nom["id"] for nom in nominations], voting_code, db_alias=db_alias
+    )
+    _check_option_conflicts(
+        [
+            option["id"]
+            for nomination in nominations
+            for option in nomination.get("options", [])
+        ],
+        voting_code,
+        db_alias=db_alias,
+    )
 
 
-def _upsert_game(data: dict[str, Any], *, db_alias: str) -> tuple[Game, bool, bool]:
-    defaults = {
+def _game_defaults(data: dict[str, Any]) -> dict[str, Any]:
+    return {
         "title": data.get("title") or "Без названия",
         "genre": data.get("genre") or "",
         "studio": data.get("studio") or "",
@@ -186,24 +201,237 @@ def _upsert_game(data: dict[str, Any], *, db_alias: str) -> tuple[Game, bool, bo
         "description": data.get("description") or "",
         "image_url": data.get("image_url"),
     }
-    game: Game | None = None
-    created = False
-    updated = False
 
-    game_id = data.get("id")
-    if game_id:
-        game = Game.objects.using(db_alias).filter(id=game_id).first()
-    if not game:
-        # Fall back to title-based lookup to reuse existing game metadata.
-        game = Game.objects.using(db_alias).filter(title=defaults["title"]).first()
 
-    if game:
-        updated = _apply_game_updates(game, defaults)
-    else:
-        game = Game.objects.using(db_alias).create(**defaults)
-        created = True
+def _game_key(data: dict[str, Any]) -> tuple[str, str]:
+    return (data.get("id") or "", _game_defaults(data)["title"])
+
+
+def _allocate_game_ids(games: list[Game], *, db_alias: str) -> None:
+    """
+    Подбирает slug-id для новых игр без явного id.
+
+    Повторяет правило ``Game._generate_id``, но проверяет занятость
+    кандидатов пачкой, а не запросом на каждую игру.
+    """
+    max_length = Game._meta.get_field("id").max_length
+    reserved: set[str] = {game.id for game in games if game.id}
+    unassigned = [game for game in games if not game.id]
+    suffix_index = 0
+    while unassigned:
+        candidates: list[str] = []
+        for game in unassigned:
+            base_slug = slugify(game.title or "") or "game"
+            if suffix_index:
+                suffix = f"-{suffix_index}"
+                base_part = base_slug[: max(max_length - len(suffix), 1)] or "game"
+                candidate = f"{base_part}{suffix}"
+            else:
+                candidate = base_slug[:max_length]
+            candidates.append(candidate)
+        taken = set(
+            Game.objects.using(db_alias)
+            .filter(id__in=set(candidates))
+            .values_list("id", flat=True)
+        )
+        still_unassigned = []
+        for game, candidate in zip(unassigned, candidates, strict=True):
+            if candidate in taken or candidate in reserved:
+                still_unassigned.append(game)
+                continue
+            game.id = candidate
+            reserved.add(candidate)
+        unassigned = still_unassigned
+        suffix_index += 1
+
+
+def _bulk_upsert_games(
+    items: list[dict[str, Any]], *, db_alias: str
+) -> tuple[dict[tuple[str, str], Game], int, int]:
+    """
+    Создаёт или обновляет игры пачкой.
+
+    Существующие игры ищутся одним запросом по внешнему id и по названию
+    (сначала id, затем название). Новые игры
+    с внешним id сохраняют его, остальные получают slug от названия.
+    Возвращает отображение ``_game_key`` -> Game и число созданных/обновлённых.
+    """
+    unique: dict[tuple[str, str], dict[str, Any]] = {}
+    for data in items:
+        unique.setdefault(_game_key(data), data)
+    if not unique:
+        return {}, 0, 0
+
+    ids = {key[0] for key in unique if key[0]}
+    titles = {key[1] for key in unique}
+    by_id: dict[str, Game] = {}
+    by_title: dict[str, Game] = {}
+    for game in Game.objects.using(db_alias).filter(
+        Q(id__in=ids) | Q(title__in=titles)
+    ):
+        by_id[game.id] = game
+        by_title[game.title] = game
+
+    resolved: dict[tuple[str, str], Game] = {}
+    to_create: list[Game] = []
+    # Несохранённые Game с пустым id равны друг другу по pk, поэтому новые
+    # объекты отличаем по identity.
+    new_objects: set[int] = set()
+    changed: dict[str, Game] = {}
+    changed_fields: set[str] = set()
+    for key, data in unique.items():
+        game_id, title = key
+        defaults = _game_defaults(data)
+        game = by_id.get(game_id) if game_id else None
+        if game is None:
+            game = by_title.get(title)
+        if game is None:
+            game = Game(id=game_id or "", **defaults)
+            to_create.append(game)
+            new_objects.add(id(game))
+            by_title[title] = game
+            if game_id:
+                by_id[game_id] = game
+        elif id(game) not in new_objects:
+            for field, value in defaults.items():
+                if getattr(game, field) != value:
+                    setattr(game, field, value)
+                    changed_fields.add(field)
+                    changed[game.id] = game
+        resolved[key] = game
+
+    if to_create:
+        _allocate_game_ids(to_create, db_alias=db_alias)
+        Game.objects.using(db_alias).bulk_create(to_create)
+    if changed:
+        now = timezone.now()
+        for game in changed.values():
+            game.updated_at = now
+        Game.objects.using(db_alias).bulk_update(
+            list(changed.values()), sorted(changed_fields | {"updated_at"})
+        )
+    return resolved, len(to_create), len(changed)
+
+
+def _create_voting(normalized: dict[str, Any], *, db_alias: str) -> Voting:
+    return Voting.objects.using(db_alias).create(
+        code=normalized["code"],
+        title=normalized["title"] or normalized["code"],
+        description=normalized["description"] or "",
+        order=normalized["order"],
+        is_active=normalized["is_active"],
+        show_vote_counts=normalized["show_vote_counts"],
+        rules=normalized["rules"] or {},
+        deadline_at=normalized["deadline_at"],
+    )
 
-    return game, created, updated
+
+class _CatalogWriter:
+    """
+    Буферизует номинации и карточки импорта и пишет их ``bulk_create``
+    пачками по ``chunk_size``. Перед записью пачки карточек сбрасываются
+    накопленные номинации (FK) и одним запросом подбираются игры.
+    """
+
+    def __init__(
+        self,
+        voting: Voting,
+        *,
+        db_alias: str,
+        chunk_size: int,
+        progress: ImportProgressCallback | None,
+    ) -> None:
+        self.voting = voting
+        self.db_alias = db_alias
+        self.chunk_size = max(1, chunk_size)
+        self.progress = progress
+        self.stats = {
+            "nominations": 0,
+            "options": 0,
+            "created_games": 0,
+            "updated_games": 0,
+        }
+        self._nominations: list[Nomination] = []
+        self._options: list[tuple[str, dict[str, Any]]] = []
+
+    def add_nomination(self, nomination: dict[str, Any]) -> None:
+        config = nomination.get("config")
+        self._nominations.append(
+            Nomination(
+                id=nomination["id"],
+                voting=self.voting,
+                title=nomination["title"],
+                description=nomination.get("description") or "",
+                kind=_normalize_kind(nomination.get("kind")),
+                config=config if isinstance(config, dict) else {},
+                order=nomination.get("order", 0),
+                is_active=True,
+            )
+        )
+        if len(self._nominations) >= self.chunk_size:
+            self._flush_nominations()
+
+    def add_option(self, nomination_id: str, option: dict[str, Any]) -> None:
+        self._options.append((nomination_id, option))
+        if len(self._options) >= self.chunk_size:
+            self._flush_options()
+
+    def flush(self) -> None:
+        self._flush_nominations()
+        self._flush_options()
+
+    def _report(self) -> None:
+        if self.progress is not None:
+            self.progress(dict(self.stats))
+
+    def _flush_nominations(self) -> None:
+        if not self._nominations:
+            return
+        batch, self._nominations = self._nominations, []
+        _check_nomination_conflicts(
+            [nomination.id for nomination in batch],
+            self.voting.code,
+            db_alias=self.db_alias,
+        )
+        Nomination.objects.using(self.db_alias).bulk_create(batch)
+        self.stats["nominations"] += len(batch)
+        self._report()
+
+    def _flush_options(self) -> None:
+        if not self._options:
+            return
+        self._flush_nominations()
+        batch, self._options = self._options, []
+        _check_option_conflicts(
+            [option["id"] for _, option in batch],
+            self.voting.code,
+            db_alias=self.db_alias,
+        )
+        games, created, updated = _bulk_upsert_games(
+            [option["game"] for _, option in batch if option.get("game")],
+            db_alias=self.db_alias,
+        )
+        NominationOption.objects.using(self.db_alias).bulk_create(
+            [
+                NominationOption(
+                    id=option["id"],
+                    nomination_id=nomination_id,
+                    game=games.get(_game_key(option["game"]))
+                    if option.get("game")
+                    else None,
+                    title=option["title"],
+                    image_url=option.get("image_url"),
+                    payload=option.get("payload") or {},
+                    order=option.get("order", 0),
+                    is_active=True,
+                )
+                for nomination_id, option in batch
+            ]
+        )
+        self.stats["options"] += len(batch)
+        self.stats["created_games"] += created
+        self.stats["updated_games"] += updated
+        self._report()
 
 
 def _serialize_game(game: Game | None) -> dict[str, Any] | None:
@@ -231,7 +459,7 @@ def _serialize_option(option: NominationOption) -> dict[str, Any]:
     }
 
 
-def _serialize_nomination(nomination: Nomination) -> dict[str, Any]:
+def _serialize_nomination_fields(nomination: Nomination) -> dict[str, Any]:
     return {
         "id": nomination.id,
         "title": nomination.title,
@@ -239,6 +467,12 @@ def _serialize_nomination(nomination: Nomination) -> dict[str, Any]:
         "kind": nomination.kind,
         "config": nomination.config if isinstance(nomination.config, dict) else {},
         "order": nomination.order,
+    }
+
+
+def _serialize_nomination(nomination: Nomination) -> dict[str, Any]:
+    return {
+        **_serialize_nomination_fields(nomination),
         "options": [_serialize_option(option) for option in nomination.options.all()],
     }
 
@@ -324,7 +558,12 @@ def preview_voting_import(
 
 
 def import_voting_payload(
-    payload: dict[str, Any], *, using: str | None = None, force: bool = False
+    payload: dict[str, Any],
+    *,
+    using: str | None = None,
+    force: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: ImportProgressCallback | None = None,
 ) -> dict[str, Any]:
     db_alias = using or "default"
     normalized = normalize_voting_import_payload(payload)
@@ -350,57 +589,15 @@ def import_voting_payload(
         existing.delete()
 
     with transaction.atomic(using=db_alias):
-        voting = Voting.objects.using(db_alias).create(
-            code=normalized["code"],
-            title=normalized["title"] or normalized["code"],
-            description=normalized["description"] or "",
-            order=normalized["order"],
-            is_active=normalized["is_active"],
-            show_vote_counts=normalized["show_vote_counts"],
-            rules=normalized["rules"] or {},
-            deadline_at=normalized["deadline_at"],
+        voting = _create_voting(normalized, db_alias=db_alias)
+        writer = _CatalogWriter(
+            voting, db_alias=db_alias, chunk_size=chunk_size, progress=progress
         )
-
-        created_games = 0
-        updated_games = 0
-        option_count = 0
-
         for nomination in normalized["nominations"]:
-            kind_value = _normalize_kind(nomination.get("kind"))
-            config_value = (
-                nomination.get("config")
-                if isinstance(nomination.get("config"), dict)
-                else {}
-            )
-            nomination_obj = Nomination.objects.using(db_alias).create(
-                id=nomination["id"],
-                voting=voting,
-                title=nomination["title"],
-                description=nomination.get("description") or "",
-                kind=kind_value,
-                config=config_value,
-                order=nomination.get("order", 0),
-                is_active=True,
-            )
+            writer.add_nomination(nomination)
             for option in nomination.get("options", []):
-                game = None
-                if option.get("game"):
-                    game, created, updated = _upsert_game(
-                        option["game"], db_alias=db_alias
-                    )
-                    created_games += int(created)
-                    updated_games += int(updated)
-                NominationOption.objects.using(db_alias).create(
-                    id=option["id"],
-                    nomination=nomination_obj,
-                    game=game,
-                    title=option["title"],
-                    image_url=option.get("image_url"),
-                    payload=option.get("payload") or {},
-                    order=option.get("order", 0),
-                    is_active=True,
-                )
-                option_count += 1
+                writer.add_option(nomination["id"], option)
+        writer.flush()
 
     export_nominations = list(
         Nomination.objects.using(db_alias)
@@ -419,13 +616,207 @@ def import_voting_payload(
     return {
         "voting": build_voting_export_payload(voting, nominations=export_nominations),
         "replaced_existing": replaced_existing,
-        "created_games": created_games,
-        "updated_games": updated_games,
-        "nominations_count": len(normalized["nominations"]),
-        "options_count": option_count,
+        "created_games": writer.stats["created_games"],
+        "updated_games": writer.stats["updated_games"],
+        "nominations_count": writer.stats["nominations"],
+        "options_count": writer.stats["options"],
     }
 
 
+def _parse_ndjson_line(raw: str | bytes, line_no: int) -> dict[str, Any] | None:
+    text = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        record = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"Строка {line_no}: некорректный JSON ({exc.msg})") from exc
+    if isinstance(record, dict):
+        return record
+    raise ValueError(f"Строка {line_no}: ожидается JSON-объект")
+
+
+def import_voting_ndjson(
+    lines: Iterable[str | bytes],
+    *,
+    using: str | None = None,
+    force: bool = False,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: ImportProgressCallback | None = None,
+) -> dict[str, Any]:
+    """
+    Импорт голосования из потока NDJSON (формат ``export_voting_ndjson``).
+
+    Первая непустая строка — запись ``voting``, далее записи ``nomination`` и
+    ``option`` (у карточки есть ``nomination_id``; номинация может также
+    содержать карточки во вложенном ``options``). Записи не накапливаются в
+    памяти целиком: номинации и карточки пишутся ``bulk_create`` пачками по
+    ``chunk_size``, игры для пачки подбираются одним запросом. Всё выполняется
+    в одной транзакции, поэтому ошибка в середине файла ничего не оставляет.
+    """
+    db_alias = using or "default"
+    iterator = iter(enumerate(lines, start=1))
+
+    header: dict[str, Any] | None = None
+    for line_no, raw in iterator:
+        record = _parse_ndjson_line(raw, line_no)
+        if record is None:
+            continue
+        if record.get("type") != NDJSON_VOTING:
+            raise ValueError(
+                f"Строка {line_no}: первой должна идти запись «{NDJSON_VOTING}»"
+            )
+        header = record
+        break
+    if header is None:
+        raise ValueError("Пустой файл импорта")
+
+    header = {key: value for key, value in header.items() if key != "type"}
+    deadline_raw = header.get("deadline_at") or header.get("deadlineAt")
+    if isinstance(deadline_raw, str):
+        header["deadline_at"] = parse_datetime(deadline_raw)
+        header.pop("deadlineAt", None)
+    header["nominations"] = []
+    normalized = normalize_voting_import_payload(header)
+
+    existing = Voting.objects.using(db_alias).filter(code=normalized["code"]).first()
+    replaced_existing = bool(existing)
+    if existing and not force:
+        raise ValueError(
+            f"Голосование с кодом «{normalized['code']}» уже существует. "
+            "Укажите force=true для замены."
+        )
+
+    nomination_ids: set[str] = set()
+    option_ids: set[str] = set()
+    option_order: dict[str, int] = {}
+
+    with transaction.atomic(using=db_alias):
+        if existing:
+            logger.info(
+                "Replacing existing voting via NDJSON import",
+                extra={"voting_code": normalized["code"]},
+            )
+            existing.delete()
+        voting = _create_voting(normalized, db_alias=db_alias)
+        writer = _CatalogWriter(
+            voting, db_alias=db_alias, chunk_size=chunk_size, progress=progress
+        )
+
+        def add_option(raw_option: dict[str, Any], nomination_id: str, line_no: int):
+            if nomination_id not in nomination_ids:
+                raise ValueError(
+                    f"Строка {line_no}: номинация {nomination_id or '—'} не найдена"
+                )
+            fallback_order = option_order.get(nomination_id, 0)
+            option_order[nomination_id] = fallback_order + 1
+            option = _normalize_option(raw_option, fallback_order)
+            if not option["id"]:
+                raise ValueError(f"Строка {line_no}: у карточки должен быть id")
+            if option["id"] in option_ids:
+                raise ValueError(f"Дублируется id карточки: {option['id']}")
+            option_ids.add(option["id"])
+            writer.add_option(nomination_id, option)
+
+        for line_no, raw in iterator:
+            record = _parse_ndjson_line(raw, line_no)
+            if record is None:
+                continue
+            record_type = record.get("type")
+            if record_type == NDJSON_NOMINATION:
+                nomination = _normalize_nomination(
+                    {**record, "options": []}, len(nomination_ids)
+                )
+                if not nomination["id"]:
+                    raise ValueError(f"Строка {line_no}: у номинации должен быть id")
+                if nomination["id"] in nomination_ids:
+                    raise ValueError(f"Дублируется id номинации: {nomination['id']}")
+                nomination_ids.add(nomination["id"])
+                writer.add_nomination(nomination)
+                for raw_option in record.get("options") or []:
+                    add_option(raw_option, nomination["id"], line_no)
+            elif record_type == NDJSON_OPTION:
+                nomination_id = _clean_str(
+                    record.get("nomination_id") or record.get("nominationId")
+                )
+                add_option(record, nomination_id, line_no)
+            else:
+                raise ValueError(
+                    f"Строка {line_no}: неизвестный тип записи «{record_type}»"
+                )
+        writer.flush()
+
+    return {
+        "code": voting.code,
+        "replaced_existing": replaced_existing,
+        "created_games": writer.stats["created_games"],
+        "updated_games": writer.stats["updated_games"],
+        "nominations_count": writer.stats["nominations"],
+        "options_count": writer.stats["options"],
+    }
+
+
+def _ndjson_dump(record: dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, cls=DjangoJSONEncoder) + "\n"
+
+
+def _iter_voting_ndjson(
+    voting: Voting, *, db_alias: str, chunk_size: int
+) -> Iterator[str]:
+    header = build_voting_export_payload(voting)
+    header.pop("nominations")
+    yield _ndjson_dump({"type": NDJSON_VOTING, **header})
+
+    nominations = (
+        Nomination.objects.using(db_alias)
+        .filter(voting=voting)
+        .order_by("order", "title", "id")
+    )
+    # Карточки читаются одним курсором в том же порядке, что и номинации,
+    # поэтому их можно сливать без запроса на каждую номинацию.
+    options = (
+        NominationOption.objects.using(db_alias)
+        .filter(nomination__voting=voting)
+        .select_related("game")
+        .order_by(
+            "nomination__order",
+            "nomination__title",
+            "nomination_id",
+            "order",
+            "title",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    pending = next(options, None)
+    for nomination in nominations.iterator(chunk_size=chunk_size):
+        record = _serialize_nomination_fields(nomination)
+        yield _ndjson_dump({"type": NDJSON_NOMINATION, **record})
+        while pending is not None and pending.nomination_id == nomination.id:
+            yield _ndjson_dump(
+                {
+                    "type": NDJSON_OPTION,
+                    "nomination_id": nomination.id,
+                    **_serialize_option(pending),
+                }
+            )
+            pending = next(options, None)
+
+
+def export_voting_ndjson(
+    code: str, *, using: str | None = None, chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Iterator[str] | None:
+    """
+    Потоковая выгрузка голосования в NDJSON: по строке на голосование,
+    номинацию и карточку. Возвращает ``None``, если голосования нет.
+    """
+    db_alias = using or "default"
+    voting = Voting.objects.using(db_alias).filter(code=code).first()
+    if not voting:
+        return None
+    return _iter_voting_ndjson(voting, db_alias=db_alias, chunk_size=chunk_size)
+
+
 def delete_voting_by_code(code: str, *, using: str | None = None) -> bool:
     db_alias = using or "default"
     deleted, _ = Voting.objects.using(db_alias).filter(code=code).delete()
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import json
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from nominations.models import Game, Nomination, NominationOption, Voting
+from votings.services import (
+    export_voting_ndjson,
+    export_voting_payload,
+    import_voting_ndjson,
+    import_voting_payload,
+)
+
+
+def _catalog(code: str, *, nominations: int, options_per_nomination: int) -> dict:
+    return {
+        "code": code,
+        "title": code.title(),
+        "nominations": [
+            {
+                "id": f"{code}-nom-{n}",
+                "title": f"Nomination {n}",
+                "options": [
+                    {
+                        "id": f"{code}-opt-{n}-{o}",
+                        "title": f"Option {n}-{o}",
+                        "game": {"id": f"game-{n}-{o}", "title": f"Game {n}-{o}"},
+                    }
+                    for o in range(options_per_nomination)
+                ],
+            }
+            for n in range(nominations)
+        ],
+    }
+
+
+class BulkImportTests(TestCase):
+    def test_games_are_upserted_by_external_id_then_title(self):
+        Game.objects.create(id="known", title="Known", genre="old")
+        Game.objects.create(id="by-title", title="By Title")
+
+        result = import_voting_payload(
+            {
+                "code": "games",
+                "title": "Games",
+                "nominations": [
+                    {
+                        "id": "games-nom",
+                        "title": "Nom",
+                        "options": [
+                            {
+                                "id": "o1",
+                                "title": "O1",
+                                "game": {"id": "known", "title": "Known", "genre": "rpg"},
+                            },
+                            {"id": "o2", "title": "O2", "game": {"title": "By Title"}},
+                            {"id": "o3", "title": "O3", "game": {"id": "ext-42", "title": "New"}},
+                            {"id": "o4", "title": "O4", "game": {"title": "Fresh Game"}},
+                            {"id": "o5", "title": "O5", "game": {"title": "Fresh Game"}},
+                        ],
+                    }
+                ],
+            }
+        )
+
+        self.assertEqual(result["created_games"], 2)
+        self.assertEqual(result["updated_games"], 1)
+        self.assertEqual(result["options_count"], 5)
+        self.assertEqual(Game.objects.get(id="known").genre, "rpg")
+        options = {opt.id: opt.game_id for opt in NominationOption.objects.all()}
+        self.assertEqual(options["o1"], "known")
+        self.assertEqual(options["o2"], "by-title")
+        self.assertEqual(options["o3"], "ext-42")
+        self.assertEqual(options["o4"], "fresh-game")
+        self.assertEqual(options["o5"], "fresh-game")
+
+    def test_new_game_slug_collision_gets_suffix(self):
+        Game.objects.create(id="clash", title="Other")
+
+        import_voting_payload(
+            {
+                "code": "slugs",
+                "title": "Slugs",
+                "nominations": [
+                    {
+                        "id": "slugs-nom",
+                        "title": "Nom",
+                        "options": [{"id": "s1", "title": "S1", "game": {"title": "Clash"}}],
+                    }
+                ],
+            }
+        )
+
+        self.assertEqual(Game.objects.get(title="Clash").id, "clash-1")
+
+    def test_query_count_is_per_chunk_not_per_option(self):
+        with CaptureQueriesContext(connection) as queries:
+            import_voting_payload(_catalog("large", nominations=4, options_per_nomination=100))
+
+        self.assertEqual(NominationOption.objects.filter(nomination__voting_id="large").count(), 400)
+        # SQLite splits bulk inserts by its variable limit; still far below one per option.
+        self.assertLess(len(queries.captured_queries), 40)
+
+    def test_progress_is_reported_per_chunk(self):
+        reports: list[dict[str, int]] = []
+
+        import_voting_payload(
+            _catalog("progress", nominations=1, options_per_nomination=5),
+            chunk_size=2,
+            progress=reports.append,
+        )
+
+        self.assertEqual(reports[-1]["options"], 5)
+        self.assertEqual([r["options"] for r in reports if r["options"]], [2, 4, 5])
+
+
+class NdjsonCatalogTests(TestCase):
+    def test_export_then_import_round_trips(self):
+        import_voting_payload(_catalog("trip", nominations=3, options_per_nomination=4))
+        Nomination.objects.create(id="trip-empty", voting_id="trip", title="Empty", order=9)
+        before = export_voting_payload("trip")
+
+        lines = list(export_voting_ndjson("trip", chunk_size=3))
+        self.assertEqual(json.loads(lines[0])["type"], "voting")
+        self.assertEqual(len(lines), 1 + 4 + 12)
+
+        result = import_voting_ndjson(lines, force=True, chunk_size=5)
+
+        self.assertTrue(result["replaced_existing"])
+        self.assertEqual(result["nominations_count"], 4)
+        self.assertEqual(result["options_count"], 12)
+        self.assertEqual(export_voting_payload("trip"), before)
+
+    def test_export_unknown_voting_returns_none(self):
+        self.assertIsNone(export_voting_ndjson("missing"))
+
+    def test_invalid_line_rolls_back_whole_import(self):
+        lines = [
+            json.dumps({"type": "voting", "code": "broken", "title": "Broken"}),
+            json.dumps({"type": "nomination", "id": "broken-nom", "title": "Nom"}),
+            json.dumps({"type": "option", "nomination_id": "broken-nom", "id": "b1", "title": "B1"}),
+            json.dumps({"type": "option", "nomination_id": "nope", "id": "b2", "title": "B2"}),
+        ]
+
+        with self.assertRaisesMessage(ValueError, "Строка 4"):
+            import_voting_ndjson(lines, chunk_size=1)
+
+        self.assertFalse(Voting.objects.filter(code="broken").exists())
+        self.assertFalse(NominationOption.objects.filter(id="b1").exists())
+
+    def test_existing_voting_requires_force(self):
+        import_voting_payload(_catalog("keep", nominations=1, options_per_nomination=1))
+
+        with self.assertRaises(ValueError):
+            import_voting_ndjson([json.dumps({"type": "voting", "code": "keep", "title": "Keep"})])
+
+        self.assertTrue(NominationOption.objects.filter(nomination__voting_id="keep").exists())